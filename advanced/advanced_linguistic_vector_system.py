@@ -21,11 +21,16 @@ from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import uuid
+import zlib
 
 # استيراد المكونات الأساسية
 from core_interfaces import BaseComponent
 from revolutionary_mother_equation import RevolutionaryMotherEquation
 
+def _stable_unit_weight(text: str) -> float:
+    """وزن في [0, 1) ثابت عبر العمليات (بخلاف hash() المتغير مع PYTHONHASHSEED)، لمتجهات تُحفظ في المخزن"""
+    return zlib.crc32(text.encode('utf-8')) % 100 / 100.0
+
 class VectorType(Enum):
     """أنواع المتجهات اللغوية"""
     WORD_VECTOR = "word_vector"
@@ -955,6 +960,123 @@ class ArabicMorphologyAnalyzer:
             'consonant_count': len([c for c in word if c not in 'اةيوأإآ'])
         }
 
+class WordVectorMatrixStore:
+    """
+    مخزن مصفوفي متصل لمتجهات الكلمات
+
+    📦 جميع المتجهات في مصفوفة واحدة متصلة (صف لكل كلمة):
+    - إضافة دفعات بنسخ واحد مع مضاعفة السعة
+    - بحث أقرب الكلمات (جيب التمام) بضرب مصفوفة في متجه واحد
+    - حفظ/تحميل بصيغة npy مع إمكانية الربط بالذاكرة (memory-map)
+    """
+
+    def __init__(self, dimension: int, dtype=np.float64, initial_capacity: int = 1024):
+        self.dimension = dimension
+        self.dtype = np.dtype(dtype)
+        self.words: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._matrix = np.zeros((initial_capacity, dimension), dtype=self.dtype)
+        self._norms = np.zeros(initial_capacity, dtype=self.dtype)
+        self.is_memory_mapped = False
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """المصفوفة الفعلية (بدون السعة الاحتياطية)"""
+        return self._matrix[:len(self.words)]
+
+    def _ensure_capacity(self, required_rows: int):
+        capacity = self._matrix.shape[0]
+        if required_rows <= capacity and not self.is_memory_mapped:
+            return
+
+        new_capacity = max(required_rows, capacity * 2, 1)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=self.dtype)
+        norms = np.zeros(new_capacity, dtype=self.dtype)
+        matrix[:len(self.words)] = self._matrix[:len(self.words)]
+        norms[:len(self.words)] = self._norms[:len(self.words)]
+        self._matrix, self._norms = matrix, norms
+        self.is_memory_mapped = False
+
+    def add_batch(self, words: List[str], vectors: np.ndarray):
+        """إضافة (أو استبدال) دفعة متجهات"""
+        vectors = np.asarray(vectors, dtype=self.dtype).reshape(len(words), self.dimension)
+
+        new_rows = [i for i, word in enumerate(words) if word not in self.index]
+        self._ensure_capacity(len(self.words) + len(new_rows))
+
+        rows = np.empty(len(words), dtype=np.int64)
+        for i, word in enumerate(words):
+            row = self.index.get(word)
+            if row is None:
+                row = len(self.words)
+                self.index[word] = row
+                self.words.append(word)
+            rows[i] = row
+
+        self._matrix[rows] = vectors
+        self._norms[rows] = np.linalg.norm(vectors, axis=1)
+
+    def get(self, word: str) -> Optional[np.ndarray]:
+        row = self.index.get(word)
+        return None if row is None else self._matrix[row]
+
+    def get_many(self, words: List[str]) -> np.ndarray:
+        """صفوف مجموعة كلمات موجودة في المخزن"""
+        return self._matrix[[self.index[word] for word in words]]
+
+    def most_similar(self, query_vector: np.ndarray, top_k: int = 10,
+                     exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """أقرب الكلمات بتشابه جيب التمام (ضرب مصفوفة في متجه)"""
+        count = len(self.words)
+        if count == 0:
+            return []
+
+        query_vector = np.asarray(query_vector, dtype=self.dtype)
+        query_norm = np.linalg.norm(query_vector)
+        if query_norm == 0:
+            return []
+
+        norms = self._norms[:count]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (self.matrix @ query_vector) / (norms * query_norm)
+        scores = np.where(norms > 0, scores, -np.inf)
+
+        if exclude is not None and exclude in self.index:
+            scores[self.index[exclude]] = -np.inf
+
+        k = min(top_k, count)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [(self.words[row], float(scores[row])) for row in candidates if np.isfinite(scores[row])]
+
+    def save(self, path_prefix: str):
+        """حفظ المصفوفة (npy) وقائمة الكلمات (json)"""
+        np.save(f"{path_prefix}.npy", self.matrix)
+        with open(f"{path_prefix}.words.json", 'w', encoding='utf-8') as f:
+            json.dump(self.words, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path_prefix: str, memory_map: bool = True) -> 'WordVectorMatrixStore':
+        """تحميل مخزن محفوظ (مربوط بالذاكرة للقراءة افتراضياً)"""
+        matrix = np.load(f"{path_prefix}.npy", mmap_mode='r' if memory_map else None)
+        with open(f"{path_prefix}.words.json", 'r', encoding='utf-8') as f:
+            words = json.load(f)
+
+        store = cls(matrix.shape[1], dtype=matrix.dtype, initial_capacity=1)
+        store._matrix = matrix
+        store._norms = np.linalg.norm(matrix, axis=1).astype(matrix.dtype)
+        store.words = words
+        store.index = {word: row for row, word in enumerate(words)}
+        # الإضافة لاحقاً تنسخ المصفوفة إلى الذاكرة أولاً
+        store.is_memory_mapped = memory_map
+        return store
+
 class AdvancedLinguisticVectorSystem(BaseComponent):
     """نظام المتجهات اللغوية المتقدم"""
     
@@ -966,6 +1088,9 @@ class AdvancedLinguisticVectorSystem(BaseComponent):
         self.word_vectors: Dict[str, LinguisticVector] = {}
         self.semantic_relationships: List[SemanticRelationship] = []
         self.vector_dimension = 100  # أبعاد المتجه
+
+        # المخزن المصفوفي لجميع المتجهات (للإنشاء الدفعي والبحث عن الأقرب)
+        self.vector_store = WordVectorMatrixStore(self.vector_dimension)
         
         # المعادلة الأم للحسابات
         self.mother_equation = None
@@ -974,6 +1099,7 @@ class AdvancedLinguisticVectorSystem(BaseComponent):
         # قواميس دلالية أساسية
         self.semantic_categories = self._initialize_semantic_categories()
         self.contextual_weights = self._initialize_contextual_weights()
+        self._semantic_offsets: Optional[Dict[str, float]] = None
         
         # إحصائيات النظام
         self.stats = {
@@ -1086,12 +1212,79 @@ class AdvancedLinguisticVectorSystem(BaseComponent):
         
         # حفظ المتجه
         self.word_vectors[word] = linguistic_vector
+        self.vector_store.add_batch([word], final_vector[np.newaxis, :])
         
         # تحديث الإحصائيات
         self._update_stats(language, start_time)
         
         return linguistic_vector
     
+    def create_word_vectors(self, words: List[str], context: str = "عام",
+                            include_morphology: bool = False) -> np.ndarray:
+        """
+        إنشاء متجهات مفردات كاملة دفعة واحدة
+
+        تُحسب المتجهات بعمليات مصفوفية بدلاً من حرف بحرف، وتُتخطى الكلمات
+        الموجودة مسبقاً في المخزن. يعيد مصفوفة (عدد الكلمات × الأبعاد)
+        بترتيب الكلمات المدخلة.
+
+        Args:
+            words: الكلمات
+            context: السياق (يحدد الوزن السياقي)
+            include_morphology: تشغيل المحلل الصرفي لكل كلمة عربية جديدة
+                (مكلف، ولا يغير المتجه إلا إذا أعاد التحليل 'root' أو 'pattern')
+        """
+        start_time = datetime.now()
+
+        new_words = list(dict.fromkeys(word for word in words if word not in self.vector_store))
+        if new_words:
+            languages = [self._detect_language(word) for word in new_words]
+
+            # المتجه الأساسي لجميع الكلمات الجديدة دفعة واحدة
+            vectors = self._generate_base_vectors(new_words)
+
+            # الخصائص الدلالية والسياقية (إزاحة لكل كلمة ثم وزن السياق)
+            semantic_offsets = self._get_semantic_offsets()
+            vectors += np.array([semantic_offsets.get(word, 0.0) for word in new_words])[:, np.newaxis]
+            vectors *= self.contextual_weights.get(context, 0.5)
+
+            # الخصائص الصرفية
+            if include_morphology:
+                morphology_offsets = np.array([
+                    self._morphological_offset(self.morphology_analyzer.analyze_word(word))
+                    if language == LanguageType.ARABIC else 0.0
+                    for word, language in zip(new_words, languages)
+                ])
+                vectors += morphology_offsets[:, np.newaxis]
+
+            self.vector_store.add_batch(new_words, vectors)
+
+            self.stats['total_vectors'] += len(new_words)
+            self.stats['arabic_vectors'] += sum(1 for language in languages if language == LanguageType.ARABIC)
+            self.stats['english_vectors'] += sum(1 for language in languages if language == LanguageType.ENGLISH)
+            self.stats['processing_time'] += (datetime.now() - start_time).total_seconds()
+
+        return self.vector_store.get_many(list(words))
+
+    def find_similar_words(self, word_or_vector: Union[str, np.ndarray], top_k: int = 10) -> List[Tuple[str, float]]:
+        """أقرب الكلمات في المخزن (تشابه جيب التمام)"""
+        if isinstance(word_or_vector, str):
+            query_vector = self.vector_store.get(word_or_vector)
+            if query_vector is None:
+                query_vector = self.create_word_vectors([word_or_vector])[0]
+            return self.vector_store.most_similar(query_vector, top_k, exclude=word_or_vector)
+
+        return self.vector_store.most_similar(word_or_vector, top_k)
+
+    def save_vector_store(self, path_prefix: str):
+        """حفظ المخزن المصفوفي"""
+        self.vector_store.save(path_prefix)
+
+    def load_vector_store(self, path_prefix: str, memory_map: bool = True):
+        """تحميل مخزن محفوظ (مربوط بالذاكرة افتراضياً)"""
+        self.vector_store = WordVectorMatrixStore.load(path_prefix, memory_map)
+        self.vector_dimension = self.vector_store.dimension
+    
     def _detect_language(self, word: str) -> LanguageType:
         """كشف نوع اللغة"""
         arabic_chars = set('ابتثجحخدذرزسشصضطظعغفقكلمنهوياةأإآ')
@@ -1141,6 +1334,46 @@ class AdvancedLinguisticVectorSystem(BaseComponent):
         
         return vector
     
+    def _generate_base_vectors(self, words: List[str]) -> np.ndarray:
+        """إنشاء المتجهات الأساسية لمجموعة كلمات بعمليات مصفوفية"""
+        dimension = self.vector_dimension
+        truncated = [word[:dimension] for word in words]
+        lengths = np.fromiter((len(word) for word in truncated), dtype=np.int64, count=len(truncated))
+
+        # قيم جميع الأحرف في مصفوفة واحدة ثم توزيعها على الصفوف
+        codes = np.frombuffer(''.join(truncated).encode('utf-32-le'), dtype=np.uint32)
+        char_values = codes.astype(np.float64) / 1000.0
+
+        if self.mother_equation:
+            # النظريات الثلاث الثورية (نفس معادلات _generate_base_vector)
+            zero_duality = np.sin(char_values * np.pi) * np.cos(char_values * np.pi)
+            perpendicular = np.sin(char_values) * np.cos(char_values + np.pi / 2)
+            filament = np.exp(-char_values) * np.sin(char_values * 2 * np.pi)
+            char_values = (zero_duality + perpendicular + filament) / 3
+
+        row_indices = np.repeat(np.arange(len(truncated)), lengths)
+        offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        column_indices = np.arange(len(codes)) - offsets
+
+        vectors = np.zeros((len(truncated), dimension))
+        vectors[row_indices, column_indices] = char_values
+
+        # تطبيع الصفوف
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def _get_semantic_offsets(self) -> Dict[str, float]:
+        """إزاحة دلالية لكل كلمة من الفئات الدلالية (تُحسب مرة واحدة)"""
+        if self._semantic_offsets is None:
+            offsets: Dict[str, float] = {}
+            for category, words in self.semantic_categories.items():
+                category_weight = _stable_unit_weight(category)
+                for word in words:
+                    offsets[word] = offsets.get(word, 0.0) + category_weight * 0.1
+            self._semantic_offsets = offsets
+        return self._semantic_offsets
+
     def _add_semantic_features(self, base_vector: np.ndarray, word: str) -> np.ndarray:
         """إضافة الخصائص الدلالية"""
         semantic_vector = base_vector.copy()
@@ -1149,7 +1382,7 @@ class AdvancedLinguisticVectorSystem(BaseComponent):
         for category, words in self.semantic_categories.items():
             if word in words:
                 # إضافة وزن دلالي للفئة
-                category_weight = hash(category) % 100 / 100.0
+                category_weight = _stable_unit_weight(category)
                 semantic_vector += category_weight * 0.1
         
         return semantic_vector
@@ -1167,21 +1400,27 @@ class AdvancedLinguisticVectorSystem(BaseComponent):
     def _add_morphological_features(self, contextual_vector: np.ndarray, morphological_features: Dict[str, Any]) -> np.ndarray:
         """إضافة الخصائص الصرفية"""
         final_vector = contextual_vector.copy()
+        final_vector += self._morphological_offset(morphological_features)
+        return final_vector
+
+    def _morphological_offset(self, morphological_features: Dict[str, Any]) -> float:
+        """الإزاحة الصرفية (الجذر والوزن) المضافة إلى المتجه"""
+        offset = 0.0
         
         if morphological_features:
             # إضافة خصائص الجذر
             if 'root' in morphological_features:
                 root = morphological_features['root']
                 root_weight = len(root) / 10.0
-                final_vector += root_weight * 0.05
+                offset += root_weight * 0.05
             
             # إضافة خصائص الوزن
             if 'pattern' in morphological_features:
                 pattern = morphological_features['pattern']
-                pattern_weight = hash(pattern) % 100 / 100.0
-                final_vector += pattern_weight * 0.03
+                pattern_weight = _stable_unit_weight(pattern)
+                offset += pattern_weight * 0.03
         
-        return final_vector
+        return offset
     
     def _calculate_semantic_weight(self, word: str) -> float:
         """حساب الوزن الدلالي"""
@@ -1231,6 +1470,18 @@ def test_linguistic_vector_system():
         print(f"      🎯 وزن دلالي: {vector.semantic_weight:.3f}")
         print(f"      🧬 وزن سياقي: {vector.contextual_weight:.3f}")
     
+    # اختبار الإنشاء الدفعي والبحث عن الأقرب
+    print(f"\n📦 اختبار الإنشاء الدفعي:")
+    batch_words = ['شمس', 'قمر', 'كتاب', 'قلم', 'مدرسة']
+    batch_vectors = system.create_word_vectors(batch_words, 'ديني', include_morphology=True)
+    print(f"   📊 مصفوفة المتجهات: {batch_vectors.shape}")
+    # 'شمس' لم يُنشأ فردياً بعد: نقارن الناتج الدفعي بالإنشاء الفردي له
+    batch_sun = batch_vectors[0].copy()
+    single_sun = system.create_word_vector('شمس', 'ديني').vector
+    print(f"   ✅ مطابقة للإنشاء الفردي: {np.allclose(batch_sun, single_sun)}")
+    for similar_word, score in system.find_similar_words('شمس', top_k=3):
+        print(f"      🔗 {similar_word}: {score:.3f}")
+    
     # عرض الإحصائيات
     print(f"\n📈 إحصائيات النظام:")
     print(f"   📊 إجمالي المتجهات: {system.stats['total_vectors']}")
@@ -1241,5 +1492,78 @@ def test_linguistic_vector_system():
     print(f"\n✅ انتهى اختبار نظام المتجهات اللغوية!")
     return system
 
+def test_word_vector_store() -> bool:
+    """اختبار المخزن المصفوفي: البحث عن الأقرب، الحفظ والتحميل المربوط بالذاكرة، وثبات المتجهات"""
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    print("🧪 اختبار المخزن المصفوفي لمتجهات الكلمات")
+    print("=" * 50)
+
+    try:
+        generator = np.random.RandomState(7)
+        words = [f"w{i}" for i in range(50)]
+        vectors = generator.normal(size=(50, 16))
+        vectors[3] = 0.0                                   # متجه صفري لا يظهر في النتائج
+        store = WordVectorMatrixStore(16, initial_capacity=4)
+        store.add_batch(words[:20], vectors[:20])
+        store.add_batch(words[20:], vectors[20:])
+        assert len(store) == 50 and np.allclose(store.matrix, vectors)
+
+        # أقرب k مطابقة للمقارنة الشاملة
+        query = generator.normal(size=16)
+        norms = np.linalg.norm(vectors, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected_scores = vectors @ query / (norms * np.linalg.norm(query))
+        ranked = [words[row] for row in np.argsort(-np.nan_to_num(expected_scores, nan=-np.inf)) if row != 3]
+        assert [word for word, _ in store.most_similar(query, top_k=5)] == ranked[:5]
+        assert len(store.most_similar(query, top_k=100)) == 49
+        assert words[0] not in [word for word, _ in store.most_similar(vectors[0], top_k=5, exclude=words[0])]
+        assert store.most_similar(np.zeros(16)) == []
+
+        # الاستبدال يحدّث الصف والمعيار
+        store.add_batch([words[1]], -vectors[1][np.newaxis, :])
+        assert store.most_similar(-vectors[1], top_k=1)[0][0] == words[1]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prefix = os.path.join(temp_dir, "vectors")
+            store.save(prefix)
+            loaded = WordVectorMatrixStore.load(prefix)
+            assert loaded.is_memory_mapped and loaded.words == store.words
+            assert np.allclose(loaded.matrix, store.matrix)
+            assert loaded.most_similar(query, top_k=5) == store.most_similar(query, top_k=5)
+
+            # الإضافة بعد التحميل تنسخ المصفوفة ولا تمس الملف
+            loaded.add_batch(["جديد"], np.ones((1, 16)))
+            assert not loaded.is_memory_mapped and len(loaded) == 51
+            assert np.load(f"{prefix}.npy").shape == (50, 16)
+
+        # المتجهات المحفوظة ثابتة عبر العمليات مهما كان PYTHONHASHSEED
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+        probe = (
+            "import sys; sys.path[:0] = sys.argv[1:]\n"
+            "from advanced_linguistic_vector_system import AdvancedLinguisticVectorSystem\n"
+            "system = AdvancedLinguisticVectorSystem()\n"
+            "print(system.create_word_vector('نور', 'ديني').vector.tobytes().hex())"
+        )
+        outputs = set()
+        for seed in ("1", "2"):
+            result = subprocess.run(
+                [sys.executable, "-c", probe, module_dir, *sys.path],
+                env={**os.environ, "PYTHONHASHSEED": seed}, capture_output=True, text=True, check=True
+            )
+            outputs.add(result.stdout.strip().splitlines()[-1])
+        assert len(outputs) == 1
+
+        print("✅ المخزن المصفوفي يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار المخزن المصفوفي: {e}")
+        return False
+
 if __name__ == "__main__":
     test_linguistic_vector_system()
+    test_word_vector_store()
@@ -17,6 +17,10 @@ from abc import ABC, abstractmethod
 from enum import Enum
 import uuid
 import os
+import time
+import threading
+import functools
+from collections import deque
 from pathlib import Path
 
 from complete_multi_layer_thinking_core import ThinkingLayerType
@@ -41,17 +45,227 @@ class LearningSource(Enum):
     ERROR_CORRECTION = "error_correction"
     CROSS_LAYER_LEARNING = "cross_layer_learning"
 
+def _json_default(value: Any) -> Any:
+    """تحويل القيم غير القابلة للتسلسل مباشرة إلى JSON"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def serialize_learning_payload(payload: Any) -> str:
+    """تسلسل بيانات التعلم إلى JSON قابل للقراءة آلياً"""
+    return json.dumps(payload, ensure_ascii=False, default=_json_default)
+
+
+def deserialize_learning_payload(text: Optional[str]) -> Any:
+    """قراءة بيانات التعلم (السجلات القديمة المحفوظة بـ str تعاد نصاً كما هي)"""
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def locked_connection(method):
+    """تنفيذ الدالة تحت connection_lock (الاتصال مشترك مع خيط الكتابة المؤجلة)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.connection_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class WriteBehindQueue:
+    """
+    طابور كتابة مؤجلة لقاعدة بيانات واحدة
+    يجمع الصفوف ويكتبها في معاملة واحدة عند بلوغ حجم الدفعة أو عمرها الأقصى
+
+    الدفعة الفاشلة تُعاد محاولتها حتى max_retries مرة؛ بعدها تُكتب صفوفها واحداً واحداً
+    والصفوف التي تفشل منفردة تُنقل إلى dead_letters (ويُستدعى on_dead_letter إن وُجد).
+    """
+
+    def __init__(self, write_batch, batch_size: int = 64, max_batch_age: float = 0.5,
+                 name: str = "WriteBehind", max_retries: int = 3,
+                 on_dead_letter=None, dead_letter_limit: int = 10000):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.max_batch_age = max_batch_age
+        self.name = name
+        self.max_retries = max_retries
+        self.on_dead_letter = on_dead_letter
+
+        self._pending: List[Tuple] = []
+        self._retry_rows: List[Tuple] = []
+        self._retry_attempts = 0
+        self._oldest_pending: Optional[float] = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.dead_letters: "deque[Tuple]" = deque(maxlen=dead_letter_limit)
+
+        self.queue_stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'failed_batches': 0,
+                            'dead_lettered': 0}
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def enqueue(self, row: Tuple):
+        """إضافة صف؛ الدفعة الممتلئة تُكتب فوراً، والأقدم يكتبها خيط الخلفية عند انتهاء عمرها"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"طابور الكتابة {self.name} مغلق")
+            self._pending.append(row)
+            self.queue_stats['enqueued'] += 1
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            batch_full = len(self._pending) >= self.batch_size
+            if not batch_full:
+                self._ensure_started()
+                self._condition.notify()
+        if batch_full:
+            self.flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and self._oldest_pending is None:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                remaining = self._oldest_pending + self.max_batch_age - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+            self.flush()
+
+    def flush(self) -> int:
+        """كتابة كل الصفوف المعلقة الآن في معاملة واحدة؛ يعيد عدد الصفوف المكتوبة"""
+        with self._flush_lock:
+            with self._condition:
+                rows = self._retry_rows + self._pending
+                self._retry_rows = []
+                self._pending = []
+                self._oldest_pending = None
+            if not rows:
+                return 0
+            try:
+                self.write_batch(rows)
+            except Exception as e:
+                with self._condition:
+                    self.queue_stats['failed_batches'] += 1
+                    self._retry_attempts += 1
+                    attempt = self._retry_attempts
+                    retry = attempt <= self.max_retries
+                    if retry:
+                        # محاولة لاحقة بعد عمر الدفعة (الصفوف الجديدة تنتظر خلفها)
+                        self._retry_rows = rows
+                        self._oldest_pending = time.monotonic()
+                        self._condition.notify()
+                print(f"   ❌ خطأ في كتابة دفعة {self.name} "
+                      f"(المحاولة {attempt}/{self.max_retries + 1}): {e}")
+                if retry:
+                    return 0
+                return self._write_rows_individually(rows)
+            with self._condition:
+                self._retry_attempts = 0
+                self.queue_stats['written'] += len(rows)
+                self.queue_stats['batches'] += 1
+            return len(rows)
+
+    def _write_rows_individually(self, rows: List[Tuple]) -> int:
+        """بعد استنفاد المحاولات: كتابة كل صف منفرداً ونقل الصفوف الفاشلة إلى dead_letters"""
+        written = 0
+        dead_rows = []
+        for row in rows:
+            try:
+                self.write_batch([row])
+                written += 1
+            except Exception:
+                dead_rows.append(row)
+
+        with self._condition:
+            self._retry_attempts = 0
+            self.queue_stats['written'] += written
+            self.queue_stats['dead_lettered'] += len(dead_rows)
+            self.dead_letters.extend(dead_rows)
+
+        if dead_rows:
+            print(f"   ☠️ {self.name}: {len(dead_rows)} صف نُقل إلى dead_letters بعد {self.max_retries + 1} محاولات")
+            if self.on_dead_letter is not None:
+                self.on_dead_letter(dead_rows)
+        return written
+
+    def close(self) -> List[Tuple]:
+        """
+        كتابة المتبقي (مع استنفاد المحاولات فوراً) وإيقاف خيط الخلفية
+
+        Returns:
+            جميع الصفوف التي تعذرت كتابتها (dead_letters)؛ قائمة فارغة عند كتابة كل شيء
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        # كل فشل يستهلك محاولة، فتنتهي الحلقة بعد max_retries + 1 محاولة على الأكثر
+        while True:
+            with self._condition:
+                if not self._pending and not self._retry_rows:
+                    break
+            self.flush()
+
+        if self.dead_letters:
+            print(f"   ⚠️ {self.name}: أُغلق مع {len(self.dead_letters)} صف لم يُكتب")
+        return list(self.dead_letters)
+
+    def get_queue_statistics(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                **self.queue_stats,
+                'pending': len(self._pending) + len(self._retry_rows),
+                'retry_attempts': self._retry_attempts,
+                'batch_size': self.batch_size,
+                'max_batch_age': self.max_batch_age
+            }
+
+
 class BaseSpecializedDatabase(ABC):
     """
     قاعدة البيانات المتخصصة الأساسية
     كل طبقة تفكير لها قاعدة بيانات متخصصة ترث من هذه الفئة
+
+    جلسات التعلم تُكتب بطريقة مؤجلة (write-behind) في دفعات داخل معاملة واحدة،
+    وتُحفظ بصيغة JSON في قاعدة بيانات بنمط WAL.
     """
+
+    # إعدادات الكتابة المؤجلة الافتراضية (يمكن تغييرها عبر configure_write_behind)
+    WRITE_BATCH_SIZE = 64
+    WRITE_BATCH_MAX_AGE = 0.5  # ثوانٍ
     
     def __init__(self, db_name: str, layer_type: ThinkingLayerType):
         self.db_name = db_name
         self.layer_type = layer_type
         self.db_path = f"databases/{db_name}.db"
         self.connection = None
+        self.connection_lock = threading.RLock()
+        self.learning_queue = WriteBehindQueue(
+            self._write_learning_sessions, self.WRITE_BATCH_SIZE, self.WRITE_BATCH_MAX_AGE,
+            name=f"LearningWriteBehind-{db_name}"
+        )
         
         # إنشاء مجلد قواعد البيانات
         os.makedirs("databases", exist_ok=True)
@@ -63,8 +277,13 @@ class BaseSpecializedDatabase(ABC):
     
     def initialize_database(self):
         """تهيئة قاعدة البيانات وإنشاء الجداول"""
-        self.connection = sqlite3.connect(self.db_path)
+        # الكتابة قد تأتي من خيط الكاتب الخلفي للنواة التفكيرية
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
         cursor = self.connection.cursor()
+
+        # نمط WAL: القراءة لا تنتظر الكتابة، والمعاملات المجمعة أرخص
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
         
         # جدول المعرفة الأساسية
         cursor.execute('''
@@ -124,50 +343,94 @@ class BaseSpecializedDatabase(ABC):
         """استرجاع المعرفة المتخصصة"""
         pass
     
+    def configure_write_behind(self, batch_size: Optional[int] = None,
+                               max_batch_age: Optional[float] = None):
+        """ضبط حجم الدفعة وعمرها الأقصى"""
+        if batch_size is not None:
+            self.learning_queue.batch_size = max(1, batch_size)
+        if max_batch_age is not None:
+            self.learning_queue.max_batch_age = max_batch_age
+    
     def store_learning_session(self, session_data: Dict[str, Any]) -> str:
-        """حفظ جلسة تعلم"""
+        """حفظ جلسة تعلم (تُضاف إلى طابور الكتابة المؤجلة ويعاد معرفها فوراً)"""
         session_id = str(uuid.uuid4())
-        cursor = self.connection.cursor()
-        
-        cursor.execute('''
-            INSERT INTO learning_sessions 
-            (session_id, input_data, output_result, learning_source, performance_score)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
+        self.learning_queue.enqueue((
             session_id,
-            str(session_data.get('input', {})),  # تحويل إلى نص
-            str(session_data.get('output', {})),  # تحويل إلى نص
+            serialize_learning_payload(session_data.get('input', {})),
+            serialize_learning_payload(session_data.get('output', {})),
             session_data.get('source', 'unknown'),
             session_data.get('performance', 0.5)
         ))
-        
-        self.connection.commit()
         return session_id
     
+    def _write_learning_sessions(self, rows: List[Tuple]):
+        """كتابة دفعة من جلسات التعلم في معاملة واحدة"""
+        with self.connection_lock:
+            with self.connection:
+                self.connection.executemany('''
+                    INSERT INTO learning_sessions 
+                    (session_id, input_data, output_result, learning_source, performance_score)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+    
+    def flush_learning(self) -> int:
+        """كتابة جلسات التعلم المعلقة فوراً"""
+        return self.learning_queue.flush()
+    
+    def retrieve_learning_sessions(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """استرجاع أحدث جلسات التعلم مع فك JSON"""
+        self.flush_learning()
+        with self.connection_lock:
+            cursor = self.connection.cursor()
+            cursor.execute('''
+                SELECT session_id, input_data, output_result, learning_source, performance_score, timestamp
+                FROM learning_sessions ORDER BY rowid DESC LIMIT ?
+            ''', (limit,))
+            rows = cursor.fetchall()
+        
+        return [
+            {
+                'session_id': row[0],
+                'input': deserialize_learning_payload(row[1]),
+                'output': deserialize_learning_payload(row[2]),
+                'source': row[3],
+                'performance': row[4],
+                'timestamp': row[5]
+            }
+            for row in rows
+        ]
+    
     def get_learning_statistics(self) -> Dict[str, Any]:
         """إحصائيات التعلم"""
-        cursor = self.connection.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM learning_sessions')
-        total_sessions = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT AVG(performance_score) FROM learning_sessions')
-        avg_performance = cursor.fetchone()[0] or 0.0
-        
-        cursor.execute('SELECT COUNT(*) FROM knowledge_base')
-        knowledge_count = cursor.fetchone()[0]
+        self.flush_learning()
+        with self.connection_lock:
+            cursor = self.connection.cursor()
+
+            cursor.execute('SELECT COUNT(*) FROM learning_sessions')
+            total_sessions = cursor.fetchone()[0]
+
+            cursor.execute('SELECT AVG(performance_score) FROM learning_sessions')
+            avg_performance = cursor.fetchone()[0] or 0.0
+
+            cursor.execute('SELECT COUNT(*) FROM knowledge_base')
+            knowledge_count = cursor.fetchone()[0]
         
         return {
             'total_sessions': total_sessions,
             'average_performance': avg_performance,
             'knowledge_entries': knowledge_count,
-            'database_type': self.layer_type.value
+            'database_type': self.layer_type.value,
+            'write_behind': self.learning_queue.get_queue_statistics()
         }
     
-    def close(self):
-        """إغلاق قاعدة البيانات"""
-        if self.connection:
-            self.connection.close()
+    def close(self) -> List[Tuple]:
+        """إغلاق قاعدة البيانات بعد كتابة جلسات التعلم المعلقة؛ يعيد الجلسات التي تعذرت كتابتها"""
+        unwritten = self.learning_queue.close()
+        with self.connection_lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+        return unwritten
 
 # ==================== قواعد البيانات المتخصصة ====================
 
@@ -247,6 +510,7 @@ class MathematicalDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         """حفظ المعرفة الرياضية"""
         knowledge_id = str(uuid.uuid4())
@@ -270,6 +534,7 @@ class MathematicalDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """استرجاع المعرفة الرياضية"""
         cursor = self.connection.cursor()
@@ -350,6 +615,7 @@ class LogicalDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         """حفظ المعرفة المنطقية"""
         knowledge_id = str(uuid.uuid4())
@@ -373,6 +639,7 @@ class LogicalDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """استرجاع المعرفة المنطقية"""
         cursor = self.connection.cursor()
@@ -469,6 +736,7 @@ class SymbolicDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         """حفظ المعرفة الرمزية"""
         knowledge_id = str(uuid.uuid4())
@@ -493,6 +761,7 @@ class SymbolicDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """استرجاع المعرفة الرمزية"""
         cursor = self.connection.cursor()
@@ -588,6 +857,7 @@ class VisualDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         """حفظ المعرفة البصرية"""
         knowledge_id = str(uuid.uuid4())
@@ -612,6 +882,7 @@ class VisualDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """استرجاع المعرفة البصرية"""
         cursor = self.connection.cursor()
@@ -698,6 +969,7 @@ class SemanticDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         """حفظ المعرفة الدلالية"""
         knowledge_id = str(uuid.uuid4())
@@ -721,6 +993,7 @@ class SemanticDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """استرجاع المعرفة الدلالية"""
         cursor = self.connection.cursor()
@@ -775,6 +1048,7 @@ class LinguisticDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         knowledge_id = str(uuid.uuid4())
         cursor = self.connection.cursor()
@@ -794,6 +1068,7 @@ class LinguisticDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         cursor = self.connection.cursor()
         cursor.execute('SELECT * FROM linguistic_rules LIMIT ?', (query.get('limit', 10),))
@@ -850,6 +1125,7 @@ class InterpretiveDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         knowledge_id = str(uuid.uuid4())
         cursor = self.connection.cursor()
@@ -869,6 +1145,7 @@ class InterpretiveDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         cursor = self.connection.cursor()
         cursor.execute('SELECT * FROM interpretations LIMIT ?', (query.get('limit', 10),))
@@ -925,6 +1202,7 @@ class PhysicalDatabase(BaseSpecializedDatabase):
         
         self.connection.commit()
     
+    @locked_connection
     def store_specialized_knowledge(self, knowledge: Dict[str, Any]) -> str:
         knowledge_id = str(uuid.uuid4())
         cursor = self.connection.cursor()
@@ -944,6 +1222,7 @@ class PhysicalDatabase(BaseSpecializedDatabase):
         self.connection.commit()
         return knowledge_id
     
+    @locked_connection
     def retrieve_specialized_knowledge(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         cursor = self.connection.cursor()
         cursor.execute('SELECT * FROM physical_laws LIMIT ?', (query.get('limit', 10),))
@@ -968,9 +1247,11 @@ class CompleteSpecializedDatabaseManager:
     يدير جميع قواعد البيانات الثمانية
     """
     
-    def __init__(self):
+    def __init__(self, batch_size: Optional[int] = None, max_batch_age: Optional[float] = None):
         self.databases = {}
         self.initialize_all_databases()
+        for db in self.databases.values():
+            db.configure_write_behind(batch_size, max_batch_age)
         
         print(f"🗄️🌟 تم إنشاء مدير قواعد البيانات المتخصصة المكتمل")
         print(f"   قواعد بيانات مفعلة: {len(self.databases)}")
@@ -1029,11 +1310,21 @@ class CompleteSpecializedDatabaseManager:
         
         return stats
     
-    def close_all_databases(self):
-        """إغلاق جميع قواعد البيانات"""
-        for db in self.databases.values():
-            db.close()
+    def flush_all(self) -> int:
+        """كتابة جميع جلسات التعلم المعلقة في كل قواعد البيانات"""
+        return sum(db.flush_learning() for db in self.databases.values())
+    
+    def close_all_databases(self) -> Dict[str, List[Tuple]]:
+        """إغلاق جميع قواعد البيانات (مع كتابة المعلق أولاً)؛ يعيد جلسات التعلم التي تعذرت كتابتها لكل قاعدة"""
+        unwritten = {}
+        for layer_type, db in self.databases.items():
+            rows = db.close()
+            if rows:
+                unwritten[layer_type] = rows
         print("🗄️ تم إغلاق جميع قواعد البيانات")
+        if unwritten:
+            print(f"   ⚠️ جلسات تعلم لم تُكتب: {sum(len(rows) for rows in unwritten.values())}")
+        return unwritten
 
 # ==================== اختبار النظام المكتمل ====================
 
@@ -1106,6 +1397,13 @@ def test_complete_specialized_databases():
     print(f"نتائج البحث البصري: {len(visual_results)}")
     print(f"نتائج البحث الدلالي: {len(semantic_results)}")
     
+    # جلسات التعلم محفوظة بصيغة JSON وتُقرأ كما حُفظت
+    print("\n📚 اختبار قراءة جلسات التعلم:")
+    manager.flush_all()
+    latest_session = manager.databases['semantic'].retrieve_learning_sessions(1)[0]
+    print(f"- مصدر آخر جلسة: {latest_session['source']}")
+    print(f"- قراءة مطابقة: {latest_session['session_id'] == semantic_id}")
+    
     # إحصائيات شاملة
     print("\n📊 إحصائيات قواعد البيانات المكتملة:")
     stats = manager.get_comprehensive_statistics()
@@ -1120,5 +1418,72 @@ def test_complete_specialized_databases():
     
     print("\n✅ تم الانتهاء من اختبار قواعد البيانات المتخصصة المكتملة!")
 
+def test_write_behind_failing_writer() -> bool:
+    """اختبار طابور الكتابة المؤجلة مع كاتب فاشل: حد المحاولات، dead_letters، وما يعيده close()"""
+    print("🧪 اختبار الكتابة المؤجلة مع كاتب فاشل")
+    print("="*60)
+
+    try:
+        # الكاتب يرفض أي دفعة فيها صف 'bad'، ويفشل مرة واحدة مع صفوف 'flaky'
+        written_rows: List[Tuple] = []
+        attempts: List[int] = []
+        flaky_failures = {'remaining': 1}
+
+        def write_batch(rows: List[Tuple]):
+            attempts.append(len(rows))
+            if any(row[0] == 'bad' for row in rows):
+                raise sqlite3.OperationalError("صف مرفوض")
+            if any(row[0] == 'flaky' for row in rows) and flaky_failures['remaining']:
+                flaky_failures['remaining'] -= 1
+                raise sqlite3.OperationalError("فشل مؤقت")
+            written_rows.extend(rows)
+
+        notified: List[Tuple] = []
+        queue = WriteBehindQueue(write_batch, batch_size=100, max_batch_age=60.0, name="FailingWriter",
+                                 max_retries=2, on_dead_letter=notified.extend)
+
+        # فشل مؤقت: تنجح المحاولة التالية للدفعة نفسها دون صفوف ميتة
+        queue.enqueue(('flaky', 1))
+        assert queue.flush() == 0 and queue.get_queue_statistics()['pending'] == 1
+        assert queue.flush() == 1 and written_rows == [('flaky', 1)]
+        assert queue.get_queue_statistics()['retry_attempts'] == 0
+
+        # فشل دائم: max_retries + 1 محاولة للدفعة ثم كتابة الصفوف منفردة
+        attempts.clear()
+        for row in (('good', 1), ('bad', 1), ('good', 2)):
+            queue.enqueue(row)
+        assert queue.flush() == 0 and queue.flush() == 0
+        assert queue.flush() == 2
+        assert attempts == [3, 3, 3, 1, 1, 1]
+        assert written_rows[-2:] == [('good', 1), ('good', 2)]
+        assert list(queue.dead_letters) == [('bad', 1)] and notified == [('bad', 1)]
+
+        # close() يستنفد المحاولات فوراً ويعيد كل الصفوف التي تعذرت كتابتها
+        attempts.clear()
+        queue.enqueue(('bad', 2))
+        queue.enqueue(('good', 3))
+        dead_rows = queue.close()
+        assert attempts == [2, 2, 2, 1, 1]
+        assert dead_rows == [('bad', 1), ('bad', 2)] and notified == dead_rows
+        assert written_rows[-1] == ('good', 3)
+
+        statistics = queue.get_queue_statistics()
+        assert statistics['dead_lettered'] == 2 and statistics['pending'] == 0
+        assert statistics['failed_batches'] == 7
+
+        try:
+            queue.enqueue(('late', 1))
+            raise AssertionError("كان يجب رفض الإضافة بعد الإغلاق")
+        except RuntimeError:
+            pass
+
+        print("✅ الكتابة المؤجلة تتعامل مع الكاتب الفاشل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الكتابة المؤجلة: {e}")
+        return False
+
 if __name__ == "__main__":
     test_complete_specialized_databases()
+    test_write_behind_failing_writer()
@@ -11,16 +11,25 @@
 جميع الأفكار والنظريات من إبداع باسل يحيى عبدالله
 """
 
+import os
+import sys
 import numpy as np
 import json
 import math
-import re
 from typing import Dict, List, Tuple, Any, Optional, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 from datetime import datetime
 
+# مستخرج الجذور المشترك يعيش في حزمة revolutionary_intelligence
+try:
+    from revolutionary_intelligence.arabic_root_extractor import CompiledArabicRootExtractor, WordFormLRU, build_normalizer
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'mubtakir_agent', 'baserah_universal_system'))
+    from revolutionary_intelligence.arabic_root_extractor import CompiledArabicRootExtractor, WordFormLRU, build_normalizer
+
 class WordType(Enum):
     """أنواع الكلمات"""
     NOUN = "اسم"
@@ -108,7 +117,7 @@ class MorphologicalAnalysis:
 class RevolutionaryArabicMorphologySystem:
     """نظام الصرف العربي الثوري"""
     
-    def __init__(self, name: str = "RevolutionaryMorphologySystem"):
+    def __init__(self, name: str = "RevolutionaryMorphologySystem", cache_size: int = 65536):
         self.name = name
         
         # المعاملات التكيفية للنظريات الثلاث
@@ -135,10 +144,19 @@ class RevolutionaryArabicMorphologySystem:
         self.pattern_database = self._initialize_pattern_database()
         self.prefix_database = self._initialize_prefix_database()
         self.suffix_database = self._initialize_suffix_database()
-        
-        # ذاكرة التحليل
-        self.analysis_cache: Dict[str, MorphologicalAnalysis] = {}
-        self.root_cache: Dict[str, RootAnalysis] = {}
+
+        # المستخرج المُجمَّع: أشجار السوابق واللواحق وقوالب الأوزان تُبنى مرة واحدة
+        self.root_extractor = CompiledArabicRootExtractor(
+            prefixes=self.prefix_database.keys(),
+            suffixes=self.suffix_database.keys(),
+            pattern_templates={name: info['template'] for name, info in self.pattern_database.items()},
+            normalizer=build_normalizer(),
+            cache_size=cache_size
+        )
+
+        # ذاكرة التحليل (محدودة الحجم - الأقدم استخداماً يُخلى أولاً)
+        self.analysis_cache = WordFormLRU(cache_size)
+        self.root_cache = WordFormLRU(cache_size)
         
         # إحصائيات النظام
         self.stats = {
@@ -162,12 +180,15 @@ class RevolutionaryArabicMorphologySystem:
         normalized_word = self._normalize_word(word)
         
         # البحث في الذاكرة المؤقتة
-        cache_key = f"{normalized_word}_{context or 'default'}"
-        if cache_key in self.analysis_cache:
-            return self.analysis_cache[cache_key]
-        
-        # تحليل الجذر باستخدام النظريات الثلاث
-        root_analysis = self._extract_root_revolutionary(normalized_word)
+        cache_key = (normalized_word, context or 'default')
+        cached_analysis = self.analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        # تحليل الجذر باستخدام النظريات الثلاث (مرة واحدة لكل صيغة كلمة)
+        root_analysis = self.root_cache.get_or_compute(
+            normalized_word, lambda: self._extract_root_revolutionary(normalized_word)
+        )
         
         # تحليل الوزن الصرفي
         pattern_analysis = self._identify_pattern_revolutionary(normalized_word, root_analysis)
@@ -212,7 +233,7 @@ class RevolutionaryArabicMorphologySystem:
         )
         
         # حفظ في الذاكرة المؤقتة
-        self.analysis_cache[cache_key] = analysis
+        self.analysis_cache.put(cache_key, analysis)
         
         # تحديث الإحصائيات
         processing_time = (datetime.now() - start_time).total_seconds()
@@ -519,31 +540,16 @@ class RevolutionaryArabicMorphologySystem:
         }
     
     def _normalize_word(self, word: str) -> str:
-        """تطبيع الكلمة"""
-        # إزالة التشكيل والرموز غير المرغوبة
-        normalized = re.sub(r'[ًٌٍَُِّْ]', '', word)
-        
-        # توحيد الألف
-        normalized = re.sub(r'[أإآ]', 'ا', normalized)
-        
-        # توحيد التاء
-        normalized = re.sub(r'ة', 'ه', normalized)
-        
-        return normalized.strip()
+        """تطبيع الكلمة (إزالة التشكيل وتوحيد الألف والتاء بجدول ترجمة واحد)"""
+        return self.root_extractor.normalizer(word)
     
     def _extract_prefix(self, word: str) -> Optional[str]:
-        """استخراج البادئة"""
-        for prefix in sorted(self.prefix_database.keys(), key=len, reverse=True):
-            if word.startswith(prefix):
-                return prefix
-        return None
+        """استخراج البادئة (أطول تطابق من شجرة السوابق)"""
+        return self.root_extractor.longest_prefix(word)
     
     def _extract_suffix(self, word: str) -> Optional[str]:
-        """استخراج اللاحقة"""
-        for suffix in sorted(self.suffix_database.keys(), key=len, reverse=True):
-            if word.endswith(suffix):
-                return suffix
-        return None
+        """استخراج اللاحقة (أطول تطابق من شجرة اللواحق المعكوسة)"""
+        return self.root_extractor.longest_suffix(word)
     
     def _extract_infix(self, word: str) -> Optional[str]:
         """استخراج الحشو (إن وجد)"""
@@ -680,14 +686,13 @@ class RevolutionaryArabicMorphologySystem:
         if len(word) != len(template):
             return 0.0
 
-        # مقارنة بسيطة - يمكن تطويرها
-        matches = 0
+        # مواضع الجذر (ف ع ل) بوزن أقل، والزوائد تطابق كامل
+        compiled = self.root_extractor.compiled_template(template)
+        root_slots = compiled.root_slots
+        matches = 0.5 * len(root_slots)
         for i, (w_char, t_char) in enumerate(zip(word, template)):
-            if t_char == 'ف' or t_char == 'ع' or t_char == 'ل':
-                # هذه مواضع الجذر
-                matches += 0.5  # وزن أقل للجذر
-            elif w_char == t_char:
-                matches += 1.0  # تطابق كامل
+            if w_char == t_char and i not in root_slots:
+                matches += 1.0
 
         return matches / len(template)
 
@@ -783,12 +788,9 @@ class RevolutionaryArabicMorphologySystem:
         if not template or len(word) != len(template):
             return list(word[:3])  # افتراضي
 
-        root_chars = []
-        for i, (w_char, t_char) in enumerate(zip(word, template)):
-            if t_char in 'فعل':  # مواضع الجذر
-                root_chars.append(w_char)
-
-        return root_chars if root_chars else list(word[:3])
+        # مواضع الجذر محسوبة مسبقاً في القالب المُجمَّع
+        root_letters = self.root_extractor.compiled_template(template).extract_root(word)
+        return list(root_letters) if root_letters else list(word[:3])
 
     def _classify_word_type(self, word: str, pattern_analysis: PatternAnalysis) -> WordType:
         """تصنيف نوع الكلمة"""
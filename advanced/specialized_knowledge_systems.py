@@ -68,6 +68,95 @@ class KnowledgeRelation:
     description: str = ""
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+class MinHashLSHIndex:
+    """
+    فهرس MinHash مع تجزئة حساسة للموقع (LSH)
+
+    🔗 بدلاً من مقارنة كل عنصر جديد بجميع العناصر المخزنة:
+    - توقيع MinHash لكل عنصر (تقدير تشابه جاكارد)
+    - تقسيم التوقيع إلى نطاقات؛ العناصر التي تتطابق في نطاق واحد تقع في الدلو نفسه
+    - المرشحون فقط (أعضاء الدلاء المشتركة) يُقارنون بالتشابه الدقيق
+    """
+
+    # أولي ميرسين 2^61 - 1 للتبديلات العشوائية
+    MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+    MAX_HASH = np.uint64((1 << 32) - 1)
+    # يُرفع عند تغيير دالة التوقيع لإعادة بناء التوقيعات المخزنة
+    HASH_VERSION = 2
+
+    def __init__(self, num_permutations: int = 64, bands: int = 32, seed: int = 1):
+        if num_permutations % bands != 0:
+            raise ValueError("num_permutations يجب أن يقبل القسمة على bands")
+
+        self.num_permutations = num_permutations
+        self.bands = bands
+        self.rows_per_band = num_permutations // bands
+        self.seed = seed
+
+        # a و b أصغر من الأولي؛ a مقسوم إلى 30 بت منخفضة و31 بت عالية لتبقى النواتج ضمن 64 بت
+        generator = np.random.RandomState(seed)
+        prime = int(self.MERSENNE_PRIME)
+        a = generator.randint(1, prime, size=num_permutations, dtype=np.int64).astype(np.uint64)
+        self._a_low = a & np.uint64((1 << 30) - 1)
+        self._a_high = a >> np.uint64(30)
+        self._b = generator.randint(0, prime, size=num_permutations, dtype=np.int64).astype(np.uint64)
+
+    @property
+    def parameters(self) -> Dict[str, int]:
+        """المعاملات التي تحدد التوقيعات (تُخزن مع الفهرس لكشف التوقيعات القديمة)"""
+        return {'permutations': self.num_permutations, 'bands': self.bands,
+                'seed': self.seed, 'hash_version': self.HASH_VERSION}
+
+    @classmethod
+    def _mod_prime(cls, values: np.ndarray) -> np.ndarray:
+        """باقي القسمة على 2^61 - 1 لقيم أقل من 2^64 (طي ميرسين دون تجاوز)"""
+        values = (values & cls.MERSENNE_PRIME) + (values >> np.uint64(61))
+        return np.where(values >= cls.MERSENNE_PRIME, values - cls.MERSENNE_PRIME, values)
+
+    def _permute(self, token_hashes: np.ndarray) -> np.ndarray:
+        """(a·x + b) mod (2^61 - 1) لكل رمز x (أقل من 2^32) ولكل تبديل، بحساب لا يتجاوز 64 بت"""
+        x = token_hashes[:, np.newaxis]
+        low = self._mod_prime(self._a_low * x)            # a_low·x < 2^62
+        high = self._mod_prime(self._a_high * x)          # a_high·x < 2^63
+        # high·2^30 mod p: البتات فوق 2^61 تُطوى لأن 2^61 ≡ 1
+        high = (high >> np.uint64(31)) + ((high & np.uint64((1 << 31) - 1)) << np.uint64(30))
+        return self._mod_prime(self._mod_prime(high) + low + self._b)
+
+    @property
+    def approximate_threshold(self) -> float:
+        """عتبة جاكارد التقريبية التي يصبح عندها العنصران مرشحين: (1/b)^(1/r)"""
+        return (1.0 / self.bands) ** (1.0 / self.rows_per_band)
+
+    def signature(self, tokens: set) -> np.ndarray:
+        """حساب توقيع MinHash لمجموعة رموز"""
+        if not tokens:
+            return np.full(self.num_permutations, self.MAX_HASH, dtype=np.uint32)
+
+        token_hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+             for token in tokens),
+            dtype=np.uint64, count=len(tokens)
+        )
+
+        permuted = self._permute(token_hashes) & self.MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        """مفاتيح الدلاء (نطاق + صفوفه) كأعداد صحيحة 64 بت موقعة"""
+        keys = []
+        rows = signature.reshape(self.bands, self.rows_per_band)
+        for band_index in range(self.bands):
+            digest = hashlib.blake2b(rows[band_index].tobytes(), digest_size=8,
+                                     salt=band_index.to_bytes(2, 'little')).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    @staticmethod
+    def estimate_jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+        """تقدير تشابه جاكارد من توقيعين"""
+        return float(np.mean(signature1 == signature2))
+
+
 class SpecializedKnowledgeSystem:
     """
     نظام المعرفة المتخصص
@@ -79,10 +168,19 @@ class SpecializedKnowledgeSystem:
     - تعلم وتطوير المعرفة تلقائياً
     """
     
-    def __init__(self, name: str = "BaserahKnowledge", db_path: str = "knowledge_systems.db"):
+    # أقصى عدد للمرشحين المقارنين لكل إدخال (يحمي من الدلاء الساخنة)
+    MAX_RELATION_CANDIDATES = 512
+    # حد متغيرات SQLite في الاستعلام الواحد
+    SQL_VARIABLE_CHUNK = 900
+
+    def __init__(self, name: str = "BaserahKnowledge", db_path: str = "knowledge_systems.db",
+                 lsh_permutations: int = 64, lsh_bands: int = 32):
         self.name = name
         self.db_path = db_path
         self.creation_time = datetime.now()
+
+        # فهرس MinHash/LSH لاكتشاف العلاقات دون مسح كامل
+        self.lsh_index = MinHashLSHIndex(lsh_permutations, lsh_bands)
         
         # معاملات المعرفة الثورية
         self.alpha_knowledge = [1.3, 0.9, 0.6]  # معاملات الفهم
@@ -156,9 +254,83 @@ class SpecializedKnowledgeSystem:
             )
         ''')
         
+        # جدول توقيعات MinHash
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS minhash_signatures (
+                item_id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                FOREIGN KEY (item_id) REFERENCES knowledge_items (item_id)
+            )
+        ''')
+
+        # جدول دلاء LSH (نطاق + صفوفه -> عنصر)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket_key INTEGER NOT NULL,
+                item_id TEXT NOT NULL,
+                FOREIGN KEY (item_id) REFERENCES knowledge_items (item_id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_lsh_buckets_key ON lsh_buckets (bucket_key)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_relations_source ON knowledge_relations (source_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_relations_target ON knowledge_relations (target_id)')
+
+        # معاملات الفهرس التي بُنيت بها التوقيعات المخزنة
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lsh_index_metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+
         conn.commit()
+
+        # إعادة البناء الكاملة فقط إذا كان الفهرس مفقوداً أو بُني بمعاملات مختلفة،
+        # وإلا تُفهرس العناصر التي لا توقيع لها فقط
+        cursor.execute("SELECT value FROM lsh_index_metadata WHERE key = 'parameters'")
+        row = cursor.fetchone()
+        index_is_stale = row is None or json.loads(row[0]) != self.lsh_index.parameters
+        if index_is_stale:
+            cursor.execute('SELECT COUNT(*) FROM knowledge_items')
+            if not cursor.fetchone()[0]:
+                self._store_lsh_parameters(cursor)
+                conn.commit()
+                index_is_stale = False
+        else:
+            self._index_missing_signatures(conn)
         conn.close()
-    
+
+        if index_is_stale:
+            self.rebuild_lsh_index()
+
+    def _store_lsh_parameters(self, cursor):
+        """تسجيل معاملات الفهرس الحالية مع التوقيعات"""
+        cursor.execute("INSERT OR REPLACE INTO lsh_index_metadata (key, value) VALUES ('parameters', ?)",
+                       (json.dumps(self.lsh_index.parameters, sort_keys=True),))
+
+    def _index_missing_signatures(self, conn, batch_size: int = 1000) -> int:
+        """فهرسة العناصر المخزنة التي لا توقيع لها (دون المساس بالتوقيعات الموجودة)"""
+        read_cursor = conn.cursor()
+        write_cursor = conn.cursor()
+
+        indexed = 0
+        read_cursor.execute('''
+            SELECT * FROM knowledge_items
+            WHERE item_id NOT IN (SELECT item_id FROM minhash_signatures)
+        ''')
+        while True:
+            rows = read_cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                self._index_item_signature(self._row_to_knowledge_item(row), write_cursor)
+            indexed += len(rows)
+
+        if indexed:
+            conn.commit()
+            print(f"🔗 تمت فهرسة {indexed} عنصر معرفي جديد بتوقيعات MinHash")
+        return indexed
+
     def compute_knowledge_understanding_function(self, complexity: float, depth: float) -> float:
         """حساب دالة الفهم المعرفي الثورية"""
         understanding_score = 0.0
@@ -175,47 +347,54 @@ class SpecializedKnowledgeSystem:
         
         return min(understanding_score, 1.0)  # تطبيع النتيجة
     
+    def _insert_knowledge_item(self, item: KnowledgeItem, cursor) -> List[KnowledgeRelation]:
+        """إدخال عنصر (بعد تحليله) وفهرسته واكتشاف علاقاته ضمن معاملة المؤشر"""
+        # تحليل المعرفة وتحديث نقاط الثقة بناءً عليه
+        analysis = self._analyze_knowledge_item(item)
+        item.confidence_score = analysis["understanding_score"]
+        
+        cursor.execute('''
+            INSERT INTO knowledge_items 
+            (item_id, title, content, knowledge_type, knowledge_level, tags, 
+             related_equations, confidence_score, creation_time, last_updated, 
+             usage_count, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            item.item_id, item.title, item.content, 
+            item.knowledge_type.value, item.knowledge_level.value,
+            json.dumps(item.tags), json.dumps(item.related_equations),
+            item.confidence_score, item.creation_time.isoformat(),
+            item.last_updated.isoformat(), item.usage_count,
+            json.dumps(item.metadata)
+        ))
+        
+        # البحث عن علاقات تلقائية (مرشحو LSH فقط) ثم فهرسة العنصر
+        return self._discover_automatic_relations(item, cursor)
+    
     def add_knowledge_item(self, item: KnowledgeItem) -> str:
-        """إضافة عنصر معرفي جديد"""
+        """إضافة عنصر معرفي جديد (العنصر وفهرسه وعلاقاته في معاملة واحدة)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # تحليل المعرفة
-        analysis = self._analyze_knowledge_item(item)
-        
-        # تحديث نقاط الثقة بناءً على التحليل
-        item.confidence_score = analysis["understanding_score"]
-        
         try:
-            cursor.execute('''
-                INSERT INTO knowledge_items 
-                (item_id, title, content, knowledge_type, knowledge_level, tags, 
-                 related_equations, confidence_score, creation_time, last_updated, 
-                 usage_count, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                item.item_id, item.title, item.content, 
-                item.knowledge_type.value, item.knowledge_level.value,
-                json.dumps(item.tags), json.dumps(item.related_equations),
-                item.confidence_score, item.creation_time.isoformat(),
-                item.last_updated.isoformat(), item.usage_count,
-                json.dumps(item.metadata)
-            ))
+            new_relations = self._insert_knowledge_item(item, cursor)
             
             conn.commit()
             self.total_knowledge_items += 1
+            self.total_relations += len(new_relations)
             
             # تحديث الذاكرة المؤقتة
             self.knowledge_cache[item.item_id] = item
-            
-            # البحث عن علاقات تلقائية
-            self._discover_automatic_relations(item)
+            for relation in new_relations:
+                self.relation_cache[relation.relation_id] = relation
             
             print(f"📚 تم إضافة عنصر معرفي: {item.title}")
             print(f"   🎯 الثقة: {item.confidence_score:.3f}")
-            print(f"   🧠 الفهم: {analysis['understanding_score']:.3f}")
+            print(f"   🧠 الفهم: {item.confidence_score:.3f}")
+            print(f"   🔗 علاقات تلقائية: {len(new_relations)}")
             
         except Exception as e:
+            conn.rollback()
             print(f"❌ خطأ في إضافة المعرفة: {e}")
             return ""
         finally:
@@ -223,6 +402,47 @@ class SpecializedKnowledgeSystem:
         
         return item.item_id
     
+    def add_knowledge_items(self, items: List[KnowledgeItem]) -> List[str]:
+        """
+        إضافة دفعة عناصر في معاملة واحدة (كل عنصر يرى علاقاته مع عناصر الدفعة السابقة له)
+        العنصر الفاشل يُتراجع عنه وحده (نقطة حفظ لكل عنصر) وتكمل الدفعة
+        لا تُحفظ عناصر الدفعة في الذاكرة المؤقتة (للتغذية بالجملة بذاكرة ثابتة)
+        """
+        if not items:
+            return []
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        saved_ids = []
+        relations_count = 0
+        failures = []
+        try:
+            cursor.execute('BEGIN')
+            for item in items:
+                cursor.execute('SAVEPOINT knowledge_item')
+                try:
+                    relations_count += len(self._insert_knowledge_item(item, cursor))
+                    saved_ids.append(item.item_id)
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO knowledge_item')
+                    failures.append(e)
+                cursor.execute('RELEASE knowledge_item')
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ خطأ في إضافة دفعة المعرفة: {e}")
+            return []
+        finally:
+            conn.close()
+        
+        if failures:
+            print(f"❌ خطأ في إضافة {len(failures)} من {len(items)} عنصر معرفي: {failures[0]}")
+        
+        self.total_knowledge_items += len(saved_ids)
+        self.total_relations += relations_count
+        return saved_ids
+    
     def _analyze_knowledge_item(self, item: KnowledgeItem) -> Dict[str, Any]:
         """تحليل عنصر المعرفة"""
         # تحليل التعقيد
@@ -305,34 +525,112 @@ class SpecializedKnowledgeSystem:
         connection_strength = min(total_connections / max_possible_connections, 1.0)
         return connection_strength
     
-    def _discover_automatic_relations(self, new_item: KnowledgeItem):
-        """اكتشاف العلاقات التلقائية"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # البحث عن عناصر مشابهة
-        cursor.execute('SELECT * FROM knowledge_items WHERE item_id != ?', (new_item.item_id,))
-        existing_items = cursor.fetchall()
-        
-        for row in existing_items:
-            existing_item = self._row_to_knowledge_item(row)
-            
-            # حساب التشابه
+    def _similarity_tokens(self, item: KnowledgeItem) -> set:
+        """رموز العنصر المستخدمة في توقيع MinHash (العلامات + كلمات المحتوى)"""
+        tokens = {f"tag:{tag}" for tag in item.tags}
+        tokens.update(f"word:{word}" for word in item.content.lower().split())
+        return tokens
+
+    def _index_item_signature(self, item: KnowledgeItem, cursor) -> List[int]:
+        """حساب توقيع العنصر وتخزينه مع دلاء LSH الخاصة به"""
+        tokens = self._similarity_tokens(item)
+        signature = self.lsh_index.signature(tokens)
+        # العناصر الفارغة لا تُوضع في الدلاء (كلها تتطابق ولا تشابه فعلياً)
+        bucket_keys = self.lsh_index.band_keys(signature) if tokens else []
+
+        cursor.execute('INSERT OR REPLACE INTO minhash_signatures (item_id, signature) VALUES (?, ?)',
+                       (item.item_id, signature.tobytes()))
+        cursor.executemany('INSERT INTO lsh_buckets (bucket_key, item_id) VALUES (?, ?)',
+                           [(key, item.item_id) for key in bucket_keys])
+        return bucket_keys
+
+    def _find_relation_candidates(self, item_id: str, bucket_keys: List[int], cursor) -> List[str]:
+        """أعضاء الدلاء المشتركة مع العنصر (مرتبون بعدد النطاقات المشتركة)"""
+        placeholders = ','.join('?' for _ in bucket_keys)
+        cursor.execute(f'''
+            SELECT item_id FROM lsh_buckets
+            WHERE bucket_key IN ({placeholders}) AND item_id != ?
+            GROUP BY item_id
+            ORDER BY COUNT(*) DESC
+            LIMIT ?
+        ''', (*bucket_keys, item_id, self.MAX_RELATION_CANDIDATES))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _load_items_by_ids(self, item_ids: List[str], cursor) -> List[KnowledgeItem]:
+        """تحميل مجموعة عناصر بمعرفاتها (على دفعات)"""
+        items = []
+        for start in range(0, len(item_ids), self.SQL_VARIABLE_CHUNK):
+            chunk = item_ids[start:start + self.SQL_VARIABLE_CHUNK]
+            placeholders = ','.join('?' for _ in chunk)
+            cursor.execute(f'SELECT * FROM knowledge_items WHERE item_id IN ({placeholders})', chunk)
+            items.extend(self._row_to_knowledge_item(row) for row in cursor.fetchall())
+        return items
+
+    def _discover_automatic_relations(self, new_item: KnowledgeItem, cursor) -> List[KnowledgeRelation]:
+        """
+        اكتشاف العلاقات التلقائية
+
+        يُقارن العنصر الجديد فقط بمرشحي دلاء LSH (وليس بجميع العناصر)،
+        وتُكتب العلاقات دفعة واحدة ضمن معاملة الإدخال نفسها.
+        """
+        bucket_keys = self._index_item_signature(new_item, cursor)
+        if not bucket_keys:
+            return []
+        candidate_ids = self._find_relation_candidates(new_item.item_id, bucket_keys, cursor)
+
+        relations = []
+        for existing_item in self._load_items_by_ids(candidate_ids, cursor):
+            # حساب التشابه الدقيق للمرشحين فقط
             similarity = self._calculate_similarity(new_item, existing_item)
             
             if similarity > 0.3:  # عتبة التشابه
-                # إنشاء علاقة
-                relation = KnowledgeRelation(
+                relations.append(KnowledgeRelation(
                     source_id=new_item.item_id,
                     target_id=existing_item.item_id,
                     relation_type="related",
                     strength=similarity,
                     description=f"علاقة تلقائية بقوة {similarity:.3f}"
-                )
-                
-                self.add_knowledge_relation(relation)
-        
+                ))
+
+        if relations:
+            cursor.executemany('''
+                INSERT INTO knowledge_relations 
+                (relation_id, source_id, target_id, relation_type, strength, description, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (relation.relation_id, relation.source_id, relation.target_id,
+                 relation.relation_type, relation.strength, relation.description,
+                 json.dumps(relation.metadata))
+                for relation in relations
+            ])
+
+        return relations
+
+    def rebuild_lsh_index(self, batch_size: int = 1000) -> int:
+        """إعادة بناء توقيعات MinHash ودلاء LSH لجميع العناصر المخزنة"""
+        conn = sqlite3.connect(self.db_path)
+        read_cursor = conn.cursor()
+        write_cursor = conn.cursor()
+
+        write_cursor.execute('DELETE FROM minhash_signatures')
+        write_cursor.execute('DELETE FROM lsh_buckets')
+
+        indexed = 0
+        read_cursor.execute('SELECT * FROM knowledge_items')
+        while True:
+            rows = read_cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                self._index_item_signature(self._row_to_knowledge_item(row), write_cursor)
+            indexed += len(rows)
+
+        self._store_lsh_parameters(write_cursor)
+        conn.commit()
         conn.close()
+
+        print(f"🔗 تمت فهرسة {indexed} عنصر معرفي بتوقيعات MinHash")
+        return indexed
     
     def _calculate_similarity(self, item1: KnowledgeItem, item2: KnowledgeItem) -> float:
         """حساب التشابه بين عنصرين معرفيين"""
@@ -545,6 +843,11 @@ class SpecializedKnowledgeSystem:
                 "k": self.k_knowledge,
                 "beta": self.beta_knowledge
             },
+            "lsh_parameters": {
+                "permutations": self.lsh_index.num_permutations,
+                "bands": self.lsh_index.bands,
+                "approximate_threshold": self.lsh_index.approximate_threshold
+            },
             "creation_time": self.creation_time.isoformat()
         }
 
@@ -632,10 +935,125 @@ def test_specialized_knowledge_systems():
     print(f"   🎯 متوسط الثقة: {stats['average_confidence']:.3f}")
     print(f"   📊 توزيع الأنواع: {stats['type_distribution']}")
     print(f"   📊 توزيع المستويات: {stats['level_distribution']}")
+    print(f"   🔗 معاملات LSH: {stats['lsh_parameters']}")
     
     print(f"\n✅ انتهى اختبار أنظمة المعرفة المتخصصة!")
     return knowledge_system
 
+def test_minhash_lsh_relations() -> bool:
+    """اختبار فهرس MinHash/LSH: الاسترجاع، حذف المطابقات بالنوع فقط، الإضافة الدفعية، وتقادم الفهرس"""
+    import os
+    import tempfile
+
+    print("🔗 اختبار فهرس MinHash/LSH للعلاقات")
+    print("="*60)
+
+    def _relation_pairs(db_path: str) -> set:
+        conn = sqlite3.connect(db_path)
+        pairs = {frozenset(row) for row in conn.execute('SELECT source_id, target_id FROM knowledge_relations')}
+        conn.close()
+        return pairs
+
+    def _item(item_id: str, words: List[str], tags: List[str],
+              knowledge_type: KnowledgeType = KnowledgeType.SCIENTIFIC) -> KnowledgeItem:
+        return KnowledgeItem(item_id=item_id, title=item_id, content=" ".join(words),
+                             knowledge_type=knowledge_type, knowledge_level=KnowledgeLevel.BASIC, tags=tags)
+
+    try:
+        # التوقيعات: تقدير جاكارد قريب من القيمة الدقيقة
+        index = MinHashLSHIndex(64, 32)
+        base = {f"word:w{i}" for i in range(40)}
+        half = {f"word:w{i}" for i in range(20, 60)}       # جاكارد = 20/60
+        assert index.estimate_jaccard(index.signature(base), index.signature(set(base))) == 1.0
+        assert abs(index.estimate_jaccard(index.signature(base), index.signature(half)) - 1 / 3) < 0.2
+        assert index.band_keys(index.signature(base)) == index.band_keys(index.signature(set(base)))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "lsh_knowledge.db")
+            system = SpecializedKnowledgeSystem("LSHTest", db_path)
+
+            # مجموعات متقاربة (تشابه مرتفع) يجب أن تُربط جميع أزواجها
+            clusters = {
+                name: [_item(f"{name}{i}", [f"{name}_w{j}" for j in range(20)] + [f"{name}{i}_extra"], [name])
+                       for i in range(3)]
+                for name in ("alpha", "beta", "gamma")
+            }
+            batch = [item for items in clusters.values() for item in items]
+            saved_ids = system.add_knowledge_items(batch)
+            assert saved_ids == [item.item_id for item in batch]
+
+            pairs = _relation_pairs(db_path)
+            expected = {
+                frozenset((first.item_id, second.item_id))
+                for items in clusters.values()
+                for index_a, first in enumerate(items) for second in items[index_a + 1:]
+            }
+            assert expected <= pairs
+            # المقارنة الشاملة: كل زوج تتجاوز مشابهته 0.3 مع تداخل رموز معتبر وُجد عبر الدلاء
+            for index_a, first in enumerate(batch):
+                for second in batch[index_a + 1:]:
+                    tokens_a, tokens_b = system._similarity_tokens(first), system._similarity_tokens(second)
+                    token_jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+                    if system._calculate_similarity(first, second) > 0.3 and token_jaccard >= 0.5:
+                        assert frozenset((first.item_id, second.item_id)) in pairs
+
+            # تطابق النوع مع تداخل ضئيل في المحتوى: يتجاوز 0.3 لكنه ليس مرشح LSH فيُحذف (سلوك موثق)
+            lonely = _item("lonely", [f"lonely_w{j}" for j in range(39)] + ["alpha_w0"], [])
+            assert system._calculate_similarity(lonely, clusters["alpha"][0]) > 0.3
+            system.add_knowledge_item(lonely)
+            assert not any("lonely" in pair for pair in _relation_pairs(db_path))
+
+            # عنصر فاشل (معرف مكرر) يُتراجع عنه وحده وتكمل الدفعة
+            duplicate = _item("alpha0", ["x"], [])
+            fresh = _item("alpha3", [f"alpha_w{j}" for j in range(20)], ["alpha"])
+            assert system.add_knowledge_items([duplicate, fresh]) == ["alpha3"]
+            assert frozenset(("alpha0", "alpha3")) in _relation_pairs(db_path)
+
+            def _signature_count() -> int:
+                conn = sqlite3.connect(db_path)
+                count = conn.execute('SELECT COUNT(*) FROM minhash_signatures').fetchone()[0]
+                conn.close()
+                return count
+
+            total_items = len(batch) + 2
+
+            def _first_bucket_rowid(item_id: str) -> int:
+                conn = sqlite3.connect(db_path)
+                rowid = conn.execute('SELECT MIN(rowid) FROM lsh_buckets WHERE item_id = ?', (item_id,)).fetchone()[0]
+                conn.close()
+                return rowid
+
+            # فهرس حديث: إعادة الفتح تفهرس العناصر الناقصة فقط (دلاء الباقي لا تُعاد كتابتها)
+            untouched_rowid = _first_bucket_rowid("alpha0")
+            conn = sqlite3.connect(db_path)
+            conn.execute("DELETE FROM minhash_signatures WHERE item_id = 'beta0'")
+            conn.execute("DELETE FROM lsh_buckets WHERE item_id = 'beta0'")
+            conn.commit()
+            conn.close()
+            SpecializedKnowledgeSystem("LSHTest", db_path)
+            assert _signature_count() == total_items
+            assert _first_bucket_rowid("beta0") is not None
+            assert _first_bucket_rowid("alpha0") == untouched_rowid
+
+            # فهرس قديم (معاملات مختلفة): إعادة بناء كاملة بالمعاملات الجديدة
+            rebuilt = SpecializedKnowledgeSystem("LSHTest", db_path, lsh_bands=16)
+            conn = sqlite3.connect(db_path)
+            stored = json.loads(conn.execute(
+                "SELECT value FROM lsh_index_metadata WHERE key = 'parameters'").fetchone()[0])
+            bucket_rows = conn.execute('SELECT COUNT(*) FROM lsh_buckets').fetchone()[0]
+            conn.close()
+            assert stored == rebuilt.lsh_index.parameters
+            assert bucket_rows == total_items * 16
+            assert _signature_count() == total_items
+
+        print("✅ فهرس MinHash/LSH يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار فهرس MinHash/LSH: {e}")
+        return False
+
 if __name__ == "__main__":
     test_specialized_knowledge_systems()
+    test_minhash_lsh_relations()
 
@@ -10,18 +10,31 @@ knowledge_feeding_system.py - نظام تغذية المعرفة لنموذج ب
 """
 
 import os
+import sys
 import json
 import csv
+import hashlib
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
 import sqlite3
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 from datetime import datetime
 from enum import Enum
 import uuid
 import re
 
+# سجل التاريخ المحدود المشترك يعيش في حزمة revolutionary_intelligence
+try:
+    from revolutionary_intelligence.bounded_history import BoundedHistory
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'mubtakir_agent', 'baserah_universal_system'))
+    from revolutionary_intelligence.bounded_history import BoundedHistory
+
 # استيراد مكونات النظام
 try:
     from complete_specialized_databases import CompleteSpecializedDatabases, ThinkingLayerType, LearningSource
@@ -52,6 +65,7 @@ except ImportError as e:
 class FileType(Enum):
     """أنواع الملفات المدعومة"""
     JSON = "json"
+    JSONL = "jsonl"
     CSV = "csv"
     TXT = "txt"
     XML = "xml"
@@ -81,61 +95,92 @@ class DataSource(Enum):
     API_IMPORT = "api_import"
     BULK_UPLOAD = "bulk_upload"
 
-class KnowledgeFeedingSystem:
+# ميزانية ذاكرة التغذية: المهام الجارية × حجم الدفعة × معامل تضخم التحويل
+FEEDING_MEMORY_BUDGET_MB = 512
+CHUNK_EXPANSION_FACTOR = 8
+MIN_CHUNK_BYTES = 256 * 1024
+# عناصر كل معاملة حفظ
+SAVE_BATCH_SIZE = 500
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def compute_file_hash(file_path: str) -> str:
+    """بصمة محتوى الملف (قراءة على كتل ثابتة الحجم)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_file_or_error(file_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """(البصمة، None) أو (None، الخطأ) لملف لا يمكن قراءته (صلاحيات، حُذف أثناء المسح...)"""
+    try:
+        return compute_file_hash(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def split_file_ranges(file_path: str, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """تقسيم الملف إلى مديات بايتات متتالية (محاذاة الأسطر تتم عند القراءة)"""
+    size = os.path.getsize(file_path)
+    return [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+
+
+class IngestionManifest:
+    """سجل الملفات المغذّاة: سطر JSON لكل ملف اكتملت تغذيته (المسار + بصمة المحتوى)"""
+    
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+    
+    def load(self) -> Dict[str, str]:
+        """المسار -> آخر بصمة مسجلة"""
+        hashes = {}
+        if not os.path.exists(self.manifest_path):
+            return hashes
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # سطر أخير مقطوع بسبب الانقطاع
+                hashes[entry['path']] = entry['hash']
+        return hashes
+    
+    def record(self, file_path: str, content_hash: str, items: int):
+        with self._lock:
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'path': file_path,
+                    'hash': content_hash,
+                    'items': items,
+                    'recorded_at': datetime.now().isoformat()
+                }, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class KnowledgeConverter:
     """
-    نظام تغذية المعرفة الشامل
+    قراءة الملفات وتحويلها إلى عناصر معرفية
     
-    🧠 يحول البيانات من مصادر مختلفة إلى معرفة منظمة
-    📊 يدعم أنواع ملفات متعددة
-    🔄 يوزع المعرفة على الطبقات المناسبة
+    بلا حالة ولا اتصالات: تستخدمه العمليات العاملة في التغذية المتوازية
     """
     
-    def __init__(self, knowledge_base_path: str = "knowledge_base"):
-        self.knowledge_base_path = knowledge_base_path
-        self.creation_time = datetime.now()
-        
-        # إنشاء مجلد قاعدة المعرفة
-        os.makedirs(knowledge_base_path, exist_ok=True)
-        
-        # إحصائيات النظام
-        self.total_files_processed = 0
-        self.total_knowledge_items = 0
-        self.processing_errors = 0
-        self.supported_formats = list(FileType)
-        
-        # تهيئة المكونات
-        self._initialize_components()
-        
-        # سجل المعالجة
-        self.processing_log = []
-        
-        print(f"🧠📚 تم إنشاء نظام تغذية المعرفة")
-        print(f"   📁 مسار قاعدة المعرفة: {knowledge_base_path}")
-        print(f"   📋 الصيغ المدعومة: {len(self.supported_formats)}")
+    # معالج قراءة الملف الكامل لكل نوع مطبق
+    DOCUMENT_READERS = {
+        FileType.JSON: '_process_json_file',
+        FileType.JSONL: '_process_jsonl_file',
+        FileType.CSV: '_process_csv_file',
+        FileType.TXT: '_process_txt_file',
+        FileType.XML: '_process_xml_file',
+        FileType.XLSX: '_process_excel_file',
+        FileType.MD: '_process_markdown_file'
+    }
     
-    def _initialize_components(self):
-        """تهيئة مكونات النظام"""
-        if DATABASES_AVAILABLE:
-            try:
-                self.specialized_databases = CompleteSpecializedDatabases()
-                print("✅ تم تحميل قواعد البيانات المتخصصة")
-            except:
-                self.specialized_databases = None
-                print("❌ فشل تحميل قواعد البيانات المتخصصة")
-        else:
-            self.specialized_databases = None
-            print("❌ قواعد البيانات المتخصصة غير متوفرة")
-
-        if KNOWLEDGE_SYSTEM_AVAILABLE:
-            try:
-                self.knowledge_system = SpecializedKnowledgeSystem()
-                print("✅ تم تحميل نظام المعرفة المتخصص")
-            except:
-                self.knowledge_system = None
-                print("❌ فشل تحميل نظام المعرفة المتخصص")
-        else:
-            self.knowledge_system = None
-            print("❌ نظام المعرفة المتخصص غير متوفر")
+    # الأنواع المقروءة على دفعات متدفقة (الباقي يُقرأ كاملاً)
+    STREAMING_FILE_TYPES = (FileType.JSONL, FileType.CSV, FileType.TXT)
     
     def detect_file_type(self, file_path: str) -> Optional[FileType]:
         """كشف نوع الملف"""
@@ -143,6 +188,8 @@ class KnowledgeFeedingSystem:
         
         type_mapping = {
             '.json': FileType.JSON,
+            '.jsonl': FileType.JSONL,
+            '.ndjson': FileType.JSONL,
             '.csv': FileType.CSV,
             '.txt': FileType.TXT,
             '.xml': FileType.XML,
@@ -156,81 +203,18 @@ class KnowledgeFeedingSystem:
         
         return type_mapping.get(extension)
     
-    def process_file(self, file_path: str, category: KnowledgeCategory = KnowledgeCategory.GENERAL,
-                    custom_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
-        """معالجة ملف واستخراج المعرفة منه"""
-        
-        if not os.path.exists(file_path):
-            return {"success": False, "error": "الملف غير موجود"}
-        
-        file_type = self.detect_file_type(file_path)
-        if not file_type:
-            return {"success": False, "error": "نوع ملف غير مدعوم"}
-        
-        print(f"\n📁 معالجة الملف: {Path(file_path).name}")
-        print(f"   📋 النوع: {file_type.value}")
-        print(f"   🏷️ الفئة: {category.value}")
-        
-        try:
-            # استخراج البيانات حسب نوع الملف
-            if file_type == FileType.JSON:
-                data = self._process_json_file(file_path)
-            elif file_type == FileType.CSV:
-                data = self._process_csv_file(file_path)
-            elif file_type == FileType.TXT:
-                data = self._process_txt_file(file_path)
-            elif file_type == FileType.XML:
-                data = self._process_xml_file(file_path)
-            elif file_type == FileType.XLSX:
-                data = self._process_excel_file(file_path)
-            elif file_type == FileType.MD:
-                data = self._process_markdown_file(file_path)
-            else:
-                return {"success": False, "error": f"معالج {file_type.value} غير مطبق بعد"}
-            
-            # تحويل البيانات إلى معرفة منظمة
-            knowledge_items = self._convert_to_knowledge(data, category, file_path, custom_metadata)
-            
-            # حفظ المعرفة في النظام
-            saved_items = self._save_knowledge_items(knowledge_items)
-            
-            # تسجيل النتائج
-            result = {
-                "success": True,
-                "file_path": file_path,
-                "file_type": file_type.value,
-                "category": category.value,
-                "items_extracted": len(knowledge_items),
-                "items_saved": len(saved_items),
-                "processing_time": datetime.now()
-            }
-            
-            self.processing_log.append(result)
-            self.total_files_processed += 1
-            self.total_knowledge_items += len(saved_items)
-            
-            print(f"   ✅ تم استخراج {len(knowledge_items)} عنصر معرفي")
-            print(f"   💾 تم حفظ {len(saved_items)} عنصر")
-            
-            return result
-            
-        except Exception as e:
-            self.processing_errors += 1
-            error_result = {
-                "success": False,
-                "file_path": file_path,
-                "error": str(e),
-                "processing_time": datetime.now()
-            }
-            self.processing_log.append(error_result)
-            print(f"   ❌ خطأ في المعالجة: {e}")
-            return error_result
-    
     def _process_json_file(self, file_path: str) -> Dict[str, Any]:
         """معالجة ملف JSON"""
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def _process_jsonl_file(self, file_path: str) -> List[Any]:
+        """معالجة ملف JSON Lines (سجل لكل سطر)"""
+        records = []
+        for start, end in split_file_ranges(file_path, os.path.getsize(file_path) or 1):
+            records.extend(self._iter_jsonl_records(file_path, start, end))
+        return records
+    
     def _process_csv_file(self, file_path: str) -> List[Dict[str, Any]]:
         """معالجة ملف CSV"""
         data = []
@@ -380,11 +364,12 @@ class KnowledgeFeedingSystem:
         return items
     
     def _process_list_data(self, data: List[Any], category: KnowledgeCategory,
-                          source_file: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """معالجة البيانات من نوع List"""
+                          source_file: str, metadata: Dict[str, Any] = None,
+                          start_index: int = 0) -> List[Dict[str, Any]]:
+        """معالجة البيانات من نوع List (start_index: موضع أول عنصر عند المعالجة على دفعات)"""
         items = []
         
-        for i, item_data in enumerate(data):
+        for i, item_data in enumerate(data, start_index):
             if isinstance(item_data, dict):
                 items.extend(self._process_dict_data(item_data, category, source_file, metadata))
             else:
@@ -486,23 +471,263 @@ class KnowledgeFeedingSystem:
         
         return list(set(tags))
     
-    def _save_knowledge_items(self, knowledge_items: List[Any]) -> List[str]:
-        """حفظ العناصر المعرفية في النظام"""
-        saved_ids = []
+    # ---------- القراءة المتدفقة ----------
+    
+    def _iter_range_lines(self, file_path: str, start: int, end: int) -> Iterator[str]:
+        """
+        أسطر المدى [start, end): السطر يتبع المدى الذي يبدأ فيه
+        (المدى غير الأول يتخطى سطره الأول الجزئي لأنه يتبع المدى السابق)
+        """
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            if start > 0:
+                f.seek(start - 1)
+                f.readline()
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                yield line.decode('utf-8')
+    
+    def _iter_jsonl_records(self, file_path: str, start: int, end: int) -> Iterator[Any]:
+        """سجلات JSON Lines في مدى بايتات"""
+        for line in self._iter_range_lines(file_path, start, end):
+            if line.strip():
+                yield json.loads(line)
+    
+    def iter_csv_chunks(self, file_path: str, chunk_bytes: int) -> Iterator[List[Dict[str, Any]]]:
+        """صفوف CSV على دفعات بحجم تقريبي محدود (القارئ يحترم الحقول متعددة الأسطر)"""
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            rows, size = [], 0
+            for row in reader:
+                rows.append(dict(row))
+                size += sum(len(value) for value in row.values() if isinstance(value, str))
+                if size >= chunk_bytes:
+                    yield rows
+                    rows, size = [], 0
+            if rows:
+                yield rows
+    
+    def convert_task(self, task: Tuple) -> List[Any]:
+        """
+        تنفيذ مهمة تغذية واحدة: (النوع، الملف، الفئة، البيانات الوصفية، الحمولة)
+        - document: قراءة الملف كاملاً بمعالج نوعه
+        - jsonl_range / text_range: مدى بايتات من الملف (السجلات غير القاموسية تُرقّم داخل مداها)
+        - csv_rows: دفعة صفوف قرأها المنسق
+        """
+        kind, file_path, category, metadata, payload = task
+        
+        if kind == 'document':
+            data = self._read_document(file_path)
+            return self._convert_to_knowledge(data, category, file_path, metadata)
+        
+        if kind == 'jsonl_range':
+            start, end = payload
+            records = list(self._iter_jsonl_records(file_path, start, end))
+            return self._process_list_data(records, category, file_path, metadata)
+        
+        if kind == 'text_range':
+            start, end, part = payload
+            content = ''.join(self._iter_range_lines(file_path, start, end))
+            if not content.strip():
+                return []
+            return [self._create_knowledge_item(
+                title=f"محتوى من {Path(file_path).name} (جزء {part})",
+                content=content,
+                category=category,
+                source_file=file_path,
+                metadata=metadata
+            )]
+        
+        if kind == 'csv_rows':
+            rows, start_index = payload
+            return self._process_list_data(rows, category, file_path, metadata, start_index)
+        
+        raise ValueError(f"نوع مهمة غير معروف: {kind}")
+    
+    def _read_document(self, file_path: str) -> Any:
+        """قراءة ملف كامل بمعالج نوعه"""
+        file_type = self.detect_file_type(file_path)
+        if file_type not in self.DOCUMENT_READERS:
+            raise ValueError(f"معالج {file_type.value if file_type else '?'} غير مطبق بعد")
+        return getattr(self, self.DOCUMENT_READERS[file_type])(file_path)
+
+
+# محوّل العمليات العاملة (واحد لكل عملية)
+_WORKER_CONVERTER = KnowledgeConverter()
+
+
+def _convert_task_in_worker(task: Tuple) -> List[Any]:
+    return _WORKER_CONVERTER.convert_task(task)
+
+
+def _log_items_saved(entry: Dict[str, Any]) -> Optional[int]:
+    """عدد العناصر المحفوظة في سجل معالجة ناجح (None لسجلات الأخطاء)"""
+    return entry.get("items_saved")
+
+
+class KnowledgeFeedingSystem(KnowledgeConverter):
+    """
+    نظام تغذية المعرفة الشامل
+    
+    🧠 يحول البيانات من مصادر مختلفة إلى معرفة منظمة
+    📊 يدعم أنواع ملفات متعددة
+    🔄 يوزع المعرفة على الطبقات المناسبة
+    """
+    
+    def __init__(self, knowledge_base_path: str = "knowledge_base", processing_log_capacity: int = 1000):
+        self.knowledge_base_path = knowledge_base_path
+        self.creation_time = datetime.now()
+        
+        # إنشاء مجلد قاعدة المعرفة
+        os.makedirs(knowledge_base_path, exist_ok=True)
         
-        for item in knowledge_items:
+        # إحصائيات النظام
+        self.total_files_processed = 0
+        self.total_knowledge_items = 0
+        self.processing_errors = 0
+        self.supported_formats = list(FileType)
+        
+        # تهيئة المكونات
+        self._initialize_components()
+        
+        # سجل المعالجة (محدود: الأقدم يُفرّغ إلى أرشيف JSONL في قاعدة المعرفة)
+        self.processing_log = BoundedHistory(
+            processing_log_capacity,
+            aggregates={'items_saved': _log_items_saved},
+            spill_path=os.path.join(knowledge_base_path, "processing_log_archive.jsonl")
+        )
+        
+        # بصمات الملفات المغذّاة (لتخطي غير المتغير في التشغيلات اللاحقة)
+        self.ingestion_manifest = IngestionManifest(os.path.join(knowledge_base_path, "ingestion_manifest.jsonl"))
+        
+        print(f"🧠📚 تم إنشاء نظام تغذية المعرفة")
+        print(f"   📁 مسار قاعدة المعرفة: {knowledge_base_path}")
+        print(f"   📋 الصيغ المدعومة: {len(self.supported_formats)}")
+    
+    def _initialize_components(self):
+        """تهيئة مكونات النظام"""
+        if DATABASES_AVAILABLE:
             try:
-                if self.knowledge_system and hasattr(item, 'title'):
-                    # حفظ في نظام المعرفة المتخصص
-                    item_id = self.knowledge_system.add_knowledge_item(item)
-                    saved_ids.append(item_id)
-                
-                # حفظ في قواعد البيانات المتخصصة
-                if self.specialized_databases:
-                    self._distribute_to_specialized_databases(item)
-                
-            except Exception as e:
-                print(f"   ⚠️ خطأ في حفظ العنصر: {e}")
+                self.specialized_databases = CompleteSpecializedDatabases()
+                print("✅ تم تحميل قواعد البيانات المتخصصة")
+            except:
+                self.specialized_databases = None
+                print("❌ فشل تحميل قواعد البيانات المتخصصة")
+        else:
+            self.specialized_databases = None
+            print("❌ قواعد البيانات المتخصصة غير متوفرة")
+
+        if KNOWLEDGE_SYSTEM_AVAILABLE:
+            try:
+                self.knowledge_system = SpecializedKnowledgeSystem()
+                print("✅ تم تحميل نظام المعرفة المتخصص")
+            except:
+                self.knowledge_system = None
+                print("❌ فشل تحميل نظام المعرفة المتخصص")
+        else:
+            self.knowledge_system = None
+            print("❌ نظام المعرفة المتخصص غير متوفر")
+    
+    def process_file(self, file_path: str, category: KnowledgeCategory = KnowledgeCategory.GENERAL,
+                    custom_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """معالجة ملف واستخراج المعرفة منه"""
+        
+        if not os.path.exists(file_path):
+            return {"success": False, "error": "الملف غير موجود"}
+        
+        file_type = self.detect_file_type(file_path)
+        if not file_type:
+            return {"success": False, "error": "نوع ملف غير مدعوم"}
+        
+        print(f"\n📁 معالجة الملف: {Path(file_path).name}")
+        print(f"   📋 النوع: {file_type.value}")
+        print(f"   🏷️ الفئة: {category.value}")
+        
+        try:
+            # استخراج البيانات حسب نوع الملف
+            if file_type not in self.DOCUMENT_READERS:
+                return {"success": False, "error": f"معالج {file_type.value} غير مطبق بعد"}
+            data = self._read_document(file_path)
+            
+            # تحويل البيانات إلى معرفة منظمة
+            knowledge_items = self._convert_to_knowledge(data, category, file_path, custom_metadata)
+            
+            # حفظ المعرفة في النظام
+            save_errors = []
+            saved_items = self._save_knowledge_items(knowledge_items, save_errors)
+            fully_saved = len(saved_items) == len(knowledge_items)
+            
+            # تسجيل النتائج (الحفظ الجزئي فشل)
+            result = {
+                "success": fully_saved,
+                "file_path": file_path,
+                "file_type": file_type.value,
+                "category": category.value,
+                "items_extracted": len(knowledge_items),
+                "items_saved": len(saved_items),
+                "processing_time": datetime.now()
+            }
+            if not fully_saved:
+                result["error"] = f"حفظ جزئي: {len(saved_items)} من {len(knowledge_items)} عنصر"
+                result["save_errors"] = save_errors
+                self.processing_errors += 1
+            
+            self.processing_log.append(result)
+            self.total_files_processed += 1
+            self.total_knowledge_items += len(saved_items)
+            
+            print(f"   ✅ تم استخراج {len(knowledge_items)} عنصر معرفي")
+            print(f"   💾 تم حفظ {len(saved_items)} عنصر")
+            if not fully_saved:
+                print(f"   ❌ {result['error']}")
+            
+            return result
+            
+        except Exception as e:
+            self.processing_errors += 1
+            error_result = {
+                "success": False,
+                "file_path": file_path,
+                "error": str(e),
+                "processing_time": datetime.now()
+            }
+            self.processing_log.append(error_result)
+            print(f"   ❌ خطأ في المعالجة: {e}")
+            return error_result
+    
+    def _save_knowledge_items(self, knowledge_items: List[Any],
+                              save_errors: Optional[List[str]] = None) -> List[str]:
+        """
+        حفظ العناصر المعرفية في النظام (معاملة واحدة لكل SAVE_BATCH_SIZE عنصر)
+
+        أخطاء الحفظ (دفعة فاشلة أو محفوظة جزئياً) تُضاف إلى save_errors إن أُعطيت
+        """
+        saved_ids = []
+        
+        if self.knowledge_system:
+            # حفظ في نظام المعرفة المتخصص
+            structured_items = [item for item in knowledge_items if hasattr(item, 'title')]
+            for start in range(0, len(structured_items), SAVE_BATCH_SIZE):
+                batch = structured_items[start:start + SAVE_BATCH_SIZE]
+                try:
+                    batch_ids = self.knowledge_system.add_knowledge_items(batch)
+                except Exception as e:
+                    batch_ids = []
+                    error = f"خطأ في حفظ الدفعة: {e}"
+                else:
+                    error = f"حُفظ {len(batch_ids)} من {len(batch)} عنصر في الدفعة"
+                saved_ids.extend(batch_ids)
+                if len(batch_ids) < len(batch):
+                    print(f"   ⚠️ {error}")
+                    if save_errors is not None:
+                        save_errors.append(error)
+        
+        # حفظ في قواعد البيانات المتخصصة
+        if self.specialized_databases:
+            for item in knowledge_items:
+                self._distribute_to_specialized_databases(item)
         
         return saved_ids
     
@@ -526,33 +751,112 @@ class KnowledgeFeedingSystem:
         except Exception as e:
             print(f"   ⚠️ خطأ في التوزيع: {e}")
     
-    def process_directory(self, directory_path: str, category: KnowledgeCategory = KnowledgeCategory.GENERAL) -> Dict[str, Any]:
-        """معالجة جميع الملفات في مجلد"""
+    def process_directory(self, directory_path: str, category: KnowledgeCategory = KnowledgeCategory.GENERAL,
+                          max_workers: Optional[int] = None, skip_unchanged: bool = True,
+                          memory_budget_mb: int = FEEDING_MEMORY_BUDGET_MB) -> Dict[str, Any]:
+        """
+        معالجة جميع الملفات في مجلد
+        
+        - الملفات تُحوّل في مجمع عمليات (max_workers=1 للتنفيذ في العملية نفسها)
+        - CSV و JSON Lines والنصوص الكبيرة تُقرأ على دفعات محدودة الحجم، وعدد المهام الجارية محدود،
+          فتبقى الذاكرة ضمن memory_budget_mb؛ الأنواع الأخرى تُقرأ كاملة إن لم تتجاوز حصة المهمة
+        - الملفات التي لم تتغير بصمة محتواها منذ آخر تغذية ناجحة تُتخطى (skip_unchanged)
+        - الحفظ على دفعات، كل دفعة في معاملة واحدة
+        """
         if not os.path.exists(directory_path):
             return {"success": False, "error": "المجلد غير موجود"}
         
-        results = []
-        total_files = 0
-        successful_files = 0
-        
         print(f"\n📁 معالجة المجلد: {directory_path}")
         
+        file_paths = []
         for root, dirs, files in os.walk(directory_path):
             for file in files:
                 file_path = os.path.join(root, file)
                 if self.detect_file_type(file_path):
-                    total_files += 1
-                    result = self.process_file(file_path, category)
-                    results.append(result)
-                    if result["success"]:
-                        successful_files += 1
+                    file_paths.append(os.path.abspath(file_path))
+        
+        workers = max(1, max_workers or os.cpu_count() or 1)
+        
+        # بصمات المحتوى بالتوازي (hashlib يحرر القفل العام أثناء الحساب)
+        results = []
+        file_hashes = {}
+        with ThreadPoolExecutor(max_workers=workers) as hash_pool:
+            for file_path, (content_hash, error) in zip(file_paths, hash_pool.map(_hash_file_or_error, file_paths)):
+                if error is None:
+                    file_hashes[file_path] = content_hash
+                else:
+                    # الملف غير المقروء يفشل وحده ولا يوقف المجلد
+                    results.append(self._finish_ingested_file(file_path, None, category, {
+                        "file_type": self.detect_file_type(file_path), "items_extracted": 0, "items_saved": 0,
+                        "error": f"تعذر حساب بصمة الملف: {error}", "save_errors": []
+                    }))
+        known_hashes = self.ingestion_manifest.load() if skip_unchanged else {}
+        pending_files = [path for path in file_hashes if known_hashes.get(path) != file_hashes[path]]
+        skipped_files = len(file_hashes) - len(pending_files)
+        
+        # حجم دفعة القراءة من ميزانية الذاكرة
+        max_in_flight = workers * 2
+        budget_bytes = memory_budget_mb * 1024 * 1024
+        chunk_bytes = max(MIN_CHUNK_BYTES, budget_bytes // (max_in_flight * CHUNK_EXPANSION_FACTOR))
+        
+        open_files: Dict[str, Dict[str, Any]] = {}
+        tasks = self._iter_ingestion_tasks(pending_files, category, chunk_bytes, open_files)
+        
+        def handle(file_path: str, items: Optional[List[Any]], error: Optional[Exception]):
+            state = open_files[file_path]
+            state["pending"] -= 1
+            if error is not None:
+                state["error"] = state["error"] or str(error)
+            elif items:
+                state["items_extracted"] += len(items)
+                state["items_saved"] += len(self._save_knowledge_items(items, state["save_errors"]))
+        
+        def finish_ready_files():
+            for file_path in [path for path, state in open_files.items()
+                              if state["emitted"] and state["pending"] == 0]:
+                state = open_files.pop(file_path)
+                results.append(self._finish_ingested_file(file_path, file_hashes[file_path], category, state))
+        
+        if workers == 1:
+            for task in tasks:
+                try:
+                    handle(task[1], self.convert_task(task), None)
+                except Exception as e:
+                    handle(task[1], None, e)
+                finish_ready_files()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                in_flight = {}
+                exhausted = False
+                while True:
+                    while not exhausted and len(in_flight) < max_in_flight:
+                        task = next(tasks, None)
+                        if task is None:
+                            exhausted = True
+                        else:
+                            in_flight[executor.submit(_convert_task_in_worker, task)] = task[1]
+                    finish_ready_files()
+                    if not in_flight:
+                        break
+                    
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        file_path = in_flight.pop(future)
+                        error = future.exception()
+                        handle(file_path, None if error else future.result(), error)
+        finish_ready_files()
+        
+        successful_files = sum(1 for result in results if result["success"])
+        total_files = len(file_paths)
+        failed_files = len(results) - successful_files
         
         summary = {
             "success": True,
             "directory": directory_path,
             "total_files": total_files,
             "successful_files": successful_files,
-            "failed_files": total_files - successful_files,
+            "failed_files": failed_files,
+            "skipped_files": skipped_files,
             "results": results,
             "processing_time": datetime.now()
         }
@@ -560,10 +864,95 @@ class KnowledgeFeedingSystem:
         print(f"   📊 ملخص المعالجة:")
         print(f"   📁 إجمالي الملفات: {total_files}")
         print(f"   ✅ نجح: {successful_files}")
-        print(f"   ❌ فشل: {total_files - successful_files}")
+        print(f"   ❌ فشل: {failed_files}")
+        print(f"   ⏭️ دون تغيير (تم تخطيها): {skipped_files}")
         
         return summary
     
+    def _iter_ingestion_tasks(self, file_paths: List[str], category: KnowledgeCategory, chunk_bytes: int,
+                              open_files: Dict[str, Dict[str, Any]]) -> Iterator[Tuple]:
+        """مهام التغذية ملفاً ملفاً (تُولّد عند الطلب فلا تُقرأ الدفعات قبل وجود مكان لها)"""
+        document_limit = chunk_bytes * CHUNK_EXPANSION_FACTOR
+        
+        for file_path in file_paths:
+            file_type = self.detect_file_type(file_path)
+            state = open_files[file_path] = {
+                "file_type": file_type, "pending": 0, "emitted": False,
+                "items_extracted": 0, "items_saved": 0, "error": None, "save_errors": []
+            }
+            
+            try:
+                size = os.path.getsize(file_path)
+                if file_type == FileType.JSONL:
+                    for start, end in split_file_ranges(file_path, chunk_bytes):
+                        state["pending"] += 1
+                        yield ('jsonl_range', file_path, category, None, (start, end))
+                elif file_type == FileType.TXT and size > chunk_bytes:
+                    for part, (start, end) in enumerate(split_file_ranges(file_path, chunk_bytes), 1):
+                        state["pending"] += 1
+                        yield ('text_range', file_path, category, None, (start, end, part))
+                elif file_type == FileType.CSV:
+                    start_index = 0
+                    for rows in self.iter_csv_chunks(file_path, chunk_bytes):
+                        state["pending"] += 1
+                        yield ('csv_rows', file_path, category, None, (rows, start_index))
+                        start_index += len(rows)
+                elif file_type not in self.DOCUMENT_READERS:
+                    state["error"] = f"معالج {file_type.value} غير مطبق بعد"
+                elif size > document_limit:
+                    state["error"] = f"الملف ({size} بايت) أكبر من حصة المهمة في ميزانية الذاكرة ({document_limit} بايت)"
+                else:
+                    state["pending"] += 1
+                    yield ('document', file_path, category, None, None)
+            except Exception as e:
+                state["error"] = str(e)
+            
+            state["emitted"] = True
+    
+    def _finish_ingested_file(self, file_path: str, content_hash: Optional[str], category: KnowledgeCategory,
+                              state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        تسجيل نتيجة ملف اكتملت مهامه
+
+        الملف ناجح فقط إذا حُفظت كل عناصره؛ عندها وحده تُسجل بصمته فلا يُعاد في التغذية التالية.
+        الحفظ الجزئي فشل يحمل أخطاء الحفظ ويُعاد الملف كاملاً لاحقاً.
+        """
+        if state["error"] is None and state["items_saved"] < state["items_extracted"]:
+            reason = (state["save_errors"][0] if state["save_errors"]
+                      else "نظام المعرفة المتخصص غير متوفر")
+            state["error"] = (f"حفظ جزئي: {state['items_saved']} من {state['items_extracted']} عنصر ({reason})")
+        
+        if state["error"] is None:
+            result = {
+                "success": True,
+                "file_path": file_path,
+                "file_type": state["file_type"].value,
+                "category": category.value,
+                "items_extracted": state["items_extracted"],
+                "items_saved": state["items_saved"],
+                "processing_time": datetime.now()
+            }
+            self.ingestion_manifest.record(file_path, content_hash, state["items_extracted"])
+            self.total_files_processed += 1
+            self.total_knowledge_items += state["items_saved"]
+            print(f"   ✅ {Path(file_path).name}: {state['items_extracted']} عنصر معرفي، {state['items_saved']} محفوظ")
+        else:
+            result = {
+                "success": False,
+                "file_path": file_path,
+                "error": state["error"],
+                "items_extracted": state["items_extracted"],
+                "items_saved": state["items_saved"],
+                "save_errors": state["save_errors"],
+                "processing_time": datetime.now()
+            }
+            self.processing_errors += 1
+            self.total_knowledge_items += state.get("items_saved", 0)
+            print(f"   ❌ {Path(file_path).name}: {state['error']}")
+        
+        self.processing_log.append(result)
+        return result
+    
     def get_statistics(self) -> Dict[str, Any]:
         """إحصائيات النظام"""
         return {
@@ -573,10 +962,117 @@ class KnowledgeFeedingSystem:
             "supported_formats": [f.value for f in self.supported_formats],
             "success_rate": (self.total_files_processed - self.processing_errors) / max(self.total_files_processed, 1) * 100,
             "creation_time": self.creation_time.isoformat(),
-            "last_processing": self.processing_log[-1] if self.processing_log else None
+            "last_processing": self.processing_log[-1] if self.processing_log else None,
+            "processing_log": self.processing_log.get_statistics()
         }
 
 
+def test_streaming_ingestion() -> bool:
+    """🧪 القراءة المتدفقة، وتخطي الملفات غير المتغيرة، والحفظ الجزئي، والملفات غير المقروءة"""
+    print("🧪 اختبار التغذية المتدفقة")
+    print("=" * 60)
+
+    if not KNOWLEDGE_SYSTEM_AVAILABLE:
+        print("⚠️ نظام المعرفة المتخصص غير متوفر - تخطي الاختبار")
+        return True
+
+    class HalfSavingKnowledgeSystem(SpecializedKnowledgeSystem):
+        """يحفظ نصف كل دفعة فقط (حفظ جزئي)"""
+        def add_knowledge_items(self, items):
+            return super().add_knowledge_items(items[:len(items) // 2])
+
+    original_cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            data_dir = os.path.join(work_dir, "data")
+            os.makedirs(data_dir)
+            converter = KnowledgeConverter()
+
+            # JSON Lines: كل سجل يُقرأ في مدى واحد بالضبط مهما كان حجم المدى
+            records = [{"title": f"سجل {i}", "content": "نص " * (i % 7 + 1)} for i in range(200)]
+            jsonl_path = os.path.join(data_dir, "records.jsonl")
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            for chunk_bytes in (1, 97, 1024, 1 << 20):
+                streamed = [record for start, end in split_file_ranges(jsonl_path, chunk_bytes)
+                            for record in converter._iter_jsonl_records(jsonl_path, start, end)]
+                assert streamed == records
+
+            # النص: الأسطر (ومنها سطر أخير بلا نهاية) تتوزع على المديات دون تكرار أو فقد
+            text = "".join(f"سطر رقم {i}\n" for i in range(300)) + "سطر أخير"
+            text_path = os.path.join(data_dir, "notes.txt")
+            with open(text_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+            for chunk_bytes in (5, 333, 1 << 20):
+                assert "".join(line for start, end in split_file_ranges(text_path, chunk_bytes)
+                               for line in converter._iter_range_lines(text_path, start, end)) == text
+
+            # CSV: الحقول متعددة الأسطر لا تنقسم بين الدفعات
+            rows = [{"title": f"صف {i}", "content": f"سطر أول\nسطر ثان {i}" if i % 3 == 0 else f"قيمة {i}"}
+                    for i in range(120)]
+            csv_path = os.path.join(data_dir, "rows.csv")
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=["title", "content"])
+                writer.writeheader()
+                writer.writerows(rows)
+            for chunk_bytes in (1, 200, 1 << 20):
+                chunks = list(converter.iter_csv_chunks(csv_path, chunk_bytes))
+                assert [row for chunk in chunks for row in chunk] == rows
+            assert len(list(converter.iter_csv_chunks(csv_path, 1))) == len(rows)
+
+            # التغذية: الملف غير المقروء (رابط مكسور) يفشل وحده
+            feeding = KnowledgeFeedingSystem(os.path.join(work_dir, "knowledge_base"))
+            feeding.specialized_databases = None
+            full_store = SpecializedKnowledgeSystem(db_path=os.path.join(work_dir, "knowledge.db"))
+            feeding.knowledge_system = full_store
+            os.symlink(os.path.join(work_dir, "missing.json"), os.path.join(data_dir, "broken.json"))
+
+            first = feeding.process_directory(data_dir, KnowledgeCategory.TECHNICAL, max_workers=1)
+            failed = [result for result in first["results"] if not result["success"]]
+            assert first["total_files"] == 4 and first["successful_files"] == 3 and first["skipped_files"] == 0
+            assert len(failed) == 1 and failed[0]["file_path"].endswith("broken.json")
+            saved = {Path(result["file_path"]).name: result["items_saved"] for result in first["results"]}
+            assert saved["records.jsonl"] == len(records) and saved["rows.csv"] == len(rows) and saved["notes.txt"] > 0
+
+            # الملفات غير المتغيرة تُتخطى، والمتغيرة وحدها تُعاد
+            second = feeding.process_directory(data_dir, KnowledgeCategory.TECHNICAL, max_workers=1)
+            assert second["skipped_files"] == 3 and second["successful_files"] == 0
+            with open(text_path, 'a', encoding='utf-8') as f:
+                f.write("\nسطر مضاف")
+            third = feeding.process_directory(data_dir, KnowledgeCategory.TECHNICAL, max_workers=1)
+            assert third["skipped_files"] == 2 and third["successful_files"] == 1
+            assert third["results"][-1]["file_path"] == os.path.abspath(text_path)
+
+            # الحفظ الجزئي فشل لا يُسجل في سجل الملفات فيُعاد في التغذية التالية
+            partial_path = os.path.join(data_dir, "partial.jsonl")
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                for record in records[:10]:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            feeding.knowledge_system = HalfSavingKnowledgeSystem(db_path=os.path.join(work_dir, "partial.db"))
+            fourth = feeding.process_directory(data_dir, KnowledgeCategory.TECHNICAL, max_workers=1)
+            partial = [result for result in fourth["results"] if result["file_path"] == os.path.abspath(partial_path)]
+            assert len(partial) == 1 and not partial[0]["success"]
+            assert partial[0]["items_extracted"] == 10 and partial[0]["items_saved"] == 5
+            assert "حفظ جزئي" in partial[0]["error"]
+            assert os.path.abspath(partial_path) not in feeding.ingestion_manifest.load()
+
+            feeding.knowledge_system = full_store
+            fifth = feeding.process_directory(data_dir, KnowledgeCategory.TECHNICAL, max_workers=1)
+            assert fifth["skipped_files"] == 3 and fifth["successful_files"] == 1
+            assert feeding.ingestion_manifest.load()[os.path.abspath(partial_path)] == compute_file_hash(partial_path)
+
+        print("✅ التغذية المتدفقة تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار التغذية المتدفقة: {e}")
+        return False
+    finally:
+        os.chdir(original_cwd)
+
+
 # مثال على الاستخدام
 if __name__ == "__main__":
     print("🧠📚 اختبار نظام تغذية المعرفة")
@@ -594,3 +1090,5 @@ if __name__ == "__main__":
     print(f"\n🎯 النظام جاهز لتغذية المعرفة!")
     print(f"   📋 الصيغ المدعومة: {', '.join([f.value for f in FileType])}")
     print(f"   🏷️ الفئات المتاحة: {', '.join([c.value for c in KnowledgeCategory])}")
+
+    test_streaming_ingestion()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+🦙 عميل Ollama المجمّع - نظام بصيرة الثوري
+🔗 اتصالات دائمة + فحص صحة مخزّن + طلبات متزامنة محدودة + ذاكرة استجابات
+
+- جلسة requests واحدة بمجمع اتصالات (لا مصافحة TCP لكل طلب)
+- فحص الصحة وقائمة النماذج محفوظان لمدة محددة (TTL)
+- عدد الطلبات المتزامنة محدود، ومعدلها مضبوط بدلو رموز (token bucket)
+- بث الاستجابة اختياري (قطعة بقطعة)
+- ذاكرة استجابات معنونة بالمحتوى: بصمة (النموذج، الاستعلام، الخيارات)
+
+المطور: باسل يحيى عبدالله
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def make_response_key(model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                      system: Optional[str] = None) -> str:
+    """بصمة المحتوى لطلب توليد (المفتاح نفسه للطلبات المتطابقة)"""
+    canonical = json.dumps(
+        {'model': model, 'prompt': prompt, 'options': options or {}, 'system': system},
+        ensure_ascii=False, sort_keys=True, separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class TokenBucket:
+    """دلو رموز: معدل ثابت مع سماح بدفعة قصيرة بحجم السعة"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0):
+        """انتظار حتى يتوفر رمز"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class ResponseCache:
+    """ذاكرة استجابات معنونة بالمحتوى (LRU في الذاكرة + ملفات اختيارية على القرص)"""
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    content = json.load(f)['response']
+                self._remember(key, content)
+                with self._lock:
+                    self.hits += 1
+                return content
+            except (OSError, ValueError, KeyError):
+                pass
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key: str, content: str):
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, key: str, content: str):
+        self._remember(key, content)
+        if self.cache_dir:
+            temp_path = f"{self._path(key)}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'response': content}, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(key))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'persistent': bool(self.cache_dir)
+        }
+
+
+class OllamaClient:
+    """
+    🦙 عميل Ollama لطلبات كثيرة ومتزامنة
+    """
+
+    def __init__(self, base_url: str = "http://localhost:11434",
+                 max_concurrency: int = 4,
+                 requests_per_second: Optional[float] = 5.0,
+                 health_ttl: float = 30.0,
+                 cache_size: int = 256,
+                 cache_dir: Optional[str] = None,
+                 timeout: float = 60.0):
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max(1, max_concurrency)
+        self.health_ttl = health_ttl
+        self.timeout = timeout
+
+        # جلسة واحدة بمجمع اتصالات بحجم التزامن
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.rate_limiter = (TokenBucket(requests_per_second, capacity=self.max_concurrency)
+                             if requests_per_second else None)
+        self.response_cache = ResponseCache(cache_size, cache_dir) if cache_size else None
+
+        # فحص الصحة المخزّن: (متاح؟، النماذج، وقت الفحص)
+        self._health: Optional[Tuple[bool, List[str], float]] = None
+        self._health_lock = threading.Lock()
+
+        self.client_stats = {
+            'requests': 0,
+            'cached_responses': 0,
+            'health_checks': 0,
+            'errors': 0
+        }
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.client_stats[key] += 1
+
+    # ---------- الصحة والنماذج ----------
+
+    def _refresh_health(self) -> Tuple[bool, List[str], float]:
+        self._count('health_checks')
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            if response.status_code == 200:
+                models = [model['name'] for model in response.json().get('models', [])]
+                return True, models, time.monotonic()
+        except (requests.RequestException, ValueError):
+            pass
+        return False, [], time.monotonic()
+
+    def health(self, force: bool = False) -> Tuple[bool, List[str]]:
+        """(متاح؟، النماذج) من الذاكرة إن كانت حديثة، وإلا بطلب واحد"""
+        with self._health_lock:
+            if (force or self._health is None
+                    or time.monotonic() - self._health[2] > self.health_ttl):
+                self._health = self._refresh_health()
+            available, models, _ = self._health
+            return available, list(models)
+
+    def is_available(self, force: bool = False) -> bool:
+        return self.health(force)[0]
+
+    def list_models(self, force: bool = False) -> List[str]:
+        return self.health(force)[1]
+
+    def invalidate_health(self):
+        with self._health_lock:
+            self._health = None
+
+    # ---------- الطلبات ----------
+
+    def _post(self, path: str, payload: Dict[str, Any], stream: bool = False, timeout: Optional[float] = None):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        self._count('requests')
+        return self.session.post(f"{self.base_url}{path}", json=payload, stream=stream,
+                                 timeout=timeout or self.timeout)
+
+    def pull_model(self, model_name: str, timeout: float = 300) -> bool:
+        """تحميل نموذج (تُبطل ذاكرة الصحة لتظهر القائمة الجديدة)"""
+        with self._slots:
+            response = self._post("/api/pull", {"name": model_name}, stream=True, timeout=timeout)
+            with response:
+                for _ in response.iter_lines():
+                    pass  # انتظار اكتمال التحميل
+                success = response.status_code == 200
+        self.invalidate_health()
+        return success
+
+    def generate(self, prompt: str, model: str,
+                 options: Optional[Dict[str, Any]] = None,
+                 system: Optional[str] = None,
+                 stream: bool = False,
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 use_cache: bool = True) -> Optional[str]:
+        """توليد استجابة (من الذاكرة إن وجدت)؛ مع stream تُمرر القطع إلى on_chunk عند وصولها"""
+        key = make_response_key(model, prompt, options, system)
+        if use_cache and self.response_cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self._count('cached_responses')
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt, "stream": stream}
+        if options:
+            payload["options"] = options
+        if system:
+            payload["system"] = system
+
+        try:
+            with self._slots:
+                response = self._post("/api/generate", payload, stream=stream)
+                with response:
+                    if response.status_code != 200:
+                        self._count('errors')
+                        print(f"❌ خطأ في توليد الاستجابة: {response.status_code}")
+                        return None
+
+                    if stream:
+                        pieces = []
+                        for line in response.iter_lines():
+                            if not line:
+                                continue
+                            chunk = json.loads(line)
+                            piece = chunk.get('response', '')
+                            if piece:
+                                pieces.append(piece)
+                                if on_chunk:
+                                    on_chunk(piece)
+                            if chunk.get('done'):
+                                break
+                        content = ''.join(pieces)
+                    else:
+                        content = response.json().get('response', '')
+        except (requests.RequestException, ValueError) as e:
+            self._count('errors')
+            self.invalidate_health()
+            print(f"❌ خطأ في التوليد: {e}")
+            return None
+
+        if content and use_cache and self.response_cache:
+            self.response_cache.put(key, content)
+        return content
+
+    def generate_many(self, prompts: List[str], model: str,
+                      options: Optional[Dict[str, Any]] = None,
+                      system: Optional[str] = None) -> List[Optional[str]]:
+        """توليد متزامن لعدة استعلامات (النتائج بترتيب الاستعلامات)"""
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(prompts)),
+                                thread_name_prefix="OllamaRequest") as executor:
+            return list(executor.map(lambda prompt: self.generate(prompt, model, options, system), prompts))
+
+    # ---------- الإحصائيات والإغلاق ----------
+
+    def get_client_statistics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.client_stats)
+        stats['max_concurrency'] = self.max_concurrency
+        stats['rate_limit'] = self.rate_limiter.rate if self.rate_limiter else None
+        stats['response_cache'] = self.response_cache.get_statistics() if self.response_cache else None
+        return stats
+
+    def close(self):
+        self.session.close()
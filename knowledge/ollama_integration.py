@@ -10,23 +10,46 @@
 المطور: باسل يحيى عبدالله
 """
 
-import requests
 import json
 import subprocess
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from knowledge_harvester import KnowledgeHarvester
 import os
 
+try:
+    from .ollama_client import OllamaClient
+except ImportError:
+    from ollama_client import OllamaClient
+
+# خيارات التوليد الافتراضية
+DEFAULT_GENERATION_OPTIONS = {
+    "temperature": 0.7,
+    "top_p": 0.9
+}
+
 class OllamaIntegration:
     """
     🦙 تكامل Ollama مع نظام بصيرة
     يربط مؤقتاً مع النماذج المفتوحة لاستخراج المعرفة
     """
     
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
+    def __init__(self, ollama_url: str = "http://localhost:11434",
+                 max_concurrency: int = 4,
+                 requests_per_second: Optional[float] = 5.0,
+                 health_ttl: float = 30.0,
+                 cache_size: int = 256,
+                 cache_dir: Optional[str] = None):
         """تهيئة تكامل Ollama"""
         self.ollama_url = ollama_url
+        self.client = OllamaClient(
+            ollama_url,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            health_ttl=health_ttl,
+            cache_size=cache_size,
+            cache_dir=cache_dir
+        )
         self.harvester = KnowledgeHarvester()
         self.available_models = []
         
@@ -39,21 +62,12 @@ class OllamaIntegration:
             print("   ⚠️ Ollama غير متاح - سيتم تشغيل النظام بدونه")
     
     def check_ollama_status(self) -> bool:
-        """فحص حالة Ollama"""
-        try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                print("   ✅ Ollama متصل ويعمل")
-                return True
-            else:
-                print(f"   ❌ Ollama يرد بحالة: {response.status_code}")
-                return False
-        except requests.exceptions.ConnectionError:
-            print("   ❌ Ollama غير متصل")
-            return False
-        except Exception as e:
-            print(f"   ❌ خطأ في الاتصال: {e}")
-            return False
+        """فحص حالة Ollama (طلب جديد دائماً؛ التوليد يستخدم الفحص المخزّن)"""
+        if self.client.is_available(force=True):
+            print("   ✅ Ollama متصل ويعمل")
+            return True
+        print("   ❌ Ollama غير متصل")
+        return False
     
     def install_ollama(self) -> bool:
         """تثبيت Ollama إذا لم يكن موجوداً"""
@@ -83,111 +97,90 @@ class OllamaIntegration:
     
     def load_available_models(self):
         """تحميل قائمة النماذج المتاحة"""
-        try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                self.available_models = [model['name'] for model in data.get('models', [])]
-                print(f"   📋 النماذج المتاحة: {self.available_models}")
-            else:
-                print("   ❌ فشل في تحميل قائمة النماذج")
-        except Exception as e:
-            print(f"   ❌ خطأ في تحميل النماذج: {e}")
+        available, models = self.client.health()
+        if available:
+            self.available_models = models
+            print(f"   📋 النماذج المتاحة: {self.available_models}")
+        else:
+            print("   ❌ فشل في تحميل قائمة النماذج")
     
     def pull_model(self, model_name: str) -> bool:
         """تحميل نموذج جديد"""
         try:
             print(f"📥 تحميل النموذج: {model_name}")
             
-            payload = {"name": model_name}
-            response = requests.post(
-                f"{self.ollama_url}/api/pull",
-                json=payload,
-                stream=True,
-                timeout=300
-            )
-            
-            if response.status_code == 200:
+            if self.client.pull_model(model_name):
                 print(f"✅ تم تحميل النموذج: {model_name}")
                 self.load_available_models()  # تحديث القائمة
                 return True
             else:
-                print(f"❌ فشل في تحميل النموذج: {response.status_code}")
+                print(f"❌ فشل في تحميل النموذج: {model_name}")
                 return False
                 
         except Exception as e:
             print(f"❌ خطأ في تحميل النموذج: {e}")
             return False
     
-    def generate_response(self, prompt: str, model: str = "llama3.2:1b") -> Optional[str]:
-        """توليد استجابة من النموذج"""
-        if not self.check_ollama_status():
-            return None
+    def _ensure_model(self, model: str) -> bool:
+        """التأكد من توفر Ollama والنموذج (فحص الصحة مخزّن لمدة health_ttl)"""
+        available, models = self.client.health()
+        if not available:
+            return False
+        self.available_models = models
         
         if model not in self.available_models:
             print(f"⚠️ النموذج {model} غير متاح، محاولة تحميله...")
             if not self.pull_model(model):
-                return None
-        
-        try:
-            payload = {
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9
-                }
-            }
-            
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json=payload,
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result.get('response', '')
-                
-                # حفظ الاستجابة في مكتبة المعرفة
-                if content:
-                    knowledge_item = self.harvester._create_knowledge_item(
-                        content=content,
-                        source=f"ollama_{model}",
-                        category="llm_response",
-                        language="ar"
-                    )
-                    self.harvester._save_knowledge_item(knowledge_item)
-                    print(f"✅ تم حفظ الاستجابة في مكتبة المعرفة")
-                
-                return content
-            else:
-                print(f"❌ خطأ في توليد الاستجابة: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            print(f"❌ خطأ في التوليد: {e}")
+                return False
+        return True
+    
+    def _save_response(self, content: str, model: str):
+        """حفظ الاستجابة في مكتبة المعرفة"""
+        knowledge_item = self.harvester._create_knowledge_item(
+            content=content,
+            source=f"ollama_{model}",
+            category="llm_response",
+            language="ar"
+        )
+        self.harvester._save_knowledge_item(knowledge_item)
+    
+    def generate_response(self, prompt: str, model: str = "llama3.2:1b",
+                          stream: bool = False,
+                          on_chunk: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """توليد استجابة من النموذج (مع بث القطع إلى on_chunk عند stream)"""
+        if not self._ensure_model(model):
             return None
+        
+        content = self.client.generate(prompt, model, options=DEFAULT_GENERATION_OPTIONS,
+                                       stream=stream, on_chunk=on_chunk)
+        
+        # حفظ الاستجابة في مكتبة المعرفة
+        if content:
+            self._save_response(content, model)
+            print(f"✅ تم حفظ الاستجابة في مكتبة المعرفة")
+        
+        return content
     
     def extract_knowledge_batch(self, topics: List[str], model: str = "llama3.2:1b") -> int:
-        """استخراج معرفة مجمعة حول مواضيع متعددة"""
-        extracted_count = 0
+        """استخراج معرفة مجمعة حول مواضيع متعددة (طلبات متزامنة محدودة بمعدل العميل)"""
+        if not topics or not self._ensure_model(model):
+            return 0
         
-        for topic in topics:
-            print(f"\n🔍 استخراج معرفة حول: {topic}")
-            
-            # إنشاء استعلام للموضوع
-            prompt = f"اشرح لي بالتفصيل عن {topic} باللغة العربية. قدم معلومات شاملة ومفيدة."
-            
-            response = self.generate_response(prompt, model)
+        # إنشاء استعلام لكل موضوع
+        prompts = [f"اشرح لي بالتفصيل عن {topic} باللغة العربية. قدم معلومات شاملة ومفيدة."
+                   for topic in topics]
+        
+        print(f"\n🔍 استخراج معرفة حول {len(topics)} موضوع (تزامن: {self.client.max_concurrency})")
+        responses = self.client.generate_many(prompts, model, options=DEFAULT_GENERATION_OPTIONS)
+        
+        extracted_count = 0
+        for topic, response in zip(topics, responses):
             if response:
-                print(f"   ✅ تم استخراج {len(response)} حرف")
+                self._save_response(response, model)
+                print(f"   ✅ {topic}: تم استخراج {len(response)} حرف")
                 extracted_count += 1
             else:
                 print(f"   ❌ فشل في استخراج معرفة حول {topic}")
-            
-            time.sleep(2)  # تجنب الضغط على النموذج
         
         return extracted_count
     
@@ -215,10 +208,11 @@ class OllamaIntegration:
         knowledge_stats = self.harvester.get_knowledge_stats()
         
         return {
-            "ollama_status": self.check_ollama_status(),
+            "ollama_status": self.client.is_available(),
             "available_models": self.available_models,
             "knowledge_base": knowledge_stats,
-            "integration_active": len(self.available_models) > 0
+            "integration_active": len(self.available_models) > 0,
+            "client": self.client.get_client_statistics()
         }
 
 def setup_recommended_models():
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+🦙 خادم Ollama تجريبي محلي - نظام بصيرة الثوري
+🧪 يحاكي واجهة Ollama (tags / generate / pull) لقياس الإنتاجية وزمن الاستجابة دون نموذج حقيقي
+
+الاستخدام:
+    python ollama_stub_server.py --port 11434 --latency 0.2
+    python ollama_stub_server.py --benchmark
+
+المطور: باسل يحيى عبدالله
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """معالج الطلبات: الاستجابة صدى للاستعلام بعد زمن تأخير محدد"""
+
+    protocol_version = "HTTP/1.1"  # اتصالات دائمة كما في Ollama
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def stub(self) -> "OllamaStubServer":
+        return self.server.stub
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length', 0))
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def do_GET(self):
+        self.stub._count('/api/tags' if self.path == '/api/tags' else 'other')
+        if self.path == '/api/tags':
+            self._send_json({'models': [{'name': model} for model in self.stub.models]})
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        payload = self._read_json()
+
+        if self.path == '/api/pull':
+            self.stub._count('/api/pull')
+            name = payload.get('name', '')
+            if name and name not in self.stub.models:
+                self.stub.models.append(name)
+            self._send_json({'status': 'success'})
+            return
+
+        if self.path != '/api/generate':
+            self._send_json({'error': 'not found'}, 404)
+            return
+
+        self.stub._count('/api/generate')
+        model = payload.get('model', '')
+        if model not in self.stub.models:
+            self._send_json({'error': f"model '{model}' not found"}, 404)
+            return
+
+        self.stub._enter()
+        try:
+            time.sleep(self.stub.latency)
+            text = self.stub.respond(payload.get('prompt', ''))
+        finally:
+            self.stub._leave()
+
+        if payload.get('stream', True):
+            self._stream_response(model, text)
+        else:
+            self._send_json({'model': model, 'response': text, 'done': True})
+
+    def _stream_response(self, model: str, text: str):
+        """بث NDJSON بترميز مجزأ: قطعة لكل كلمة ثم سطر done"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        words = text.split(' ')
+        lines = [{'model': model, 'response': word + (' ' if i < len(words) - 1 else ''), 'done': False}
+                 for i, word in enumerate(words)]
+        lines.append({'model': model, 'response': '', 'done': True})
+        for line in lines:
+            data = (json.dumps(line, ensure_ascii=False) + '\n').encode('utf-8')
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class OllamaStubServer:
+    """
+    🧪 خادم تجريبي بواجهة Ollama
+    يعمل في خيط خلفي ويسجل عدد الطلبات وأقصى تزامن ملحوظ
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 models: Optional[List[str]] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.models = list(models) if models is not None else ["llama3.2:1b"]
+
+        self.request_counts: Dict[str, int] = {}
+        self.active_requests = 0
+        self.max_active_requests = 0
+        self._lock = threading.Lock()
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def respond(self, prompt: str) -> str:
+        """نص الاستجابة (صدى قابل للتحقق)"""
+        return f"استجابة تجريبية: {prompt}"
+
+    def _count(self, path: str):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def _enter(self):
+        with self._lock:
+            self.active_requests += 1
+            self.max_active_requests = max(self.max_active_requests, self.active_requests)
+
+    def _leave(self):
+        with self._lock:
+            self.active_requests -= 1
+
+    def start(self) -> "OllamaStubServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), _StubRequestHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="OllamaStub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "OllamaStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def run_benchmark(requests_count: int = 16, latency: float = 0.2, max_concurrency: int = 4):
+    """مقارنة التنفيذ التسلسلي بالمتزامن ثم بالذاكرة على الخادم التجريبي"""
+    try:
+        from .ollama_client import OllamaClient
+    except ImportError:
+        from ollama_client import OllamaClient
+
+    print("🦙 قياس عميل Ollama على الخادم التجريبي")
+    print("=" * 60)
+
+    with OllamaStubServer(latency=latency) as stub:
+        prompts = [f"موضوع رقم {i}" for i in range(requests_count)]
+        model = stub.models[0]
+
+        sequential_client = OllamaClient(stub.url, max_concurrency=1, requests_per_second=None, cache_size=0)
+        start = time.perf_counter()
+        for prompt in prompts:
+            sequential_client.generate(prompt, model)
+        sequential_time = time.perf_counter() - start
+
+        client = OllamaClient(stub.url, max_concurrency=max_concurrency, requests_per_second=None)
+        start = time.perf_counter()
+        client.generate_many(prompts, model)
+        concurrent_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.generate_many(prompts, model)
+        cached_time = time.perf_counter() - start
+
+        print(f"   ⏱️ تسلسلي: {sequential_time:.2f} ثانية")
+        print(f"   ⚡ متزامن ({max_concurrency}): {concurrent_time:.2f} ثانية")
+        print(f"   💾 من الذاكرة: {cached_time:.4f} ثانية")
+        print(f"   🔀 أقصى تزامن على الخادم: {stub.max_active_requests}")
+        print(f"   📊 {client.get_client_statistics()}")
+
+        sequential_client.close()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="خادم Ollama تجريبي محلي")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--latency', type=float, default=0.2, help="زمن تأخير كل توليد بالثواني")
+    parser.add_argument('--models', nargs='*', default=["llama3.2:1b"])
+    parser.add_argument('--benchmark', action='store_true', help="تشغيل قياس الإنتاجية ثم الخروج")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(latency=args.latency)
+        return
+
+    stub = OllamaStubServer(args.host, args.port, args.latency, args.models).start()
+    print(f"🦙 الخادم التجريبي يعمل على {stub.url} (Ctrl+C للإيقاف)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -221,7 +221,8 @@ class RevolutionaryKnowledgeSystem:
         try:
             content = None
             
-            if source_type == "ollama" and self.ollama.check_ollama_status():
+            # فحص الصحة المخزّن في العميل (بلا طلب إضافي لكل استخراج)
+            if source_type == "ollama" and self.ollama.client.is_available():
                 content = self.ollama.generate_response(query)
             elif source_type == "wikipedia":
                 # يمكن إضافة استخراج من ويكيبيديا هنا
@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 import copy
 import json
+from operator import attrgetter
 
 try:
     from revolutionary_intelligence.revolutionary_mother_system.revolutionary_mother_system import BaserahRevolutionaryMotherSystem, InheritanceType, AdaptationType
@@ -20,6 +21,11 @@ except ImportError:
         InheritanceType = None
         AdaptationType = None
 
+try:
+    from revolutionary_intelligence.bounded_history import BoundedHistory
+except ImportError:
+    from ..bounded_history import BoundedHistory
+
 class EvolutionDirection(Enum):
     """اتجاهات التطوير التلقائي."""
     OPTIMIZE_PERFORMANCE = "optimize_performance"
@@ -56,14 +62,22 @@ class BaserahSelfEvolvingSystem:
     فالنظام مفتوح جاهز للتطور دوما، والنظام يطور نفسه بنفسه بعد أن يتأكد من الخطوة القادمة التي سيقدم عليها."
     """
 
-    def __init__(self, mother_system: BaserahRevolutionaryMotherSystem):
+    def __init__(self, mother_system: BaserahRevolutionaryMotherSystem,
+                 metrics_history_capacity: int = 1000):
         """تهيئة نظام التطوير التلقائي."""
         self.mother_system = mother_system
         self.evolution_id = f"self_evolution_{uuid.uuid4()}"
 
         # مقاييس التطوير
         self.current_metrics = EvolutionMetrics()
-        self.metrics_history: List[EvolutionMetrics] = []
+        # سجل محدود: الأقدم يُخلى عند الامتلاء مع متوسطات متدحرجة للمقاييس الرئيسية
+        self.metrics_history = BoundedHistory(
+            metrics_history_capacity,
+            aggregates={
+                'performance_score': attrgetter('performance_score'),
+                'revolutionary_potential': attrgetter('revolutionary_potential')
+            }
+        )
 
         # سجل التطوير التلقائي
         self.evolution_log: List[Dict[str, Any]] = []
@@ -619,5 +633,10 @@ class BaserahSelfEvolvingSystem:
                     'revolutionary_potential': m.revolutionary_potential
                 }
                 for m in self.metrics_history[-10:]  # آخر 10 قياسات
-            ]
+            ],
+            'metrics_rolling': {
+                'performance_score': self.metrics_history.rolling('performance_score'),
+                'revolutionary_potential': self.metrics_history.rolling('revolutionary_potential'),
+                'total_measurements': self.metrics_history.total_appended
+            }
         }
\ No newline at end of file
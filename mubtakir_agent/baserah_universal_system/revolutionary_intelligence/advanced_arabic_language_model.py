@@ -12,6 +12,7 @@ from .responsive_cognitive_system import ResponsiveCognitiveSystem
 # استيراد الأسس الثورية
 from .revolutionary_mother_equation import ConcreteRevolutionaryMotherEquation
 from .ai_oop_foundation import BaserahAIOOPFoundation
+from .arabic_root_extractor import CompiledArabicRootExtractor, build_normalizer
 from artistic_intelligence.baserah_core import baserah_sigmoid, baserah_linear, baserah_quantum_sigmoid
 
 class ArabicLetterSemanticsEngine:
@@ -1463,19 +1464,24 @@ class AdvancedArabicRootExtractor:
         self.prefixes = ['ال', 'و', 'ف', 'ب', 'ك', 'ل', 'من', 'إلى', 'على', 'في']
         self.suffixes = ['ة', 'ان', 'ين', 'ون', 'ات', 'ها', 'هم', 'هن', 'كم', 'كن']
 
+        # المستخرج المُجمَّع: يبقى الجذع ثلاثة أحرف على الأقل بعد إزالة الزوائد
+        self.compiled_extractor = CompiledArabicRootExtractor(
+            prefixes=self.prefixes,
+            suffixes=self.suffixes,
+            known_roots=[root for roots in self.roots_database.values() for root in roots],
+            min_stem_length=3,
+            normalizer=build_normalizer(unify_alef_maqsura=True),
+            root_fallback=lambda stem: stem[:3]
+        )
+
         print("📝 تم تهيئة مستخرج الجذور العربية المتقدم")
 
     def extract_root(self, word: str) -> Dict[str, Any]:
         """استخراج جذر الكلمة العربية."""
 
-        # تنظيف الكلمة
-        cleaned_word = self._clean_word(word)
-
-        # إزالة السوابق واللواحق
-        stem = self._remove_affixes(cleaned_word)
-
-        # استخراج الجذر
-        root = self._extract_root_pattern(stem)
+        # تنظيف الكلمة وإزالة السوابق واللواحق واستخراج الجذر (محفوظ لكل صيغة كلمة)
+        extraction = self.compiled_extractor.extract(word)
+        root = extraction.root if extraction.root is not None else extraction.stem
 
         # تطبيق التحويل الثوري للجذر
         root_analysis = self._apply_revolutionary_root_analysis(root, word)
@@ -1485,43 +1491,22 @@ class AdvancedArabicRootExtractor:
     def _clean_word(self, word: str) -> str:
         """تنظيف الكلمة من الحركات والرموز."""
 
-        # إزالة الحركات
-        diacritics = 'ًٌٍَُِّْ'
-        cleaned = ''.join(char for char in word if char not in diacritics)
-
-        # تطبيع الحروف
-        cleaned = cleaned.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
-        cleaned = cleaned.replace('ة', 'ه').replace('ى', 'ي')
-
-        return cleaned.strip()
+        # إزالة الحركات وتطبيع الحروف
+        return self.compiled_extractor.normalizer(word)
 
     def _remove_affixes(self, word: str) -> str:
         """إزالة السوابق واللواحق."""
 
-        stem = word
-
-        # إزالة السوابق
-        for prefix in sorted(self.prefixes, key=len, reverse=True):
-            if stem.startswith(prefix) and len(stem) > len(prefix) + 2:
-                stem = stem[len(prefix):]
-                break
-
-        # إزالة اللواحق
-        for suffix in sorted(self.suffixes, key=len, reverse=True):
-            if stem.endswith(suffix) and len(stem) > len(suffix) + 2:
-                stem = stem[:-len(suffix)]
-                break
-
+        _, stem, _ = self.compiled_extractor.strip_affixes(word)
         return stem
 
     def _extract_root_pattern(self, stem: str) -> str:
         """استخراج نمط الجذر."""
 
         # البحث في قاعدة البيانات أولاً
-        for root_type, roots in self.roots_database.items():
-            for root in roots:
-                if self._matches_root_pattern(stem, root):
-                    return root
+        known_root = self.compiled_extractor.find_known_root(stem)
+        if known_root:
+            return known_root
 
         # استخراج تلقائي للجذر
         if len(stem) >= 3:
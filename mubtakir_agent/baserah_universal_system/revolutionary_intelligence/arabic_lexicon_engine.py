@@ -11,11 +11,14 @@
 
 import os
 import sys
+import copy
 import json
 import sqlite3
+import threading
+import weakref
 import requests
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 
@@ -30,6 +33,45 @@ from artistic_intelligence.baserah_core import (
 # استيراد النظام الأساسي
 from .ai_oop_foundation import BaserahExpertExplorerFoundation
 from .revolutionary_mother_equation import ConcreteRevolutionaryMotherEquation
+from .arabic_root_extractor import CompiledArabicRootExtractor, WordFormLRU
+from .engine_metrics import ENGINE_METRICS, instrumented
+
+
+# الحروف الزائدة الشائعة المستخدمة في استخراج الجذر
+LEXICON_PREFIXES = ['ال', 'و', 'ف', 'ب', 'ك', 'ل']
+LEXICON_SUFFIXES = ['ة', 'ان', 'ين', 'ون', 'ها', 'هم', 'هن', 'كم', 'كن']
+
+
+def create_lexicon_root_extractor(cache_size: int = 65536) -> CompiledArabicRootExtractor:
+    """مستخرج جذور بإعدادات المعجم (يمكن استخدامه دون إنشاء المحرك كاملاً)."""
+
+    return CompiledArabicRootExtractor(
+        prefixes=LEXICON_PREFIXES,
+        suffixes=LEXICON_SUFFIXES,
+        root_fallback=lambda stem: stem[:3],
+        cache_size=cache_size
+    )
+
+
+# عبارات SQL ثابتة (يعيد sqlite3 استخدام العبارات المُجهَّزة على الاتصال الدائم)
+SELECT_ENTRY_SQL = ('SELECT meaning, detailed_meaning, usage_examples FROM lexicon_entries '
+                    'WHERE word = ? ORDER BY id LIMIT 1')
+SELECT_RELATED_SQL = 'SELECT word FROM lexicon_entries WHERE root = ? AND word != ? ORDER BY id'
+INSERT_ANALYSIS_SQL = '''
+    INSERT OR REPLACE INTO lexicon_entries
+    (word, root, meaning, detailed_meaning, source, letter_analysis, baserah_analysis,
+     basil_theories, semantic_weight, usage_examples, related_words, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_LETTER_SQL = '''
+    INSERT INTO letter_analyses
+    (word, letter, position, meaning, baserah_value, basil_theory,
+     semantic_contribution, revolutionary_insights)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# حد عدد المعاملات في استعلام IN واحد (حد SQLite الافتراضي القديم 999)
+SQL_IN_CHUNK_SIZE = 500
 
 
 class LexiconSource(Enum):
@@ -104,6 +146,14 @@ class LetterAnalysis:
     revolutionary_insights: List[str]
 
 
+def _reset_engine_after_fork(engine_ref: "weakref.ref"):
+    """خطاف os.register_at_fork: إعادة تهيئة اتصال المحرك في العملية الابنة إن كان حياً."""
+
+    engine = engine_ref()
+    if engine is not None:
+        engine._reset_after_fork()
+
+
 class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
     """
     محرك المعجم العربي الثوري.
@@ -117,7 +167,8 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
     """
     
     def __init__(self, engine_name: str = "ArabicLexiconEngine",
-                 mother_inheritance: ConcreteRevolutionaryMotherEquation = None):
+                 mother_inheritance: ConcreteRevolutionaryMotherEquation = None,
+                 analysis_cache_size: int = 4096):
         """تهيئة محرك المعجم العربي الثوري."""
         
         # الوراثة من الأسس الثورية
@@ -131,6 +182,22 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         # قاعدة بيانات المعجم
         self.lexicon_db_path = "data/arabic_lexicon.db"
         self.letter_meanings_path = "ref/معاني الحروف.txt"
+
+        # اتصال واحد طوال عمر المحرك (محمي بقفل لأن الواجهات متعددة الخيوط)
+        self._db_connection: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.RLock()
+
+        # الاتصال لا يُشارك عبر fork (عمّال خادم pre-fork): العملية الابنة تفتح اتصالها
+        if hasattr(os, 'register_at_fork'):
+            engine_ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: _reset_engine_after_fork(engine_ref))
+
+        # ذاكرة التحليل الدفعي: (الكلمة، عمق التحليل) -> (مدخل معجمي، تحليل الحروف)
+        # تُعاد نسخ من المدخلات، وكل حفظ يبطل مدخلات الكلمات المحفوظة وجذورها (related_words)
+        self.analysis_memo = WordFormLRU(analysis_cache_size)
+
+        # مستمعو الكتابة: يُستدعون (الكلمات، الجذور) بعد كل حفظ (مثل إبطال ذاكرة استجابات API)
+        self.write_listeners: List[Callable[[List[str], List[str]], None]] = []
         
         # إحصائيات المحرك
         self.engine_stats = {
@@ -141,7 +208,8 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
             'baserah_analyses_performed': 0,
             'basil_theories_applications': 0,
             'average_semantic_weight': 0.0,
-            'total_revolutionary_insights': 0
+            'total_revolutionary_insights': 0,
+            'memo_hits': 0
         }
         
         # معاجم مدمجة
@@ -152,6 +220,9 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         
         # دلالات الحروف
         self.letter_meanings = self._load_letter_meanings()
+
+        # مستخرج الجذور المُجمَّع (أشجار السوابق واللواحق + ذاكرة صيغ الكلمات)
+        self.root_extractor = create_lexicon_root_extractor()
         
         # تهيئة قاعدة البيانات
         self._initialize_database()
@@ -225,6 +296,38 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         
         return letter_meanings
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """الاتصال الدائم بقاعدة بيانات المعجم (يُفتح عند أول استخدام)."""
+
+        with self._db_lock:
+            if self._db_connection is None:
+                self._db_connection = sqlite3.connect(
+                    self.lexicon_db_path, check_same_thread=False, cached_statements=256
+                )
+            return self._db_connection
+
+    def add_write_listener(self, listener: Callable[[List[str], List[str]], None]):
+        """تسجيل دالة تُستدعى (الكلمات، الجذور) بعد كل كتابة في المعجم."""
+
+        self.write_listeners.append(listener)
+
+    def _reset_after_fork(self):
+        """
+        في العملية الابنة بعد fork: ترك الاتصال الموروث دون إغلاقه (إغلاقه قد يمس معاملات الأب)
+        وقفل جديد، فيُفتح اتصال خاص بالعملية عند أول استخدام.
+        """
+
+        self._db_lock = threading.RLock()
+        self._db_connection = None
+
+    def close(self):
+        """إغلاق الاتصال الدائم بقاعدة البيانات."""
+
+        with self._db_lock:
+            if self._db_connection is not None:
+                self._db_connection.close()
+                self._db_connection = None
+
     def _initialize_database(self):
         """تهيئة قاعدة بيانات المعجم."""
         
@@ -232,7 +335,7 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         os.makedirs(os.path.dirname(self.lexicon_db_path), exist_ok=True)
         
         try:
-            conn = sqlite3.connect(self.lexicon_db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # جدول الكلمات الرئيسي
@@ -289,7 +392,6 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_letter ON letter_analyses(letter)')
             
             conn.commit()
-            conn.close()
             
             print(f"✅ تم تهيئة قاعدة بيانات المعجم: {self.lexicon_db_path}")
             
@@ -356,6 +458,7 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         
         print(f"📚 تم تحميل المعجم الأساسي: {len(basic_lexicon)} كلمة")
     
+    @instrumented('lexicon_operation_seconds', operation='analyze_word')
     def analyze_word_revolutionary(self, word: str, deep_analysis: bool = True) -> LexiconEntry:
         """
         تحليل ثوري شامل للكلمة.
@@ -373,22 +476,41 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         # البحث في المعاجم المدمجة
         lexicon_data = self._search_in_lexicons(word)
         
-        # تحليل الحروف
-        letter_analyses = self._analyze_letters_revolutionary(word)
-        
         # استخراج الجذر
         root = self._extract_root(word)
         
+        # بناء المدخل المعجمي الثوري
+        lexicon_entry, letter_analyses = self._build_lexicon_entry(
+            word, root, lexicon_data, self._find_related_words(word, root), deep_analysis
+        )
+        
+        # حفظ التحليل
+        self._save_analysis_to_database(lexicon_entry, letter_analyses)
+        
+        # تحديث الإحصائيات
+        self._update_engine_statistics(lexicon_entry, letter_analyses)
+        
+        print(f"✅ اكتمل التحليل الثوري للكلمة: {word}")
+        
+        return lexicon_entry
+
+    def _build_lexicon_entry(self, word: str, root: str, lexicon_data: Dict[str, Any],
+                             related_words: List[str],
+                             deep_analysis: bool) -> Tuple[LexiconEntry, List[LetterAnalysis]]:
+        """بناء مدخل معجمي من بيانات المعجم (مشترك بين التحليل الفردي والدفعي)."""
+
+        # تحليل الحروف
+        letter_analyses = self._analyze_letters_revolutionary(word)
+
         # تحليل Baserah
         baserah_analysis = self._apply_baserah_analysis(word, letter_analyses)
-        
+
         # تطبيق نظريات باسل
         basil_theories = self._apply_basil_theories_to_word(word, letter_analyses) if deep_analysis else {}
-        
+
         # حساب الوزن الدلالي
         semantic_weight = self._calculate_semantic_weight(word, letter_analyses, baserah_analysis)
-        
-        # إنشاء مدخل معجمي ثوري
+
         lexicon_entry = LexiconEntry(
             word=word,
             root=root,
@@ -400,24 +522,178 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
             basil_theories_application=basil_theories,
             semantic_weight=semantic_weight,
             usage_examples=lexicon_data.get('usage_examples', []),
-            related_words=self._find_related_words(word, root),
+            related_words=related_words,
             metadata={
                 'analysis_time': datetime.now().isoformat(),
                 'deep_analysis': deep_analysis,
                 'revolutionary_method': True
             }
         )
-        
-        # حفظ التحليل
-        self._save_analysis_to_database(lexicon_entry, letter_analyses)
-        
-        # تحديث الإحصائيات
-        self._update_engine_statistics(lexicon_entry, letter_analyses)
-        
-        print(f"✅ اكتمل التحليل الثوري للكلمة: {word}")
-        
-        return lexicon_entry
 
+        return lexicon_entry, letter_analyses
+
+    def analyze_words(self, words: List[str], deep_analysis: bool = False) -> List[LexiconEntry]:
+        """
+        تحليل دفعة من الكلمات.
+
+        الكلمات المكررة تُحلل مرة واحدة، وجميع الكلمات المميزة تُبحث في قاعدة البيانات
+        باستعلام IN واحد، وتُحفظ التحليلات الجديدة في معاملة واحدة وفي ذاكرة التحليل.
+
+        Returns:
+            List[LexiconEntry]: تحليل لكل كلمة بترتيب المدخلات (الكلمات المتعذر تحليلها تُحذف)
+        """
+
+        analyses = self._analyze_distinct_words(words, deep_analysis)
+
+        # كل موضع يحصل على مدخله الخاص حتى للكلمات المكررة
+        results = []
+        returned_words = set()
+        for word in words:
+            if word in analyses:
+                entry = analyses[word]
+                results.append(copy.deepcopy(entry) if word in returned_words else entry)
+                returned_words.add(word)
+        return results
+
+    @instrumented('lexicon_operation_seconds', operation='analyze_words')
+    def _analyze_distinct_words(self, words: List[str], deep_analysis: bool) -> Dict[str, LexiconEntry]:
+        """تحليل الكلمات المميزة مع الاستفادة من ذاكرة التحليل."""
+
+        analyses: Dict[str, LexiconEntry] = {}
+        pending_words = []
+        for word in dict.fromkeys(words):
+            if not word:
+                continue
+            cached = self.analysis_memo.get((word, deep_analysis))
+            if cached is not None:
+                cached_entry, cached_letters = cached
+                analyses[word] = copy.deepcopy(cached_entry)
+                self.engine_stats['memo_hits'] += 1
+                self._update_engine_statistics(cached_entry, cached_letters)
+            else:
+                pending_words.append(word)
+
+        ENGINE_METRICS.count('lexicon_memo_lookups_total', len(analyses), result='hit')
+        ENGINE_METRICS.count('lexicon_memo_lookups_total', len(pending_words), result='miss')
+
+        if not pending_words:
+            return analyses
+
+        print(f"🔍 بدء التحليل الدفعي لـ {len(pending_words)} كلمة مميزة")
+
+        custom_lexicon = self.integrated_lexicons[LexiconSource.CUSTOM_DATABASE]
+        database_entries = self._fetch_lexicon_entries([word for word in pending_words if word not in custom_lexicon])
+        roots = {word: self._extract_root(word) for word in pending_words}
+        words_by_root = self._fetch_words_by_roots(set(roots.values()))
+
+        new_analyses = []
+        for word in pending_words:
+            try:
+                if word in custom_lexicon:
+                    lexicon_data = custom_lexicon[word]
+                else:
+                    lexicon_data = database_entries.get(word) or self._default_lexicon_data(word)
+
+                root = roots[word]
+                related_words = self._complete_related_words(
+                    word, root, [related for related in words_by_root.get(root, []) if related != word]
+                )
+                lexicon_entry, letter_analyses = self._build_lexicon_entry(
+                    word, root, lexicon_data, related_words, deep_analysis
+                )
+
+                # الكلمة المحللة تصبح مرتبطة بما بعدها من كلمات الجذر نفسه (كما في التحليل الفردي)
+                words_by_root.setdefault(root, []).append(word)
+
+                new_analyses.append((lexicon_entry, letter_analyses))
+                analyses[word] = lexicon_entry
+                self._update_engine_statistics(lexicon_entry, letter_analyses)
+
+            except Exception as e:
+                print(f"⚠️ خطأ في تحليل الكلمة '{word}': {e}")
+
+        self._save_analyses_to_database(new_analyses)
+
+        # تُحفظ في الذاكرة فقط المدخلات التي لم تُضف بعدها كلمة من جذرها في هذه الدفعة
+        # (وإلا أصبحت related_words قديمة مقارنة بقاعدة البيانات)
+        last_index_by_root = {entry.root: index for index, (entry, _) in enumerate(new_analyses)}
+        for index, (lexicon_entry, letter_analyses) in enumerate(new_analyses):
+            if last_index_by_root[lexicon_entry.root] == index:
+                self.analysis_memo.put((lexicon_entry.word, deep_analysis),
+                                       (copy.deepcopy(lexicon_entry), letter_analyses))
+
+        print(f"✅ اكتمل التحليل الدفعي: {len(new_analyses)} كلمة جديدة")
+
+        return analyses
+
+    @instrumented('lexicon_lookup_seconds', lookup='entries_batch')
+    def _fetch_lexicon_entries(self, words: List[str]) -> Dict[str, Dict[str, Any]]:
+        """جلب مدخلات عدة كلمات باستعلام IN (أول مدخل لكل كلمة)."""
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        if not words:
+            return entries
+
+        try:
+            with self._db_lock:
+                cursor = self._get_connection().cursor()
+                for start in range(0, len(words), SQL_IN_CHUNK_SIZE):
+                    chunk = words[start:start + SQL_IN_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(
+                        'SELECT word, meaning, detailed_meaning, usage_examples FROM lexicon_entries '
+                        f'WHERE word IN ({placeholders}) ORDER BY id', chunk
+                    )
+                    for word, meaning, detailed_meaning, usage_examples in cursor.fetchall():
+                        if word not in entries:
+                            entries[word] = {
+                                'meaning': meaning,
+                                'detailed_meaning': detailed_meaning,
+                                'usage_examples': json.loads(usage_examples) if usage_examples else []
+                            }
+
+        except Exception as e:
+            print(f"⚠️ خطأ في البحث في قاعدة البيانات: {e}")
+
+        return entries
+
+    @instrumented('lexicon_lookup_seconds', lookup='related_words_batch')
+    def _fetch_words_by_roots(self, roots: set) -> Dict[str, List[str]]:
+        """جلب كلمات عدة جذور باستعلام IN (بترتيب الإدخال)."""
+
+        words_by_root: Dict[str, List[str]] = {}
+        roots = [root for root in roots if root]
+        if not roots:
+            return words_by_root
+
+        try:
+            with self._db_lock:
+                cursor = self._get_connection().cursor()
+                for start in range(0, len(roots), SQL_IN_CHUNK_SIZE):
+                    chunk = roots[start:start + SQL_IN_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(
+                        f'SELECT root, word FROM lexicon_entries WHERE root IN ({placeholders}) ORDER BY id',
+                        chunk
+                    )
+                    for root, word in cursor.fetchall():
+                        words_by_root.setdefault(root, []).append(word)
+
+        except Exception as e:
+            print(f"⚠️ خطأ في البحث عن الكلمات ذات الصلة: {e}")
+
+        return words_by_root
+
+    def _default_lexicon_data(self, word: str) -> Dict[str, Any]:
+        """تحليل أساسي للكلمات غير الموجودة في المعاجم."""
+
+        return {
+            'meaning': f'كلمة عربية: {word}',
+            'detailed_meaning': f'تحليل ثوري للكلمة: {word}',
+            'usage_examples': []
+        }
+
+    @instrumented('lexicon_lookup_seconds', lookup='entry')
     def _search_in_lexicons(self, word: str) -> Dict[str, Any]:
         """البحث في المعاجم المدمجة."""
 
@@ -427,30 +703,23 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
 
         # البحث في قاعدة البيانات
         try:
-            conn = sqlite3.connect(self.lexicon_db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT * FROM lexicon_entries WHERE word = ?', (word,))
-            result = cursor.fetchone()
+            with self._db_lock:
+                cursor = self._get_connection().cursor()
+                cursor.execute(SELECT_ENTRY_SQL, (word,))
+                result = cursor.fetchone()
 
             if result:
                 return {
-                    'meaning': result[3],
-                    'detailed_meaning': result[4],
-                    'usage_examples': json.loads(result[10]) if result[10] else []
+                    'meaning': result[0],
+                    'detailed_meaning': result[1],
+                    'usage_examples': json.loads(result[2]) if result[2] else []
                 }
 
-            conn.close()
-
         except Exception as e:
             print(f"⚠️ خطأ في البحث في قاعدة البيانات: {e}")
 
         # إذا لم توجد، إنشاء تحليل أساسي
-        return {
-            'meaning': f'كلمة عربية: {word}',
-            'detailed_meaning': f'تحليل ثوري للكلمة: {word}',
-            'usage_examples': []
-        }
+        return self._default_lexicon_data(word)
 
     def _analyze_letters_revolutionary(self, word: str) -> List[LetterAnalysis]:
         """تحليل ثوري للحروف."""
@@ -536,32 +805,10 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
     def _extract_root(self, word: str) -> str:
         """استخراج الجذر الثلاثي للكلمة."""
 
-        # خوارزمية بسيطة لاستخراج الجذر
-        # يمكن تطويرها لتكون أكثر دقة
-
-        # إزالة الحروف الزائدة الشائعة
-        prefixes = ['ال', 'و', 'ف', 'ب', 'ك', 'ل']
-        suffixes = ['ة', 'ان', 'ين', 'ون', 'ها', 'هم', 'هن', 'كم', 'كن']
-
-        clean_word = word
-
-        # إزالة البادئات
-        for prefix in prefixes:
-            if clean_word.startswith(prefix):
-                clean_word = clean_word[len(prefix):]
-                break
-
-        # إزالة اللواحق
-        for suffix in suffixes:
-            if clean_word.endswith(suffix):
-                clean_word = clean_word[:-len(suffix)]
-                break
-
-        # استخراج الجذر الثلاثي (أول 3 حروف عادة)
-        if len(clean_word) >= 3:
-            return clean_word[:3]
-        else:
-            return clean_word
+        # خوارزمية بسيطة لاستخراج الجذر: إزالة الحروف الزائدة الشائعة
+        # ثم أخذ أول 3 حروف عادة (النتيجة محفوظة لكل صيغة كلمة)
+        extraction = self.root_extractor.extract(word)
+        return extraction.root if extraction.root is not None else extraction.stem
 
     def _apply_baserah_analysis(self, word: str, letter_analyses: List[LetterAnalysis]) -> Dict[str, float]:
         """تطبيق تحليل Baserah على الكلمة."""
@@ -582,7 +829,7 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
 
         # تطبيق دوال Baserah المتقدمة
         quantum_value = baserah_quantum_sigmoid(average_value, n=1000, k=2.0, x0=0.5, alpha=1.2)
-        linear_trend = baserah_linear(average_value, slope=1.5, intercept=0.1)
+        linear_trend = baserah_linear(average_value, 1.5, 0.1)
 
         return {
             'total_value': total_value,
@@ -669,6 +916,7 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         # تطبيق التحويل الثوري
         return baserah_sigmoid(semantic_weight * 2.0, n=1, k=2.0, x0=0.5, alpha=1.0)
 
+    @instrumented('lexicon_lookup_seconds', lookup='related_words')
     def _find_related_words(self, word: str, root: str) -> List[str]:
         """البحث عن الكلمات ذات الصلة."""
 
@@ -676,19 +924,21 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
 
         # البحث في قاعدة البيانات عن كلمات بنفس الجذر
         try:
-            conn = sqlite3.connect(self.lexicon_db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT word FROM lexicon_entries WHERE root = ? AND word != ?', (root, word))
-            results = cursor.fetchall()
+            with self._db_lock:
+                cursor = self._get_connection().cursor()
+                cursor.execute(SELECT_RELATED_SQL, (root, word))
+                results = cursor.fetchall()
 
             related_words = [result[0] for result in results]
 
-            conn.close()
-
         except Exception as e:
             print(f"⚠️ خطأ في البحث عن الكلمات ذات الصلة: {e}")
 
+        return self._complete_related_words(word, root, related_words)
+
+    def _complete_related_words(self, word: str, root: str, related_words: List[str]) -> List[str]:
+        """إكمال الكلمات ذات الصلة بأنماط افتراضية عند غيابها."""
+
         # إضافة كلمات افتراضية إذا لم توجد
         if not related_words and root:
             # كلمات شائعة بنفس الجذر (يمكن تطويرها)
@@ -701,27 +951,30 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         """حفظ مدخل معجمي في قاعدة البيانات."""
 
         try:
-            conn = sqlite3.connect(self.lexicon_db_path)
-            cursor = conn.cursor()
+            # تغيير المعجم يبطل التحليلات المحفوظة في الذاكرة
+            self._on_lexicon_write([word], [data.get('root', '')])
 
-            cursor.execute('''
-                INSERT OR REPLACE INTO lexicon_entries
-                (word, root, meaning, detailed_meaning, source, letter_analysis, usage_examples, related_words, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                word,
-                data.get('root', ''),
-                data.get('meaning', ''),
-                data.get('detailed_meaning', ''),
-                source.value,
-                json.dumps(data.get('letter_analysis', {}), ensure_ascii=False),
-                json.dumps(data.get('usage_examples', []), ensure_ascii=False),
-                json.dumps(data.get('related_words', []), ensure_ascii=False),
-                json.dumps({'source': source.value}, ensure_ascii=False)
-            ))
+            with self._db_lock:
+                conn = self._get_connection()
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO lexicon_entries
+                    (word, root, meaning, detailed_meaning, source, letter_analysis, usage_examples, related_words, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    word,
+                    data.get('root', ''),
+                    data.get('meaning', ''),
+                    data.get('detailed_meaning', ''),
+                    source.value,
+                    json.dumps(data.get('letter_analysis', {}), ensure_ascii=False),
+                    json.dumps(data.get('usage_examples', []), ensure_ascii=False),
+                    json.dumps(data.get('related_words', []), ensure_ascii=False),
+                    json.dumps({'source': source.value}, ensure_ascii=False)
+                ))
+
+                conn.commit()
 
         except Exception as e:
             print(f"❌ خطأ في حفظ المدخل المعجمي: {e}")
@@ -729,17 +982,18 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
     def _save_analysis_to_database(self, lexicon_entry: LexiconEntry, letter_analyses: List[LetterAnalysis]):
         """حفظ التحليل في قاعدة البيانات."""
 
-        try:
-            conn = sqlite3.connect(self.lexicon_db_path)
-            cursor = conn.cursor()
+        self._save_analyses_to_database([(lexicon_entry, letter_analyses)])
 
-            # حفظ المدخل المعجمي
-            cursor.execute('''
-                INSERT OR REPLACE INTO lexicon_entries
-                (word, root, meaning, detailed_meaning, source, letter_analysis, baserah_analysis,
-                 basil_theories, semantic_weight, usage_examples, related_words, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+    def _save_analyses_to_database(self, analyses: List[Tuple[LexiconEntry, List[LetterAnalysis]]]):
+        """حفظ عدة تحليلات في معاملة واحدة."""
+
+        if not analyses:
+            return
+
+        entry_rows = []
+        letter_rows = []
+        for lexicon_entry, letter_analyses in analyses:
+            entry_rows.append((
                 lexicon_entry.word,
                 lexicon_entry.root,
                 lexicon_entry.meaning,
@@ -753,31 +1007,60 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
                 json.dumps(lexicon_entry.related_words, ensure_ascii=False),
                 json.dumps(lexicon_entry.metadata, ensure_ascii=False)
             ))
+            letter_rows.extend((
+                lexicon_entry.word,
+                letter_analysis.letter,
+                letter_analysis.position,
+                letter_analysis.meaning,
+                letter_analysis.baserah_value,
+                letter_analysis.basil_theory_applied,
+                letter_analysis.semantic_contribution,
+                json.dumps(letter_analysis.revolutionary_insights, ensure_ascii=False)
+            ) for letter_analysis in letter_analyses)
 
-            # حفظ تحليل الحروف
-            for letter_analysis in letter_analyses:
-                cursor.execute('''
-                    INSERT INTO letter_analyses
-                    (word, letter, position, meaning, baserah_value, basil_theory,
-                     semantic_contribution, revolutionary_insights)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    lexicon_entry.word,
-                    letter_analysis.letter,
-                    letter_analysis.position,
-                    letter_analysis.meaning,
-                    letter_analysis.baserah_value,
-                    letter_analysis.basil_theory_applied,
-                    letter_analysis.semantic_contribution,
-                    json.dumps(letter_analysis.revolutionary_insights, ensure_ascii=False)
-                ))
+        try:
+            with self._db_lock:
+                conn = self._get_connection()
+                try:
+                    cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                    # حفظ المدخلات المعجمية
+                    cursor.executemany(INSERT_ANALYSIS_SQL, entry_rows)
+
+                    # حفظ تحليل الحروف
+                    cursor.executemany(INSERT_LETTER_SQL, letter_rows)
+
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
 
         except Exception as e:
             print(f"❌ خطأ في حفظ التحليل: {e}")
 
+        finally:
+            self._on_lexicon_write([entry.word for entry, _ in analyses],
+                                   [entry.root for entry, _ in analyses])
+
+    def _on_lexicon_write(self, words: List[str], roots: List[str]):
+        """إبطال ذاكرة التحليل وإبلاغ مستمعي الكتابة بالكلمات والجذور المتغيرة."""
+
+        self._invalidate_analysis_memo(words, roots)
+        for listener in self.write_listeners:
+            try:
+                listener(words, roots)
+            except Exception as e:
+                print(f"⚠️ خطأ في مستمع كتابة المعجم: {e}")
+
+    def _invalidate_analysis_memo(self, words: List[str], roots: List[str]) -> int:
+        """إبطال تحليلات الذاكرة التي يغيرها الحفظ: الكلمات نفسها وكل كلمات جذورها (related_words)."""
+
+        words = set(words)
+        roots = {root for root in roots if root}
+        return self.analysis_memo.discard_where(
+            lambda key, value: key[0] in words or value[0].root in roots
+        )
+
     def _update_engine_statistics(self, lexicon_entry: LexiconEntry, letter_analyses: List[LetterAnalysis]):
         """تحديث إحصائيات المحرك."""
 
@@ -802,6 +1085,7 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         total_insights = sum(len(l.revolutionary_insights) for l in letter_analyses)
         self.engine_stats['total_revolutionary_insights'] += total_insights
 
+    @instrumented('lexicon_operation_seconds', operation='search_word_meanings')
     def search_word_meanings(self, word: str, include_related: bool = True) -> Dict[str, Any]:
         """البحث عن معاني الكلمة مع التحليل الثوري."""
 
@@ -870,16 +1154,13 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         words = []
 
         try:
-            conn = sqlite3.connect(self.lexicon_db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT word FROM lexicon_entries WHERE word LIKE ?', (f'%{letter}%',))
-            results = cursor.fetchall()
+            with self._db_lock:
+                cursor = self._get_connection().cursor()
+                cursor.execute('SELECT word FROM lexicon_entries WHERE word LIKE ?', (f'%{letter}%',))
+                results = cursor.fetchall()
 
             words = [result[0] for result in results]
 
-            conn.close()
-
         except Exception as e:
             print(f"⚠️ خطأ في البحث عن الكلمات: {e}")
 
@@ -890,6 +1171,7 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
 
         return words
 
+    @instrumented('lexicon_operation_seconds', operation='analyze_text')
     def analyze_text_revolutionary(self, text: str) -> Dict[str, Any]:
         """تحليل ثوري شامل لنص كامل."""
 
@@ -904,20 +1186,17 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
         all_letters = []
         all_roots = set()
 
-        for word in words:
-            # تنظيف الكلمة من علامات الترقيم
-            clean_word = ''.join(c for c in word if c.isalpha())
+        # تنظيف الكلمات من علامات الترقيم
+        clean_words = [''.join(c for c in word if c.isalpha()) for word in words]
+        clean_words = [clean_word for clean_word in clean_words if clean_word]
 
-            if clean_word:
-                try:
-                    analysis = self.analyze_word_revolutionary(clean_word, deep_analysis=False)
-                    word_analyses.append(analysis)
-                    total_semantic_weight += analysis.semantic_weight
-                    all_letters.extend(list(clean_word))
-                    if analysis.root:
-                        all_roots.add(analysis.root)
-                except Exception as e:
-                    print(f"⚠️ خطأ في تحليل الكلمة '{clean_word}': {e}")
+        # تحليل دفعي: كل كلمة مميزة تُحلل مرة واحدة
+        for analysis in self.analyze_words(clean_words, deep_analysis=False):
+            word_analyses.append(analysis)
+            total_semantic_weight += analysis.semantic_weight
+            all_letters.extend(list(analysis.word))
+            if analysis.root:
+                all_roots.add(analysis.root)
 
         # تحليل إحصائي للنص
         text_statistics = {
@@ -1083,6 +1362,8 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
             },
             'letter_meanings_count': len(self.letter_meanings),
             'database_path': self.lexicon_db_path,
+            'database_connection_open': self._db_connection is not None,
+            'analysis_memo': self.analysis_memo.statistics(),
             'revolutionary_features': {
                 'baserah_pure_approach': True,
                 'basil_theories_integration': True,
@@ -1109,11 +1390,10 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
             }
 
             # استخراج نتائج التحليل من قاعدة البيانات
-            conn = sqlite3.connect(self.lexicon_db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT * FROM lexicon_entries ORDER BY created_at DESC LIMIT 100')
-            results = cursor.fetchall()
+            with self._db_lock:
+                cursor = self._get_connection().cursor()
+                cursor.execute('SELECT * FROM lexicon_entries ORDER BY created_at DESC LIMIT 100')
+                results = cursor.fetchall()
 
             for result in results:
                 analysis_result = {
@@ -1125,8 +1405,6 @@ class ArabicLexiconEngine(BaserahExpertExplorerFoundation):
                 }
                 export_data['analysis_results'].append(analysis_result)
 
-            conn.close()
-
             # حفظ البيانات
             if format_type.lower() == 'json':
                 with open(output_file, 'w', encoding='utf-8') as f:
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+مستخرج الجذور العربية المُجمَّع - Compiled Arabic Root Extractor
+نظام بصيرة الثوري
+
+🌱 محرك مشترك لاستخراج الجذور والسوابق واللواحق:
+- شجرة بادئات (trie) للسوابق وأخرى معكوسة للواحق (أطول تطابق أولاً)
+- قوالب أوزان مُجمَّعة مسبقاً (تعابير نمطية + مواضع حروف الجذر)
+- جذور معروفة مفهرسة بالتجزئة: يُبحث عن تتابعات حروف الجذع في الفهرس بدلاً من مسح كل الجذور
+- ذاكرة LRU محدودة لصيغ الكلمات المحللة (النص العربي شديد التكرار)
+
+المطور: باسل يحيى عبدالله
+جميع الأفكار والنظريات من إبداع باسل يحيى عبدالله
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from itertools import combinations
+from math import comb
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Any, Optional, Callable, Iterable
+
+# الحركات العربية
+ARABIC_DIACRITICS = 'ًٌٍَُِّْ'
+
+# حروف مواضع الجذر في قوالب الأوزان (ف ع ل)
+ROOT_PLACEHOLDERS = 'فعل'
+
+_DIACRITICS_TABLE = str.maketrans('', '', ARABIC_DIACRITICS)
+
+
+def build_normalizer(unify_alef: bool = True, unify_ta_marbuta: bool = True,
+                     unify_alef_maqsura: bool = False,
+                     strip_diacritics: bool = True) -> Callable[[str], str]:
+    """بناء دالة تطبيع مُجمَّعة (جدول translate واحد)"""
+    mapping: Dict[int, Optional[str]] = {}
+    if strip_diacritics:
+        mapping.update(_DIACRITICS_TABLE)
+    if unify_alef:
+        mapping.update(str.maketrans('أإآ', 'ااا'))
+    if unify_ta_marbuta:
+        mapping[ord('ة')] = 'ه'
+    if unify_alef_maqsura:
+        mapping[ord('ى')] = 'ي'
+
+    def normalize(word: str) -> str:
+        return word.translate(mapping).strip()
+
+    return normalize
+
+
+class AffixTrie:
+    """شجرة بادئات للسوابق (أو معكوسة للواحق) تعيد التطابقات من الأطول للأقصر"""
+
+    _END = object()
+
+    def __init__(self, affixes: Iterable[str], reverse: bool = False):
+        self.reverse = reverse
+        self.root: Dict[Any, Any] = {}
+        self.affixes = list(dict.fromkeys(affix for affix in affixes if affix))
+
+        for affix in self.affixes:
+            node = self.root
+            for char in (reversed(affix) if reverse else affix):
+                node = node.setdefault(char, {})
+            node[self._END] = affix
+
+    def matches(self, word: str) -> List[str]:
+        """جميع اللواحق/السوابق المطابقة، الأطول أولاً"""
+        found = []
+        node = self.root
+        for char in (reversed(word) if self.reverse else word):
+            node = node.get(char)
+            if node is None:
+                break
+            affix = node.get(self._END)
+            if affix is not None:
+                found.append(affix)
+        found.reverse()
+        return found
+
+    def longest_match(self, word: str) -> Optional[str]:
+        matches = self.matches(word)
+        return matches[0] if matches else None
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """قالب وزن مُجمَّع: تعبير نمطي + مواضع حروف الجذر"""
+    name: str
+    template: str
+    regex: Any
+    root_slots: Tuple[int, ...]
+
+    def matches(self, word: str) -> bool:
+        return self.regex.fullmatch(word) is not None
+
+    def extract_root(self, word: str) -> Optional[str]:
+        """حروف الجذر من مواضعها إذا كان طول الكلمة مساوياً لطول القالب"""
+        if len(word) != len(self.template) or not self.root_slots:
+            return None
+        return ''.join(word[slot] for slot in self.root_slots)
+
+
+def compile_pattern_template(name: str, template: str,
+                             placeholders: str = ROOT_PLACEHOLDERS) -> CompiledPattern:
+    """تجميع قالب وزن: حروف (ف ع ل) مواضع جذر، وبقية الحروف زوائد حرفية"""
+    parts = []
+    slots = []
+    for position, char in enumerate(template):
+        if char in placeholders:
+            parts.append('(.)')
+            slots.append(position)
+        else:
+            parts.append(re.escape(char))
+    return CompiledPattern(name, template, re.compile(''.join(parts)), tuple(slots))
+
+
+class WordFormLRU:
+    """ذاكرة LRU محدودة وآمنة عبر الخيوط لصيغ الكلمات المحللة"""
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int = 65536):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def discard_where(self, predicate: Callable[[Any, Any], bool]) -> int:
+        """حذف المدخلات التي يتحقق فيها predicate(key, value)؛ يعيد عدد المحذوف"""
+        with self._lock:
+            stale_keys = [key for key, value in self._entries.items() if predicate(key, value)]
+            for key in stale_keys:
+                del self._entries[key]
+            return len(stale_keys)
+
+    def statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+@dataclass(frozen=True)
+class RootExtraction:
+    """نتيجة استخراج الجذر لصيغة كلمة"""
+    word: str
+    normalized_word: str
+    prefix: Optional[str]
+    stem: str
+    suffix: Optional[str]
+    root: Optional[str]
+    source: str                     # known_root | pattern | fallback | none
+    pattern: Optional[str] = None
+
+
+class CompiledArabicRootExtractor:
+    """
+    مستخرج الجذور العربية المُجمَّع
+
+    خط المعالجة لكل صيغة كلمة (مع حفظ النتيجة في ذاكرة LRU):
+    1. التطبيع (اختياري)
+    2. نزع أطول سابقة ثم أطول لاحقة تترك جذعاً بطول min_stem_length على الأقل
+    3. الجذور المعروفة: أول جذر (بالترتيب المسجل) تظهر حروفه في الجذع بالترتيب، بالبحث في فهرس مجزأ
+    4. قوالب الأوزان المُجمَّعة
+    5. دالة احتياطية خاصة بالمستهلك (مثل النظريات الثلاث)
+    """
+
+    def __init__(self, prefixes: Iterable[str] = (), suffixes: Iterable[str] = (),
+                 known_roots: Iterable[str] = (),
+                 pattern_templates: Optional[Dict[str, str]] = None,
+                 min_stem_length: int = 0,
+                 normalizer: Optional[Callable[[str], str]] = None,
+                 root_fallback: Optional[Callable[[str], Optional[str]]] = None,
+                 cache_size: int = 65536):
+        self.prefix_trie = AffixTrie(prefixes)
+        self.suffix_trie = AffixTrie(suffixes, reverse=True)
+        self.min_stem_length = min_stem_length
+        self.normalizer = normalizer
+        self.root_fallback = root_fallback
+
+        # الجذور المعروفة: ترتيب ثابت + فهرس مجزأ (الجذر -> ترتيبه) + أطوال الجذور المسجلة
+        self.known_roots: Tuple[str, ...] = tuple(dict.fromkeys(known_roots))
+        self._known_root_order: Dict[str, int] = {root: index for index, root in enumerate(self.known_roots)}
+        self._known_root_lengths: Tuple[int, ...] = tuple(sorted({len(root) for root in self.known_roots}))
+        self._known_root_chars = [(root, frozenset(root)) for root in self.known_roots]
+
+        self.patterns: List[CompiledPattern] = [
+            compile_pattern_template(name, template)
+            for name, template in (pattern_templates or {}).items()
+        ]
+        self._patterns_by_template = {pattern.template: pattern for pattern in self.patterns}
+
+        self.word_cache = WordFormLRU(cache_size)
+
+    # ---------- السوابق واللواحق ----------
+
+    def longest_prefix(self, word: str) -> Optional[str]:
+        return self.prefix_trie.longest_match(word)
+
+    def longest_suffix(self, word: str) -> Optional[str]:
+        return self.suffix_trie.longest_match(word)
+
+    def strip_affixes(self, word: str) -> Tuple[Optional[str], str, Optional[str]]:
+        """نزع السابقة ثم اللاحقة (الأطول أولاً مع احترام الحد الأدنى للجذع)"""
+        prefix = None
+        stem = word
+        for candidate in self.prefix_trie.matches(stem):
+            if len(stem) - len(candidate) >= self.min_stem_length:
+                prefix = candidate
+                stem = stem[len(candidate):]
+                break
+
+        suffix = None
+        for candidate in self.suffix_trie.matches(stem):
+            if len(stem) - len(candidate) >= self.min_stem_length:
+                suffix = candidate
+                stem = stem[:-len(candidate)]
+                break
+
+        return prefix, stem, suffix
+
+    # ---------- الجذور والأوزان ----------
+
+    @staticmethod
+    def is_subsequence(root: str, word: str) -> bool:
+        """هل حروف الجذر موجودة في الكلمة بالترتيب؟"""
+        characters = iter(word)
+        return all(char in characters for char in root)
+
+    def find_known_root(self, stem: str) -> Optional[str]:
+        """
+        أول جذر معروف (بالترتيب المسجل) تظهر حروفه في الجذع بالترتيب
+
+        تتابعات الجذع بأطوال الجذور المسجلة تُبحث في الفهرس المجزأ، فلا تعتمد التكلفة على عدد
+        الجذور المعروفة. المسح الخطي يُستخدم فقط إن كانت التتابعات أكثر من الجذور (جذع طويل جداً).
+        """
+        if not self.known_roots:
+            return None
+
+        subsequence_count = sum(comb(len(stem), length) for length in self._known_root_lengths)
+        if subsequence_count <= len(self.known_roots):
+            best_index = None
+            for length in self._known_root_lengths:
+                for characters in combinations(stem, length):
+                    index = self._known_root_order.get(''.join(characters))
+                    if index is not None and (best_index is None or index < best_index):
+                        best_index = index
+            return self.known_roots[best_index] if best_index is not None else None
+
+        stem_chars = set(stem)
+        for root, root_chars in self._known_root_chars:
+            if root_chars <= stem_chars and self.is_subsequence(root, stem):
+                return root
+        return None
+
+    def match_pattern(self, stem: str) -> Optional[Tuple[str, str]]:
+        """أول قالب وزن يطابق الجذع تماماً: (اسم الوزن، الجذر)"""
+        for pattern in self.patterns:
+            if pattern.matches(stem):
+                return pattern.name, pattern.extract_root(stem)
+        return None
+
+    def compiled_template(self, template: str) -> CompiledPattern:
+        """قالب مُجمَّع (مع تجميعه وحفظه عند أول طلب)"""
+        pattern = self._patterns_by_template.get(template)
+        if pattern is None:
+            pattern = compile_pattern_template(template, template)
+            self._patterns_by_template[template] = pattern
+        return pattern
+
+    # ---------- الاستخراج مع الذاكرة ----------
+
+    def _extract_uncached(self, word: str) -> RootExtraction:
+        normalized = self.normalizer(word) if self.normalizer else word
+        prefix, stem, suffix = self.strip_affixes(normalized)
+
+        root = self.find_known_root(stem)
+        if root is not None:
+            return RootExtraction(word, normalized, prefix, stem, suffix, root, 'known_root')
+
+        pattern_match = self.match_pattern(stem)
+        if pattern_match is not None:
+            pattern_name, root = pattern_match
+            return RootExtraction(word, normalized, prefix, stem, suffix, root, 'pattern', pattern_name)
+
+        if self.root_fallback is not None:
+            root = self.root_fallback(stem)
+            if root:
+                return RootExtraction(word, normalized, prefix, stem, suffix, root, 'fallback')
+
+        return RootExtraction(word, normalized, prefix, stem, suffix, None, 'none')
+
+    def extract(self, word: str) -> RootExtraction:
+        """استخراج كامل لصيغة كلمة (محفوظ في ذاكرة LRU)"""
+        return self.word_cache.get_or_compute(word, lambda: self._extract_uncached(word))
+
+    def extract_root(self, word: str) -> Optional[str]:
+        return self.extract(word).root
+
+    def extract_roots(self, text: str, min_word_length: int = 0) -> List[str]:
+        """جذور جميع كلمات النص (الكلمات المكررة تُحلل مرة واحدة)"""
+        roots = []
+        for word in text.split():
+            if len(word) >= min_word_length:
+                root = self.extract(word).root
+                if root:
+                    roots.append(root)
+        return roots
+
+    def cache_statistics(self) -> Dict[str, Any]:
+        return self.word_cache.statistics()
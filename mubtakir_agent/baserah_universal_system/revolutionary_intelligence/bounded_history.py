@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+سجل التاريخ المحدود - Bounded History Ring Buffer
+نظام بصيرة الثوري
+
+🔁 بديل محدود للقوائم التي لا يُضاف إليها إلا من الآخر (سجلات وتواريخ المكونات طويلة التشغيل):
+- حلقة دائرية بسعة ثابتة: الأقدم يُخلى عند الامتلاء فتستقر الذاكرة
+- تفريغ اختياري للعناصر المُخلاة إلى ملف JSONL على القرص (مع تدوير عند حد الحجم)
+- مجاميع متدحرجة في O(1) لكل إضافة: العدد والمجموع والمتوسط والانحراف والأدنى والأعلى
+- واجهة متوافقة مع القوائم: len / فهرسة / تقطيع / تكرار / append / remove
+
+المطور: باسل يحيى عبدالله
+جميع الأفكار والنظريات من إبداع باسل يحيى عبدالله
+"""
+
+import json
+import math
+import os
+import threading
+from collections import deque
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator
+
+# السعة الافتراضية لسجل التاريخ
+DEFAULT_HISTORY_CAPACITY = 1000
+
+# حد حجم ملف التفريغ قبل تدويره إلى ‎.1‎ (بالبايت)
+DEFAULT_SPILL_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _spill_default(value: Any) -> Any:
+    """تحويل القيم غير القابلة للتسلسل في JSON."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def serialize_history_entry(entry: Any) -> str:
+    """تسلسل عنصر تاريخ إلى سطر JSON."""
+    return json.dumps(entry, ensure_ascii=False, default=_spill_default)
+
+
+class RollingAggregate:
+    """
+    مجموع متدحرج لقيمة رقمية مستخرجة من كل عنصر
+
+    المجموع ومجموع المربعات يُحدّثان في O(1)، والأدنى/الأعلى بطابورين رتيبين
+    (O(1) مطفأ). يُعاد حساب المجاميع بدقة مرة كل سعة كاملة لمنع تراكم أخطاء الفاصلة العائمة.
+    """
+
+    __slots__ = ('extract', 'values', 'count', 'total', 'total_squares',
+                 'lifetime_count', 'lifetime_total', '_min_queue', '_max_queue')
+
+    def __init__(self, extract: Callable[[Any], Optional[float]]):
+        self.extract = extract
+        self.values: deque = deque()
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.lifetime_count = 0
+        self.lifetime_total = 0.0
+        self._min_queue: deque = deque()   # (التسلسل، القيمة) تصاعدياً
+        self._max_queue: deque = deque()   # (التسلسل، القيمة) تنازلياً
+
+    def push(self, sequence: int, item: Any):
+        value = self.extract(item)
+        if value is not None:
+            value = float(value)
+            self.count += 1
+            self.total += value
+            self.total_squares += value * value
+            self.lifetime_count += 1
+            self.lifetime_total += value
+            while self._min_queue and self._min_queue[-1][1] >= value:
+                self._min_queue.pop()
+            self._min_queue.append((sequence, value))
+            while self._max_queue and self._max_queue[-1][1] <= value:
+                self._max_queue.pop()
+            self._max_queue.append((sequence, value))
+        self.values.append(value)
+
+    def pop_oldest(self, sequence: int):
+        value = self.values.popleft()
+        if value is not None:
+            self.count -= 1
+            self.total -= value
+            self.total_squares -= value * value
+            if self._min_queue and self._min_queue[0][0] == sequence:
+                self._min_queue.popleft()
+            if self._max_queue and self._max_queue[0][0] == sequence:
+                self._max_queue.popleft()
+
+    def rebuild(self, sequences: Iterable[int]):
+        """إعادة بناء المجاميع من القيم المخزنة (بعد حذف من الوسط أو دورياً)."""
+        present = [value for value in self.values if value is not None]
+        self.count = len(present)
+        self.total = math.fsum(present)
+        self.total_squares = math.fsum(value * value for value in present)
+        self._min_queue.clear()
+        self._max_queue.clear()
+        for sequence, value in zip(sequences, self.values):
+            if value is None:
+                continue
+            while self._min_queue and self._min_queue[-1][1] >= value:
+                self._min_queue.pop()
+            self._min_queue.append((sequence, value))
+            while self._max_queue and self._max_queue[-1][1] <= value:
+                self._max_queue.pop()
+            self._max_queue.append((sequence, value))
+
+    def clear(self):
+        self.values.clear()
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self._min_queue.clear()
+        self._max_queue.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        mean = self.total / self.count if self.count else 0.0
+        variance = max(0.0, self.total_squares / self.count - mean * mean) if self.count else 0.0
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': mean,
+            'std': math.sqrt(variance),
+            'min': self._min_queue[0][1] if self._min_queue else None,
+            'max': self._max_queue[0][1] if self._max_queue else None,
+            'lifetime_count': self.lifetime_count,
+            'lifetime_sum': self.lifetime_total,
+            'lifetime_mean': self.lifetime_total / self.lifetime_count if self.lifetime_count else 0.0
+        }
+
+
+class BoundedHistory:
+    """
+    🔁 سجل تاريخ محدود السعة (آمن عبر الخيوط)
+
+    Args:
+        capacity: أقصى عدد عناصر في الذاكرة
+        aggregates: اسم -> دالة تستخرج قيمة رقمية من العنصر (None = تُتجاهل)
+        spill_path: ملف JSONL تُلحق به العناصر المُخلاة (None = تُهمل)
+        spill_max_bytes: حجم ملف التفريغ قبل تدويره إلى ‎.1‎
+        serializer: دالة تحويل العنصر إلى سطر نصي للتفريغ
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_CAPACITY,
+                 aggregates: Optional[Dict[str, Callable[[Any], Optional[float]]]] = None,
+                 spill_path: Optional[str] = None,
+                 spill_max_bytes: int = DEFAULT_SPILL_MAX_BYTES,
+                 serializer: Callable[[Any], str] = serialize_history_entry):
+        if capacity < 1:
+            raise ValueError("سعة سجل التاريخ يجب أن تكون 1 على الأقل")
+
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self.serializer = serializer
+
+        self._items: deque = deque()
+        self._sequences: deque = deque()
+        self._aggregates = {name: RollingAggregate(extract) for name, extract in (aggregates or {}).items()}
+        self._next_sequence = 0
+        self._evictions_since_rebuild = 0
+        self._spill_file = None
+        self._lock = threading.RLock()
+
+        self.total_appended = 0
+        self.evicted_count = 0
+        self.spilled_count = 0
+
+    # ---------- الإضافة والإخلاء ----------
+
+    def append(self, item: Any):
+        with self._lock:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            self._items.append(item)
+            self._sequences.append(sequence)
+            for aggregate in self._aggregates.values():
+                aggregate.push(sequence, item)
+            self.total_appended += 1
+
+            if len(self._items) > self.capacity:
+                self._evict_oldest()
+
+    def extend(self, items: Iterable[Any]):
+        for item in items:
+            self.append(item)
+
+    def _evict_oldest(self):
+        item = self._items.popleft()
+        sequence = self._sequences.popleft()
+        for aggregate in self._aggregates.values():
+            aggregate.pop_oldest(sequence)
+        self.evicted_count += 1
+
+        self._evictions_since_rebuild += 1
+        if self._evictions_since_rebuild >= self.capacity:
+            self._evictions_since_rebuild = 0
+            for aggregate in self._aggregates.values():
+                aggregate.rebuild(self._sequences)
+
+        if self.spill_path:
+            self._spill(item)
+
+    def _spill(self, item: Any):
+        try:
+            if self._spill_file is None:
+                directory = os.path.dirname(self.spill_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+
+            self._spill_file.write(self.serializer(item) + '\n')
+            self.spilled_count += 1
+
+            if self._spill_file.tell() >= self.spill_max_bytes:
+                self._spill_file.close()
+                self._spill_file = None
+                os.replace(self.spill_path, f"{self.spill_path}.1")
+        except (OSError, TypeError, ValueError) as e:
+            print(f"❌ خطأ في تفريغ سجل التاريخ إلى {self.spill_path}: {e}")
+
+    def remove(self, item: Any):
+        """حذف أول عنصر مساوٍ (O(n)، كما في القوائم)؛ ValueError إذا لم يوجد."""
+        with self._lock:
+            for index, existing in enumerate(self._items):
+                if existing is item or existing == item:
+                    break
+            else:
+                raise ValueError("العنصر غير موجود في سجل التاريخ")
+
+            del self._items[index]
+            del self._sequences[index]
+            for aggregate in self._aggregates.values():
+                del aggregate.values[index]
+                aggregate.rebuild(self._sequences)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sequences.clear()
+            for aggregate in self._aggregates.values():
+                aggregate.clear()
+
+    def flush(self):
+        """كتابة ما في ذاكرة ملف التفريغ إلى القرص."""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    # ---------- واجهة القوائم ----------
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_list())
+
+    def __reversed__(self) -> Iterator[Any]:
+        return reversed(self.to_list())
+
+    def __contains__(self, item: Any) -> bool:
+        with self._lock:
+            return item in self._items
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                return list(self._items)[index]
+            return self._items[index]
+
+    def to_list(self) -> List[Any]:
+        """نسخة من العناصر الحالية (من الأقدم للأحدث)."""
+        with self._lock:
+            return list(self._items)
+
+    def __repr__(self) -> str:
+        return f"<BoundedHistory {len(self._items)}/{self.capacity} (أُضيف {self.total_appended})>"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_spill_file'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    # ---------- المجاميع المتدحرجة ----------
+
+    def rolling(self, name: str) -> Dict[str, Any]:
+        """المجاميع المتدحرجة لقيمة محددة على النافذة الحالية (مع مجاميع كل التاريخ)."""
+        with self._lock:
+            if name not in self._aggregates:
+                raise KeyError(f"مجموع غير معرف: {name}")
+            return self._aggregates[name].summary()
+
+    def rolling_mean(self, name: str) -> float:
+        return self.rolling(name)['mean']
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """إحصائيات السجل والمجاميع."""
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'capacity': self.capacity,
+                'total_appended': self.total_appended,
+                'evicted': self.evicted_count,
+                'spilled': self.spilled_count,
+                'spill_path': self.spill_path,
+                'aggregates': {name: aggregate.summary() for name, aggregate in self._aggregates.items()}
+            }
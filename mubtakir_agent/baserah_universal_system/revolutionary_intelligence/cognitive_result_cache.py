@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# cognitive_result_cache.py - ذاكرة تخزين مؤقت لنتائج التفكير العميق (LRU + TTL + حد بالبايت)
+
+import copy
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+# يُرفع عند تغيير بنية النتائج المخزنة لإبطال المفاتيح القديمة
+CACHE_FORMAT_VERSION = 1
+
+_SCALAR_TYPES = (str, bool, int, float, type(None))
+
+
+def _tag_cache_input(value: Any) -> Any:
+    """تمثيل قابل لـ JSON يحمل نوع كل قيمة بجانبها (النصوص تبقى كما هي حرفياً)."""
+
+    if isinstance(value, _SCALAR_TYPES):
+        return [type(value).__name__, value]
+
+    if isinstance(value, dict):
+        items = [[_tag_cache_input(key), _tag_cache_input(item)] for key, item in value.items()]
+        return ["dict", sorted(items, key=_canonical_json)]
+
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_tag_cache_input(item) for item in value]]
+
+    if isinstance(value, (set, frozenset)):
+        return [type(value).__name__, sorted((_tag_cache_input(item) for item in value), key=_canonical_json)]
+
+    value_type = type(value)
+    return [f"{value_type.__module__}.{value_type.__qualname__}", str(value)]
+
+
+def _canonical_json(tagged: Any) -> str:
+    return json.dumps(tagged, ensure_ascii=False, separators=(",", ":"))
+
+
+def normalize_cache_input(input_data: Any) -> str:
+    """
+    تطبيع المدخل إلى نص ثابت: JSON معنون بالأنواع مع ترتيب مفاتيح القواميس.
+
+    المدخلات المختلفة لا تتصادم (1 و"1"، None و"null")، والنصوص تُحفظ حرفياً دون تعديل المسافات.
+    """
+
+    return _canonical_json(_tag_cache_input(input_data))
+
+
+def make_cache_key(*parts: Any) -> str:
+    """مفتاح معنون بالمحتوى (SHA-256) من أجزاء مطبّعة."""
+
+    digest = hashlib.sha256()
+    digest.update(str(CACHE_FORMAT_VERSION).encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x1f")
+        digest.update(normalize_cache_input(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def estimate_size_bytes(value: Any) -> int:
+    """تقدير حجم القيمة بالبايت (pickle، مع الرجوع إلى repr عند التعذر)."""
+
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return len(repr(value).encode("utf-8"))
+
+
+def _freeze(value: Any) -> Tuple[Any, bool, int]:
+    """نسخة مجمدة مستقلة عن القيمة؛ يعيد (الحمولة، مسلسلة؟، الحجم بالبايت). يرفع خطأ إن تعذر النسخ."""
+
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return payload, True, len(payload)
+    except Exception:
+        return copy.deepcopy(value), False, len(repr(value).encode("utf-8"))
+
+
+def _thaw(payload: Any, pickled: bool) -> Any:
+    """نسخة جديدة من الحمولة المجمدة لكل قارئ."""
+
+    return pickle.loads(payload) if pickled else copy.deepcopy(payload)
+
+
+class CognitiveResultCache:
+    """
+    ذاكرة تخزين مؤقت للنتائج المعرفية
+
+    - إخلاء الأقدم استخداماً (LRU) عند تجاوز عدد المدخلات أو الحجم بالبايت
+    - انتهاء صلاحية كل مدخل بعد مدة محددة (TTL)
+    - إحصائيات إصابة/إخفاق لكل مرحلة
+    - القيم تُخزن مسلسلة وكل قراءة تعيد نسخة جديدة: تعديل النتيجة المسترجعة لا يمس الذاكرة
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (payload, size_bytes, expires_at, namespace, pickled)
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float], str, bool]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+
+        self.cache_stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'oversized_rejections': 0,
+            'uncopyable_rejections': 0
+        }
+        self.namespace_stats: Dict[str, Dict[str, int]] = {}
+
+    def _namespace_counter(self, namespace: str) -> Dict[str, int]:
+        counter = self.namespace_stats.get(namespace)
+        if counter is None:
+            counter = {'hits': 0, 'misses': 0}
+            self.namespace_stats[namespace] = counter
+        return counter
+
+    def _remove(self, key: str):
+        _, size_bytes, _, _, _ = self._entries.pop(key)
+        self.current_bytes -= size_bytes
+
+    def get(self, key: str, namespace: str = "default") -> Tuple[bool, Any]:
+        """البحث عن مفتاح؛ يعيد (وُجد، القيمة)."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            counter = self._namespace_counter(namespace)
+
+            if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                self.cache_stats['expirations'] += 1
+                entry = None
+
+            if entry is None:
+                self.cache_stats['misses'] += 1
+                counter['misses'] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.cache_stats['hits'] += 1
+            counter['hits'] += 1
+            payload, pickled = entry[0], entry[4]
+
+        return True, _thaw(payload, pickled)
+
+    def put(self, key: str, value: Any, namespace: str = "default") -> bool:
+        """تخزين قيمة مع إخلاء الأقدم استخداماً عند تجاوز الحدود."""
+
+        try:
+            payload, pickled, size_bytes = _freeze(value)
+        except Exception:
+            # لا تُخزن قيمة مشتركة يمكن أن يعدلها القارئ
+            with self._lock:
+                self.cache_stats['uncopyable_rejections'] += 1
+            return False
+
+        with self._lock:
+            if size_bytes > self.max_bytes:
+                self.cache_stats['oversized_rejections'] += 1
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+
+            expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+            self._entries[key] = (payload, size_bytes, expires_at, namespace, pickled)
+            self.current_bytes += size_bytes
+
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self.current_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.cache_stats['evictions'] += 1
+
+            return True
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       namespace: str = "default") -> Tuple[Any, bool]:
+        """إرجاع القيمة المخزنة أو حسابها وتخزينها؛ يعيد (القيمة، إصابة؟)."""
+
+        found, value = self.get(key, namespace)
+        if found:
+            return value, True
+
+        value = compute()
+        self.put(key, value, namespace)
+        return value, False
+
+    def invalidate(self, key: str) -> bool:
+        """إبطال مدخل واحد؛ يعيد True إن كان موجوداً."""
+
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """إبطال جميع المدخلات في مساحة أسماء محددة."""
+
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[3] == namespace]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """مسح الذاكرة المؤقتة بالكامل."""
+
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """إحصائيات الذاكرة المؤقتة."""
+
+        with self._lock:
+            lookups = self.cache_stats['hits'] + self.cache_stats['misses']
+            return {
+                **self.cache_stats,
+                'hit_rate': self.cache_stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'phases': {name: dict(counter) for name, counter in self.namespace_stats.items()}
+            }
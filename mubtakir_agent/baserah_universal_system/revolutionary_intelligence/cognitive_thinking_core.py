@@ -10,13 +10,23 @@ import math
 # استيراد الأسس الثورية
 from .revolutionary_mother_equation import BaserahRevolutionaryMotherEquation
 from .ai_oop_foundation import BaserahAIOOPFoundation, BaserahExpertExplorerFoundation
+from .bounded_history import BoundedHistory
 from artistic_intelligence.baserah_core import baserah_sigmoid, baserah_linear, baserah_quantum_sigmoid
 
+
+def _thought_confidence(thought: Dict[str, Any]) -> Optional[float]:
+    """ثقة الفكرة النهائية (للمجموع المتدحرج لسلسلة الأفكار)."""
+    return thought['final_thought'].get('confidence')
+
+
 class BaserahCognitiveLayer(BaserahAIOOPFoundation):
     """
     طبقة معرفية أساسية في النواة التفكيرية
     ترث من الأساس الثوري وتطبق التفكير المعرفي
     """
+
+    # سعة سلسلة الأفكار (الأقدم يُخلى عند الامتلاء)
+    THOUGHT_CHAIN_CAPACITY = 256
     
     def __init__(self, layer_name: str, layer_type: str, layer_depth: int = 1,
                  mother_equation_inheritance: Dict[str, Any] = None):
@@ -47,7 +57,10 @@ class BaserahCognitiveLayer(BaserahAIOOPFoundation):
         # حالة التفكير
         self.thinking_state = "ready"
         self.current_thought = None
-        self.thought_chain = []
+        self.thought_chain = BoundedHistory(
+            self.THOUGHT_CHAIN_CAPACITY,
+            aggregates={'confidence': _thought_confidence}
+        )
         
         print(f"🧠 تم تهيئة الطبقة المعرفية: {layer_name} (العمق: {layer_depth})")
     
@@ -287,6 +300,7 @@ class BaserahCognitiveLayer(BaserahAIOOPFoundation):
             'thinking_state': self.thinking_state,
             'memory_size': len(self.layer_memory),
             'thought_chain_length': len(self.thought_chain),
+            'thought_confidence': self.thought_chain.rolling('confidence'),
             'learned_patterns_count': len(self.learned_patterns),
             'system_status': self.get_system_status(),
             'last_thought': self.thought_chain[-1] if self.thought_chain else None
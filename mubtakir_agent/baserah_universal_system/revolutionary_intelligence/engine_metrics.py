@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+مقاييس المحركات - Engine Metrics & Profiling Hooks
+نظام بصيرة الثوري
+
+📊 طبقة قياس خفيفة تُبلغ إليها المحركات (النواة التفكيرية، الذكاء المطور لذاته، المعجم، الاستنباط البصري):
+- مؤقتات (timed / instrumented) تسجل الزمن في مدرجات تكرارية
+- عدادات (count) ومدرجات (observe) بتسميات اختيارية
+- معطلة افتراضياً: الاستدعاء عندها فحص علم واحد فقط (تكلفة شبه معدومة)
+- تصدير بصيغة Prometheus النصية (render_prometheus) أو قاموس (get_statistics)
+
+ملاحظة: السجل لكل عملية؛ في وضع pre-fork يُبلغ كل عامل عن مقاييسه هو.
+
+المطور: باسل يحيى عبدالله
+جميع الأفكار والنظريات من إبداع باسل يحيى عبدالله
+"""
+
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+# حدود المدرجات الافتراضية للأزمنة (بالثواني)
+DEFAULT_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                        0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# نوع المحتوى لصيغة Prometheus النصية
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items())) if labels else ()
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Histogram:
+    """مدرج تكراري لسلسلة واحدة (عدادات الحدود غير تراكمية داخلياً)."""
+
+    __slots__ = ('bounds', 'bucket_counts', 'count', 'total', 'maximum')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, q: float) -> float:
+        """تقدير المئين من حدود المدرج (الحد الأعلى للمدى الذي يقع فيه)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds, self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+
+class _NullTimer:
+    """مؤقت لا يفعل شيئاً (عند تعطيل المقاييس)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """مؤقت يسجل الزمن المنقضي في مدرج عند الخروج."""
+
+    __slots__ = ('registry', 'name', 'key', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, key: LabelKey):
+        self.registry = registry
+        self.name = name
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.registry._observe(self.name, self.key, time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    📊 سجل مقاييس المحركات
+
+    Args:
+        namespace: بادئة أسماء المقاييس عند التصدير
+        enabled: تفعيل القياس منذ البداية
+        buckets: حدود المدرجات الافتراضية
+    """
+
+    def __init__(self, namespace: str = "baserah", enabled: bool = False,
+                 buckets: Tuple[float, ...] = DEFAULT_TIME_BUCKETS):
+        self.namespace = namespace
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._histogram_bounds: Dict[str, Tuple[float, ...]] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # ---------- التحكم ----------
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """مسح جميع القيم المسجلة (الأوصاف تبقى)."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def describe(self, name: str, description: str, buckets: Optional[Tuple[float, ...]] = None):
+        """وصف مقياس (سطر HELP) وحدود مدرجه إن كان مدرجاً بحدود خاصة."""
+        self._descriptions[name] = description
+        if buckets is not None:
+            self._histogram_bounds[name] = tuple(sorted(buckets))
+
+    # ---------- التسجيل ----------
+
+    def count(self, name: str, value: float = 1, **labels):
+        """زيادة عداد (يُفضل أن ينتهي الاسم بـ ‎_total‎)."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            if name in self._histograms:
+                raise ValueError(f"المقياس {name} مسجل كمدرج وليس عداداً")
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """تسجيل قيمة في مدرج."""
+        if not self.enabled:
+            return
+        self._observe(name, _label_key(labels), value)
+
+    def timed(self, name: str, **labels):
+        """مدير سياق يسجل زمن الكتلة بالثواني في المدرج name."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, _label_key(labels))
+
+    def _observe(self, name: str, key: LabelKey, value: float):
+        with self._lock:
+            if name in self._counters:
+                raise ValueError(f"المقياس {name} مسجل كعداد وليس مدرجاً")
+            series = self._histograms.get(name)
+            if series is None:
+                series = self._histograms[name] = {}
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._histogram_bounds.get(name, self.buckets))
+            histogram.observe(value)
+
+    # ---------- التصدير ----------
+
+    def render_prometheus(self) -> str:
+        """تصدير جميع المقاييس بصيغة Prometheus النصية (الإصدار 0.0.4)."""
+        lines: List[str] = []
+        prefix = f"{self.namespace}_" if self.namespace else ""
+
+        with self._lock:
+            for name in sorted(self._counters):
+                full_name = prefix + name
+                if name in self._descriptions:
+                    lines.append(f"# HELP {full_name} {self._descriptions[name]}")
+                lines.append(f"# TYPE {full_name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+
+            for name in sorted(self._histograms):
+                full_name = prefix + name
+                if name in self._descriptions:
+                    lines.append(f"# HELP {full_name} {self._descriptions[name]}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.bounds, histogram.bucket_counts):
+                        cumulative += bucket_count
+                        lines.append(f"{full_name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} "
+                                     f"{cumulative}")
+                    lines.append(f"{full_name}_bucket{_format_labels(key, (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(histogram.total)}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """ملخص المقاييس: العدادات، ولكل مدرج العدد والمجموع والمتوسط والأقصى ومئينات تقريبية."""
+        def series_name(key: LabelKey) -> str:
+            return ','.join(f"{name}={value}" for name, value in key) or 'all'
+
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'counters': {
+                    name: {series_name(key): value for key, value in series.items()}
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: {
+                        series_name(key): {
+                            'count': histogram.count,
+                            'sum': histogram.total,
+                            'mean': histogram.total / histogram.count if histogram.count else 0.0,
+                            'max': histogram.maximum,
+                            'p50': histogram.quantile(0.5),
+                            'p95': histogram.quantile(0.95)
+                        }
+                        for key, histogram in series.items()
+                    }
+                    for name, series in self._histograms.items()
+                }
+            }
+
+
+# السجل الافتراضي المشترك بين المحركات (معطل حتى يُفعَّل)
+ENGINE_METRICS = MetricsRegistry()
+
+
+def instrumented(name: str, registry: Optional[MetricsRegistry] = None, **labels) -> Callable:
+    """
+    مُزخرف يسجل زمن الدالة في المدرج name.
+
+    عند تعطيل السجل تُستدعى الدالة مباشرة بعد فحص العلم فقط.
+    """
+    metrics = registry if registry is not None else ENGINE_METRICS
+    key = _label_key(labels)
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metrics._observe(name, key, time.perf_counter() - start)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+# baserah_snapshot.py - صيغة اللقطات الثنائية لحالة الخبير والمستكشف Baserah
+
+"""
+صيغة لقطة ثنائية ذات إصدار لحفظ حالة النظام المتكامل واستعادتها بسرعة.
+
+بنية الملف:
+    BSNP | الإصدار (uint16) | الضغط (uint8) | محجوز (uint8) | طول الفهرس (uint32)
+    فهرس JSON صغير يصف الأقسام (الإزاحة، الطول المضغوط، الطول الخام)
+    الأقسام: جدول النصوص، المعرفة، العلاقات، المجموعات، كتل المعادلات
+
+- المعاملات الرقمية تُخزن كمصفوفات numpy متجاورة وتُقرأ بدون نسخ،
+  مع نوع كل قيمة (int / float / نوع numpy) وأعلام وجود حقول المكوّن لتُستعاد كما حُفظت.
+- المعرفات والأنواع والتواريخ تُخزن مرة واحدة في جدول نصوص وتُشار إليها بأرقام.
+- كل كتلة معادلات تُضغط على حدة وتُفك عند أول وصول إليها فقط.
+"""
+
+import gc
+import io
+import json
+import lzma
+import os
+import struct
+from bisect import bisect_right
+from collections.abc import MutableSequence
+from enum import Enum
+from typing import Dict, List, Tuple, Optional, Any, Iterable
+
+import numpy as np
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+from .baserah_expert_core import BaserahKnowledgeItem, KnowledgeType
+from .baserah_explorer_core import BaserahEquation
+
+SNAPSHOT_MAGIC = b"BSNP"
+SNAPSHOT_VERSION = 1
+EQUATION_BLOCK_SIZE = 65536
+
+_HEADER = struct.Struct("<4sHBBI")
+_ARRAY_ALIGNMENT = 8
+
+
+class SnapshotCompression(str, Enum):
+    """خوارزميات ضغط أقسام اللقطة."""
+    NONE = "none"
+    LZMA = "lzma"
+    ZSTD = "zstd"
+
+
+_COMPRESSION_CODES = {
+    SnapshotCompression.NONE: 0,
+    SnapshotCompression.LZMA: 1,
+    SnapshotCompression.ZSTD: 2,
+}
+
+
+def _compress(data: bytes, compression: SnapshotCompression) -> bytes:
+    if compression == SnapshotCompression.LZMA:
+        return lzma.compress(data, preset=1)
+    if compression == SnapshotCompression.ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: SnapshotCompression) -> bytes:
+    if compression == SnapshotCompression.LZMA:
+        return lzma.decompress(data)
+    if compression == SnapshotCompression.ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("اللقطة مضغوطة بـ zstd لكن مكتبة zstandard غير مثبتة")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def _pack_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    """دمج مصفوفات مسماة في كتلة واحدة: رأس JSON ثم بيانات محاذاة."""
+    layout = []
+    body = io.BytesIO()
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        padding = (-body.tell()) % _ARRAY_ALIGNMENT
+        body.write(b"\0" * padding)
+        layout.append([name, array.dtype.str, int(array.size), body.tell()])
+        body.write(array.tobytes())
+    header = json.dumps(layout).encode("utf-8")
+    header += b" " * ((-(len(header) + 4)) % _ARRAY_ALIGNMENT)
+    return struct.pack("<I", len(header)) + header + body.getvalue()
+
+
+def _unpack_arrays(raw: bytes) -> Dict[str, np.ndarray]:
+    (header_length,) = struct.unpack_from("<I", raw, 0)
+    layout = json.loads(raw[4:4 + header_length].decode("utf-8"))
+    body_start = 4 + header_length
+    arrays = {}
+    for name, dtype, size, offset in layout:
+        arrays[name] = np.frombuffer(raw, dtype=np.dtype(dtype), count=size, offset=body_start + offset)
+    return arrays
+
+
+def _json_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class _StringTableBuilder:
+    """بناء جدول النصوص المشترك أثناء الكتابة."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        position = self.index.get(value)
+        if position is None:
+            position = len(self.strings)
+            self.index[value] = position
+            self.strings.append(value)
+        return position
+
+    def intern_many(self, values: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.intern(value) for value in values), dtype=np.uint32)
+
+    def encode(self) -> bytes:
+        text = "".join(self.strings)
+        offsets = np.zeros(len(self.strings) + 1, dtype=np.uint64)
+        np.cumsum([len(value) for value in self.strings], out=offsets[1:])
+        return _pack_arrays({
+            "offsets": offsets,
+            "text": np.frombuffer(text.encode("utf-8"), dtype=np.uint8),
+        })
+
+
+class _StringTable:
+    """جدول النصوص بعد القراءة (الإزاحات بوحدة الحرف)."""
+
+    def __init__(self, raw: bytes):
+        arrays = _unpack_arrays(raw)
+        self.offsets = arrays["offsets"].tolist()
+        self.text = arrays["text"].tobytes().decode("utf-8")
+
+    def __getitem__(self, position: int) -> str:
+        return self.text[self.offsets[position]:self.offsets[position + 1]]
+
+    def lookup(self, positions: np.ndarray) -> List[str]:
+        text, offsets = self.text, self.offsets
+        return [text[offsets[p]:offsets[p + 1]] for p in positions.tolist()]
+
+
+# أعلام وجود حقول المكوّن (المفقود يُستعاد مفقوداً لا فارغاً)
+_HAS_TYPE, _HAS_PARAMS, _HAS_VARIABLE = 1, 2, 4
+
+# نوع قيمة المعامل: عدد Python حقيقي، عدد Python صحيح، أو قيمة numpy بنوعها
+_PARAM_FLOAT, _PARAM_INT, _PARAM_NUMPY = 0, 1, 2
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _is_regular_param(value: Any) -> bool:
+    """قيمة رقمية تُخزن بدقة في عمودي float64/int64."""
+    if isinstance(value, bool) or isinstance(value, np.bool_):
+        return False
+    if isinstance(value, (int, np.integer)):
+        return _INT64_MIN <= int(value) <= _INT64_MAX
+    return isinstance(value, (float, np.floating)) and np.dtype(type(value)).itemsize <= 8
+
+
+def _is_regular_component(component: Dict[str, Any]) -> bool:
+    if set(component) - {"type", "params", "variable"}:
+        return False
+    if not isinstance(component.get("type", ""), str) or not isinstance(component.get("variable", ""), str):
+        return False
+    params = component.get("params", {})
+    return isinstance(params, dict) and all(
+        isinstance(key, str) and _is_regular_param(value) for key, value in params.items()
+    )
+
+
+def _encode_equations(equations: List[BaserahEquation], strings: _StringTableBuilder) -> bytes:
+    """ترميز كتلة معادلات: أعمدة رقمية + مكونات بصيغة CSR + JSON للحقول غير المنتظمة."""
+    component_offsets = [0]
+    component_types, component_variables, component_flags = [], [], []
+    param_offsets = [0]
+    param_keys, param_values, param_ints, param_kinds, param_dtypes = [], [], [], [], []
+    variable_offsets = [0]
+    variable_ids = []
+    metadata, irregular = [], {}
+    no_dtype = strings.intern("")
+
+    for position, equation in enumerate(equations):
+        if all(_is_regular_component(component) for component in equation.components):
+            for component in equation.components:
+                flags = ((_HAS_TYPE if "type" in component else 0)
+                         | (_HAS_PARAMS if "params" in component else 0)
+                         | (_HAS_VARIABLE if "variable" in component else 0))
+                component_flags.append(flags)
+                component_types.append(strings.intern(component.get("type", "")))
+                component_variables.append(strings.intern(component.get("variable", "")))
+                for key, value in component.get("params", {}).items():
+                    param_keys.append(strings.intern(key))
+                    if isinstance(value, (np.integer, np.floating)):
+                        param_kinds.append(_PARAM_NUMPY)
+                        param_dtypes.append(strings.intern(value.dtype.str))
+                    else:
+                        param_kinds.append(_PARAM_INT if isinstance(value, int) else _PARAM_FLOAT)
+                        param_dtypes.append(no_dtype)
+                    if isinstance(value, (int, np.integer)):
+                        param_ints.append(int(value))
+                        param_values.append(0.0)
+                    else:
+                        param_ints.append(0)
+                        param_values.append(float(value))
+                param_offsets.append(len(param_keys))
+        else:
+            irregular[position] = equation.components
+        component_offsets.append(len(component_types))
+
+        for variable in sorted(equation.variables):
+            variable_ids.append(strings.intern(variable))
+        variable_offsets.append(len(variable_ids))
+        metadata.append(equation.metadata)
+
+    arrays = {
+        "ids": strings.intern_many(eq.id for eq in equations),
+        "types": strings.intern_many(eq.equation_type for eq in equations),
+        "dates": strings.intern_many(eq.creation_date for eq in equations),
+        "complexity": np.array([eq.complexity for eq in equations], dtype=np.float64),
+        "fitness": np.array([eq.fitness for eq in equations], dtype=np.float64),
+        "variable_offsets": np.array(variable_offsets, dtype=np.uint32),
+        "variable_ids": np.array(variable_ids, dtype=np.uint32),
+        "component_offsets": np.array(component_offsets, dtype=np.uint32),
+        "component_types": np.array(component_types, dtype=np.uint32),
+        "component_variables": np.array(component_variables, dtype=np.uint32),
+        "component_flags": np.array(component_flags, dtype=np.uint8),
+        "param_offsets": np.array(param_offsets, dtype=np.uint32),
+        "param_keys": np.array(param_keys, dtype=np.uint32),
+        "param_values": np.array(param_values, dtype=np.float64),
+        "param_ints": np.array(param_ints, dtype=np.int64),
+        "param_kinds": np.array(param_kinds, dtype=np.uint8),
+        "param_dtypes": np.array(param_dtypes, dtype=np.uint32),
+        "json": np.frombuffer(_json_bytes({"metadata": metadata, "irregular": irregular}), dtype=np.uint8),
+    }
+    return _pack_arrays(arrays)
+
+
+def _decode_params(arrays: Dict[str, np.ndarray], strings: _StringTable) -> List[Any]:
+    """استعادة قيم المعاملات بأنواعها الأصلية."""
+    values = arrays["param_values"].tolist()
+    ints = arrays["param_ints"].tolist()
+    dtypes = strings.lookup(arrays["param_dtypes"])
+    decoded = []
+    for kind, value, int_value, dtype in zip(arrays["param_kinds"].tolist(), values, ints, dtypes):
+        if kind == _PARAM_INT:
+            decoded.append(int_value)
+        elif kind == _PARAM_NUMPY:
+            numpy_type = np.dtype(dtype).type
+            decoded.append(numpy_type(int_value if issubclass(numpy_type, np.integer) else value))
+        else:
+            decoded.append(value)
+    return decoded
+
+
+def _decode_equations(raw: bytes, strings: _StringTable) -> List[BaserahEquation]:
+    arrays = _unpack_arrays(raw)
+    extra = json.loads(arrays["json"].tobytes().decode("utf-8"))
+    metadata = extra["metadata"]
+    irregular = {int(position): components for position, components in extra["irregular"].items()}
+
+    ids = strings.lookup(arrays["ids"])
+    types = strings.lookup(arrays["types"])
+    dates = strings.lookup(arrays["dates"])
+    complexity = arrays["complexity"].tolist()
+    fitness = arrays["fitness"].tolist()
+    variable_offsets = arrays["variable_offsets"].tolist()
+    variable_names = strings.lookup(arrays["variable_ids"])
+    component_offsets = arrays["component_offsets"].tolist()
+    component_types = strings.lookup(arrays["component_types"])
+    component_variables = strings.lookup(arrays["component_variables"])
+    all_present = _HAS_TYPE | _HAS_PARAMS | _HAS_VARIABLE
+    component_flags = (arrays["component_flags"].tolist() if "component_flags" in arrays
+                       else [all_present] * len(component_types))
+    param_offsets = arrays["param_offsets"].tolist()
+    param_keys = strings.lookup(arrays["param_keys"])
+    param_values = _decode_params(arrays, strings)
+
+    equations = []
+    for position in range(len(ids)):
+        components = irregular.get(position) if irregular else None
+        if components is None:
+            components = []
+            for c in range(component_offsets[position], component_offsets[position + 1]):
+                flags = component_flags[c]
+                component = {}
+                if flags & _HAS_TYPE:
+                    component["type"] = component_types[c]
+                if flags & _HAS_PARAMS:
+                    component["params"] = {
+                        param_keys[p]: param_values[p] for p in range(param_offsets[c], param_offsets[c + 1])
+                    }
+                if flags & _HAS_VARIABLE:
+                    component["variable"] = component_variables[c]
+                components.append(component)
+        equations.append(BaserahEquation(
+            id=ids[position],
+            equation_type=types[position],
+            components=components,
+            complexity=complexity[position],
+            fitness=fitness[position],
+            variables=set(variable_names[variable_offsets[position]:variable_offsets[position + 1]]),
+            metadata=metadata[position],
+            creation_date=dates[position],
+        ))
+    return equations
+
+
+def _encode_knowledge_items(items: List[BaserahKnowledgeItem], strings: _StringTableBuilder) -> bytes:
+    return _pack_arrays({
+        "ids": strings.intern_many(item.id for item in items),
+        "types": strings.intern_many(item.type.value for item in items),
+        "dates": strings.intern_many(item.creation_date for item in items),
+        "activation_level": np.array([item.activation_level for item in items], dtype=np.float64),
+        "relevance_score": np.array([item.relevance_score for item in items], dtype=np.float64),
+        "baserah_weight": np.array([item.baserah_weight for item in items], dtype=np.float64),
+        "json": np.frombuffer(_json_bytes([[item.content, item.metadata] for item in items]), dtype=np.uint8),
+    })
+
+
+def _decode_knowledge_items(raw: bytes, strings: _StringTable) -> List[BaserahKnowledgeItem]:
+    arrays = _unpack_arrays(raw)
+    payload = json.loads(arrays["json"].tobytes().decode("utf-8"))
+    ids = strings.lookup(arrays["ids"])
+    types = strings.lookup(arrays["types"])
+    dates = strings.lookup(arrays["dates"])
+    activation = arrays["activation_level"].tolist()
+    relevance = arrays["relevance_score"].tolist()
+    weight = arrays["baserah_weight"].tolist()
+    return [
+        BaserahKnowledgeItem(
+            id=ids[i], type=KnowledgeType(types[i]), content=payload[i][0],
+            activation_level=activation[i], relevance_score=relevance[i], baserah_weight=weight[i],
+            metadata=payload[i][1], creation_date=dates[i],
+        )
+        for i in range(len(ids))
+    ]
+
+
+def _encode_relationships(relationships: List[Any], strings: _StringTableBuilder) -> bytes:
+    return _pack_arrays({
+        "ids": strings.intern_many(rel.id for rel in relationships),
+        "sources": strings.intern_many(rel.source_id for rel in relationships),
+        "targets": strings.intern_many(rel.target_id for rel in relationships),
+        "types": strings.intern_many(rel.relationship_type for rel in relationships),
+        "dates": strings.intern_many(rel.creation_date for rel in relationships),
+        "strength": np.array([rel.strength for rel in relationships], dtype=np.float64),
+        "confidence": np.array([rel.confidence for rel in relationships], dtype=np.float64),
+        "json": np.frombuffer(_json_bytes([rel.metadata for rel in relationships]), dtype=np.uint8),
+    })
+
+
+def _decode_relationships(raw: bytes, strings: _StringTable) -> List[Any]:
+    from .knowledge_manager import KnowledgeRelationship
+
+    arrays = _unpack_arrays(raw)
+    metadata = json.loads(arrays["json"].tobytes().decode("utf-8"))
+    ids = strings.lookup(arrays["ids"])
+    sources = strings.lookup(arrays["sources"])
+    targets = strings.lookup(arrays["targets"])
+    types = strings.lookup(arrays["types"])
+    dates = strings.lookup(arrays["dates"])
+    strength = arrays["strength"].tolist()
+    confidence = arrays["confidence"].tolist()
+    return [
+        KnowledgeRelationship(
+            id=ids[i], source_id=sources[i], target_id=targets[i], relationship_type=types[i],
+            strength=strength[i], confidence=confidence[i], metadata=metadata[i], creation_date=dates[i],
+        )
+        for i in range(len(ids))
+    ]
+
+
+class BaserahSnapshotWriter:
+    """كاتب اللقطات الثنائية: تُجمع الأقسام ثم تُكتب دفعة واحدة (ذرياً)."""
+
+    def __init__(self, compression: SnapshotCompression = SnapshotCompression.LZMA,
+                 block_size: int = EQUATION_BLOCK_SIZE):
+        compression = SnapshotCompression(compression)
+        if compression == SnapshotCompression.ZSTD and not ZSTD_AVAILABLE:
+            raise RuntimeError("ضغط zstd يتطلب مكتبة zstandard")
+        self.compression = compression
+        self.block_size = block_size
+        self.strings = _StringTableBuilder()
+        self.sections: Dict[str, bytes] = {}
+        self.equation_sets: Dict[str, List[Tuple[str, int]]] = {}
+        self.state: Dict[str, Any] = {}
+
+    def add_knowledge_items(self, name: str, items: List[BaserahKnowledgeItem]):
+        self.sections[name] = _encode_knowledge_items(items, self.strings)
+
+    def add_relationships(self, name: str, relationships: List[Any]):
+        self.sections[name] = _encode_relationships(relationships, self.strings)
+
+    def add_json(self, name: str, value: Any):
+        self.sections[name] = _json_bytes(value)
+
+    def add_equations(self, name: str, equations: List[BaserahEquation]):
+        blocks = []
+        for start in range(0, len(equations), self.block_size):
+            block = equations[start:start + self.block_size]
+            block_name = f"{name}/{len(blocks)}"
+            self.sections[block_name] = _encode_equations(block, self.strings)
+            blocks.append((block_name, len(block)))
+        self.equation_sets[name] = blocks
+
+    def write(self, file_path: str):
+        sections = dict(self.sections)
+        sections["strings"] = self.strings.encode()
+
+        table, payloads, offset = {}, [], 0
+        for name, raw in sections.items():
+            compressed = _compress(raw, self.compression)
+            table[name] = [offset, len(compressed), len(raw)]
+            payloads.append(compressed)
+            offset += len(compressed)
+
+        toc = _json_bytes({
+            "sections": table,
+            "equation_sets": self.equation_sets,
+            "state": self.state,
+        })
+        # الكتابة إلى ملف مؤقت في نفس المجلد ثم استبداله ذرياً:
+        # انقطاع الكتابة لا يترك لقطة مبتورة مكان اللقطة السابقة
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                     _COMPRESSION_CODES[self.compression], 0, len(toc)))
+                f.write(toc)
+                for payload in payloads:
+                    f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class BaserahSnapshotReader:
+    """قارئ اللقطات الثنائية: يقرأ الفهرس فوراً والأقسام عند الطلب."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            magic, version, compression_code, _, toc_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"ليس ملف لقطة Baserah: {file_path}")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"إصدار لقطة غير مدعوم: {version}")
+            toc = json.loads(f.read(toc_length).decode("utf-8"))
+        self.version = version
+        self.compression = next(c for c, code in _COMPRESSION_CODES.items() if code == compression_code)
+        self.data_offset = _HEADER.size + toc_length
+        self.sections: Dict[str, List[int]] = toc["sections"]
+        self.equation_sets: Dict[str, List[List[Any]]] = toc["equation_sets"]
+        self.state: Dict[str, Any] = toc["state"]
+        self._strings: Optional[_StringTable] = None
+
+    def read_section(self, name: str) -> bytes:
+        offset, length, _ = self.sections[name]
+        with open(self.file_path, "rb") as f:
+            f.seek(self.data_offset + offset)
+            return _decompress(f.read(length), self.compression)
+
+    @property
+    def strings(self) -> _StringTable:
+        if self._strings is None:
+            self._strings = _StringTable(self.read_section("strings"))
+        return self._strings
+
+    def knowledge_items(self, name: str) -> List[BaserahKnowledgeItem]:
+        return _decode_knowledge_items(self.read_section(name), self.strings)
+
+    def relationships(self, name: str) -> List[Any]:
+        return _decode_relationships(self.read_section(name), self.strings)
+
+    def json_section(self, name: str) -> Any:
+        return json.loads(self.read_section(name).decode("utf-8"))
+
+    def equation_block(self, block_name: str) -> List[BaserahEquation]:
+        # إيقاف جامع المهملات أثناء إنشاء عشرات الآلاف من الكائنات دفعة واحدة
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return _decode_equations(self.read_section(block_name), self.strings)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def equations(self, name: str) -> "LazyEquationArchive":
+        return LazyEquationArchive(self, self.equation_sets.get(name, []))
+
+
+class LazyEquationArchive(MutableSequence):
+    """
+    أرشيف معادلات يفك كتل اللقطة عند أول وصول إليها.
+    الإلحاق لا يحمّل شيئاً؛ أي تعديل آخر في الوسط يحمّل الأرشيف كاملاً.
+    """
+
+    def __init__(self, reader: BaserahSnapshotReader, blocks: List[List[Any]]):
+        self._reader = reader
+        self._block_names = [name for name, _ in blocks]
+        self._blocks: List[Optional[List[BaserahEquation]]] = [None] * len(blocks)
+        self._block_starts: List[int] = []
+        total = 0
+        for _, size in blocks:
+            self._block_starts.append(total)
+            total += size
+        self._archived = total
+        self._tail: List[BaserahEquation] = []
+
+    @property
+    def loaded_blocks(self) -> int:
+        return sum(block is not None for block in self._blocks)
+
+    def _block(self, index: int) -> List[BaserahEquation]:
+        block = self._blocks[index]
+        if block is None:
+            block = self._reader.equation_block(self._block_names[index])
+            self._blocks[index] = block
+        return block
+
+    def _materialize(self):
+        if self._blocks:
+            equations = []
+            for index in range(len(self._blocks)):
+                equations.extend(self._block(index))
+            self._tail = equations + self._tail
+            self._blocks, self._block_names, self._block_starts = [], [], []
+            self._archived = 0
+
+    def __len__(self) -> int:
+        return self._archived + len(self._tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("فهرس المعادلة خارج النطاق")
+        if index >= self._archived:
+            return self._tail[index - self._archived]
+        block_index = bisect_right(self._block_starts, index) - 1
+        return self._block(block_index)[index - self._block_starts[block_index]]
+
+    def __iter__(self):
+        for index in range(len(self._blocks)):
+            yield from self._block(index)
+        yield from self._tail
+
+    def __setitem__(self, index, value):
+        self._materialize()
+        self._tail[index] = value
+
+    def __delitem__(self, index):
+        self._materialize()
+        del self._tail[index]
+
+    def insert(self, index: int, value: BaserahEquation):
+        if index >= len(self):
+            self._tail.append(value)
+            return
+        self._materialize()
+        self._tail.insert(index, value)
+
+    def append(self, value: BaserahEquation):
+        self._tail.append(value)
+
+    def extend(self, values: Iterable[BaserahEquation]):
+        self._tail.extend(values)
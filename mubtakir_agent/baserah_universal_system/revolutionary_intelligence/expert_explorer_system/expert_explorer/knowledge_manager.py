@@ -3,6 +3,7 @@
 
 import json
 import uuid
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from typing import Dict, List, Tuple, Union, Optional, Any, Set
 from dataclasses import dataclass, field
@@ -50,7 +51,12 @@ class BaserahKnowledgeManager:
         # فهارس للبحث السريع
         self.type_index: Dict[KnowledgeType, Set[str]] = {}
         self.variable_index: Dict[str, Set[str]] = {}  # فهرس المتغيرات للمعادلات
-        self.complexity_index: Dict[int, Set[str]] = {}  # فهرس التعقيد
+        # فهرس التعقيد: مصفوفتان متوازيتان مرتبتان حسب التعقيد لاستعلامات النطاق عبر bisect
+        self.complexity_keys: List[float] = []
+        self.complexity_ids: List[str] = []
+        self.indexed_complexity: Dict[str, float] = {}  # التعقيد المفهرس لكل معادلة
+        # خريطة التجاور: معرف العنصر → معرفات العلاقات المتصلة به
+        self.relationship_adjacency: Dict[str, Set[str]] = {}
         
         # إحصائيات
         self.total_knowledge_items = 0
@@ -64,8 +70,12 @@ class BaserahKnowledgeManager:
         if not isinstance(item, BaserahKnowledgeItem):
             raise TypeError("يجب أن يكون العنصر من نوع BaserahKnowledgeItem")
         
+        if item.id in self.knowledge_items:
+            self._unindex_knowledge_item(self.knowledge_items[item.id])
+        else:
+            self.total_knowledge_items += 1
+        
         self.knowledge_items[item.id] = item
-        self.total_knowledge_items += 1
         
         # تحديث فهرس النوع
         if item.type not in self.type_index:
@@ -75,12 +85,16 @@ class BaserahKnowledgeManager:
         print(f"✅ تمت إضافة معرفة ({item.type}): {item.id}")
     
     def add_equation(self, equation: BaserahEquation):
-        """إضافة معادلة."""
+        """إضافة معادلة (إعادة الإضافة تعيد فهرسة المعادلة)."""
         if not isinstance(equation, BaserahEquation):
             raise TypeError("يجب أن يكون العنصر من نوع BaserahEquation")
         
+        if equation.id in self.equations:
+            self._unindex_equation(equation.id)
+        else:
+            self.total_equations += 1
+        
         self.equations[equation.id] = equation
-        self.total_equations += 1
         
         # تحديث فهرس المتغيرات
         for variable in equation.variables:
@@ -88,11 +102,12 @@ class BaserahKnowledgeManager:
                 self.variable_index[variable] = set()
             self.variable_index[variable].add(equation.id)
         
-        # تحديث فهرس التعقيد
-        complexity_level = int(equation.complexity)
-        if complexity_level not in self.complexity_index:
-            self.complexity_index[complexity_level] = set()
-        self.complexity_index[complexity_level].add(equation.id)
+        # تحديث فهرس التعقيد المرتب
+        complexity = float(equation.complexity)
+        position = bisect_right(self.complexity_keys, complexity)
+        self.complexity_keys.insert(position, complexity)
+        self.complexity_ids.insert(position, equation.id)
+        self.indexed_complexity[equation.id] = complexity
         
         print(f"✅ تمت إضافة معادلة ({equation.equation_type}): {equation.id}")
     
@@ -101,11 +116,143 @@ class BaserahKnowledgeManager:
         if not isinstance(relationship, KnowledgeRelationship):
             raise TypeError("يجب أن يكون العنصر من نوع KnowledgeRelationship")
         
+        if relationship.id in self.relationships:
+            self._unindex_relationship(self.relationships[relationship.id])
+        else:
+            self.total_relationships += 1
+        
         self.relationships[relationship.id] = relationship
-        self.total_relationships += 1
+        
+        # تحديث خريطة التجاور لطرفي العلاقة
+        for endpoint in (relationship.source_id, relationship.target_id):
+            if endpoint not in self.relationship_adjacency:
+                self.relationship_adjacency[endpoint] = set()
+            self.relationship_adjacency[endpoint].add(relationship.id)
         
         print(f"🔗 تمت إضافة علاقة ({relationship.relationship_type}): {relationship.source_id} → {relationship.target_id}")
     
+    def restore_state(self, knowledge_items: List[BaserahKnowledgeItem],
+                      equations: List[BaserahEquation],
+                      relationships: List[KnowledgeRelationship],
+                      clusters: List[KnowledgeCluster]):
+        """استبدال محتوى المدير دفعة واحدة وبناء الفهارس مرة واحدة (لاستعادة اللقطات)."""
+        self.knowledge_items = {item.id: item for item in knowledge_items}
+        self.equations = {equation.id: equation for equation in equations}
+        self.relationships = {relationship.id: relationship for relationship in relationships}
+        self.clusters = {cluster.id: cluster for cluster in clusters}
+        
+        self.type_index = {}
+        for item in self.knowledge_items.values():
+            self.type_index.setdefault(item.type, set()).add(item.id)
+        
+        self.variable_index = {}
+        self.indexed_complexity = {}
+        for equation in self.equations.values():
+            for variable in equation.variables:
+                self.variable_index.setdefault(variable, set()).add(equation.id)
+            self.indexed_complexity[equation.id] = float(equation.complexity)
+        ordered = sorted(self.indexed_complexity.items(), key=lambda entry: entry[1])
+        self.complexity_ids = [eq_id for eq_id, _ in ordered]
+        self.complexity_keys = [complexity for _, complexity in ordered]
+        
+        self.relationship_adjacency = {}
+        for relationship in self.relationships.values():
+            self.relationship_adjacency.setdefault(relationship.source_id, set()).add(relationship.id)
+            self.relationship_adjacency.setdefault(relationship.target_id, set()).add(relationship.id)
+        
+        self.total_knowledge_items = len(self.knowledge_items)
+        self.total_equations = len(self.equations)
+        self.total_relationships = len(self.relationships)
+        
+        print(f"📂 تمت استعادة مدير المعرفة: {self.total_knowledge_items} معرفة، "
+              f"{self.total_equations} معادلة، {self.total_relationships} علاقة")
+    
+    def remove_knowledge_item(self, item_id: str) -> bool:
+        """حذف عنصر معرفة مع علاقاته وعضويته في المجموعات."""
+        item = self.knowledge_items.pop(item_id, None)
+        if item is None:
+            return False
+        
+        self._unindex_knowledge_item(item)
+        self.total_knowledge_items -= 1
+        self._remove_item_links(item_id)
+        for cluster in self.clusters.values():
+            if item_id in cluster.knowledge_items:
+                cluster.knowledge_items = [i for i in cluster.knowledge_items if i != item_id]
+        
+        print(f"🗑️ تم حذف معرفة: {item_id}")
+        return True
+    
+    def remove_equation(self, equation_id: str) -> bool:
+        """حذف معادلة مع علاقاتها وعضويتها في المجموعات."""
+        if equation_id not in self.equations:
+            return False
+        
+        self._unindex_equation(equation_id)
+        del self.equations[equation_id]
+        self.total_equations -= 1
+        self._remove_item_links(equation_id)
+        for cluster in self.clusters.values():
+            if equation_id in cluster.equations:
+                cluster.equations = [e for e in cluster.equations if e != equation_id]
+        
+        print(f"🗑️ تم حذف معادلة: {equation_id}")
+        return True
+    
+    def remove_relationship(self, relationship_id: str) -> bool:
+        """حذف علاقة."""
+        relationship = self.relationships.pop(relationship_id, None)
+        if relationship is None:
+            return False
+        
+        self._unindex_relationship(relationship)
+        self.total_relationships -= 1
+        return True
+    
+    def _remove_item_links(self, item_id: str):
+        """حذف جميع العلاقات المتصلة بعنصر."""
+        for rel_id in list(self.relationship_adjacency.get(item_id, ())):
+            self.remove_relationship(rel_id)
+    
+    def _unindex_knowledge_item(self, item: BaserahKnowledgeItem):
+        """إزالة عنصر معرفة من فهرس النوع."""
+        ids = self.type_index.get(item.type)
+        if ids is not None:
+            ids.discard(item.id)
+            if not ids:
+                del self.type_index[item.type]
+    
+    def _unindex_equation(self, equation_id: str):
+        """إزالة معادلة من فهارس المتغيرات والتعقيد."""
+        equation = self.equations[equation_id]
+        for variable in equation.variables:
+            ids = self.variable_index.get(variable)
+            if ids is not None:
+                ids.discard(equation_id)
+                if not ids:
+                    del self.variable_index[variable]
+        
+        # تُحذف القيمة المفهرسة لا الحالية، فقد تتغير المعادلة بعد إضافتها
+        complexity = self.indexed_complexity.pop(equation_id, None)
+        if complexity is None:
+            return
+        start = bisect_left(self.complexity_keys, complexity)
+        end = bisect_right(self.complexity_keys, complexity)
+        for position in range(start, end):
+            if self.complexity_ids[position] == equation_id:
+                del self.complexity_keys[position]
+                del self.complexity_ids[position]
+                break
+    
+    def _unindex_relationship(self, relationship: KnowledgeRelationship):
+        """إزالة علاقة من خريطة التجاور."""
+        for endpoint in (relationship.source_id, relationship.target_id):
+            rel_ids = self.relationship_adjacency.get(endpoint)
+            if rel_ids is not None:
+                rel_ids.discard(relationship.id)
+                if not rel_ids:
+                    del self.relationship_adjacency[endpoint]
+    
     def create_cluster(self, name: str, cluster_type: str = "general") -> KnowledgeCluster:
         """إنشاء مجموعة معرفة جديدة."""
         cluster = KnowledgeCluster(
@@ -141,50 +288,27 @@ class BaserahKnowledgeManager:
     
     def search_knowledge_by_type(self, knowledge_type: KnowledgeType) -> List[BaserahKnowledgeItem]:
         """البحث عن المعرفة حسب النوع."""
-        if knowledge_type not in self.type_index:
-            return []
-        
-        items = []
-        for item_id in self.type_index[knowledge_type]:
-            if item_id in self.knowledge_items:
-                items.append(self.knowledge_items[item_id])
-        
-        return items
+        return [self.knowledge_items[item_id] for item_id in self.type_index.get(knowledge_type, ())]
     
     def search_equations_by_variable(self, variable: str) -> List[BaserahEquation]:
         """البحث عن المعادلات حسب المتغير."""
-        if variable not in self.variable_index:
-            return []
-        
-        equations = []
-        for eq_id in self.variable_index[variable]:
-            if eq_id in self.equations:
-                equations.append(self.equations[eq_id])
-        
-        return equations
+        return [self.equations[eq_id] for eq_id in self.variable_index.get(variable, ())]
     
     def search_equations_by_complexity(self, min_complexity: float, max_complexity: float) -> List[BaserahEquation]:
-        """البحث عن المعادلات حسب التعقيد."""
-        equations = []
-        
-        for complexity_level in range(int(min_complexity), int(max_complexity) + 1):
-            if complexity_level in self.complexity_index:
-                for eq_id in self.complexity_index[complexity_level]:
-                    if eq_id in self.equations:
-                        eq = self.equations[eq_id]
-                        if min_complexity <= eq.complexity <= max_complexity:
-                            equations.append(eq)
-        
-        return equations
+        """البحث عن المعادلات حسب التعقيد (استعلام نطاق على الفهرس المرتب)."""
+        start = bisect_left(self.complexity_keys, min_complexity)
+        end = bisect_right(self.complexity_keys, max_complexity)
+        return [self.equations[eq_id] for eq_id in self.complexity_ids[start:end]]
     
     def find_related_items(self, item_id: str) -> List[Tuple[str, KnowledgeRelationship]]:
         """العثور على العناصر المرتبطة بعنصر معين."""
         related_items = []
         
-        for rel_id, relationship in self.relationships.items():
+        for rel_id in self.relationship_adjacency.get(item_id, ()):
+            relationship = self.relationships[rel_id]
             if relationship.source_id == item_id:
                 related_items.append((relationship.target_id, relationship))
-            elif relationship.target_id == item_id:
+            else:
                 related_items.append((relationship.source_id, relationship))
         
         return related_items
@@ -297,7 +421,8 @@ class BaserahKnowledgeManager:
             'index_sizes': {
                 'type_index': len(self.type_index),
                 'variable_index': len(self.variable_index),
-                'complexity_index': len(self.complexity_index)
+                'complexity_index': len(self.complexity_keys),
+                'relationship_adjacency': len(self.relationship_adjacency)
             }
         }
     
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# test_baserah_snapshot.py - اختبار اللقطات الثنائية Baserah
+
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from .baserah_expert_core import BaserahKnowledgeItem, KnowledgeType, BaserahInferenceContext, InferenceMethod
+from .baserah_explorer_core import BaserahEquation, ExplorationConfig, ExplorationMode
+from .baserah_snapshot import BaserahSnapshotReader, BaserahSnapshotWriter
+from .integrated_expert_explorer import BaserahIntegratedExpertExplorer
+
+
+def test_component_round_trip():
+    """الحقول المفقودة تبقى مفقودة وأنواع المعاملات تُستعاد كما حُفظت."""
+
+    print("🧪 اختبار استعادة المكونات بأنواعها")
+    print("=" * 50)
+
+    try:
+        equation = BaserahEquation(
+            id="eq_types",
+            components=[
+                {"type": "sigmoid", "params": {"n": 2, "k": 1.5, "big": 2 ** 60}, "variable": "x"},
+                {"type": "linear", "params": {}},
+                {"type": "constant"},
+                {"params": {"w": np.int32(7), "h": np.float32(0.25), "d": np.float64(1e-3)}, "variable": ""},
+            ],
+            variables={"x"},
+        )
+        irregular = BaserahEquation(id="eq_irregular", components=[{"type": "sigmoid", "params": {"flag": True}}])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "types.bsnp")
+            writer = BaserahSnapshotWriter(compression="none")
+            writer.add_equations("equations", [equation, irregular])
+            writer.write(path)
+            restored, restored_irregular = list(BaserahSnapshotReader(path).equations("equations"))
+
+        assert restored == equation and restored_irregular == irregular
+        assert "variable" not in restored.components[1] and "params" not in restored.components[2]
+        assert "type" not in restored.components[3]
+        params = restored.components[0]["params"]
+        assert type(params["n"]) is int and type(params["k"]) is float and params["big"] == 2 ** 60
+        numpy_params = restored.components[3]["params"]
+        assert numpy_params["w"].dtype == np.int32 and numpy_params["h"].dtype == np.float32
+        assert numpy_params["d"].dtype == np.float64
+
+        print("✅ المكونات تُستعاد بأنواعها بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار استعادة المكونات: {e}")
+        return False
+
+
+def test_atomic_write():
+    """الكتابة الفاشلة لا تمس اللقطة السابقة ولا تترك ملفات مؤقتة."""
+
+    print("🧪 اختبار الكتابة الذرية")
+    print("=" * 50)
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "atomic.bsnp")
+            writer = BaserahSnapshotWriter(compression="none")
+            writer.add_json("value", {"version": 1})
+            writer.write(path)
+
+            failing = BaserahSnapshotWriter(compression="none")
+            failing.add_json("value", {"version": 2})
+            failing.sections["broken"] = "ليست بايتات"  # تفشل الكتابة بعد فتح الملف المؤقت
+            try:
+                failing.write(path)
+                raise AssertionError("كتابة لقطة معطوبة لم ترفع خطأ")
+            except TypeError:
+                pass
+
+            assert BaserahSnapshotReader(path).json_section("value") == {"version": 1}
+            assert os.listdir(directory) == ["atomic.bsnp"]
+
+        print("✅ الكتابة الذرية تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الكتابة الذرية: {e}")
+        return False
+
+
+def test_integrated_snapshot():
+    """حفظ وتحميل النظام المتكامل مع الإحصائيات والتواريخ."""
+
+    print("🧪 اختبار لقطة النظام المتكامل")
+    print("=" * 50)
+
+    try:
+        system = BaserahIntegratedExpertExplorer()
+        system.expert_core.add_knowledge(BaserahKnowledgeItem(
+            id="fact_snapshot", type=KnowledgeType.FACT, content={"قيمة": [1, 2, 3]}
+        ))
+        system.expert_core.infer(BaserahInferenceContext(
+            method=InferenceMethod.FORWARD_CHAINING, current_facts={"fact_snapshot"}
+        ))
+        exploration = system.explorer_core.explore(ExplorationConfig(
+            mode=ExplorationMode.RANDOM, budget=20, fitness_threshold=0.0
+        ))
+        for equation in exploration.discovered_equations:
+            system.knowledge_manager.add_equation(equation)
+        system.knowledge_manager.auto_cluster_by_similarity()
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "system.bsnp")
+            system.save_integrated_snapshot(snapshot_path, compression="lzma")
+
+            restored = BaserahIntegratedExpertExplorer()
+            restored.load_integrated_snapshot(snapshot_path)
+
+            assert restored.expert_core.knowledge_base == system.expert_core.knowledge_base
+            assert restored.knowledge_manager.equations == system.knowledge_manager.equations
+            assert restored.knowledge_manager.clusters == system.knowledge_manager.clusters
+            assert list(restored.explorer_core.discovered_equations) == list(system.explorer_core.discovered_equations)
+            assert restored.explorer_core.get_statistics() == system.explorer_core.get_statistics()
+            assert restored.expert_core.get_statistics() == system.expert_core.get_statistics()
+            assert restored.explorer_core.exploration_history == system.explorer_core.exploration_history
+
+            # التحميل الكسول: لا تُفك أي كتلة قبل أول وصول
+            writer = BaserahSnapshotWriter(compression="none", block_size=4)
+            writer.add_equations("archive", exploration.discovered_equations)
+            writer.write(snapshot_path)
+            archive = BaserahSnapshotReader(snapshot_path).equations("archive")
+            assert archive.loaded_blocks == 0
+            assert archive[5] == exploration.discovered_equations[5]
+            assert archive.loaded_blocks == 1
+
+        print("✅ لقطة النظام المتكامل تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار لقطة النظام المتكامل: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات اللقطات الثنائية Baserah")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("استعادة المكونات بأنواعها", test_component_round_trip()),
+        ("الكتابة الذرية", test_atomic_write()),
+        ("لقطة النظام المتكامل", test_integrated_snapshot())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
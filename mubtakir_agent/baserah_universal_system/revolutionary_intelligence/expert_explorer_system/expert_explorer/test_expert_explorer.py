@@ -233,6 +233,53 @@ def test_knowledge_manager():
     
     print("\n✅ اختبار مدير المعرفة مكتمل!")
 
+def test_knowledge_manager_indexes():
+    """اختبار الفهارس الثانوية لمدير المعرفة بعد الحذف والتجميع."""
+    
+    print("\n🗂️ اختبار فهارس مدير المعرفة Baserah...")
+    print("=" * 50)
+    
+    from baserah_explorer_core import BaserahEquation
+    km = BaserahKnowledgeManager()
+    
+    equations = [
+        BaserahEquation(id=f"eq_{i}", complexity=float(i), variables={'x'} if i % 2 else {'y'})
+        for i in range(1, 7)
+    ]
+    for equation in equations:
+        km.add_equation(equation)
+    
+    concept = BaserahKnowledgeItem(id="concept_1", type=KnowledgeType.CONCEPT, content="مفهوم")
+    km.add_knowledge_item(concept)
+    km.add_relationship(KnowledgeRelationship(id="rel_1", source_id="concept_1", target_id="eq_1"))
+    km.add_relationship(KnowledgeRelationship(id="rel_2", source_id="eq_3", target_id="concept_1"))
+    km.auto_cluster_by_similarity()
+    
+    in_range = km.search_equations_by_complexity(2.0, 4.5)
+    assert [eq.id for eq in in_range] == ["eq_2", "eq_3", "eq_4"]
+    assert {eq.id for eq in km.search_equations_by_variable('x')} == {"eq_1", "eq_3", "eq_5"}
+    assert {other for other, _ in km.find_related_items("concept_1")} == {"eq_1", "eq_3"}
+    
+    # الحذف يجب أن يُحدّث جميع الفهارس والمجموعات
+    km.remove_equation("eq_3")
+    assert [eq.id for eq in km.search_equations_by_complexity(2.0, 4.5)] == ["eq_2", "eq_4"]
+    assert {eq.id for eq in km.search_equations_by_variable('x')} == {"eq_1", "eq_5"}
+    assert [other for other, _ in km.find_related_items("concept_1")] == ["eq_1"]
+    assert "rel_2" not in km.relationships
+    assert all("eq_3" not in cluster.equations for cluster in km.clusters.values())
+    
+    km.remove_knowledge_item("concept_1")
+    assert km.search_knowledge_by_type(KnowledgeType.CONCEPT) == []
+    assert km.find_related_items("eq_1") == []
+    
+    # إعادة إضافة معادلة بتعقيد جديد تعيد فهرستها
+    equations[0].complexity = 10.0
+    km.add_equation(equations[0])
+    assert [eq.id for eq in km.search_equations_by_complexity(9.0, 11.0)] == ["eq_1"]
+    assert km.get_statistics()['total_equations'] == 5
+    
+    print("\n✅ اختبار فهارس مدير المعرفة مكتمل!")
+
 def test_pattern_discoverer():
     """اختبار مكتشف الأنماط."""
     
@@ -365,6 +412,7 @@ def run_comprehensive_test():
         test_expert_core()
         test_explorer_core()
         test_knowledge_manager()
+        test_knowledge_manager_indexes()
         test_pattern_discoverer()
         
         # اختبار النظام المتكامل
@@ -13,6 +13,7 @@ import math
 from .revolutionary_mother_equation import ConcreteRevolutionaryMotherEquation
 from .ai_oop_foundation import BaserahAIOOPFoundation
 from .semantic_meaning_engine import SemanticMeaningEngine
+from .engine_metrics import ENGINE_METRICS, instrumented
 from artistic_intelligence.baserah_core import baserah_sigmoid, baserah_linear, baserah_quantum_sigmoid
 
 @dataclass
@@ -191,6 +192,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
         
         return shapes_db
     
+    @instrumented('visual_inference_seconds')
     def analyze_image_intelligently(self, image_data: Any, 
                                   analysis_depth: int = 3) -> ImageAnalysisResult:
         """
@@ -249,6 +251,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
             
             # تحديث الإحصائيات
             self._update_engine_statistics(result)
+            ENGINE_METRICS.count('visual_inference_analyses_total', outcome='success')
             
             print(f"   ✅ اكتمل التحليل - الثقة: {overall_confidence:.3f}")
             
@@ -256,6 +259,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
             
         except Exception as e:
             print(f"   ❌ خطأ في التحليل البصري: {e}")
+            ENGINE_METRICS.count('visual_inference_analyses_total', outcome='error')
             return ImageAnalysisResult(
                 detected_elements=[],
                 scene_description="فشل في تحليل الصورة",
@@ -264,6 +268,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
                 inference_details={'error': str(e)}
             )
     
+    @instrumented('visual_inference_stage_seconds', stage='feature_extraction')
     def _extract_visual_features(self, image_data: Any, depth: int) -> List[Dict[str, Any]]:
         """استخراج الميزات البصرية من الصورة."""
         
@@ -319,6 +324,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
         
         return features
     
+    @instrumented('visual_inference_stage_seconds', stage='pattern_recognition')
     def _recognize_patterns_with_euclidean_distance(self, features: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """التعرف على الأنماط باستخدام المسافة الإقليدية."""
         
@@ -505,6 +511,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
             }
         }
 
+    @instrumented('visual_inference_stage_seconds', stage='element_inference')
     def _infer_elements_intelligently(self, pattern_matches: List[Dict[str, Any]],
                                     features: List[Dict[str, Any]]) -> List[VisualElement]:
         """الاستنباط الذكي للعناصر البصرية."""
@@ -685,6 +692,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
 
         return default_size
 
+    @instrumented('visual_inference_stage_seconds', stage='scene_composition')
     def _compose_scene_description(self, detected_elements: List[VisualElement]) -> str:
         """تركيب وصف المشهد من العناصر المكتشفة."""
 
@@ -827,6 +835,7 @@ class IntelligentVisualInferenceEngine(BaserahAIOOPFoundation):
 
         return None
 
+    @instrumented('visual_inference_stage_seconds', stage='confidence')
     def _calculate_overall_confidence(self, detected_elements: List[VisualElement]) -> float:
         """حساب الثقة الإجمالية."""
 
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# lazy_component_registry.py - سجل المكونات الكسولة (إنشاء المحركات عند أول استخدام)
+
+import threading
+import time
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+
+class LazyComponent:
+    """
+    وكيل كسول لمكوّن ثقيل
+
+    لا يُنشأ المكوّن الحقيقي إلا عند أول وصول لإحدى خصائصه،
+    والإنشاء آمن عبر الخيوط (قفل مزدوج الفحص) فلا يُبنى المكوّن إلا مرة واحدة.
+    """
+
+    __slots__ = ('_component_name', '_factory', '_instance', '_lock', '_load_time', '_on_load')
+
+    def __init__(self, name: str, factory: Callable[[], Any],
+                 on_load: Optional[Callable[[str, float], None]] = None):
+        object.__setattr__(self, '_component_name', name)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+        object.__setattr__(self, '_load_time', None)
+        object.__setattr__(self, '_on_load', on_load)
+
+    def get_instance(self) -> Any:
+        """الحصول على المكوّن الحقيقي (إنشاؤه إن لم يُنشأ بعد)."""
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                start_time = time.perf_counter()
+                instance = self._factory()
+                load_time = time.perf_counter() - start_time
+                object.__setattr__(self, '_load_time', load_time)
+                object.__setattr__(self, '_instance', instance)
+                if self._on_load is not None:
+                    self._on_load(self._component_name, load_time)
+            return self._instance
+
+    @property
+    def is_loaded(self) -> bool:
+        """هل تم إنشاء المكوّن الحقيقي؟"""
+        return self._instance is not None
+
+    @property
+    def component_name(self) -> str:
+        return self._component_name
+
+    @property
+    def load_time(self) -> Optional[float]:
+        return self._load_time
+
+    def __getattr__(self, attribute: str) -> Any:
+        # يُستدعى فقط للخصائص غير الموجودة على الوكيل نفسه
+        return getattr(self.get_instance(), attribute)
+
+    def __setattr__(self, attribute: str, value: Any):
+        setattr(self.get_instance(), attribute, value)
+
+    def __call__(self, *args, **kwargs):
+        return self.get_instance()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "pending"
+        return f"<LazyComponent {self._component_name} ({state})>"
+
+
+class LazyComponentRegistry:
+    """
+    سجل المكونات الكسولة
+
+    - تسجيل مصانع المكونات بدلاً من إنشائها مباشرة
+    - إنشاء كل مكوّن عند أول استخدام فقط
+    - إحماء مسبق اختياري لمجموعة محددة (متزامن أو في الخلفية)
+    """
+
+    def __init__(self, registry_name: str = "LazyComponentRegistry"):
+        self.registry_name = registry_name
+        self.components: Dict[str, LazyComponent] = {}
+        self.load_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._warm_up_threads: List[threading.Thread] = []
+
+    def register(self, name: str, factory: Callable[[], Any]) -> LazyComponent:
+        """تسجيل مصنع مكوّن وإرجاع الوكيل الكسول الخاص به."""
+        with self._lock:
+            component = LazyComponent(name, factory, on_load=self._record_load)
+            self.components[name] = component
+            return component
+
+    def _record_load(self, name: str, load_time: float):
+        with self._lock:
+            self.load_times[name] = load_time
+
+    def get(self, name: str) -> Any:
+        """الحصول على المكوّن الحقيقي بالاسم (مع إنشائه إن لزم)."""
+        if name not in self.components:
+            raise KeyError(f"المكوّن غير مسجل: {name}")
+        return self.components[name].get_instance()
+
+    def is_loaded(self, name: str) -> bool:
+        component = self.components.get(name)
+        return component is not None and component.is_loaded
+
+    def loaded_components(self) -> List[str]:
+        """أسماء المكونات التي تم إنشاؤها فعلاً."""
+        return [name for name, component in self.components.items() if component.is_loaded]
+
+    def pending_components(self) -> List[str]:
+        """أسماء المكونات التي لم تُنشأ بعد."""
+        return [name for name, component in self.components.items() if not component.is_loaded]
+
+    def warm_up(self, names: Optional[Iterable[str]] = None,
+                background: bool = False) -> Optional[threading.Thread]:
+        """
+        إحماء مسبق لمجموعة من المكونات
+
+        Args:
+            names: أسماء المكونات (None = جميع المكونات المسجلة)
+            background: الإحماء في خيط خلفي دون حجب المستدعي
+        """
+        target_names = list(self.components) if names is None else list(names)
+        unknown = [name for name in target_names if name not in self.components]
+        if unknown:
+            print(f"⚠️ مكونات غير مسجلة في الإحماء: {unknown}")
+        target_names = [name for name in target_names if name in self.components]
+
+        def _load_all():
+            for name in target_names:
+                try:
+                    self.components[name].get_instance()
+                except Exception as e:
+                    print(f"❌ خطأ في إحماء المكوّن {name}: {e}")
+
+        if not background:
+            _load_all()
+            return None
+
+        thread = threading.Thread(target=_load_all, name=f"{self.registry_name}-warmup", daemon=True)
+        thread.start()
+        self._warm_up_threads.append(thread)
+        return thread
+
+    def wait_for_warm_up(self, timeout: Optional[float] = None):
+        """انتظار انتهاء الإحماء في الخلفية."""
+        for thread in list(self._warm_up_threads):
+            thread.join(timeout)
+        self._warm_up_threads = [thread for thread in self._warm_up_threads if thread.is_alive()]
+
+    def get_registry_status(self) -> Dict[str, Any]:
+        """حالة السجل (مع مدخل لكل مكوّن مسجل سواء أُنشئ أم لا)."""
+        return {
+            'registry_name': self.registry_name,
+            'registered_components': len(self.components),
+            'components': {
+                name: {'loaded': True, 'load_time': component.load_time} if component.is_loaded
+                else {'loaded': False}
+                for name, component in self.components.items()
+            },
+            'loaded_components': self.loaded_components(),
+            'pending_components': self.pending_components(),
+            'load_times': dict(self.load_times),
+            'total_load_time': sum(self.load_times.values())
+        }
+
+
+def resolve_component(component: Any) -> Any:
+    """إرجاع المكوّن الحقيقي سواء كان وكيلاً كسولاً أم كائناً عادياً."""
+    if isinstance(component, LazyComponent):
+        return component.get_instance()
+    return component
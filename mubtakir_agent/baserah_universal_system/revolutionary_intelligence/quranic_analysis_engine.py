@@ -19,6 +19,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import math
+from collections import Counter
 
 # إضافة المسار للوصول للنظام الثوري
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -31,7 +32,9 @@ from artistic_intelligence.baserah_core import (
 # استيراد النظام الأساسي
 from .ai_oop_foundation import BaserahExpertExplorerFoundation
 from .revolutionary_mother_equation import ConcreteRevolutionaryMotherEquation
-from .arabic_lexicon_engine import ArabicLexiconEngine
+from .arabic_lexicon_engine import ArabicLexiconEngine, create_lexicon_root_extractor
+from .quranic_search_index import QuranicSearchIndex, compute_text_fingerprint, strip_quranic_diacritics
+from .lazy_component_registry import LazyComponent
 
 
 class QuranicTextType(Enum):
@@ -124,9 +127,16 @@ class QuranicAnalysisEngine(BaserahExpertExplorerFoundation):
         # قاعدة بيانات القرآن
         self.quran_db_path = "data/quran_analysis.db"
         self.quran_text_path = "data/quran/quran_text.json"
+        self.quran_index_path = "data/quran/quran_search_index.json"
+        self.search_index: Optional[QuranicSearchIndex] = None
+
+        # مستخرج الجذور بإعدادات المعجم (لبناء فهرس الجذور دون إنشاء المعجم)
+        self.root_extractor = create_lexicon_root_extractor()
         
-        # محرك المعجم العربي المدمج
-        self.lexicon_engine = ArabicLexiconEngine("QuranicLexiconEngine")
+        # محرك المعجم العربي المدمج (يُنشأ عند أول تحليل للكلمات)
+        self.lexicon_engine = LazyComponent(
+            "QuranicLexiconEngine", lambda: ArabicLexiconEngine("QuranicLexiconEngine")
+        )
         
         # إحصائيات المحرك
         self.engine_stats = {
@@ -333,6 +343,25 @@ class QuranicAnalysisEngine(BaserahExpertExplorerFoundation):
         except Exception as e:
             print(f"⚠️ تحذير: لم يتم تحميل النص القرآني: {e}")
             self.quran_text_data = {}
+
+        # فهرس البحث (يُحمّل من القرص أو يُبنى مرة واحدة)
+        self._load_search_index()
+
+    def _load_search_index(self):
+        """تحميل فهرس البحث المحفوظ أو بناؤه وحفظه عند تغير النص."""
+
+        fingerprint = compute_text_fingerprint(self.quran_text_data)
+        self.search_index = QuranicSearchIndex.load(self.quran_index_path, fingerprint)
+        if self.search_index is not None:
+            print(f"✅ تم تحميل فهرس البحث القرآني من: {self.quran_index_path}")
+            return
+
+        self.search_index = QuranicSearchIndex.build(self.quran_text_data, self.root_extractor.extract_root)
+        try:
+            self.search_index.save(self.quran_index_path)
+            print(f"✅ تم بناء فهرس البحث القرآني: {len(self.search_index.verse_refs)} آية")
+        except Exception as e:
+            print(f"⚠️ تحذير: لم يتم حفظ فهرس البحث: {e}")
     
     def _create_sample_quran_data(self):
         """إنشاء بيانات قرآنية تجريبية."""
@@ -438,18 +467,18 @@ class QuranicAnalysisEngine(BaserahExpertExplorerFoundation):
         words = clean_text.split()
         word_analyses = []
         
-        for word in words:
+        # تحليل دفعي: الكلمات المكررة في الآية تُحلل مرة واحدة
+        for word_analysis in self._analyze_verse_words(words):
             try:
-                word_analysis = self.lexicon_engine.analyze_word_revolutionary(word, deep_analysis=False)
                 word_analyses.append({
-                    'word': word,
+                    'word': word_analysis.word,
                     'root': word_analysis.root,
                     'meaning': word_analysis.meaning,
                     'semantic_weight': word_analysis.semantic_weight,
                     'baserah_analysis': word_analysis.baserah_analysis
                 })
             except Exception as e:
-                print(f"⚠️ تحذير: لم يتم تحليل الكلمة '{word}': {e}")
+                print(f"⚠️ تحذير: لم يتم تحليل الكلمة '{word_analysis.word}': {e}")
         
         # تحليل الحروف
         letter_frequency = self._analyze_letter_frequency(clean_text)
@@ -519,19 +548,29 @@ class QuranicAnalysisEngine(BaserahExpertExplorerFoundation):
     def _remove_diacritics(self, text: str) -> str:
         """إزالة التشكيل من النص."""
 
-        # رموز التشكيل العربية
-        diacritics = [
-            '\u064B', '\u064C', '\u064D', '\u064E', '\u064F', '\u0650',  # تنوين وحركات
-            '\u0651', '\u0652', '\u0653', '\u0654', '\u0655', '\u0656',  # شدة وسكون
-            '\u0657', '\u0658', '\u0659', '\u065A', '\u065B', '\u065C',  # علامات أخرى
-            '\u065D', '\u065E', '\u065F', '\u0670'  # علامات إضافية
-        ]
+        return strip_quranic_diacritics(text)
 
-        clean_text = text
-        for diacritic in diacritics:
-            clean_text = clean_text.replace(diacritic, '')
+    def _analyze_verse_words(self, words: List[str]) -> List[Any]:
+        """تحليل كلمات الآية دفعة واحدة، مع الرجوع للتحليل الفردي إن فشلت الدفعة؛ الكلمة المتعذرة لا توقف الآية."""
 
-        return clean_text
+        try:
+            entries = self.lexicon_engine.analyze_words(words, deep_analysis=False)
+        except Exception as e:
+            print(f"⚠️ تحذير: تعذر التحليل الدفعي لكلمات الآية، يُعاد التحليل كلمة كلمة: {e}")
+            entries = []
+            for word in words:
+                try:
+                    entries.append(self.lexicon_engine.analyze_word_revolutionary(word, deep_analysis=False))
+                except Exception as word_error:
+                    print(f"⚠️ تحذير: لم يتم تحليل الكلمة '{word}': {word_error}")
+            return entries
+
+        # analyze_words يحذف الكلمات المتعذر تحليلها، فنبلغ عنها كما في التحليل الفردي
+        analyzed_words = {entry.word for entry in entries}
+        for word in dict.fromkeys(words):
+            if word and word not in analyzed_words:
+                print(f"⚠️ تحذير: لم يتم تحليل الكلمة '{word}'")
+        return entries
 
     def _analyze_letter_frequency(self, text: str) -> Dict[str, int]:
         """تحليل تكرار الحروف."""
@@ -1292,78 +1331,54 @@ class QuranicAnalysisEngine(BaserahExpertExplorerFoundation):
             'search_statistics': {}
         }
 
-        # البحث في جميع السور
-        for surah_num, surah_data in self.quran_text_data.get('surahs', {}).items():
-            surah_number = int(surah_num)
-            surah_name = surah_data.get('name', f'السورة {surah_number}')
-            verses = surah_data.get('verses', {})
-
-            for verse_num, verse_text in verses.items():
-                verse_number = int(verse_num)
-
-                # البحث حسب النوع
-                if search_type == 'word':
-                    # البحث عن الكلمة
-                    clean_verse = self._remove_diacritics(verse_text)
-                    clean_search = self._remove_diacritics(search_term)
-
-                    if clean_search in clean_verse.split():
-                        match = {
-                            'surah_number': surah_number,
-                            'surah_name': surah_name,
-                            'verse_number': verse_number,
-                            'verse_text': verse_text,
-                            'match_type': 'exact_word'
-                        }
-                        results['matches'].append(match)
-                        results['surahs_found'].add(surah_number)
-
-                elif search_type == 'partial':
-                    # البحث الجزئي
-                    clean_verse = self._remove_diacritics(verse_text)
-                    clean_search = self._remove_diacritics(search_term)
-
-                    if clean_search in clean_verse:
-                        match = {
-                            'surah_number': surah_number,
-                            'surah_name': surah_name,
-                            'verse_number': verse_number,
-                            'verse_text': verse_text,
-                            'match_type': 'partial_match'
-                        }
-                        results['matches'].append(match)
-                        results['surahs_found'].add(surah_number)
-
-                elif search_type == 'root':
-                    # البحث في الجذور
-                    words = self._remove_diacritics(verse_text).split()
-                    for word in words:
-                        try:
-                            word_analysis = self.lexicon_engine.analyze_word_revolutionary(word, deep_analysis=False)
-                            if word_analysis.root == search_term:
-                                match = {
-                                    'surah_number': surah_number,
-                                    'surah_name': surah_name,
-                                    'verse_number': verse_number,
-                                    'verse_text': verse_text,
-                                    'matched_word': word,
-                                    'root': word_analysis.root,
-                                    'match_type': 'root_match'
-                                }
-                                results['matches'].append(match)
-                                results['surahs_found'].add(surah_number)
-                                break
-                        except:
-                            continue
+        # البحث عبر الفهرس المعكوس (تقاطع القوائم بدل المرور على جميع الآيات)
+        if self.search_index is None:
+            self._load_search_index()
+        index = self.search_index
+        clean_search = self._remove_diacritics(search_term)
+
+        if search_type == 'word':
+            verse_ids, match_type = index.search_words(clean_search), 'exact_word'
+        elif search_type == 'partial':
+            verse_ids, match_type = index.search_partial(clean_search), 'partial_match'
+        elif search_type == 'root':
+            verse_ids, match_type = index.search_root(search_term), 'root_match'
+        else:
+            verse_ids, match_type = [], None
+
+        surahs = self.quran_text_data.get('surahs', {})
+        for verse_id in verse_ids:
+            surah_number, verse_number = index.verse_refs[verse_id]
+            surah_data = surahs.get(str(surah_number), {})
+            match = {
+                'surah_number': surah_number,
+                'surah_name': surah_data.get('name', f'السورة {surah_number}'),
+                'verse_number': verse_number,
+                'verse_text': surah_data.get('verses', {}).get(str(verse_number), ''),
+                'match_type': match_type
+            }
+
+            if search_type == 'root':
+                # أول كلمة في الآية من الجذر المطلوب
+                for word in index.clean_texts[verse_id].split():
+                    if self.root_extractor.extract_root(word) == search_term:
+                        match['matched_word'] = word
+                        match['root'] = search_term
+                        break
+
+            results['matches'].append(match)
+            results['surahs_found'].add(surah_number)
 
         # إحصائيات البحث
         results['total_matches'] = len(results['matches'])
         results['surahs_found'] = list(results['surahs_found'])
+        surah_match_counts = Counter(match['surah_number'] for match in results['matches'])
         results['search_statistics'] = {
             'total_verses_found': len(results['matches']),
             'total_surahs_found': len(results['surahs_found']),
             'search_coverage': len(results['surahs_found']) / 114 * 100,  # نسبة السور المطابقة
-            'most_frequent_surah': max(results['surahs_found'], key=lambda s: len([m for m in results['matches'] if m['surah_number'] == s])) if results['surahs_found'] else None
+            'most_frequent_surah': max(results['surahs_found'], key=surah_match_counts.get) if results['surahs_found'] else None,
+            'indexed_search': True
         }
 
         print(f"✅ تم العثور على {results['total_matches']} نتيجة في {len(results['surahs_found'])} سورة")
@@ -1397,9 +1412,11 @@ class QuranicAnalysisEngine(BaserahExpertExplorerFoundation):
                 'quran_db_path': self.quran_db_path,
                 'quran_text_path': self.quran_text_path,
                 'database_exists': os.path.exists(self.quran_db_path),
-                'text_data_loaded': hasattr(self, 'quran_text_data')
+                'text_data_loaded': hasattr(self, 'quran_text_data'),
+                'quran_index_path': self.quran_index_path
             },
-            'lexicon_engine_status': self.lexicon_engine.get_engine_status() if hasattr(self.lexicon_engine, 'get_engine_status') else {},
+            'search_index': self.search_index.get_index_statistics() if self.search_index else {},
+            'lexicon_engine_status': self.lexicon_engine.get_engine_status() if self.lexicon_engine.is_loaded and hasattr(self.lexicon_engine, 'get_engine_status') else {},
             'revolutionary_features': {
                 'baserah_pure_approach': True,
                 'basil_theories_integration': True,
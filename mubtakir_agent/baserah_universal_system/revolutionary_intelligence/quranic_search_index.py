@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# quranic_search_index.py - فهرس معكوس للنص القرآني (نص مطبّع + قوائم الكلمات والجذور)
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from .arabic_root_extractor import WordFormLRU
+
+# يُرفع عند تغيير بنية الفهرس أو قواعد التطبيع/استخراج الجذر لإعادة البناء
+INDEX_FORMAT_VERSION = 1
+
+# رموز التشكيل العربية (تنوين وحركات وشدة وسكون وعلامات إضافية)
+QURANIC_DIACRITICS = (
+    '\u064B\u064C\u064D\u064E\u064F\u0650'  # تنوين وحركات
+    '\u0651\u0652\u0653\u0654\u0655\u0656'  # شدة وسكون
+    '\u0657\u0658\u0659\u065A\u065B\u065C'  # علامات أخرى
+    '\u065D\u065E\u065F\u0670'                # علامات إضافية
+)
+
+_DIACRITICS_TABLE = str.maketrans('', '', QURANIC_DIACRITICS)
+
+
+def strip_quranic_diacritics(text: str) -> str:
+    """إزالة التشكيل بجدول ترجمة واحد."""
+
+    return text.translate(_DIACRITICS_TABLE)
+
+
+def intersect_postings(postings_lists: List[List[int]]) -> List[int]:
+    """تقاطع قوائم مرتبة (من الأقصر للأطول)."""
+
+    if not postings_lists:
+        return []
+
+    ordered = sorted(postings_lists, key=len)
+    result = ordered[0]
+    for postings in ordered[1:]:
+        if not result:
+            break
+        members = set(postings)
+        result = [verse_id for verse_id in result if verse_id in members]
+    return list(result)
+
+
+def compute_text_fingerprint(quran_text_data: Dict[str, Any]) -> str:
+    """بصمة النص القرآني + إصدار الفهرس (لاكتشاف الفهرس القديم)."""
+
+    digest = hashlib.sha256()
+    digest.update(str(INDEX_FORMAT_VERSION).encode('utf-8'))
+    digest.update(json.dumps(quran_text_data.get('surahs', {}), ensure_ascii=False,
+                             sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class QuranicSearchIndex:
+    """
+    فهرس البحث القرآني
+
+    - verse_refs: رقم داخلي لكل آية -> (السورة، الآية) بترتيب النص الأصلي
+    - clean_texts: نص كل آية بعد إزالة التشكيل (يُحسب مرة واحدة)
+    - token_postings: كلمة مطبّعة -> أرقام الآيات مرتبة
+    - root_postings: جذر -> أرقام الآيات مرتبة
+    """
+
+    def __init__(self, fingerprint: str = ""):
+        self.fingerprint = fingerprint
+        self.verse_refs: List[Tuple[int, int]] = []
+        self.clean_texts: List[str] = []
+        self.token_postings: Dict[str, List[int]] = {}
+        self.root_postings: Dict[str, List[int]] = {}
+        self.loaded_from_disk = False
+
+        # نتائج مسح المفردات للبحث الجزئي (مفاتيح قليلة ومتكررة)
+        self._fragment_cache = WordFormLRU(1024)
+
+    # ---------- البناء والحفظ ----------
+
+    @classmethod
+    def build(cls, quran_text_data: Dict[str, Any],
+              extract_root: Callable[[str], Optional[str]]) -> 'QuranicSearchIndex':
+        """بناء الفهرس مرة واحدة من بيانات النص القرآني."""
+
+        index = cls(compute_text_fingerprint(quran_text_data))
+
+        for surah_num, surah_data in quran_text_data.get('surahs', {}).items():
+            for verse_num, verse_text in surah_data.get('verses', {}).items():
+                verse_id = len(index.verse_refs)
+                clean_text = strip_quranic_diacritics(verse_text)
+                index.verse_refs.append((int(surah_num), int(verse_num)))
+                index.clean_texts.append(clean_text)
+
+                for token in clean_text.split():
+                    token_postings = index.token_postings.setdefault(token, [])
+                    if not token_postings or token_postings[-1] != verse_id:
+                        token_postings.append(verse_id)
+
+                    root = extract_root(token)
+                    if root:
+                        root_postings = index.root_postings.setdefault(root, [])
+                        if not root_postings or root_postings[-1] != verse_id:
+                            root_postings.append(verse_id)
+
+        return index
+
+    def save(self, index_path: str):
+        """حفظ الفهرس على القرص (كتابة ذرية)."""
+
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format_version': INDEX_FORMAT_VERSION,
+                'fingerprint': self.fingerprint,
+                'verse_refs': self.verse_refs,
+                'clean_texts': self.clean_texts,
+                'token_postings': self.token_postings,
+                'root_postings': self.root_postings
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, index_path)
+
+    @classmethod
+    def load(cls, index_path: str, expected_fingerprint: str) -> Optional['QuranicSearchIndex']:
+        """تحميل فهرس محفوظ إذا كان مطابقاً للنص الحالي، وإلا None."""
+
+        if not os.path.exists(index_path):
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (data.get('format_version') != INDEX_FORMAT_VERSION
+                or data.get('fingerprint') != expected_fingerprint):
+            return None
+
+        index = cls(expected_fingerprint)
+        index.verse_refs = [tuple(reference) for reference in data['verse_refs']]
+        index.clean_texts = data['clean_texts']
+        index.token_postings = data['token_postings']
+        index.root_postings = data['root_postings']
+        index.loaded_from_disk = True
+        return index
+
+    # ---------- الاستعلامات ----------
+
+    def _tokens_containing(self, fragment: str, position: str = 'any') -> List[int]:
+        """آيات تحتوي كلمة يظهر فيها الجزء (في أي موضع أو بدايةً أو نهايةً)."""
+
+        def _scan():
+            verse_ids = set()
+            for token, postings in self.token_postings.items():
+                if position == 'start':
+                    found = token.startswith(fragment)
+                elif position == 'end':
+                    found = token.endswith(fragment)
+                else:
+                    found = fragment in token
+                if found:
+                    verse_ids.update(postings)
+            return sorted(verse_ids)
+
+        return self._fragment_cache.get_or_compute((fragment, position), _scan)
+
+    def search_words(self, clean_query: str) -> List[int]:
+        """الآيات التي تحتوي جميع كلمات الاستعلام (تقاطع القوائم)."""
+
+        tokens = clean_query.split()
+        if not tokens:
+            return []
+        postings_lists = []
+        for token in dict.fromkeys(tokens):
+            postings = self.token_postings.get(token)
+            if not postings:
+                return []
+            postings_lists.append(postings)
+        return intersect_postings(postings_lists)
+
+    def search_partial(self, clean_query: str) -> List[int]:
+        """الآيات التي يظهر فيها الاستعلام نصاً جزئياً (مع التحقق على المرشحين)."""
+
+        if not clean_query:
+            return list(range(len(self.clean_texts)))
+
+        pieces = clean_query.split(' ')
+        if len(pieces) == 1:
+            return self._tokens_containing(clean_query)
+
+        # الأجزاء الداخلية كلمات كاملة، والأول نهاية كلمة، والأخير بداية كلمة
+        postings_lists = []
+        if pieces[0]:
+            postings_lists.append(self._tokens_containing(pieces[0], 'end'))
+        if pieces[-1]:
+            postings_lists.append(self._tokens_containing(pieces[-1], 'start'))
+        for piece in pieces[1:-1]:
+            if piece:
+                postings_lists.append(self.token_postings.get(piece, []))
+
+        candidates = intersect_postings(postings_lists) if postings_lists else range(len(self.clean_texts))
+        return [verse_id for verse_id in candidates if clean_query in self.clean_texts[verse_id]]
+
+    def search_root(self, root: str) -> List[int]:
+        """الآيات التي تحتوي كلمة من الجذر."""
+
+        return list(self.root_postings.get(root, []))
+
+    def get_index_statistics(self) -> Dict[str, Any]:
+        """إحصائيات الفهرس."""
+
+        return {
+            'format_version': INDEX_FORMAT_VERSION,
+            'indexed_verses': len(self.verse_refs),
+            'unique_tokens': len(self.token_postings),
+            'unique_roots': len(self.root_postings),
+            'loaded_from_disk': self.loaded_from_disk,
+            'fragment_cache': self._fragment_cache.statistics()
+        }
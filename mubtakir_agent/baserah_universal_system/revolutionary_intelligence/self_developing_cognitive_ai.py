@@ -20,10 +20,49 @@ from .advanced_mathematical_engine import AdvancedMathematicalEngine
 from .hierarchical_inheritance_system import BaserahHierarchicalInheritanceSystem
 from .revolutionary_mother_equation import ConcreteRevolutionaryMotherEquation
 from .ai_oop_foundation import BaserahExpertExplorerFoundation
+from .lazy_component_registry import LazyComponentRegistry, LazyComponent
+from .cognitive_result_cache import CognitiveResultCache, make_cache_key
+from .engine_metrics import ENGINE_METRICS, instrumented
 
 # استيراد الأسس الثورية
 from artistic_intelligence.baserah_core import baserah_sigmoid, baserah_linear, baserah_quantum_sigmoid
 
+# المحركات الثقيلة التي تُنشأ كسولاً: اسم المكوّن -> (الصنف، اسم المحرك، دالة الإحصائيات)
+# (دالة الإحصائيات None = نموذج لغوي يُبلغ عبر performance_stats)
+COGNITIVE_ENGINE_SPECS = {
+    'innovative_model': (BaserahInnovativeLanguageModel, "SelfDevInnovativeLanguageModel", None),
+    'arabic_model': (AdvancedArabicLanguageModel, "SelfDevArabicLanguageModel", None),
+    'semantic_meaning_engine': (SemanticMeaningEngine, "SelfDevSemanticMeaningEngine", 'get_engine_statistics'),
+    'dream_interpretation_engine': (DreamInterpretationEngine, "SelfDevDreamInterpretationEngine",
+                                    'get_engine_statistics'),
+    'revolutionary_code_generator': (RevolutionaryCodeGenerator, "SelfDevRevolutionaryCodeGenerator",
+                                     'get_generator_statistics'),
+    'revolutionary_multimedia_generator': (RevolutionaryMultimediaGenerator,
+                                           "SelfDevRevolutionaryMultimediaGenerator", 'get_generator_statistics'),
+    'intelligent_visual_inference_engine': (IntelligentVisualInferenceEngine,
+                                            "SelfDevIntelligentVisualInferenceEngine", 'get_engine_statistics'),
+    'revolutionary_content_transformer': (RevolutionaryContentTransformer,
+                                          "SelfDevRevolutionaryContentTransformer", 'get_transformer_statistics'),
+    'advanced_mathematical_engine': (AdvancedMathematicalEngine, "SelfDevAdvancedMathematicalEngine",
+                                     'get_engine_statistics')
+}
+
+# مراحل تسبق التطوير الذاتي: مفاتيحها لا تشمل جيل التطوير، فلا يبطلها التطوير المنفذ في الاستدعاء السابق
+PRE_DEVELOPMENT_PHASES = frozenset({'initial_thinking', 'step_validation'})
+
+
+def register_cognitive_engines(registry: LazyComponentRegistry,
+                               mother_inheritance: Dict[str, Any]) -> Dict[str, LazyComponent]:
+    """تسجيل مصانع جميع المحركات الثقيلة في السجل الكسول (بدون إنشاء أي منها)."""
+
+    def _factory(component_class, engine_name: str):
+        return lambda: component_class(engine_name, mother_inheritance)
+
+    return {
+        name: registry.register(name, _factory(component_class, engine_name))
+        for name, (component_class, engine_name, _) in COGNITIVE_ENGINE_SPECS.items()
+    }
+
 class SelfDevelopingCognitiveAI:
     """
     النظام الذكي المعرفي الذي يطور نفسه بنفسه
@@ -35,8 +74,20 @@ class SelfDevelopingCognitiveAI:
     - تفكير عميق ومعالجة معرفية متقدمة
     """
     
-    def __init__(self, system_name: str = "SelfDevelopingCognitiveAI"):
-        """تهيئة النظام الذكي المعرفي الذي يطور نفسه."""
+    def __init__(self, system_name: str = "SelfDevelopingCognitiveAI",
+                 preload_components: Optional[List[str]] = None,
+                 background_warm_up: bool = False,
+                 result_cache_config: Optional[Dict[str, Any]] = None):
+        """
+        تهيئة النظام الذكي المعرفي الذي يطور نفسه.
+
+        Args:
+            system_name: اسم النظام
+            preload_components: مكونات تُنشأ مسبقاً بدلاً من الانتظار لأول استخدام
+            background_warm_up: إنشاء المكونات المسبقة في خيط خلفي
+            result_cache_config: إعدادات ذاكرة النتائج المؤقتة
+                (max_entries, max_bytes, ttl_seconds)
+        """
         
         self.system_name = system_name
         self.system_id = f"self_dev_ai_{uuid.uuid4()}"
@@ -66,59 +117,31 @@ class SelfDevelopingCognitiveAI:
             mother_inheritance
         )
 
+        # سجل المكونات الكسولة: المحركات الثقيلة تُنشأ عند أول استخدام فقط
+        # (كثير منها يفتح قواعد بيانات SQLite ويطبع رسائل تهيئة)
+        self.component_registry = LazyComponentRegistry(f"{system_name}_Components")
+
+        engines = register_cognitive_engines(self.component_registry, mother_inheritance)
+
         # النماذج اللغوية المتقدمة (ترث من الخبير/المستكشف والمعادلة الأم)
         self.language_models = {
-            'innovative_model': BaserahInnovativeLanguageModel(
-                "SelfDevInnovativeLanguageModel",
-                mother_inheritance
-            ),
-            'arabic_model': AdvancedArabicLanguageModel(
-                "SelfDevArabicLanguageModel",
-                mother_inheritance
-            )
+            'innovative_model': engines['innovative_model'],
+            'arabic_model': engines['arabic_model']
         }
 
-        # محرك الدلالة المعنوية الثوري (ترث من المعادلة الأم)
-        self.semantic_meaning_engine = SemanticMeaningEngine(
-            "SelfDevSemanticMeaningEngine",
-            mother_inheritance
-        )
+        # محركات الدلالة المعنوية وتفسير الأحلام وتوليد الكود والوسائط والاستنباط البصري
+        # وتحويل المحتوى والرياضيات (جميعها ترث من المعادلة الأم)
+        self.semantic_meaning_engine = engines['semantic_meaning_engine']
+        self.dream_interpretation_engine = engines['dream_interpretation_engine']
+        self.revolutionary_code_generator = engines['revolutionary_code_generator']
+        self.revolutionary_multimedia_generator = engines['revolutionary_multimedia_generator']
+        self.intelligent_visual_inference_engine = engines['intelligent_visual_inference_engine']
+        self.revolutionary_content_transformer = engines['revolutionary_content_transformer']
+        self.advanced_mathematical_engine = engines['advanced_mathematical_engine']
 
-        # محرك تفسير الأحلام الثوري (ترث من المعادلة الأم)
-        self.dream_interpretation_engine = DreamInterpretationEngine(
-            "SelfDevDreamInterpretationEngine",
-            mother_inheritance
-        )
-
-        # مولد الكود الثوري (ترث من المعادلة الأم)
-        self.revolutionary_code_generator = RevolutionaryCodeGenerator(
-            "SelfDevRevolutionaryCodeGenerator",
-            mother_inheritance
-        )
-
-        # مولد الوسائط المتعددة الثوري (ترث من المعادلة الأم)
-        self.revolutionary_multimedia_generator = RevolutionaryMultimediaGenerator(
-            "SelfDevRevolutionaryMultimediaGenerator",
-            mother_inheritance
-        )
-
-        # محرك الاستنباط البصري الذكي (العين المستنبطة) (ترث من المعادلة الأم)
-        self.intelligent_visual_inference_engine = IntelligentVisualInferenceEngine(
-            "SelfDevIntelligentVisualInferenceEngine",
-            mother_inheritance
-        )
-
-        # محول المحتوى الثوري (ترث من المعادلة الأم)
-        self.revolutionary_content_transformer = RevolutionaryContentTransformer(
-            "SelfDevRevolutionaryContentTransformer",
-            mother_inheritance
-        )
-
-        # المحرك الرياضي المتقدم (ترث من المعادلة الأم)
-        self.advanced_mathematical_engine = AdvancedMathematicalEngine(
-            "SelfDevAdvancedMathematicalEngine",
-            mother_inheritance
-        )
+        # إحماء مسبق اختياري لمجموعة محددة من المكونات
+        if preload_components:
+            self.component_registry.warm_up(preload_components, background=background_warm_up)
         
         # مكونات التطوير الذاتي
         self.self_development_components = {
@@ -154,7 +177,12 @@ class SelfDevelopingCognitiveAI:
         self.development_cycles_count = 0
         self.total_improvements = 0
         self.current_performance_level = 0.5
+        # جيل التطوير: يزداد كلما عدّل التطوير الذاتي المعاملات أو الطبقات، ويدخل في مفاتيح الذاكرة المؤقتة
+        self.development_generation = 0
         
+        # ذاكرة النتائج المؤقتة (معنونة بالمحتوى، لكل مرحلة وللنتيجة الكاملة)
+        self.result_cache = CognitiveResultCache(**(result_cache_config or {}))
+
         # إحصائيات التطوير
         self.development_stats = {
             'total_development_cycles': 0,
@@ -162,17 +190,21 @@ class SelfDevelopingCognitiveAI:
             'validated_steps': 0,
             'knowledge_expansions': 0,
             'creative_insights': 0,
-            'performance_improvements': 0.0
+            'performance_improvements': 0.0,
+            'cached_cycles': 0
         }
         
         print(f"✅ تم تهيئة النظام الذكي المعرفي الذي يطور نفسه بنجاح!")
         print(f"   🆔 معرف النظام: {self.system_id}")
         print(f"   🧠 النواة المعرفية: {len(self.cognitive_core.all_layers)} طبقات")
         print(f"   🗣️ النماذج اللغوية: {len(self.language_models)} نماذج")
+        print(f"   💤 المكونات الكسولة: {len(self.component_registry.components)} مكونات (تُنشأ عند أول استخدام)")
         print(f"   🔧 مكونات التطوير: {len(self.self_development_components)} مكونات")
     
+    @instrumented('cognitive_think_seconds')
     def think_deeply_and_develop(self, input_data: Any, thinking_depth: int = 3,
-                               enable_self_development: bool = True) -> Dict[str, Any]:
+                               enable_self_development: bool = True,
+                               use_cache: bool = True) -> Dict[str, Any]:
         """
         التفكير العميق مع التطوير الذاتي.
         
@@ -180,6 +212,8 @@ class SelfDevelopingCognitiveAI:
             input_data: البيانات المدخلة للتفكير
             thinking_depth: عمق التفكير
             enable_self_development: تفعيل التطوير الذاتي
+            use_cache: استخدام ذاكرة النتائج المؤقتة (النتيجة الكاملة تُسترجع فقط عند تعطيل
+                التطوير الذاتي، لأن التطوير يغير حالة النظام في كل استدعاء ولا يُستعاد من الذاكرة)
             
         Returns:
             نتيجة التفكير العميق مع التطوير
@@ -188,6 +222,19 @@ class SelfDevelopingCognitiveAI:
         print(f"🧠🔍 بدء التفكير العميق مع التطوير الذاتي")
         print(f"   📊 عمق التفكير: {thinking_depth}")
         print(f"   🔧 التطوير الذاتي: {'مفعل' if enable_self_development else 'معطل'}")
+
+        # النتيجة الكاملة: فقط دون تطوير ذاتي، ومفتاحها يشمل جيل التطوير الحالي
+        full_result_key = None
+        if use_cache and not enable_self_development:
+            full_result_key = self._phase_cache_key('full_result', input_data, thinking_depth)
+            found, cached_result = self.result_cache.get(full_result_key, 'full_result')
+            ENGINE_METRICS.count('cognitive_cache_lookups_total', phase='full_result', result='hit' if found else 'miss')
+            if found:
+                print("   ⚡ تم استرجاع النتيجة من الذاكرة المؤقتة")
+                cached_result['from_cache'] = True
+                self.development_stats['cached_cycles'] += 1
+                self._update_development_memory_and_stats(cached_result)
+                return cached_result
         
         self.system_state = "deep_thinking_and_developing"
         
@@ -199,18 +246,27 @@ class SelfDevelopingCognitiveAI:
             'development_phases': [],
             'final_result': None,
             'performance_improvement': 0.0,
+            'from_cache': False,
             'timestamp': datetime.now()
         }
         
         # المرحلة 1: التفكير العميق الأولي
         print("   🤔 المرحلة 1: التفكير العميق الأولي...")
-        initial_thinking = self._perform_initial_deep_thinking(input_data, thinking_depth)
+        initial_thinking = self._run_cached_phase(
+            'initial_thinking', use_cache, input_data, thinking_depth,
+            lambda: self._perform_initial_deep_thinking(input_data, thinking_depth)
+        )
         thinking_result['thinking_phases'].append(initial_thinking)
         
         # المرحلة 2: التحقق من الخطوات (إذا كان مفعلاً)
         if enable_self_development:
             print("   ✅ المرحلة 2: التحقق من الخطوات...")
-            step_validation = self._validate_thinking_steps(initial_thinking)
+            # needs_improvement يعتمد على عتبة التحسين التي يعدلها التطوير الذاتي
+            step_validation = self._run_cached_phase(
+                'step_validation', use_cache, input_data, thinking_depth,
+                lambda: self._validate_thinking_steps(initial_thinking),
+                self.development_parameters['self_improvement_threshold']
+            )
             thinking_result['development_phases'].append(step_validation)
             
             # المرحلة 3: التطوير الذاتي بناءً على التحقق
@@ -218,6 +274,9 @@ class SelfDevelopingCognitiveAI:
                 print("   🔧 المرحلة 3: التطوير الذاتي...")
                 self_development = self._perform_self_development(step_validation)
                 thinking_result['development_phases'].append(self_development)
+
+                # المراحل اللاحقة تُبنى على تفكير جديد بعد التطوير: لا تُسترجع من الذاكرة
+                use_cache = False
                 
                 # المرحلة 4: إعادة التفكير بعد التطوير
                 print("   🔄 المرحلة 4: إعادة التفكير بعد التطوير...")
@@ -239,8 +298,9 @@ class SelfDevelopingCognitiveAI:
         
         # المرحلة 5: معالجة الدلالة المعنوية الثورية
         print("   🧠 المرحلة 5: معالجة الدلالة المعنوية...")
-        semantic_analysis = self._process_semantic_meaning(
-            thinking_result['final_result'], input_data
+        semantic_analysis = self._run_cached_phase(
+            'semantic_analysis', use_cache, input_data, thinking_depth,
+            lambda: self._process_semantic_meaning(thinking_result['final_result'], input_data)
         )
         thinking_result['semantic_analysis'] = semantic_analysis
 
@@ -248,8 +308,11 @@ class SelfDevelopingCognitiveAI:
         dream_interpretation = None
         if self._is_dream_input(input_data):
             print("   🌙 المرحلة 6: تفسير الأحلام الثوري...")
-            dream_interpretation = self._process_dream_interpretation(
-                thinking_result['final_result'], input_data, semantic_analysis
+            dream_interpretation = self._run_cached_phase(
+                'dream_interpretation', use_cache, input_data, thinking_depth,
+                lambda: self._process_dream_interpretation(
+                    thinking_result['final_result'], input_data, semantic_analysis
+                )
             )
             thinking_result['dream_interpretation'] = dream_interpretation
 
@@ -257,8 +320,11 @@ class SelfDevelopingCognitiveAI:
         code_generation = None
         if self._is_code_request(input_data):
             print("   🚀 المرحلة 7: توليد الكود الثوري...")
-            code_generation = self._process_revolutionary_code_generation(
-                thinking_result['final_result'], input_data, semantic_analysis, dream_interpretation
+            code_generation = self._run_cached_phase(
+                'code_generation', use_cache, input_data, thinking_depth,
+                lambda: self._process_revolutionary_code_generation(
+                    thinking_result['final_result'], input_data, semantic_analysis, dream_interpretation
+                )
             )
             thinking_result['code_generation'] = code_generation
 
@@ -308,6 +374,9 @@ class SelfDevelopingCognitiveAI:
         
         # تحديث الذاكرة والإحصائيات
         self._update_development_memory_and_stats(thinking_result)
+
+        if full_result_key is not None:
+            self.result_cache.put(full_result_key, thinking_result, 'full_result')
         
         self.system_state = "ready"
         
@@ -316,6 +385,35 @@ class SelfDevelopingCognitiveAI:
         
         return thinking_result
     
+    def _phase_cache_key(self, phase_name: str, input_data: Any, thinking_depth: int,
+                         *extra_parts: Any) -> str:
+        """
+        مفتاح مرحلة: المدخل المطبّع + العمق (+ جيل التطوير لمراحل ما بعد التطوير الذاتي).
+
+        جيل التطوير يزداد مع كل تطوير ذاتي، فلو دخل مفاتيح المراحل الأولى لما أُعيد استخدامها أبداً
+        عند تفعيل التطوير؛ أما المراحل اللاحقة والنتيجة الكاملة فتُبطل عند تغيره.
+        """
+
+        generation_parts = () if phase_name in PRE_DEVELOPMENT_PHASES else (self.development_generation,)
+        return make_cache_key(phase_name, input_data, thinking_depth, *generation_parts, *extra_parts)
+
+    def _run_cached_phase(self, phase_name: str, use_cache: bool, input_data: Any,
+                          thinking_depth: int, compute, *extra_parts: Any) -> Any:
+        """تنفيذ مرحلة عبر ذاكرة النتائج المؤقتة."""
+
+        if not use_cache:
+            return compute()
+
+        key = self._phase_cache_key(phase_name, input_data, thinking_depth, *extra_parts)
+        value, hit = self.result_cache.get_or_compute(key, compute, phase_name)
+        ENGINE_METRICS.count('cognitive_cache_lookups_total', phase=phase_name, result='hit' if hit else 'miss')
+        return value
+
+    def clear_result_cache(self):
+        """مسح ذاكرة النتائج المؤقتة."""
+        self.result_cache.clear()
+
+    @instrumented('cognitive_phase_seconds', phase='initial_thinking')
     def _perform_initial_deep_thinking(self, input_data: Any, depth: int) -> Dict[str, Any]:
         """تنفيذ التفكير العميق الأولي."""
         
@@ -338,6 +436,7 @@ class SelfDevelopingCognitiveAI:
             'phase': 'initial_deep_thinking'
         }
     
+    @instrumented('cognitive_phase_seconds', phase='step_validation')
     def _validate_thinking_steps(self, thinking_result: Dict[str, Any]) -> Dict[str, Any]:
         """التحقق من صحة خطوات التفكير."""
         
@@ -357,6 +456,7 @@ class SelfDevelopingCognitiveAI:
         
         return validation_result
     
+    @instrumented('cognitive_phase_seconds', phase='self_development')
     def _perform_self_development(self, validation_result: Dict[str, Any]) -> Dict[str, Any]:
         """تنفيذ التطوير الذاتي."""
         
@@ -378,6 +478,7 @@ class SelfDevelopingCognitiveAI:
         
         # تحديث معاملات النظام
         self._update_system_parameters(development_result['applied_improvements'])
+        self.development_generation += 1
         
         # حساب الأداء الجديد
         new_performance = self._evaluate_system_performance()
@@ -531,6 +632,7 @@ class SelfDevelopingCognitiveAI:
         
         return overall_performance
     
+    @instrumented('cognitive_phase_seconds', phase='improved_thinking')
     def _perform_improved_thinking(self, input_data: Any, depth: int, 
                                  development_result: Dict[str, Any]) -> Dict[str, Any]:
         """تنفيذ التفكير المحسن بعد التطوير."""
@@ -591,6 +693,7 @@ class SelfDevelopingCognitiveAI:
         
         return improvement_ratio
     
+    @instrumented('cognitive_phase_seconds', phase='semantic_analysis')
     def _process_semantic_meaning(self, thinking_result: Dict[str, Any],
                                 input_data: Any) -> Dict[str, Any]:
         """
@@ -666,6 +769,7 @@ class SelfDevelopingCognitiveAI:
         input_lower = input_data.lower()
         return any(keyword in input_lower for keyword in dream_keywords)
 
+    @instrumented('cognitive_phase_seconds', phase='dream_interpretation')
     def _process_dream_interpretation(self, thinking_result: Dict[str, Any],
                                     input_data: Any, semantic_analysis: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -747,6 +851,7 @@ class SelfDevelopingCognitiveAI:
         input_lower = input_data.lower()
         return any(keyword in input_lower for keyword in code_keywords)
 
+    @instrumented('cognitive_phase_seconds', phase='code_generation')
     def _process_revolutionary_code_generation(self, thinking_result: Dict[str, Any],
                                              input_data: Any, semantic_analysis: Dict[str, Any] = None,
                                              dream_interpretation: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -888,6 +993,7 @@ class SelfDevelopingCognitiveAI:
         input_lower = input_data.lower()
         return any(keyword in input_lower for keyword in multimedia_keywords)
 
+    @instrumented('cognitive_phase_seconds', phase='multimedia_generation')
     def _process_revolutionary_multimedia_generation(self, thinking_result: Dict[str, Any],
                                                    input_data: Any, semantic_analysis: Dict[str, Any] = None,
                                                    dream_interpretation: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -1077,6 +1183,7 @@ class SelfDevelopingCognitiveAI:
         input_lower = input_data.lower()
         return any(keyword in input_lower for keyword in visual_analysis_keywords)
 
+    @instrumented('cognitive_phase_seconds', phase='visual_inference')
     def _process_intelligent_visual_inference(self, thinking_result: Dict[str, Any],
                                             input_data: Any, semantic_analysis: Dict[str, Any] = None,
                                             dream_interpretation: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -1255,6 +1362,7 @@ class SelfDevelopingCognitiveAI:
         input_lower = input_data.lower()
         return any(keyword in input_lower for keyword in mathematical_keywords)
 
+    @instrumented('cognitive_phase_seconds', phase='mathematical_processing')
     def _process_advanced_mathematics(self, thinking_result: Dict[str, Any],
                                     input_data: Any, semantic_analysis: Dict[str, Any] = None,
                                     dream_interpretation: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -1623,6 +1731,7 @@ class SelfDevelopingCognitiveAI:
         input_lower = input_data.lower()
         return any(keyword in input_lower for keyword in content_transformation_keywords)
 
+    @instrumented('cognitive_phase_seconds', phase='content_transformation')
     def _process_revolutionary_content_transformation(self, thinking_result: Dict[str, Any],
                                                     input_data: Any, semantic_analysis: Dict[str, Any] = None,
                                                     dream_interpretation: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -1997,6 +2106,7 @@ class SelfDevelopingCognitiveAI:
             'quality_grade': 'excellent' if overall_quality > 0.8 else 'good' if overall_quality > 0.6 else 'developing'
         }
 
+    @instrumented('cognitive_phase_seconds', phase='language_response')
     def _generate_advanced_language_response(self, thinking_result: Dict[str, Any],
                                            input_data: Any, semantic_analysis: Dict[str, Any] = None,
                                            dream_interpretation: Dict[str, Any] = None,
@@ -2398,6 +2508,7 @@ class SelfDevelopingCognitiveAI:
 
         return response
     
+    @instrumented('cognitive_phase_seconds', phase='memory_update')
     def _update_development_memory_and_stats(self, thinking_result: Dict[str, Any]):
         """تحديث ذاكرة التطوير والإحصائيات."""
         
@@ -2416,8 +2527,15 @@ class SelfDevelopingCognitiveAI:
                 if phase.get('development_success', False):
                     self.development_stats['successful_improvements'] += 1
     
-    def get_system_status(self) -> Dict[str, Any]:
-        """الحصول على حالة النظام الشاملة."""
+    def get_system_status(self, build_pending_components: bool = False) -> Dict[str, Any]:
+        """
+        الحصول على حالة النظام الشاملة.
+
+        Args:
+            build_pending_components: إنشاء المحركات الكسولة التي لم تُنشأ بعد للإبلاغ عن إحصائياتها؛
+                افتراضياً يبقى مفتاح كل محرك لم يُنشأ موجوداً بقيمة {'loaded': False}
+                حتى لا يفرض استعلام الحالة تحميل كل المحركات
+        """
         
         return {
             'system_info': {
@@ -2434,18 +2552,32 @@ class SelfDevelopingCognitiveAI:
             'development_statistics': self.development_stats.copy(),
             'cognitive_core_status': self.cognitive_core.get_interaction_statistics(),
             'language_models_status': {
-                name: model.performance_stats for name, model in self.language_models.items()
+                name: self._get_component_status(name, build_pending_components) for name in self.language_models
+            },
+            **{
+                f"{name}_status": self._get_component_status(name, build_pending_components)
+                for name, (_, _, method_name) in COGNITIVE_ENGINE_SPECS.items() if method_name
             },
-            'semantic_meaning_engine_status': self.semantic_meaning_engine.get_engine_statistics(),
-            'dream_interpretation_engine_status': self.dream_interpretation_engine.get_engine_statistics(),
-            'revolutionary_code_generator_status': self.revolutionary_code_generator.get_generator_statistics(),
-            'revolutionary_multimedia_generator_status': self.revolutionary_multimedia_generator.get_generator_statistics(),
-            'intelligent_visual_inference_engine_status': self.intelligent_visual_inference_engine.get_engine_statistics(),
-            'revolutionary_content_transformer_status': self.revolutionary_content_transformer.get_transformer_statistics(),
-            'advanced_mathematical_engine_status': self.advanced_mathematical_engine.get_engine_statistics(),
+            'lazy_components_status': self.component_registry.get_registry_status(),
+            'result_cache_status': self.result_cache.get_cache_statistics(),
             'system_assessment': 'excellent' if self.current_performance_level > 0.8 else 'good' if self.current_performance_level > 0.6 else 'developing'
         }
 
+    def _get_component_status(self, name: str, build_pending: bool = True) -> Dict[str, Any]:
+        """إحصائيات مكوّن كسول، أو {'loaded': False} إن لم يُنشأ ولم يُطلب إنشاؤه."""
+
+        if not build_pending and not self.component_registry.is_loaded(name):
+            return {'loaded': False}
+
+        component = self.component_registry.get(name)
+        method_name = COGNITIVE_ENGINE_SPECS[name][2]
+        return getattr(component, method_name)() if method_name else component.performance_stats
+
+    def warm_up_components(self, component_names: Optional[List[str]] = None,
+                           background: bool = False):
+        """إحماء مسبق للمكونات الكسولة (None = جميع المكونات)."""
+        return self.component_registry.warm_up(component_names, background=background)
+
 # مكونات التطوير الذاتي المساعدة
 class PerformanceMonitor:
     """مراقب الأداء."""
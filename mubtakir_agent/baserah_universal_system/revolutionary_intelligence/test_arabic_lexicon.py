@@ -5,6 +5,7 @@ import sys
 import os
 import tempfile
 import shutil
+import dataclasses
 from datetime import datetime
 
 # إضافة المسار للوصول للمكتبات
@@ -24,6 +25,21 @@ from .lexicon_data_loader import (
     quick_load_lexicon_data,
     create_sample_lexicon_files
 )
+from .ai_oop_foundation import BaserahExpertExplorerFoundation
+
+
+class _FoundationSignatureAdapter(BaserahExpertExplorerFoundation):
+    """يقبل استدعاء المحرك (engine_name, mother_inheritance) ويمرر للأساس المجال فقط كما يتوقع توقيعه."""
+
+    def __init__(self, engine_name: str, mother_inheritance=None):
+        super().__init__(engine_name)
+
+
+class LexiconTestEngine(ArabicLexiconEngine, _FoundationSignatureAdapter):
+    """
+    محرك المعجم كما هو، مع مواءمة تهيئة الأساس الثوري (توقيعه الحالي لا يطابق استدعاء المحرك)،
+    لتعمل اختبارات الذاكرة والاتصال على المحرك الحقيقي.
+    """
 
 
 def test_engine_initialization():
@@ -410,6 +426,130 @@ def test_engine_performance():
         return False
 
 
+def test_batch_analysis_memo():
+    """اختبار ذاكرة التحليل الدفعي: النسخ والإبطال وعد الإصابات."""
+
+    print("\n🧠 اختبار ذاكرة التحليل الدفعي")
+    print("=" * 50)
+
+    try:
+        engine = LexiconTestEngine("BatchMemoTestEngine")
+
+        # الكلمات المكررة: نتيجة لكل موضع دون مشاركة الكائن
+        results = engine.analyze_words(['علم', 'حكمة', 'علم'])
+        assert [entry.word for entry in results] == ['علم', 'حكمة', 'علم']
+        assert results[0] is not results[2] and results[0].meaning == results[2].meaning
+
+        # الإصابة تعيد نسخة وتُحتسب في الإحصائيات
+        engine.analyze_words(['علم'])
+        words_before = engine.engine_stats['words_analyzed']
+        hits_before = engine.engine_stats['memo_hits']
+        first = engine.analyze_words(['علم'])[0]
+        assert engine.engine_stats['memo_hits'] == hits_before + 1
+        assert engine.engine_stats['words_analyzed'] == words_before + 1
+
+        first.related_words.append('كلمة_معدلة')
+        first.metadata['معدل'] = True
+        second = engine.analyze_words(['علم'])[0]
+        assert 'كلمة_معدلة' not in second.related_words and 'معدل' not in second.metadata
+
+        print("✅ الذاكرة تعيد نسخاً وتحتسب الإصابات")
+
+        # حفظ كلمة من الجذر نفسه يبطل مدخلات ذلك الجذر فقط
+        engine.analyze_words(['سلام'])
+        assert ('علم', False) in engine.analysis_memo and ('سلام', False) in engine.analysis_memo
+        sibling = dataclasses.replace(second, word='علمنا_اختبار', related_words=[])
+        engine._save_analyses_to_database([(sibling, [])])
+        assert ('علم', False) not in engine.analysis_memo
+        assert ('سلام', False) in engine.analysis_memo
+
+        # التحليل التالي يُعاد حسابه من قاعدة البيانات ثم يُحفظ من جديد
+        hits_before = engine.engine_stats['memo_hits']
+        engine.analyze_words(['علم'])
+        assert engine.engine_stats['memo_hits'] == hits_before
+        assert ('علم', False) in engine.analysis_memo
+
+        print("✅ الحفظ يبطل تحليلات الجذر المتأثر")
+
+        engine.close()
+        return True
+
+    except Exception as e:
+        print(f"❌ فشل اختبار ذاكرة التحليل الدفعي: {e}")
+        return False
+
+
+def test_engine_close():
+    """اختبار إغلاق الاتصال الدائم وإعادة فتحه عند الاستخدام."""
+
+    print("\n🔒 اختبار إغلاق المحرك")
+    print("=" * 50)
+
+    try:
+        engine = LexiconTestEngine("CloseTestEngine")
+        engine.analyze_words(['نور'])
+        assert engine._db_connection is not None
+
+        engine.close()
+        assert engine._db_connection is None
+        engine.close()  # الإغلاق المتكرر آمن
+
+        # الاستخدام بعد الإغلاق يعيد فتح الاتصال
+        results = engine.analyze_words(['نور', 'كتاب'])
+        assert [entry.word for entry in results] == ['نور', 'كتاب']
+        assert engine._db_connection is not None
+        engine.close()
+
+        print("✅ الإغلاق وإعادة الفتح يعملان بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ فشل اختبار إغلاق المحرك: {e}")
+        return False
+
+
+def test_connection_after_fork():
+    """اختبار أن العملية الابنة بعد fork لا تستخدم اتصال الأب بل تفتح اتصالها."""
+
+    print("\n🍴 اختبار الاتصال بعد fork")
+    print("=" * 50)
+
+    if not hasattr(os, 'fork'):
+        print("⏭️ fork غير متاح على هذا النظام")
+        return True
+
+    try:
+        engine = LexiconTestEngine("ForkTestEngine")
+        engine.analyze_words(['نور'])
+        parent_connection = engine._db_connection
+        assert parent_connection is not None
+
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                if engine._db_connection is None:
+                    results = engine.analyze_words(['كتاب'])
+                    connection = engine._db_connection
+                    if results and connection is not None and connection is not parent_connection:
+                        exit_code = 0
+            finally:
+                os._exit(exit_code)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert engine._db_connection is parent_connection
+        assert engine.analyze_words(['نور'])[0].word == 'نور'
+        engine.close()
+
+        print("✅ العملية الابنة تفتح اتصالها الخاص")
+        return True
+
+    except Exception as e:
+        print(f"❌ فشل اختبار الاتصال بعد fork: {e}")
+        return False
+
+
 def run_all_tests():
     """تشغيل جميع الاختبارات."""
     
@@ -427,7 +567,10 @@ def run_all_tests():
         ("اختبار نظريات باسل", test_basil_theories_application),
         ("اختبار محمل البيانات", test_data_loader),
         ("اختبار الدوال السريعة", test_quick_functions),
-        ("اختبار الأداء", test_engine_performance)
+        ("اختبار الأداء", test_engine_performance),
+        ("اختبار ذاكرة التحليل الدفعي", test_batch_analysis_memo),
+        ("اختبار إغلاق المحرك", test_engine_close),
+        ("اختبار الاتصال بعد fork", test_connection_after_fork)
     ]
     
     results = []
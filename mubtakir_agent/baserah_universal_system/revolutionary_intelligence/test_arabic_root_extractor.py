@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# test_arabic_root_extractor.py - اختبار مستخرج الجذور العربية المُجمَّع
+
+import sys
+import os
+import random
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .arabic_root_extractor import (
+    AffixTrie, CompiledArabicRootExtractor, WordFormLRU, build_normalizer, compile_pattern_template
+)
+
+
+def test_affix_tries():
+    """أشجار السوابق واللواحق تعيد أطول تطابق أولاً مع احترام الحد الأدنى للجذع."""
+
+    print("🧪 اختبار أشجار السوابق واللواحق")
+    print("=" * 50)
+
+    try:
+        prefixes = AffixTrie(['و', 'ال', 'وال'])
+        assert prefixes.matches('والكتاب') == ['وال', 'و']
+        assert prefixes.longest_match('كتاب') is None
+
+        suffixes = AffixTrie(['ة', 'ات', 'هات'], reverse=True)
+        assert suffixes.matches('امهات') == ['هات', 'ات']
+
+        extractor = CompiledArabicRootExtractor(prefixes=['ال', 'و'], suffixes=['ون', 'ات'],
+                                                min_stem_length=3)
+        assert extractor.strip_affixes('والكاتبون') == ('و', 'الكاتب', 'ون')
+        # نزع "ال" سيترك جذعاً أقصر من ثلاثة أحرف
+        assert extractor.strip_affixes('الحق') == (None, 'الحق', None)
+
+        print("✅ الأشجار تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الأشجار: {e}")
+        return False
+
+
+def test_roots_and_patterns():
+    """الجذور المعروفة ثم قوالب الأوزان المُجمَّعة ثم الدالة الاحتياطية."""
+
+    print("🧪 اختبار الجذور والأوزان")
+    print("=" * 50)
+
+    try:
+        pattern = compile_pattern_template('مفعول', 'مفعول')
+        assert pattern.root_slots == (1, 2, 4)
+        assert pattern.matches('مكتوب') and not pattern.matches('كاتب')
+        assert pattern.extract_root('مكتوب') == 'كتب'
+
+        extractor = CompiledArabicRootExtractor(
+            prefixes=['ال'], suffixes=['ة'],
+            known_roots=['علم', 'دحرج'],
+            pattern_templates={'فاعل': 'فاعل', 'مفعول': 'مفعول'},
+            normalizer=build_normalizer(),
+            root_fallback=lambda stem: stem[:3]
+        )
+
+        assert extractor.extract('العالِم').source == 'known_root'
+        assert extractor.extract_root('العالِم') == 'علم'
+        assert extractor.extract('مشروب').pattern == 'مفعول'
+        assert extractor.extract_root('مشروب') == 'شرب'
+        assert extractor.extract('سفر').source == 'fallback'
+        assert build_normalizer(unify_alef_maqsura=True)('إِلَى') == 'الي'
+
+        print("✅ الجذور والأوزان تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الجذور والأوزان: {e}")
+        return False
+
+
+def test_known_root_lookup():
+    """البحث المجزأ عن الجذور المعروفة يطابق المسح الخطي بالترتيب المسجل."""
+
+    print("🧪 اختبار البحث عن الجذور المعروفة")
+    print("=" * 50)
+
+    try:
+        letters = 'ابتثجحخدرزسشصضطعغفقكلمنهوي'
+        generator = random.Random(7)
+        roots = list(dict.fromkeys(
+            ''.join(generator.choice(letters) for _ in range(generator.choice((2, 3, 3, 4))))
+            for _ in range(3000)
+        ))
+        extractor = CompiledArabicRootExtractor(known_roots=roots)
+
+        def linear_scan(stem):
+            return next((root for root in roots if extractor.is_subsequence(root, stem)), None)
+
+        stems = [''.join(generator.choice(letters) for _ in range(generator.randint(1, 9)))
+                 for _ in range(500)]
+        stems.append('ب' * 40)   # جذع طويل: المسح الخطي أرخص من تعداد التتابعات
+        for stem in stems:
+            assert extractor.find_known_root(stem) == linear_scan(stem), stem
+
+        # الترتيب المسجل يحسم عند تطابق أكثر من جذر
+        ordered = CompiledArabicRootExtractor(known_roots=['كتب', 'كت', 'تب'])
+        assert ordered.find_known_root('مكتوب') == 'كتب'
+        assert CompiledArabicRootExtractor(known_roots=['تب', 'كتب']).find_known_root('مكتوب') == 'تب'
+
+        print("✅ البحث عن الجذور المعروفة يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار البحث عن الجذور المعروفة: {e}")
+        return False
+
+
+def test_word_form_memoization():
+    """صيغ الكلمات المكررة تُحلل مرة واحدة، والذاكرة محدودة الحجم."""
+
+    print("🧪 اختبار ذاكرة صيغ الكلمات")
+    print("=" * 50)
+
+    try:
+        calls = []
+
+        def _fallback(stem):
+            calls.append(stem)
+            return stem[:3]
+
+        extractor = CompiledArabicRootExtractor(prefixes=['ال'], root_fallback=_fallback)
+        roots = extractor.extract_roots("الكتاب الكتاب الكتاب قلم قلم من", min_word_length=3)
+        assert roots == ['كتا', 'كتا', 'كتا', 'قلم', 'قلم']
+        assert calls == ['كتاب', 'قلم']
+
+        statistics = extractor.cache_statistics()
+        assert statistics['misses'] == 2 and statistics['hits'] == 3
+
+        lru = WordFormLRU(max_size=2)
+        lru.put('a', 1)
+        lru.put('b', 2)
+        assert lru.get('a') == 1
+        lru.put('c', 3)
+        assert 'b' not in lru and len(lru) == 2
+
+        print("✅ ذاكرة صيغ الكلمات تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار ذاكرة صيغ الكلمات: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات مستخرج الجذور المُجمَّع")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("أشجار السوابق واللواحق", test_affix_tries()),
+        ("الجذور والأوزان", test_roots_and_patterns()),
+        ("البحث عن الجذور المعروفة", test_known_root_lookup()),
+        ("ذاكرة صيغ الكلمات", test_word_form_memoization())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
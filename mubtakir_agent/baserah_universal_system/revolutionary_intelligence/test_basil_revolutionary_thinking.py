@@ -198,7 +198,7 @@ def test_integrated_revolutionary_thinking():
         print("📊 حالة النظام مع التفكير الثوري")
         print("-" * 50)
         
-        system_status = cognitive_ai.get_system_status()
+        system_status = cognitive_ai.get_system_status(build_pending_components=True)
         
         print(f"🧠 النواة المعرفية:")
         cognitive_stats = system_status['cognitive_core_status']
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# test_bounded_history.py - اختبار سجل التاريخ المحدود
+
+import sys
+import os
+import json
+import pickle
+import random
+import tempfile
+from datetime import datetime
+from operator import itemgetter
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .bounded_history import BoundedHistory
+
+
+def test_capacity_and_list_interface():
+    """السعة ثابتة والأقدم يُخلى، مع واجهة متوافقة مع القوائم."""
+
+    print("🧪 اختبار السعة وواجهة القوائم")
+    print("=" * 50)
+
+    try:
+        history = BoundedHistory(3)
+        assert not history and len(history) == 0
+        history.extend(range(5))
+
+        assert len(history) == 3 and list(history) == [2, 3, 4]
+        assert history[-1] == 4 and history[0] == 2 and history[-2:] == [3, 4]
+        assert history.total_appended == 5 and history.evicted_count == 2
+        assert 3 in history and 0 not in history
+
+        history.remove(3)
+        assert history.to_list() == [2, 4]
+        try:
+            history.remove(99)
+            raise AssertionError("حذف عنصر غير موجود لم يرفع ValueError")
+        except ValueError:
+            pass
+
+        print("✅ السعة وواجهة القوائم تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار السعة: {e}")
+        return False
+
+
+def test_rolling_aggregates():
+    """المجاميع المتدحرجة تطابق الحساب المباشر على النافذة الحالية."""
+
+    print("🧪 اختبار المجاميع المتدحرجة")
+    print("=" * 50)
+
+    try:
+        rng = random.Random(7)
+        history = BoundedHistory(50, aggregates={'score': itemgetter('score')})
+        values = []
+        for step in range(500):
+            value = rng.random()
+            values.append(value)
+            history.append({'score': value, 'step': step})
+
+            if step % 37 == 0:
+                window = values[-50:]
+                rolling = history.rolling('score')
+                mean = sum(window) / len(window)
+                assert rolling['count'] == len(window)
+                assert abs(rolling['mean'] - mean) < 1e-9
+                assert rolling['min'] == min(window) and rolling['max'] == max(window)
+                assert abs(rolling['std'] - (sum((v - mean) ** 2 for v in window) / len(window)) ** 0.5) < 1e-9
+
+        assert history.rolling('score')['lifetime_count'] == 500
+        assert abs(history.rolling('score')['lifetime_mean'] - sum(values) / 500) < 1e-9
+
+        # الحذف من الوسط يعيد بناء المجاميع
+        removed = history[10]
+        history.remove(removed)
+        window = [entry['score'] for entry in history]
+        assert history.rolling('score')['max'] == max(window)
+        assert abs(history.rolling('score')['sum'] - sum(window)) < 1e-9
+
+        # القيم None لا تدخل في المجاميع
+        optional = BoundedHistory(5, aggregates={'saved': lambda entry: entry.get('saved')})
+        optional.extend([{'saved': 2}, {'error': 'x'}, {'saved': 4}])
+        assert optional.rolling('saved')['count'] == 2 and optional.rolling_mean('saved') == 3.0
+
+        print("✅ المجاميع المتدحرجة تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار المجاميع: {e}")
+        return False
+
+
+def test_spill_to_disk():
+    """العناصر المُخلاة تُفرّغ إلى ملف JSONL مع التدوير عند حد الحجم."""
+
+    print("🧪 اختبار التفريغ إلى القرص")
+    print("=" * 50)
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            spill_path = os.path.join(directory, "archive", "history.jsonl")
+            history = BoundedHistory(2, spill_path=spill_path)
+            for step in range(5):
+                history.append({'step': step, 'time': datetime(2025, 1, 1)})
+            history.flush()
+
+            with open(spill_path, encoding='utf-8') as f:
+                spilled = [json.loads(line) for line in f]
+            assert [entry['step'] for entry in spilled] == [0, 1, 2]
+            assert spilled[0]['time'] == '2025-01-01T00:00:00'
+            assert history.spilled_count == 3
+            history.close()
+
+            rotating = BoundedHistory(1, spill_path=spill_path, spill_max_bytes=64)
+            for step in range(20):
+                rotating.append({'step': step})
+            rotating.close()
+            assert os.path.exists(f"{spill_path}.1")
+            assert os.path.getsize(spill_path) < 64 + 32
+
+        print("✅ التفريغ إلى القرص يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار التفريغ: {e}")
+        return False
+
+
+def test_pickling():
+    """السجل قابل للتسلسل (بدون القفل وملف التفريغ)."""
+
+    print("🧪 اختبار التسلسل")
+    print("=" * 50)
+
+    try:
+        history = BoundedHistory(4, aggregates={'score': itemgetter('score')})
+        history.extend({'score': value} for value in (1, 2, 3, 4, 5))
+        restored = pickle.loads(pickle.dumps(history))
+        assert restored.to_list() == history.to_list()
+        assert restored.rolling('score') == history.rolling('score')
+        restored.append({'score': 9})
+        assert restored.rolling('score')['max'] == 9.0
+
+        print("✅ التسلسل يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار التسلسل: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات سجل التاريخ المحدود")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("السعة وواجهة القوائم", test_capacity_and_list_interface()),
+        ("المجاميع المتدحرجة", test_rolling_aggregates()),
+        ("التفريغ إلى القرص", test_spill_to_disk()),
+        ("التسلسل", test_pickling())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# test_cognitive_result_cache.py - اختبار ذاكرة النتائج المؤقتة للتفكير العميق
+
+import sys
+import os
+import time
+import threading
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .cognitive_result_cache import CognitiveResultCache, make_cache_key, normalize_cache_input
+from .self_developing_cognitive_ai import SelfDevelopingCognitiveAI
+
+
+def test_key_normalization():
+    """المدخلات المتكافئة تعطي المفتاح نفسه، والمختلفة (ولو في النوع) لا تتصادم."""
+
+    print("🧪 اختبار تطبيع المفاتيح")
+    print("=" * 50)
+
+    try:
+        assert make_cache_key({'b': 1, 'a': 2}) == make_cache_key({'a': 2, 'b': 1})
+        assert make_cache_key({'s': {2, 1}}) == make_cache_key({'s': {1, 2}})
+        assert make_cache_key("سؤال", 3) != make_cache_key("سؤال", 4)
+
+        # النوع جزء من المفتاح
+        distinct_inputs = [1, "1", 1.0, True, None, "null", {'a': 1}, {'a': '1'}, {1: 'a'}, {'1': 'a'},
+                           [1, 2], (1, 2), "[1, 2]"]
+        normalized = [normalize_cache_input(value) for value in distinct_inputs]
+        assert len(set(normalized)) == len(distinct_inputs)
+
+        # النصوص حرفية: المسافات داخلها جزء من المعنى
+        assert make_cache_key("ما معنى الحياة؟") != make_cache_key("ما  معنى\nالحياة؟")
+        assert make_cache_key("ما معنى الحياة؟") == make_cache_key("ما معنى الحياة؟")
+
+        print("✅ تطبيع المفاتيح يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار تطبيع المفاتيح: {e}")
+        return False
+
+
+def test_lru_ttl_and_byte_bound():
+    """الإخلاء بالأقدم استخداماً، وانتهاء الصلاحية، وحد الحجم بالبايت."""
+
+    print("🧪 اختبار الإخلاء وانتهاء الصلاحية")
+    print("=" * 50)
+
+    try:
+        cache = CognitiveResultCache(max_entries=2, max_bytes=10_000, ttl_seconds=None)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == (True, 1)      # a أصبح الأحدث استخداماً
+        cache.put('c', 3)                        # يُخلي b
+        assert cache.get('b') == (False, None)
+        assert cache.get('c') == (True, 3)
+        assert cache.get_cache_statistics()['evictions'] == 1
+
+        # حد البايت
+        small_cache = CognitiveResultCache(max_entries=100, max_bytes=300, ttl_seconds=None)
+        small_cache.put('big', 'x' * 1000)
+        assert small_cache.get('big') == (False, None)
+        assert small_cache.get_cache_statistics()['oversized_rejections'] == 1
+        for index in range(10):
+            small_cache.put(f"k{index}", 'y' * 50)
+        assert small_cache.current_bytes <= 300
+
+        # انتهاء الصلاحية
+        ttl_cache = CognitiveResultCache(ttl_seconds=0.01)
+        ttl_cache.put('t', 'قيمة')
+        time.sleep(0.02)
+        assert ttl_cache.get('t') == (False, None)
+        assert ttl_cache.get_cache_statistics()['expirations'] == 1
+
+        print("✅ الإخلاء وانتهاء الصلاحية يعملان بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الإخلاء: {e}")
+        return False
+
+
+def test_cached_values_are_isolated():
+    """تعديل القيمة المخزنة أو المسترجعة لا يغير ما في الذاكرة."""
+
+    print("🧪 اختبار استقلال القيم المخزنة")
+    print("=" * 50)
+
+    try:
+        cache = CognitiveResultCache(ttl_seconds=None)
+        result = {'phases': [{'quality': 0.5}], 'from_cache': False}
+        cache.put('r', result)
+        result['phases'][0]['quality'] = 0.0          # تعديل الأصل بعد التخزين
+
+        _, first = cache.get('r')
+        first['phases'].append({'quality': 1.0})       # تعديل النسخة المسترجعة
+        first['from_cache'] = True
+        _, second = cache.get('r')
+        assert second == {'phases': [{'quality': 0.5}], 'from_cache': False}
+        assert second is not first
+
+        # القيم غير القابلة للتسلسل تُنسخ نسخاً عميقاً، وما يتعذر نسخه لا يُخزن
+        callback_holder = {'callback': lambda: 1, 'items': [1]}
+        cache.put('u', callback_holder)
+        _, restored = cache.get('u')
+        restored['items'].append(2)
+        assert cache.get('u')[1]['items'] == [1]
+        assert not cache.put('lock', {'lock': threading.Lock()})
+        assert cache.get_cache_statistics()['uncopyable_rejections'] == 1
+
+        print("✅ القيم المخزنة مستقلة عن النسخ المسترجعة")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار استقلال القيم: {e}")
+        return False
+
+
+def test_phase_invalidation():
+    """
+    المراحل تبقى صالحة بين الاستدعاءات؛ التطوير الذاتي يبطل مراحل ما بعده فقط
+    (المراحل السابقة له تُستعاد حتى مع التطوير في كل استدعاء).
+    """
+
+    print("🧪 اختبار إبطال المراحل بعد التطوير")
+    print("=" * 50)
+
+    try:
+        # كائن خفيف دون تهيئة المحركات: المراحل تُحسب بدوال عدّادة
+        cognitive_ai = SelfDevelopingCognitiveAI.__new__(SelfDevelopingCognitiveAI)
+        cognitive_ai.result_cache = CognitiveResultCache()
+        cognitive_ai.development_generation = 0
+
+        calls = {'initial_thinking': 0, 'semantic_analysis': 0}
+
+        def _run_phases():
+            for phase_name in calls:
+                def _compute(phase_name=phase_name):
+                    calls[phase_name] += 1
+                    return phase_name
+                cognitive_ai._run_cached_phase(phase_name, True, "ما هو الإبداع؟", 3, _compute)
+
+        _run_phases()
+        _run_phases()
+        assert calls == {'initial_thinking': 1, 'semantic_analysis': 1}
+
+        cognitive_ai.development_generation += 1     # ما يفعله _perform_self_development
+        _run_phases()
+        assert calls == {'initial_thinking': 1, 'semantic_analysis': 2}
+
+        phases = cognitive_ai.result_cache.get_cache_statistics()['phases']
+        assert phases['initial_thinking'] == {'hits': 2, 'misses': 1}
+        assert phases['semantic_analysis'] == {'hits': 1, 'misses': 2}
+
+        print("✅ التطوير الذاتي أبطل مراحل ما بعده فقط")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار إبطال المراحل: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات ذاكرة النتائج المؤقتة")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("تطبيع المفاتيح", test_key_normalization()),
+        ("الإخلاء وانتهاء الصلاحية", test_lru_ttl_and_byte_bound()),
+        ("استقلال القيم المخزنة", test_cached_values_are_isolated()),
+        ("إبطال المراحل بعد التطوير", test_phase_invalidation())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -232,7 +232,7 @@ def test_complete_integrated_system():
         print("📊 اختبار 6: حالة النظام الشاملة")
         print("-" * 60)
         
-        system_status = cognitive_ai.get_system_status()
+        system_status = cognitive_ai.get_system_status(build_pending_components=True)
         
         print(f"🧠 النواة المعرفية:")
         cognitive_stats = system_status['cognitive_core_status']
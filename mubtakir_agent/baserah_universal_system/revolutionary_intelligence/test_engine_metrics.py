@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# test_engine_metrics.py - اختبار مقاييس المحركات
+
+import sys
+import os
+import time
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .engine_metrics import MetricsRegistry, instrumented
+
+
+def test_disabled_is_noop():
+    """السجل المعطل لا يسجل شيئاً والدوال المزخرفة تعمل كما هي."""
+
+    print("🧪 اختبار السجل المعطل")
+    print("=" * 50)
+
+    try:
+        registry = MetricsRegistry()
+
+        @instrumented('work_seconds', registry=registry)
+        def work(value):
+            return value * 2
+
+        assert work(21) == 42
+        with registry.timed('block_seconds'):
+            pass
+        registry.count('events_total')
+        registry.observe('sizes', 3)
+        assert registry.render_prometheus() == ''
+        assert registry.get_statistics()['counters'] == {}
+
+        print("✅ السجل المعطل يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار السجل المعطل: {e}")
+        return False
+
+
+def test_timers_counters_histograms():
+    """المؤقتات والعدادات والمدرجات تُسجل بتسمياتها."""
+
+    print("🧪 اختبار المؤقتات والعدادات والمدرجات")
+    print("=" * 50)
+
+    try:
+        registry = MetricsRegistry(enabled=True)
+
+        @instrumented('phase_seconds', registry=registry, phase='slow')
+        def slow_phase():
+            time.sleep(0.01)
+
+        @instrumented('phase_seconds', registry=registry, phase='failing')
+        def failing_phase():
+            raise RuntimeError("فشل")
+
+        slow_phase()
+        slow_phase()
+        try:
+            failing_phase()
+        except RuntimeError:
+            pass
+        registry.count('lookups_total', 3, result='hit')
+        registry.count('lookups_total', result='hit')
+
+        statistics = registry.get_statistics()
+        slow = statistics['histograms']['phase_seconds']['phase=slow']
+        assert slow['count'] == 2 and slow['sum'] >= 0.02 and slow['max'] >= 0.01
+        assert statistics['histograms']['phase_seconds']['phase=failing']['count'] == 1
+        assert statistics['counters']['lookups_total']['result=hit'] == 4
+
+        try:
+            registry.observe('lookups_total', 1.0)
+            raise AssertionError("تسجيل عداد كمدرج لم يرفع ValueError")
+        except ValueError:
+            pass
+
+        print("✅ المؤقتات والعدادات والمدرجات تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار التسجيل: {e}")
+        return False
+
+
+def test_prometheus_exposition():
+    """صيغة Prometheus النصية: HELP/TYPE، حدود تراكمية، مجموع وعدد، وتهريب التسميات."""
+
+    print("🧪 اختبار تصدير Prometheus")
+    print("=" * 50)
+
+    try:
+        registry = MetricsRegistry(namespace="baserah", enabled=True)
+        registry.describe('request_seconds', "زمن الطلب", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            registry.observe('request_seconds', value, endpoint='/api/info')
+        registry.count('requests_total', endpoint='a"b')
+
+        lines = registry.render_prometheus().splitlines()
+        assert '# TYPE baserah_requests_total counter' in lines
+        assert 'baserah_requests_total{endpoint="a\\"b"} 1' in lines
+        assert '# HELP baserah_request_seconds زمن الطلب' in lines
+        assert '# TYPE baserah_request_seconds histogram' in lines
+        assert 'baserah_request_seconds_bucket{endpoint="/api/info",le="0.1"} 1' in lines
+        assert 'baserah_request_seconds_bucket{endpoint="/api/info",le="1"} 2' in lines
+        assert 'baserah_request_seconds_bucket{endpoint="/api/info",le="+Inf"} 3' in lines
+        assert 'baserah_request_seconds_sum{endpoint="/api/info"} 5.55' in lines
+        assert 'baserah_request_seconds_count{endpoint="/api/info"} 3' in lines
+
+        registry.reset()
+        assert registry.render_prometheus() == ''
+
+        print("✅ تصدير Prometheus يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار تصدير Prometheus: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات مقاييس المحركات")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("السجل المعطل", test_disabled_is_noop()),
+        ("المؤقتات والعدادات والمدرجات", test_timers_counters_histograms()),
+        ("تصدير Prometheus", test_prometheus_exposition())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
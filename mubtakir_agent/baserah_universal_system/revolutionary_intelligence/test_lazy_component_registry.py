@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# test_lazy_component_registry.py - اختبار سجل المكونات الكسولة
+
+import sys
+import os
+import threading
+import time
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .lazy_component_registry import LazyComponent, LazyComponentRegistry, resolve_component
+
+
+class _CountingEngine:
+    """محرك وهمي يحسب عدد مرات إنشائه."""
+
+    instances_created = 0
+
+    def __init__(self, engine_name: str, creation_delay: float = 0.0):
+        time.sleep(creation_delay)
+        _CountingEngine.instances_created += 1
+        self.engine_name = engine_name
+        self.calls = 0
+
+    def analyze(self, value):
+        self.calls += 1
+        return f"{self.engine_name}:{value}"
+
+
+def test_lazy_creation_on_first_use():
+    """المكوّن لا يُنشأ إلا عند أول استخدام."""
+
+    print("🧪 اختبار الإنشاء عند أول استخدام")
+    print("=" * 50)
+
+    try:
+        _CountingEngine.instances_created = 0
+        registry = LazyComponentRegistry("TestRegistry")
+        engine = registry.register('engine', lambda: _CountingEngine("LazyEngine"))
+
+        assert _CountingEngine.instances_created == 0
+        assert not engine.is_loaded
+        assert registry.pending_components() == ['engine']
+
+        assert engine.analyze("كلمة") == "LazyEngine:كلمة"
+        assert engine.is_loaded
+        assert engine.calls == 1
+        assert _CountingEngine.instances_created == 1
+
+        # تعيين الخصائص يمر إلى المكوّن الحقيقي
+        engine.calls = 10
+        assert registry.get('engine').calls == 10
+        assert resolve_component(engine) is registry.get('engine')
+        assert 'engine' in registry.get_registry_status()['load_times']
+
+        print("✅ الإنشاء الكسول يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الإنشاء الكسول: {e}")
+        return False
+
+
+def test_thread_safe_single_construction():
+    """الوصول المتزامن من عدة خيوط يُنشئ المكوّن مرة واحدة فقط."""
+
+    print("🧪 اختبار أمان الخيوط")
+    print("=" * 50)
+
+    try:
+        _CountingEngine.instances_created = 0
+        component = LazyComponent('slow_engine', lambda: _CountingEngine("SlowEngine", 0.05))
+        seen = []
+
+        def _worker():
+            seen.append(id(component.get_instance()))
+
+        threads = [threading.Thread(target=_worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert _CountingEngine.instances_created == 1
+        assert len(set(seen)) == 1
+
+        print("✅ المكوّن أُنشئ مرة واحدة رغم الوصول المتزامن")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار أمان الخيوط: {e}")
+        return False
+
+
+def test_warm_up():
+    """الإحماء المسبق لمجموعة محددة (متزامن وفي الخلفية)."""
+
+    print("🧪 اختبار الإحماء المسبق")
+    print("=" * 50)
+
+    try:
+        registry = LazyComponentRegistry("WarmUpRegistry")
+        for name in ('a', 'b', 'c'):
+            registry.register(name, lambda name=name: _CountingEngine(name))
+
+        registry.warm_up(['a'])
+        assert registry.loaded_components() == ['a']
+
+        thread = registry.warm_up(['b', 'unknown'], background=True)
+        assert thread is not None
+        registry.wait_for_warm_up(timeout=5)
+        assert sorted(registry.loaded_components()) == ['a', 'b']
+        assert registry.pending_components() == ['c']
+
+        # الحالة تحتوي مدخلاً لكل مكوّن مسجل، بما فيها غير المُنشأة
+        components = registry.get_registry_status()['components']
+        assert sorted(components) == ['a', 'b', 'c']
+        assert components['c'] == {'loaded': False}
+        assert components['a']['loaded'] and components['a']['load_time'] is not None
+
+        print("✅ الإحماء المسبق يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الإحماء: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات سجل المكونات الكسولة")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("الإنشاء عند أول استخدام", test_lazy_creation_on_first_use()),
+        ("أمان الخيوط", test_thread_safe_single_construction()),
+        ("الإحماء المسبق", test_warm_up())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# test_quranic_search_index.py - اختبار الفهرس المعكوس للبحث القرآني
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .quranic_search_index import QuranicSearchIndex, compute_text_fingerprint, intersect_postings
+from .arabic_lexicon_engine import create_lexicon_root_extractor
+
+SAMPLE_TEXT = {
+    "surahs": {
+        "1": {"name": "الفاتحة", "verses": {
+            "1": "بِسْمِ اللَّهِ الرَّحْمَٰنِ الرَّحِيمِ",
+            "2": "الْحَمْدُ لِلَّهِ رَبِّ الْعَالَمِينَ"
+        }},
+        "113": {"name": "الفلق", "verses": {
+            "1": "قُلْ أَعُوذُ بِرَبِّ الْفَلَقِ",
+            "2": "مِن شَرِّ مَا خَلَقَ"
+        }}
+    }
+}
+
+
+def _build_index() -> QuranicSearchIndex:
+    return QuranicSearchIndex.build(SAMPLE_TEXT, create_lexicon_root_extractor().extract_root)
+
+
+def test_word_and_partial_search():
+    """البحث بالكلمة (تقاطع القوائم) والبحث الجزئي (مع التحقق)."""
+
+    print("🧪 اختبار البحث بالكلمة والبحث الجزئي")
+    print("=" * 50)
+
+    try:
+        index = _build_index()
+        assert index.clean_texts[0] == "بسم الله الرحمن الرحيم"
+        assert index.search_words("الرحيم") == [0]
+        assert index.search_words("قل اعوذ") == []          # أعوذ بالهمزة في النص
+        assert index.search_words("قل أعوذ") == [2]
+        assert index.search_partial("رب") == [1, 2]
+        assert index.search_partial("رب الف") == [2]         # يمتد عبر كلمتين
+        assert index.search_partial("لله رب") == [1]
+        assert intersect_postings([[1, 3, 5], [3, 5, 7], [5]]) == [5]
+
+        print("✅ البحث بالكلمة والبحث الجزئي يعملان بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار البحث: {e}")
+        return False
+
+
+def test_root_search():
+    """قائمة الجذور مبنية بنفس قواعد المعجم."""
+
+    print("🧪 اختبار البحث بالجذر")
+    print("=" * 50)
+
+    try:
+        index = _build_index()
+        root = create_lexicon_root_extractor().extract_root("الحمد")
+        assert index.search_root(root) == [1]
+        assert index.search_root("غير_موجود") == []
+
+        print("✅ البحث بالجذر يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار البحث بالجذر: {e}")
+        return False
+
+
+def test_persistence_and_fingerprint():
+    """الفهرس المحفوظ يُحمّل فقط إذا طابقت البصمة النص الحالي."""
+
+    print("🧪 اختبار حفظ الفهرس وبصمته")
+    print("=" * 50)
+
+    try:
+        index = _build_index()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index_path = os.path.join(temp_dir, "quran_search_index.json")
+            index.save(index_path)
+
+            loaded = QuranicSearchIndex.load(index_path, compute_text_fingerprint(SAMPLE_TEXT))
+            assert loaded is not None and loaded.loaded_from_disk
+            assert loaded.verse_refs == index.verse_refs
+            assert loaded.search_partial("رب الف") == [2]
+
+            changed_text = {"surahs": {"1": {"verses": {"1": "نص مختلف"}}}}
+            assert QuranicSearchIndex.load(index_path, compute_text_fingerprint(changed_text)) is None
+
+        print("✅ حفظ الفهرس وبصمته يعملان بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار حفظ الفهرس: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات الفهرس المعكوس للبحث القرآني")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("البحث بالكلمة والبحث الجزئي", test_word_and_partial_search()),
+        ("البحث بالجذر", test_root_search()),
+        ("حفظ الفهرس وبصمته", test_persistence_and_fingerprint())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
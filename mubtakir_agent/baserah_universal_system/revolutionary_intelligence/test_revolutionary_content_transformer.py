@@ -342,7 +342,7 @@ def test_integrated_cognitive_content_system():
         print("📊 حالة النظام المتكامل مع تحويل المحتوى")
         print("-" * 50)
         
-        system_status = cognitive_ai.get_system_status()
+        system_status = cognitive_ai.get_system_status(build_pending_components=True)
         
         print(f"🧠 النواة المعرفية:")
         cognitive_stats = system_status['cognitive_core_status']
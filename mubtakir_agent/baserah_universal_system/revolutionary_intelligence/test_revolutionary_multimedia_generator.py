@@ -298,7 +298,7 @@ def test_integrated_cognitive_multimedia_system():
         print("📊 حالة النظام المتكامل مع توليد الوسائط المتعددة")
         print("-" * 50)
         
-        system_status = cognitive_ai.get_system_status()
+        system_status = cognitive_ai.get_system_status(build_pending_components=True)
         
         print(f"🧠 النواة المعرفية:")
         cognitive_stats = system_status['cognitive_core_status']
@@ -69,6 +69,12 @@ try:
         AgentCapabilityLevel
     )
     
+    from .agent_task_scheduler import (
+        AgentTaskScheduler,
+        SchedulerConfig,
+        SchedulerQueueFullError
+    )
+    
     from .content_generation_helpers import BaserahContentGenerator
     
     # قائمة الصادرات
@@ -88,6 +94,11 @@ try:
         'AgentTaskType',
         'AgentCapabilityLevel',
         
+        # مجدول المهام
+        'AgentTaskScheduler',
+        'SchedulerConfig',
+        'SchedulerQueueFullError',
+        
         # مولد المحتوى
         'BaserahContentGenerator',
         
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# agent_task_scheduler.py - مجدول المهام غير المتزامن للوكيل المساعد الثوري
+# طوابير أولوية لكل نوع مهمة، حدود تزامن، تفريغ المهام الحسابية لمجمع عمليات،
+# مهلة وإلغاء لكل مهمة، وضغط عكسي عند امتلاء الطابور
+
+import os
+import asyncio
+import heapq
+import itertools
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
+
+from .revolutionary_agent_core import (
+    AgentTask, AgentResponse, AgentTaskType, AgentCapabilityLevel
+)
+
+
+class SchedulerQueueFullError(RuntimeError):
+    """يُرفع عند امتلاء طابور المهام وطلب الإرسال بدون انتظار."""
+
+
+@dataclass
+class SchedulerConfig:
+    """إعدادات مجدول مهام الوكيل."""
+    max_concurrent_tasks: int = 4
+    max_queue_size: int = 256
+    per_type_limits: Dict[AgentTaskType, int] = field(default_factory=dict)
+    default_timeout: Optional[float] = 300.0
+    task_timeouts: Dict[AgentTaskType, float] = field(default_factory=dict)
+    cpu_bound_task_types: Set[AgentTaskType] = field(default_factory=lambda: {
+        AgentTaskType.MATHEMATICAL_SOLVING,
+        AgentTaskType.MULTIMEDIA_GENERATION
+    })
+    use_process_pool: bool = True
+    process_workers: int = max(1, (os.cpu_count() or 2) - 1)
+    thread_workers: int = 8
+    # دالة على مستوى الوحدة (قابلة للتسلسل) تبني وكيل كل عملية عامل: (agent_name, capability_level) -> وكيل
+    worker_factory: Optional[Callable[[str, AgentCapabilityLevel], Any]] = None
+
+
+@dataclass(order=True)
+class _QueuedTask:
+    """عنصر في طابور الأولوية: الأولوية الأعلى أولاً ثم ترتيب الوصول."""
+    sort_key: Tuple[int, int]
+    task: AgentTask = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+# === تنفيذ المهام داخل عمليات العمال ===
+
+_worker_agent = None
+
+
+def _build_worker_agent(agent_name: str, capability_level: AgentCapabilityLevel):
+    """المصنع الافتراضي لوكيل العامل: نواة وكيل كاملة."""
+    from .revolutionary_agent_core import RevolutionaryAgentCore
+    return RevolutionaryAgentCore(agent_name, capability_level)
+
+
+def _init_process_worker(agent_name: str, capability_level: AgentCapabilityLevel,
+                         worker_factory: Optional[Callable] = None):
+    """تهيئة وكيل محلي مرة واحدة في كل عملية عامل."""
+    global _worker_agent
+    _worker_agent = (worker_factory or _build_worker_agent)(f"{agent_name}_worker", capability_level)
+
+
+def _execute_in_process(task: AgentTask) -> AgentResponse:
+    """تنفيذ مهمة على وكيل العامل (داخل عملية منفصلة)."""
+    return asyncio.run(_worker_agent.execute_task(task))
+
+
+def _execute_in_thread(agent, task: AgentTask) -> AgentResponse:
+    """تنفيذ مهمة على الوكيل الرئيسي داخل خيط منفصل حتى لا تُحجب حلقة الأحداث."""
+    return asyncio.run(agent.execute_task(task))
+
+
+class AgentTaskScheduler:
+    """
+    مجدول مهام الوكيل المساعد الثوري.
+
+    - طابور أولوية مستقل لكل AgentTaskType (الأولوية 10 أولاً)
+    - حد عام للتزامن وحدود اختيارية لكل نوع
+    - المهام الحسابية الثقيلة تُنفذ في مجمع عمليات، والباقي في مجمع خيوط
+    - مهلة لكل مهمة وإمكانية الإلغاء سواء كانت في الطابور أو قيد التنفيذ
+      (المهلة والإلغاء يحرران مكان المهمة فوراً، لكن العامل الجاري يكمل في الخلفية)
+    - ضغط عكسي: الإرسال ينتظر (أو يرفض) عند امتلاء الطابور
+    """
+
+    def __init__(self, agent, config: Optional[SchedulerConfig] = None):
+        """تهيئة المجدول للوكيل المعطى."""
+        self.agent = agent
+        self.config = config or SchedulerConfig()
+
+        self._queues: Dict[AgentTaskType, List[_QueuedTask]] = {task_type: [] for task_type in AgentTaskType}
+        self._queued_count = 0
+        self._sequence = itertools.count()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_per_type: Counter = Counter()
+        self._pending: Dict[str, _QueuedTask] = {}
+
+        self._condition: Optional[asyncio.Condition] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+        self.scheduler_stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'cancelled': 0,
+            'rejected': 0,
+            'offloaded_to_processes': 0
+        }
+
+    # === دورة الحياة ===
+
+    async def start(self):
+        """تشغيل حلقة التوزيع وإنشاء مجمعات التنفيذ."""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+
+        # مجمعات تشغيل سابق انتهت حلقته دون stop() (مثل إغلاق حلقة الأحداث)
+        self._shutdown_pools(wait=False)
+
+        self._condition = asyncio.Condition()
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=self.config.thread_workers,
+            thread_name_prefix=f"{self.agent.agent_name}_task"
+        )
+        if self.config.use_process_pool and self.config.cpu_bound_task_types:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.config.process_workers,
+                initializer=_init_process_worker,
+                initargs=(self.agent.agent_name, self.agent.capability_level, self.config.worker_factory)
+            )
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        self.agent.logger.info(
+            f"🗓️ تم تشغيل مجدول المهام (تزامن: {self.config.max_concurrent_tasks}, "
+            f"طابور: {self.config.max_queue_size})"
+        )
+
+    async def stop(self, wait: bool = True):
+        """إيقاف المجدول؛ ينتظر المهام الجارية أو يلغيها، ويلغي المهام المنتظرة."""
+        if self._dispatcher is None:
+            return
+
+        for task_id in list(self._pending):
+            await self.cancel_task(task_id)
+
+        running = list(self._running.values())
+        if not wait:
+            for runner in running:
+                runner.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+        self._dispatcher = None
+
+        self._shutdown_pools(wait=wait)
+
+    def _shutdown_pools(self, wait: bool):
+        """إغلاق مجمعي الخيوط والعمليات إن وُجدا."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+
+    # === الإرسال والإلغاء ===
+
+    async def submit(self, task: AgentTask, block: bool = True) -> asyncio.Future:
+        """
+        إرسال مهمة للمجدول.
+
+        Args:
+            task: المهمة المراد جدولتها
+            block: انتظار توفر مكان عند امتلاء الطابور بدلاً من رفع SchedulerQueueFullError
+
+        Returns:
+            asyncio.Future: تكتمل باستجابة الوكيل AgentResponse
+        """
+        await self.start()
+
+        async with self._condition:
+            if self._queued_count >= self.config.max_queue_size:
+                if not block:
+                    self.scheduler_stats['rejected'] += 1
+                    raise SchedulerQueueFullError(
+                        f"طابور المهام ممتلئ ({self.config.max_queue_size})"
+                    )
+                await self._condition.wait_for(
+                    lambda: self._queued_count < self.config.max_queue_size
+                )
+
+            entry = _QueuedTask(
+                sort_key=(-task.priority, next(self._sequence)),
+                task=task,
+                future=asyncio.get_running_loop().create_future()
+            )
+            heapq.heappush(self._queues[task.task_type], entry)
+            self._pending[task.task_id] = entry
+            self._queued_count += 1
+            self.agent.task_queue.append(task)
+            self.scheduler_stats['submitted'] += 1
+            self._condition.notify_all()
+
+        return entry.future
+
+    async def run_task(self, task: AgentTask, block: bool = True) -> AgentResponse:
+        """إرسال مهمة وانتظار استجابتها."""
+        return await (await self.submit(task, block=block))
+
+    async def cancel_task(self, task_id: str) -> bool:
+        """إلغاء مهمة في الطابور أو قيد التنفيذ."""
+        entry = self._pending.pop(task_id, None)
+        if entry is not None:
+            # تبقى في الكومة وتُتجاهل عند السحب لأن مستقبلها مكتمل
+            self._queued_count -= 1
+            self._remove_from_agent_queue(entry.task)
+            self.scheduler_stats['cancelled'] += 1
+            entry.future.set_result(self._failure_response(entry.task, "cancelled", "تم إلغاء المهمة قبل تنفيذها"))
+            async with self._condition:
+                self._condition.notify_all()
+            return True
+
+        runner = self._running.get(task_id)
+        if runner is not None:
+            runner.cancel()
+            return True
+
+        return False
+
+    # === التوزيع والتنفيذ ===
+
+    def _pop_next_ready(self) -> Optional[_QueuedTask]:
+        """سحب المهمة ذات الأولوية الأعلى من بين الأنواع التي لم تبلغ حدها."""
+        if len(self._running) >= self.config.max_concurrent_tasks:
+            return None
+
+        best_type = None
+        for task_type, queue in self._queues.items():
+            while queue and queue[0].future.done():
+                heapq.heappop(queue)  # مهام ملغاة
+            if not queue:
+                continue
+            limit = self.config.per_type_limits.get(task_type)
+            if limit is not None and self._running_per_type[task_type] >= limit:
+                continue
+            if best_type is None or queue[0] < self._queues[best_type][0]:
+                best_type = task_type
+
+        if best_type is None:
+            return None
+        return heapq.heappop(self._queues[best_type])
+
+    async def _dispatch_loop(self):
+        """حلقة توزيع المهام على المنفذين مع احترام حدود التزامن."""
+        while True:
+            async with self._condition:
+                entry = self._pop_next_ready()
+                while entry is None:
+                    await self._condition.wait()
+                    entry = self._pop_next_ready()
+
+                self._pending.pop(entry.task.task_id, None)
+                self._queued_count -= 1
+                self._remove_from_agent_queue(entry.task)
+                self._running_per_type[entry.task.task_type] += 1
+                self._running[entry.task.task_id] = asyncio.create_task(self._run_entry(entry))
+                # أصبح في الطابور مكان للمرسلين المنتظرين
+                self._condition.notify_all()
+
+    async def _run_entry(self, entry: _QueuedTask):
+        """تنفيذ مهمة واحدة مع المهلة ومعالجة الإلغاء."""
+        task = entry.task
+        loop = asyncio.get_running_loop()
+        timeout = task.metadata.get('timeout', self.config.task_timeouts.get(task.task_type, self.config.default_timeout))
+        in_process = self._process_pool is not None and task.task_type in self.config.cpu_bound_task_types
+
+        self.agent.active_tasks[task.task_id] = task
+        try:
+            if in_process:
+                self.scheduler_stats['offloaded_to_processes'] += 1
+                execution = loop.run_in_executor(self._process_pool, _execute_in_process, task)
+            else:
+                execution = loop.run_in_executor(self._thread_pool, _execute_in_thread, self.agent, task)
+
+            response = await asyncio.wait_for(execution, timeout)
+            self.scheduler_stats['completed' if response.success else 'failed'] += 1
+
+        except asyncio.TimeoutError:
+            self.scheduler_stats['timed_out'] += 1
+            response = self._failure_response(task, "timeout", f"تجاوزت المهمة المهلة المحددة ({timeout} ثانية)")
+        except asyncio.CancelledError:
+            self.scheduler_stats['cancelled'] += 1
+            response = self._failure_response(task, "cancelled", "تم إلغاء المهمة أثناء التنفيذ")
+        except Exception as e:
+            self.scheduler_stats['failed'] += 1
+            response = self._failure_response(task, "error_handling", str(e))
+        finally:
+            self.agent.active_tasks.pop(task.task_id, None)
+            self._running.pop(task.task_id, None)
+            self._running_per_type[task.task_type] -= 1
+
+        if in_process:
+            # الوكيل في العامل حدّث إحصائياته هو، فنسجل النتيجة (نجاحاً أو فشلاً) في الوكيل الرئيسي هنا
+            if response.success:
+                self.agent._record_completed_task(response)
+            else:
+                self.agent._record_failed_task(response)
+
+        if not entry.future.done():
+            entry.future.set_result(response)
+
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _failure_response(self, task: AgentTask, method: str, message: str) -> AgentResponse:
+        """إنشاء استجابة فشل موحدة للمهام الملغاة أو المتجاوزة للمهلة."""
+        self.agent.logger.warning(f"⚠️ لم تكتمل المهمة: {task.task_id} - {message}")
+        return AgentResponse(
+            task_id=task.task_id,
+            success=False,
+            result=None,
+            confidence_score=0.0,
+            execution_time=0.0,
+            method_used=method,
+            revolutionary_insights=[],
+            basil_theories_applied=[],
+            cognitive_analysis={},
+            error_message=message
+        )
+
+    def _remove_from_agent_queue(self, task: AgentTask):
+        try:
+            self.agent.task_queue.remove(task)
+        except ValueError:
+            pass
+
+    def get_scheduler_status(self) -> Dict[str, Any]:
+        """الحصول على حالة المجدول."""
+        return {
+            'running': self._dispatcher is not None and not self._dispatcher.done(),
+            'queued_tasks': self._queued_count,
+            'queued_by_type': {
+                task_type.value: sum(1 for entry in queue if not entry.future.done())
+                for task_type, queue in self._queues.items() if queue
+            },
+            'active_tasks': len(self._running),
+            'active_by_type': {
+                task_type.value: count for task_type, count in self._running_per_type.items() if count
+            },
+            'max_concurrent_tasks': self.config.max_concurrent_tasks,
+            'max_queue_size': self.config.max_queue_size,
+            'process_pool_enabled': self._process_pool is not None,
+            'statistics': dict(self.scheduler_stats)
+        }
@@ -1916,7 +1916,6 @@ if (typeof module !== 'undefined' && module.exports) {
     </script>
 </body>
 </html>'''
-'''
 
     @staticmethod
     def generate_yaml_config_content(project_idea: str) -> str:
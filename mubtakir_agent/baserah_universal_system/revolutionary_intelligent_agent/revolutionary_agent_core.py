@@ -6,6 +6,7 @@ import os
 import sys
 import json
 import asyncio
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
@@ -19,6 +20,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from revolutionary_intelligence.self_developing_cognitive_ai import SelfDevelopingCognitiveAI
 from revolutionary_intelligence.revolutionary_mother_equation import ConcreteRevolutionaryMotherEquation
 from revolutionary_intelligence.ai_oop_foundation import BaserahExpertExplorerFoundation
+from revolutionary_intelligence.bounded_history import BoundedHistory
 
 # استيراد النواة الفنية
 from artistic_intelligence.baserah_core import (
@@ -105,6 +107,9 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
     5. تحويل المحتوى والوسائط المتعددة
     6. منهج Baserah النقي (sigmoid + linear فقط)
     """
+
+    # سعة سجل المهام المكتملة (الأقدم يُخلى عند الامتلاء)
+    COMPLETED_TASKS_CAPACITY = 1000
     
     def __init__(self, agent_name: str = "RevolutionaryIntelligentAgent",
                  capability_level: AgentCapabilityLevel = AgentCapabilityLevel.REVOLUTIONARY,
@@ -129,6 +134,7 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
         # إحصائيات الوكيل
         self.agent_stats = {
             'tasks_completed': 0,
+            'tasks_failed': 0,
             'projects_created': 0,
             'files_generated': 0,
             'mathematical_problems_solved': 0,
@@ -160,11 +166,17 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
             'cognitive_enhancement': True
         }
         
-        # قائمة انتظار المهام
+        # قائمة انتظار المهام (غير محدودة: المهام المعلقة لا تُسقط، وحد الطابور في المجدول)
         self.task_queue: List[AgentTask] = []
-        self.completed_tasks: List[AgentResponse] = []
+        self.completed_tasks = BoundedHistory(self.COMPLETED_TASKS_CAPACITY)
         self.active_tasks: Dict[str, AgentTask] = {}
         
+        # قفل الإحصائيات وسجل المهام المكتملة: المجدول قد ينفذ execute_task في عدة خيوط معاً
+        self._bookkeeping_lock = threading.RLock()
+        
+        # مجدول المهام المتزامنة (يُنشأ عند أول استخدام)
+        self.task_scheduler = None
+        
         # إعداد نظام التسجيل
         self._setup_logging()
         
@@ -253,15 +265,11 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
                 metadata=result.get('metadata', {})
             )
             
-            # تحديث الإحصائيات
-            self._update_agent_statistics(response)
-            
-            # إضافة للمهام المكتملة
-            self.completed_tasks.append(response)
+            # تحديث الإحصائيات والإضافة للمهام المكتملة
+            self._record_completed_task(response)
             
             # إزالة من المهام النشطة
-            if task.task_id in self.active_tasks:
-                del self.active_tasks[task.task_id]
+            self.active_tasks.pop(task.task_id, None)
             
             self.logger.info(f"✅ اكتملت المهمة بنجاح: {task.task_id}")
             return response
@@ -284,12 +292,33 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
             )
             
             # إزالة من المهام النشطة
-            if task.task_id in self.active_tasks:
-                del self.active_tasks[task.task_id]
+            self.active_tasks.pop(task.task_id, None)
+            self._record_failed_task(error_response)
             
             self.logger.error(f"❌ فشلت المهمة: {task.task_id} - {e}")
             return error_response
     
+    def get_task_scheduler(self, config=None):
+        """
+        الحصول على مجدول المهام المتزامنة للوكيل (يُنشأ عند أول طلب).
+        
+        Args:
+            config: إعدادات SchedulerConfig اختيارية (تُطبق عند الإنشاء فقط)
+        """
+        
+        if self.task_scheduler is None:
+            from .agent_task_scheduler import AgentTaskScheduler
+            self.task_scheduler = AgentTaskScheduler(self, config)
+        return self.task_scheduler
+    
+    async def submit_task(self, task: AgentTask, block: bool = True) -> AgentResponse:
+        """
+        تنفيذ مهمة عبر المجدول بدلاً من تنفيذها مباشرة على حلقة الأحداث.
+        يسمح بخدمة عدة مستخدمين بالتوازي مع احترام الأولويات وحدود التزامن.
+        """
+        
+        return await self.get_task_scheduler().run_task(task, block=block)
+    
     def _determine_execution_method(self, task: AgentTask) -> str:
         """تحديد طريقة التنفيذ المناسبة للمهمة."""
         
@@ -893,8 +922,9 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
                     self.logger.error(error_msg)
 
             # تحديث الإحصائيات
-            self.agent_stats['projects_created'] += 1
-            self.agent_stats['files_generated'] += len(creation_results['files_created'])
+            with self._bookkeeping_lock:
+                self.agent_stats['projects_created'] += 1
+                self.agent_stats['files_generated'] += len(creation_results['files_created'])
 
             return creation_results
 
@@ -948,25 +978,39 @@ class RevolutionaryAgentCore(BaserahExpertExplorerFoundation):
         else:
             return f"# {file_path}\n# تم إنشاؤه بواسطة الوكيل المساعد الثوري\n# مشروع: {project_idea}\n"
 
+    def _record_completed_task(self, response: AgentResponse):
+        """تسجيل مهمة مكتملة: الإحصائيات وسجل المكتملة معاً تحت قفل واحد."""
+
+        with self._bookkeeping_lock:
+            self._update_agent_statistics(response)
+            self.completed_tasks.append(response)
+
+    def _record_failed_task(self, response: AgentResponse):
+        """تسجيل مهمة فاشلة في الإحصائيات (لا تدخل سجل المكتملة)."""
+
+        with self._bookkeeping_lock:
+            self.agent_stats['tasks_failed'] += 1
+
     def _update_agent_statistics(self, response: AgentResponse):
         """تحديث إحصائيات الوكيل."""
 
-        self.agent_stats['tasks_completed'] += 1
+        with self._bookkeeping_lock:
+            self.agent_stats['tasks_completed'] += 1
 
-        # تحديث متوسط الثقة
-        current_avg = self.agent_stats['average_confidence']
-        tasks_count = self.agent_stats['tasks_completed']
-        new_avg = ((current_avg * (tasks_count - 1)) + response.confidence_score) / tasks_count
-        self.agent_stats['average_confidence'] = new_avg
+            # تحديث متوسط الثقة
+            current_avg = self.agent_stats['average_confidence']
+            tasks_count = self.agent_stats['tasks_completed']
+            new_avg = ((current_avg * (tasks_count - 1)) + response.confidence_score) / tasks_count
+            self.agent_stats['average_confidence'] = new_avg
 
-        # تحديث متوسط وقت التنفيذ
-        current_avg_time = self.agent_stats['average_execution_time']
-        new_avg_time = ((current_avg_time * (tasks_count - 1)) + response.execution_time) / tasks_count
-        self.agent_stats['average_execution_time'] = new_avg_time
+            # تحديث متوسط وقت التنفيذ
+            current_avg_time = self.agent_stats['average_execution_time']
+            new_avg_time = ((current_avg_time * (tasks_count - 1)) + response.execution_time) / tasks_count
+            self.agent_stats['average_execution_time'] = new_avg_time
 
-        # تحديث الإحصائيات المتخصصة
-        self.agent_stats['total_revolutionary_insights'] += len(response.revolutionary_insights)
-        self.agent_stats['basil_theories_applications'] += len(response.basil_theories_applied)
+            # تحديث الإحصائيات المتخصصة
+            self.agent_stats['total_revolutionary_insights'] += len(response.revolutionary_insights)
+            self.agent_stats['basil_theories_applications'] += len(response.basil_theories_applied)
 
-        if response.cognitive_analysis:
-            self.agent_stats['cognitive_interactions'] += 1
+            if response.cognitive_analysis:
+                self.agent_stats['cognitive_interactions'] += 1
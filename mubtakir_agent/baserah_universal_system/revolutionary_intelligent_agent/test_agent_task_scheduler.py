@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# test_agent_task_scheduler.py - اختبار مجدول مهام الوكيل المساعد الثوري
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from .revolutionary_agent_core import RevolutionaryAgentCore, AgentTask, AgentTaskType, AgentResponse
+from .agent_task_scheduler import AgentTaskScheduler, SchedulerConfig, SchedulerQueueFullError
+
+
+class SleepingAgent:
+    """
+    وكيل خفيف ينام بالمدة المعطاة في input_data بدلاً من التفكير الفعلي.
+    يستخدم دوال التسجيل الحقيقية من RevolutionaryAgentCore (إنشاء الوكيل الكامل يتطلب كل المحركات).
+    """
+    agent_name = "SchedulerTestAgent"
+    capability_level = None
+
+    _record_completed_task = RevolutionaryAgentCore._record_completed_task
+    _record_failed_task = RevolutionaryAgentCore._record_failed_task
+    _update_agent_statistics = RevolutionaryAgentCore._update_agent_statistics
+
+    def __init__(self):
+        self.task_queue, self.completed_tasks, self.active_tasks = [], [], {}
+        self.logger = logging.getLogger(self.agent_name)
+        self.execution_order = []
+        self._bookkeeping_lock = threading.RLock()
+        self.agent_stats = {
+            'tasks_completed': 0,
+            'tasks_failed': 0,
+            'average_confidence': 0.0,
+            'average_execution_time': 0.0,
+            'total_revolutionary_insights': 0,
+            'basil_theories_applications': 0,
+            'cognitive_interactions': 0
+        }
+
+    async def execute_task(self, task):
+        self.execution_order.append(task.task_id)
+        time.sleep(task.input_data)
+        response = AgentResponse(task.task_id, True, None, 1.0, task.input_data,
+                                 "sleep", ["رؤية"], [], {'نوم': True})
+        self._record_completed_task(response)
+        return response
+
+
+class ArithmeticWorker:
+    """وكيل عامل حسابي خفيف يُبنى داخل عمليات المجمع؛ يجمع مربعات range(input_data)."""
+
+    def __init__(self, agent_name):
+        self.agent_name = agent_name
+
+    async def execute_task(self, task):
+        if task.input_data < 0:
+            return AgentResponse(task.task_id, False, None, 0.0, 0.0, "error_handling",
+                                 [], [], {}, error_message="مدخل سالب")
+        total = sum(i * i for i in range(task.input_data))
+        return AgentResponse(task.task_id, True, {'total': total, 'pid': os.getpid()}, 1.0, 0.0,
+                             "arithmetic", [], [], {})
+
+
+def build_arithmetic_worker(agent_name, capability_level):
+    """مصنع وكيل العامل للاختبار (على مستوى الوحدة ليقبل التسلسل)."""
+    return ArithmeticWorker(agent_name)
+
+
+async def test_concurrency_and_timeout():
+    """التنفيذ المتزامن والمهلة لكل مهمة."""
+
+    print("🧪 اختبار التزامن والمهلة")
+    print("=" * 50)
+
+    try:
+        agent = SleepingAgent()
+
+        # التزامن: 8 مهام × 0.2 ثانية بأربعة منفذين ≈ 0.4 ثانية
+        scheduler = AgentTaskScheduler(agent, SchedulerConfig(
+            max_concurrent_tasks=4, use_process_pool=False, default_timeout=0.5
+        ))
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            scheduler.run_task(AgentTask(f"t{i}", AgentTaskType.SEMANTIC_ANALYSIS, "نوم", 0.2))
+            for i in range(8)
+        ])
+        assert all(response.success for response in responses)
+        assert time.perf_counter() - start < 1.2
+
+        timed_out = await scheduler.run_task(AgentTask("slow", AgentTaskType.CODE_GENERATION, "نوم", 1.0))
+        assert not timed_out.success and timed_out.method_used == "timeout"
+        await scheduler.stop()
+
+        print("✅ التزامن والمهلة يعملان بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار التزامن والمهلة: {e}")
+        return False
+
+
+async def test_priority_cancel_backpressure():
+    """الأولوية والإلغاء والضغط العكسي بمنفذ واحد."""
+
+    print("🧪 اختبار الأولوية والإلغاء والضغط العكسي")
+    print("=" * 50)
+
+    try:
+        agent = SleepingAgent()
+        scheduler = AgentTaskScheduler(agent, SchedulerConfig(
+            max_concurrent_tasks=1, max_queue_size=4, use_process_pool=False
+        ))
+        blocker = await scheduler.submit(AgentTask("blocker", AgentTaskType.CODE_GENERATION, "نوم", 0.2))
+        await asyncio.sleep(0.05)
+        futures = [
+            await scheduler.submit(AgentTask(f"p{priority}", AgentTaskType.FILE_MANAGEMENT, "نوم", 0.0, priority=priority))
+            for priority in (1, 9, 5, 7)
+        ]
+        assert await scheduler.cancel_task("p5")
+        try:
+            await scheduler.submit(AgentTask("overflow", AgentTaskType.FILE_MANAGEMENT, "نوم", 0.0), block=False)
+            await scheduler.submit(AgentTask("rejected", AgentTaskType.FILE_MANAGEMENT, "نوم", 0.0), block=False)
+            raise AssertionError("كان يجب رفض المهمة عند امتلاء الطابور")
+        except SchedulerQueueFullError:
+            pass
+        await asyncio.gather(blocker, *futures)
+        assert agent.execution_order == ["blocker", "p9", "p7", "overflow", "p1"]
+        assert futures[2].result().method_used == "cancelled"
+        await scheduler.stop()
+
+        print("✅ الأولوية والإلغاء والضغط العكسي تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الأولوية: {e}")
+        return False
+
+
+async def test_concurrent_bookkeeping():
+    """إحصائيات الوكيل وسجل المكتملة متسقة عند تنفيذ المهام في عدة خيوط."""
+
+    print("🧪 اختبار اتساق الإحصائيات عبر الخيوط")
+    print("=" * 50)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # تبديل متكرر بين الخيوط لكشف أي تحديث غير محمي
+    try:
+        agent = SleepingAgent()
+        scheduler = AgentTaskScheduler(agent, SchedulerConfig(
+            max_concurrent_tasks=8, max_queue_size=512, thread_workers=8, use_process_pool=False
+        ))
+        # التسجيل يمر عبر القفل: لا يكتمل أثناء حجزه
+        with agent._bookkeeping_lock:
+            held = await scheduler.submit(AgentTask("held", AgentTaskType.SEMANTIC_ANALYSIS, "نوم", 0.0))
+            await asyncio.sleep(0.1)
+            assert not held.done() and agent.agent_stats['tasks_completed'] == 0
+        await held
+        assert agent.agent_stats['tasks_completed'] == 1
+
+        task_count = 400
+        responses = await asyncio.gather(*[
+            scheduler.run_task(AgentTask(f"b{i}", AgentTaskType.SEMANTIC_ANALYSIS, "نوم", 0.0))
+            for i in range(task_count)
+        ])
+        await scheduler.stop()
+        task_count += 1
+
+        assert all(response.success for response in responses)
+        assert agent.agent_stats['tasks_completed'] == task_count
+        assert len(agent.completed_tasks) == task_count
+        assert agent.agent_stats['total_revolutionary_insights'] == task_count
+        assert agent.agent_stats['cognitive_interactions'] == task_count
+        assert abs(agent.agent_stats['average_confidence'] - 1.0) < 1e-9
+
+        print("✅ الإحصائيات متسقة عبر الخيوط")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار اتساق الإحصائيات: {e}")
+        return False
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+async def test_process_pool_offload():
+    """المهام الحسابية تُنفذ في مجمع العمليات، وتُسجل نتائجها، ولا تتسرب المجمعات عند إعادة التشغيل."""
+
+    print("🧪 اختبار تفريغ المهام الحسابية لمجمع العمليات")
+    print("=" * 50)
+
+    try:
+        agent = SleepingAgent()
+        scheduler = AgentTaskScheduler(agent, SchedulerConfig(
+            use_process_pool=True, process_workers=1, worker_factory=build_arithmetic_worker
+        ))
+
+        solved = await scheduler.run_task(AgentTask("sum", AgentTaskType.MATHEMATICAL_SOLVING, "مربعات", 200000))
+        assert solved.success and solved.result['total'] == sum(i * i for i in range(200000))
+        assert solved.result['pid'] != os.getpid()
+        failed = await scheduler.run_task(AgentTask("negative", AgentTaskType.MATHEMATICAL_SOLVING, "مربعات", -1))
+        assert not failed.success
+        light = await scheduler.run_task(AgentTask("light", AgentTaskType.SEMANTIC_ANALYSIS, "نوم", 0.0))
+        assert light.success
+
+        assert scheduler.scheduler_stats['offloaded_to_processes'] == 2
+        assert agent.agent_stats['tasks_completed'] == 2
+        assert agent.agent_stats['tasks_failed'] == 1
+
+        # انتهاء حلقة التوزيع دون stop() ثم إعادة التشغيل: تُغلق المجمعات القديمة
+        old_pools = (scheduler._thread_pool, scheduler._process_pool)
+        scheduler._dispatcher.cancel()
+        await asyncio.gather(scheduler._dispatcher, return_exceptions=True)
+        await scheduler.start()
+        for pool in old_pools:
+            try:
+                pool.submit(int)
+                raise AssertionError("المجمع القديم ما زال يعمل بعد إعادة التشغيل")
+            except RuntimeError:
+                pass
+        again = await scheduler.run_task(AgentTask("again", AgentTaskType.MATHEMATICAL_SOLVING, "مربعات", 10))
+        assert again.success and again.result['total'] == 285
+        await scheduler.stop()
+        assert scheduler._thread_pool is None and scheduler._process_pool is None
+
+        print("✅ مجمع العمليات يعمل ويُغلق بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار مجمع العمليات: {e}")
+        return False
+
+
+async def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات مجدول مهام الوكيل")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("التزامن والمهلة", await test_concurrency_and_timeout()),
+        ("الأولوية والإلغاء والضغط العكسي", await test_priority_cancel_backpressure()),
+        ("اتساق الإحصائيات عبر الخيوط", await test_concurrent_bookkeeping()),
+        ("تفريغ المهام الحسابية لمجمع العمليات", await test_process_pool_offload())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_all_tests())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# load_generator.py - مولد حمل لقياس إنتاجية واجهات الويب و API وزمن الاستجابة
+#
+# 🧪 الاختبارات: عدد من العملاء المتزامنين (خيط لكل عميل باتصال دائم) يرسلون طلبات
+#    لمدة محددة أو عدداً محدداً، ثم يُحسب عدد الطلبات في الثانية ومئينات زمن الاستجابة
+# 🌟 النظام: Baserah Universal System
+#
+# الاستخدام:
+#     python load_generator.py --url http://127.0.0.1:8000/api/info --concurrency 32 --duration 10
+#     python load_generator.py --url http://127.0.0.1:8000/api/lexicon/search_root \
+#         --method POST --body '{"root": "كتب"}' --requests 5000
+
+import json
+import time
+import argparse
+import threading
+import http.client
+from collections import Counter
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# المئينات المبلغ عنها لزمن الاستجابة
+LATENCY_PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+class _ClientWorker(threading.Thread):
+    """عميل واحد باتصال دائم يسجل زمن كل طلب."""
+
+    def __init__(self, target: Dict[str, Any], stop_at: Optional[float],
+                 request_budget: Optional[List[int]], budget_lock: threading.Lock,
+                 timeout: float, keepalive: bool):
+        super().__init__(daemon=True)
+        self.target = target
+        self.stop_at = stop_at
+        self.request_budget = request_budget
+        self.budget_lock = budget_lock
+        self.timeout = timeout
+        self.keepalive = keepalive
+
+        self.latencies: List[float] = []
+        self.status_counts: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._connection: Optional[http.client.HTTPConnection] = None
+
+    def _take_request(self) -> bool:
+        if self.stop_at is not None and time.perf_counter() >= self.stop_at:
+            return False
+        if self.request_budget is None:
+            return True
+        with self.budget_lock:
+            if self.request_budget[0] <= 0:
+                return False
+            self.request_budget[0] -= 1
+            return True
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._connection is None:
+            connection_class = (http.client.HTTPSConnection if self.target['scheme'] == 'https'
+                                else http.client.HTTPConnection)
+            self._connection = connection_class(self.target['host'], self.target['port'],
+                                                timeout=self.timeout)
+        return self._connection
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def run(self):
+        target = self.target
+        while self._take_request():
+            start_time = time.perf_counter()
+            try:
+                connection = self._connect()
+                connection.request(target['method'], target['path'], body=target['body'],
+                                   headers=target['headers'])
+                response = connection.getresponse()
+                response.read()
+                self.latencies.append(time.perf_counter() - start_time)
+                self.status_counts[response.status] += 1
+                if not self.keepalive or response.will_close:
+                    self._close()
+            except (OSError, http.client.HTTPException) as e:
+                self.errors[type(e).__name__] += 1
+                self._close()
+        self._close()
+
+
+def run_load(url: str, method: str = "GET", body: Optional[str] = None,
+             concurrency: int = 16, duration: Optional[float] = 10.0,
+             total_requests: Optional[int] = None, timeout: float = 30.0,
+             keepalive: bool = True, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """تشغيل الحمل وإرجاع الإنتاجية ومئينات زمن الاستجابة."""
+
+    parts = urlsplit(url)
+    request_headers = {'Connection': 'keep-alive' if keepalive else 'close'}
+    encoded_body = None
+    if body is not None:
+        encoded_body = body.encode('utf-8')
+        request_headers['Content-Type'] = 'application/json'
+    request_headers.update(headers or {})
+
+    target = {
+        'scheme': parts.scheme or 'http',
+        'host': parts.hostname or '127.0.0.1',
+        'port': parts.port or (443 if parts.scheme == 'https' else 80),
+        'path': (parts.path or '/') + (f"?{parts.query}" if parts.query else ''),
+        'method': method.upper(),
+        'body': encoded_body,
+        'headers': request_headers
+    }
+
+    request_budget = [total_requests] if total_requests else None
+    stop_at = time.perf_counter() + duration if duration and not total_requests else None
+    budget_lock = threading.Lock()
+    workers = [_ClientWorker(target, stop_at, request_budget, budget_lock, timeout, keepalive)
+               for _ in range(concurrency)]
+
+    start_time = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start_time
+
+    latencies = np.array([latency for worker in workers for latency in worker.latencies])
+    status_counts = sum((worker.status_counts for worker in workers), Counter())
+    errors = sum((worker.errors for worker in workers), Counter())
+
+    result = {
+        'url': url,
+        'method': target['method'],
+        'concurrency': concurrency,
+        'elapsed_seconds': elapsed,
+        'completed_requests': int(latencies.size),
+        'requests_per_second': latencies.size / elapsed if elapsed else 0.0,
+        'status_counts': {str(status): count for status, count in sorted(status_counts.items())},
+        'errors': dict(errors)
+    }
+    if latencies.size:
+        latencies_ms = latencies * 1000
+        result['latency_ms'] = {
+            'mean': float(latencies_ms.mean()),
+            **{f"p{percentile:g}": float(value) for percentile, value in
+               zip(LATENCY_PERCENTILES, np.percentile(latencies_ms, LATENCY_PERCENTILES))},
+            'max': float(latencies_ms.max())
+        }
+    return result
+
+
+def print_report(result: Dict[str, Any]):
+    """طباعة ملخص القياس."""
+
+    print(f"🎯 {result['method']} {result['url']} ({result['concurrency']} عميل متزامن)")
+    print(f"   ✅ طلبات مكتملة: {result['completed_requests']} في {result['elapsed_seconds']:.2f} ثانية")
+    print(f"   ⚡ الإنتاجية: {result['requests_per_second']:.1f} طلب/ثانية")
+    if 'latency_ms' in result:
+        latency = result['latency_ms']
+        percentiles = " | ".join(f"{name} {value:.2f}" for name, value in latency.items())
+        print(f"   ⏱️ زمن الاستجابة (ms): {percentiles}")
+    print(f"   📊 رموز الحالة: {result['status_counts']}")
+    if result['errors']:
+        print(f"   ❌ أخطاء: {result['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مولد حمل لواجهات النظام الثوري")
+    parser.add_argument('--url', default="http://127.0.0.1:8000/api/info")
+    parser.add_argument('--method', default="GET")
+    parser.add_argument('--body', help="جسم JSON للطلب")
+    parser.add_argument('--concurrency', type=int, default=16, help="عدد العملاء المتزامنين")
+    parser.add_argument('--duration', type=float, default=10.0, help="مدة القياس بالثواني")
+    parser.add_argument('--requests', type=int, help="عدد الطلبات الكلي (بدلاً من المدة)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="مهلة الطلب بالثواني")
+    parser.add_argument('--no-keepalive', action='store_true', help="اتصال جديد لكل طلب")
+    parser.add_argument('--json', help="حفظ النتائج في ملف JSON")
+    args = parser.parse_args()
+
+    result = run_load(args.url, args.method, args.body, args.concurrency, args.duration,
+                      args.requests, args.timeout, not args.no_keepalive)
+    print_report(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 تم حفظ النتائج في: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# startup_benchmark.py - قياس زمن الإقلاع البارد للوكيل والواجهات
+#
+# 🧪 الاختبارات: يقيس زمن إنشاء الوكيل الذكي وواجهتي الويب وAPI في عملية جديدة
+#    لكل تشغيل (إقلاع بارد حقيقي)، مع المقارنة بين الإنشاء الكسول والإحماء الكامل
+#    الهدف cognitive_engines يقيس سجل المحركات نفسه (register_cognitive_engines) دون بقية النظام،
+#    والهدف الذي لا يمكن إنشاؤه في الشجرة الحالية يُبلغ عن سبب فشله بدلاً من توقف القياس
+# 🌟 النظام: Baserah Universal System
+
+import sys
+import os
+import json
+import time
+import argparse
+import textwrap
+import subprocess
+import statistics
+from typing import Dict, List, Any
+
+SYSTEM_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# كل هدف: شيفرة الاستيراد + شيفرة الإنشاء (تُقاس كل منهما على حدة)
+BENCHMARK_TARGETS = {
+    'cognitive_engines': (
+        "from revolutionary_intelligence.self_developing_cognitive_ai import register_cognitive_engines\n"
+        "from revolutionary_intelligence.lazy_component_registry import LazyComponentRegistry\n"
+        "from revolutionary_intelligence.hierarchical_inheritance_system import BaserahHierarchicalInheritanceSystem",
+        "_mother = BaserahHierarchicalInheritanceSystem().mother_equation.generate_inheritance_package("
+        "'StartupBenchmarkEngines')\n"
+        "_instance = LazyComponentRegistry('StartupBenchmarkEngines')\n"
+        "register_cognitive_engines(_instance, _mother)\n"
+        "if {preload}:\n"
+        "    _instance.warm_up({preload})"
+    ),
+    'cognitive_ai': (
+        "from revolutionary_intelligence.self_developing_cognitive_ai import SelfDevelopingCognitiveAI",
+        "_instance = SelfDevelopingCognitiveAI('StartupBenchmarkCognitiveAI', preload_components={preload})"
+    ),
+    'agent': (
+        "from revolutionary_intelligent_agent.revolutionary_agent_core import RevolutionaryAgentCore",
+        "_instance = RevolutionaryAgentCore('StartupBenchmarkAgent')"
+    ),
+    'api_interface': (
+        "BaserahAPIInterface = _load_file('user_interfaces/api_interface.py').BaserahAPIInterface",
+        "_instance = BaserahAPIInterface(preload_components={preload})"
+    ),
+    'web_interface': (
+        "BaserahWebInterface = _load_file('user_interfaces/web_interface.py').BaserahWebInterface",
+        "_instance = BaserahWebInterface(preload_components={preload})"
+    )
+}
+
+# قائمة الإحماء الكامل لكل هدف (None = لا يدعم الإحماء)
+COGNITIVE_ENGINES = [
+    'innovative_model', 'arabic_model', 'semantic_meaning_engine',
+    'dream_interpretation_engine', 'revolutionary_code_generator',
+    'revolutionary_multimedia_generator', 'intelligent_visual_inference_engine',
+    'revolutionary_content_transformer', 'advanced_mathematical_engine'
+]
+FULL_PRELOAD = {
+    'cognitive_engines': COGNITIVE_ENGINES,
+    'cognitive_ai': COGNITIVE_ENGINES,
+    'agent': None,
+    'api_interface': ['quranic_engine', 'lexicon_engine', 'intelligent_agent'],
+    'web_interface': ['quranic_engine', 'lexicon_engine', 'intelligent_agent', 'mathematical_engine']
+}
+
+# ملفات الواجهات تُحمّل بالمسار لأن الحزم user_interfaces/api_interface/ و web_interface/ تحجبها
+CHILD_TEMPLATE = """
+import sys, os, io, time, json, contextlib, importlib.util
+sys.path.insert(0, {root!r})
+
+def _load_file(relative_path):
+    path = os.path.join({root!r}, relative_path)
+    module_name = os.path.splitext(os.path.basename(path))[0] + '_startup_benchmark'
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{import_code}
+_imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{construct_code}
+_constructed = time.perf_counter()
+
+# المكونات التي أُنشئت فعلاً (الإحماء يطبع أخطاء المكونات الفاشلة ويكمل)
+_registry = getattr(_instance, 'component_registry', _instance)
+_loaded = _registry.loaded_components() if hasattr(_registry, 'loaded_components') else []
+print(json.dumps({{'import_time': _imported - _start, 'construct_time': _constructed - _imported,
+                  'components_loaded': len(_loaded)}}))
+"""
+
+
+def run_cold_start(target: str, preload_all: bool = False, timeout: float = 300.0) -> Dict[str, Any]:
+    """تشغيل إقلاع بارد واحد لهدف محدد في عملية فرعية جديدة."""
+
+    import_code, construct_template = BENCHMARK_TARGETS[target]
+    preload = FULL_PRELOAD[target] if preload_all else None
+    child_code = CHILD_TEMPLATE.format(
+        root=SYSTEM_ROOT,
+        import_code=textwrap.indent(import_code, "    "),
+        construct_code=textwrap.indent(construct_template.format(preload=repr(preload)), "    ")
+    )
+
+    wall_start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", child_code],
+        capture_output=True, text=True, timeout=timeout, cwd=SYSTEM_ROOT
+    )
+    wall_time = time.perf_counter() - wall_start
+
+    if completed.returncode != 0:
+        error_lines = completed.stderr.strip().splitlines()
+        return {'success': False, 'wall_time': wall_time,
+                'error': error_lines[-1] if error_lines else 'unknown error'}
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result.update({'success': True, 'wall_time': wall_time})
+    return result
+
+
+def benchmark_target(target: str, runs: int = 3, preload_all: bool = False) -> Dict[str, Any]:
+    """قياس عدة إقلاعات باردة لهدف وتلخيصها."""
+
+    samples = [run_cold_start(target, preload_all) for _ in range(runs)]
+    successful = [sample for sample in samples if sample['success']]
+
+    summary = {
+        'target': target,
+        'mode': 'preload_all' if preload_all else 'lazy',
+        'runs': runs,
+        'successful_runs': len(successful)
+    }
+    if not successful:
+        summary['error'] = samples[-1].get('error')
+        return summary
+
+    summary['components_loaded'] = successful[-1]['components_loaded']
+    if preload_all:
+        summary['components_requested'] = len(FULL_PRELOAD[target])
+
+    for metric in ('import_time', 'construct_time', 'wall_time'):
+        values = [sample[metric] for sample in successful]
+        summary[metric] = {
+            'median': statistics.median(values),
+            'min': min(values),
+            'max': max(values)
+        }
+    return summary
+
+
+def run_startup_benchmark(targets: List[str] = None, runs: int = 3,
+                          compare_preload: bool = True) -> List[Dict[str, Any]]:
+    """تشغيل قياس الإقلاع لجميع الأهداف المطلوبة."""
+
+    print("⏱️ بدء قياس زمن الإقلاع البارد")
+    print("=" * 60)
+
+    results = []
+    for target in targets or list(BENCHMARK_TARGETS):
+        modes = [False]
+        if compare_preload and FULL_PRELOAD[target]:
+            modes.append(True)
+
+        for preload_all in modes:
+            summary = benchmark_target(target, runs, preload_all)
+            results.append(summary)
+
+            label = f"{target} ({summary['mode']})"
+            if summary['successful_runs'] == 0:
+                print(f"❌ {label}: {summary['error']}")
+            else:
+                components = f"{summary['components_loaded']}"
+                if 'components_requested' in summary:
+                    components += f"/{summary['components_requested']}"
+                print(f"✅ {label}: استيراد {summary['import_time']['median']:.3f}s | "
+                      f"إنشاء {summary['construct_time']['median']:.3f}s | "
+                      f"كلي {summary['wall_time']['median']:.3f}s | "
+                      f"مكونات مُنشأة {components}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="قياس زمن الإقلاع البارد للنظام الثوري")
+    parser.add_argument('--targets', nargs='*', choices=list(BENCHMARK_TARGETS),
+                        help="الأهداف المطلوب قياسها (الافتراضي: الكل)")
+    parser.add_argument('--runs', type=int, default=3, help="عدد الإقلاعات لكل هدف")
+    parser.add_argument('--no-preload-comparison', action='store_true',
+                        help="عدم المقارنة مع الإحماء الكامل")
+    parser.add_argument('--json', help="حفظ النتائج في ملف JSON")
+    args = parser.parse_args()
+
+    results = run_startup_benchmark(args.targets, args.runs, not args.no_preload_comparison)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 تم حفظ النتائج في: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
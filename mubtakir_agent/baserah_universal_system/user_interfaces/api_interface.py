@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 # api_interface.py - واجهة API REST للنظام الثوري Baserah
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 import sys
 import os
+import time
 from datetime import datetime
 import numpy as np
 import uuid
@@ -20,6 +21,15 @@ from artistic_unit.integrated_system import BaserahIntegratedSystem
 from revolutionary_intelligence.quranic_analysis_engine import QuranicAnalysisEngine
 from revolutionary_intelligence.arabic_lexicon_engine import ArabicLexiconEngine
 from revolutionary_intelligent_agent.intelligent_agent import BaserahIntelligentAgent
+from revolutionary_intelligence.lazy_component_registry import LazyComponentRegistry
+from revolutionary_intelligence.cognitive_result_cache import CognitiveResultCache, make_cache_key
+from revolutionary_intelligence.engine_metrics import ENGINE_METRICS, PROMETHEUS_CONTENT_TYPE
+
+# إعدادات ذاكرة الاستجابات الافتراضية (مشتركة بين مسارات البحث والمعجم والدلالة)
+DEFAULT_RESPONSE_CACHE_CONFIG = {'max_entries': 4096, 'max_bytes': 64 * 1024 * 1024, 'ttl_seconds': 300.0}
+
+# أقصى عدد عناصر في طلب دفعة واحد
+MAX_BATCH_ITEMS = 500
 
 class BaserahAPIInterface:
     """
@@ -33,8 +43,29 @@ class BaserahAPIInterface:
     - الوحدة الفنية
     """
     
-    def __init__(self):
-        """تهيئة واجهة API."""
+    def __init__(self, preload_components: list = None, response_cache_config: dict = None,
+                 enable_engine_metrics: bool = False):
+        """
+        تهيئة واجهة API.
+
+        Args:
+            preload_components: محركات تُنشأ مسبقاً بدلاً من الانتظار لأول طلب
+                (مثلاً ['quranic_engine', 'lexicon_engine'])
+            response_cache_config: إعدادات ذاكرة الاستجابات
+                (max_entries / max_bytes / ttl_seconds)
+            enable_engine_metrics: تفعيل مقاييس المحركات وقياس زمن الطلبات
+                وإتاحة مسار /metrics بصيغة Prometheus
+        """
+
+        self.preload_components = preload_components
+        self.engine_metrics_enabled = enable_engine_metrics
+        if enable_engine_metrics:
+            ENGINE_METRICS.enable()
+        
+        # ذاكرة الاستجابات: مفتاح لكل (مسار، معاملات مطبّعة)، مع انتهاء صلاحية
+        self.response_cache = CognitiveResultCache(
+            **{**DEFAULT_RESPONSE_CACHE_CONFIG, **(response_cache_config or {})}
+        )
         
         self.app = Flask(__name__)
         CORS(self.app)  # تمكين CORS للوصول من المتصفحات
@@ -44,6 +75,8 @@ class BaserahAPIInterface:
         
         # إعداد المسارات
         self.setup_api_routes()
+        if self.engine_metrics_enabled:
+            self.setup_metrics_routes()
         
         # سجل العمليات
         self.operation_log = []
@@ -73,14 +106,27 @@ class BaserahAPIInterface:
             self.consciousness = BaserahAdvancedCognitiveObject("الوعي API",
                                                               AdvancedCognitiveType.CONSCIOUSNESS_SIMULATOR)
 
+            # المحركات الثقيلة تُنشأ عند أول طلب يحتاجها (سجل المكونات الكسولة)
+            self.component_registry = LazyComponentRegistry("APIComponents")
+
             # محرك التحليل القرآني
-            self.quranic_engine = QuranicAnalysisEngine("APIQuranicEngine")
+            self.quranic_engine = self.component_registry.register(
+                'quranic_engine', lambda: QuranicAnalysisEngine("APIQuranicEngine")
+            )
 
             # محرك المعجم العربي
-            self.lexicon_engine = ArabicLexiconEngine("APILexiconEngine")
+            self.lexicon_engine = self.component_registry.register(
+                'lexicon_engine', lambda: self.watch_lexicon_writes(ArabicLexiconEngine("APILexiconEngine"))
+            )
 
             # الوكيل الذكي الثوري
-            self.intelligent_agent = BaserahIntelligentAgent("APIIntelligentAgent")
+            self.intelligent_agent = self.component_registry.register(
+                'intelligent_agent', lambda: BaserahIntelligentAgent("APIIntelligentAgent")
+            )
+            
+            # إحماء مسبق اختياري للمحركات المحددة
+            if self.preload_components:
+                self.component_registry.warm_up(self.preload_components)
             
             self.system_ready = True
             print("✅ تم تهيئة النظام الثوري للAPI بنجاح")
@@ -122,6 +168,139 @@ class BaserahAPIInterface:
         
         return jsonify(response)
     
+    def cached_result(self, namespace, params, compute):
+        """نتيجة من ذاكرة الاستجابات أو بحسابها؛ يعيد (البيانات، إصابة؟)."""
+        return self.response_cache.get_or_compute(make_cache_key(namespace, params), compute, namespace)
+    
+    def run_batch(self, items, compute_one):
+        """
+        تنفيذ دفعة عناصر بالترتيب (العناصر المكررة تُحسب مرة واحدة عبر الذاكرة).
+        
+        يعيد بيانات الاستجابة: نتيجة لكل عنصر (بيانات أو خطأ) مع ملخص.
+        """
+        results = []
+        succeeded = 0
+        cache_hits = 0
+        for item in items:
+            try:
+                data, hit = compute_one(item)
+                results.append({'success': True, 'data': data, 'cached': hit})
+                succeeded += 1
+                cache_hits += hit
+            except Exception as e:
+                results.append({'success': False, 'error': str(e)})
+        
+        return {
+            'results': results,
+            'total': len(items),
+            'succeeded': succeeded,
+            'failed': len(items) - succeeded,
+            'cache_hits': cache_hits
+        }
+    
+    def read_batch_items(self, field):
+        """قراءة قائمة عناصر الدفعة من حقل JSON؛ يعيد (العناصر، رسالة الخطأ)."""
+        request_data = request.get_json(silent=True)
+        if not request_data or not isinstance(request_data.get(field), list):
+            return None, f'يرجى تحديد قائمة في حقل {field}'
+        items = request_data[field]
+        if not items:
+            return None, f'القائمة {field} فارغة'
+        if len(items) > MAX_BATCH_ITEMS:
+            return None, f'الحد الأقصى للدفعة {MAX_BATCH_ITEMS} عنصر'
+        return items, None
+    
+    def semantic_interpret_data(self, sentence):
+        """تفسير جملة دلالية (مع ذاكرة الاستجابات)."""
+        def compute():
+            interpretation = self.semantic_system.interpret_semantic_sentence(sentence)
+            return {
+                'sentence': sentence,
+                'confidence': interpretation['confidence'],
+                'recognized_words': interpretation['recognized_words'],
+                'execution_plan_steps': len(interpretation['execution_plan']),
+                'mathematical_components': len(interpretation.get('mathematical_representation', [])),
+                'semantic_components': len(interpretation.get('semantic_representation', [])),
+                'interpretation_id': interpretation['interpretation_id']
+            }
+        return self.cached_result('semantic_interpret', sentence, compute)
+    
+    def semantic_transform_data(self, source, target):
+        """تحويل دلالي بين كلمتين (مع ذاكرة الاستجابات)."""
+        def compute():
+            transformation = self.semantic_system.create_semantic_transformation(source, target)
+            if 'error' in transformation:
+                raise ValueError(transformation['error'])
+            return {
+                'source': source,
+                'target': target,
+                'transformation_score': transformation['transformation_score'],
+                'mathematical_steps': len(transformation['mathematical_steps']),
+                'semantic_changes': len(transformation['semantic_changes']),
+                'transformation_id': transformation['transformation_id']
+            }
+        return self.cached_result('semantic_transform', {'source': source, 'target': target}, compute)
+    
+    def quran_search_data(self, search_term, search_type):
+        """البحث في القرآن الكريم (مع ذاكرة الاستجابات)."""
+        def compute():
+            search_result = self.quranic_engine.search_quranic_text(search_term, search_type)
+            return {
+                'search_term': search_term,
+                'search_type': search_type,
+                'total_matches': search_result['total_matches'],
+                'surahs_found': len(search_result['surahs_found']),
+                'matches': search_result['matches'][:20],  # أول 20 نتيجة
+                'search_statistics': search_result['search_statistics']
+            }
+        return self.cached_result('quran_search', {'term': search_term, 'type': search_type}, compute)
+    
+    def watch_lexicon_writes(self, lexicon_engine):
+        """ربط كتابات المعجم بإبطال استجابات المعجم المخزنة؛ يعيد المحرك نفسه."""
+        lexicon_engine.add_write_listener(self.invalidate_lexicon_responses)
+        return lexicon_engine
+    
+    def invalidate_lexicon_responses(self, words, roots):
+        """
+        إبطال استجابات الكلمات المكتوبة وجذورها؛ يعيد عدد المدخلات المبطلة.
+        
+        تحليلات الكلمات الأخرى من الجذر نفسه (related_words) لا تُبطل وتتقادم حتى انتهاء صلاحيتها.
+        """
+        keys = [make_cache_key('lexicon_word', {'word': word, 'deep': deep})
+                for word in set(words) for deep in (True, False)]
+        keys.extend(make_cache_key('lexicon_root', root) for root in set(roots) if root)
+        return sum(self.response_cache.invalidate(key) for key in keys)
+    
+    def lexicon_word_data(self, word, deep_analysis=True):
+        """تحليل كلمة عربية (مع ذاكرة الاستجابات)."""
+        def compute():
+            analysis = self.lexicon_engine.analyze_word_revolutionary(word, deep_analysis=deep_analysis)
+            return {
+                'word': analysis.word,
+                'root': analysis.root,
+                'meaning': analysis.meaning,
+                'morphological_weight': analysis.morphological_weight,
+                'semantic_weight': analysis.semantic_weight,
+                'revolutionary_insights': analysis.revolutionary_insights,
+                'morphological_analysis': analysis.morphological_analysis,
+                'baserah_analysis': analysis.baserah_analysis,
+                'analysis_id': analysis.analysis_id
+            }
+        return self.cached_result('lexicon_word', {'word': word, 'deep': bool(deep_analysis)}, compute)
+    
+    def lexicon_root_data(self, root):
+        """البحث عن جذر في المعجم (مع ذاكرة الاستجابات)."""
+        def compute():
+            search_result = self.lexicon_engine.search_by_root(root)
+            return {
+                'root': root,
+                'words_found': len(search_result['words']),
+                'words': search_result['words'][:30],  # أول 30 كلمة
+                'root_meaning': search_result.get('root_meaning', ''),
+                'morphological_patterns': search_result.get('patterns', [])
+            }
+        return self.cached_result('lexicon_root', root, compute)
+    
     def setup_api_routes(self):
         """إعداد مسارات API."""
         
@@ -188,7 +367,10 @@ class BaserahAPIInterface:
                         'creativity_index': cognitive_summary['creativity_index'],
                         'learning_efficiency': cognitive_summary['learning_efficiency'],
                         'total_activities': cognitive_summary['total_activities']
-                    }
+                    },
+                    'lazy_components': self.component_registry.get_registry_status(),
+                    'response_cache': self.response_cache.get_cache_statistics(),
+                    'engine_metrics': ENGINE_METRICS.get_statistics() if self.engine_metrics_enabled else {'enabled': False}
                 }
                 
                 self.log_operation('system_status_check')
@@ -302,20 +484,10 @@ class BaserahAPIInterface:
                 if not sentence:
                     return self.create_response(False, error='الجملة فارغة')
                 
-                interpretation = self.semantic_system.interpret_semantic_sentence(sentence)
-                
-                data = {
-                    'sentence': sentence,
-                    'confidence': interpretation['confidence'],
-                    'recognized_words': interpretation['recognized_words'],
-                    'execution_plan_steps': len(interpretation['execution_plan']),
-                    'mathematical_components': len(interpretation.get('mathematical_representation', [])),
-                    'semantic_components': len(interpretation.get('semantic_representation', [])),
-                    'interpretation_id': interpretation['interpretation_id']
-                }
+                data, cached = self.semantic_interpret_data(sentence)
                 
-                self.log_operation('semantic_interpret', {'sentence': sentence, 'confidence': interpretation['confidence']})
-                return self.create_response(data=data)
+                self.log_operation('semantic_interpret', {'sentence': sentence, 'confidence': data['confidence'], 'cached': cached})
+                return self.create_response(data={**data, 'cached': cached})
                 
             except Exception as e:
                 return self.create_response(False, error=str(e))
@@ -371,22 +543,10 @@ class BaserahAPIInterface:
                 if not source or not target:
                     return self.create_response(False, error='كلمتا المصدر والهدف مطلوبتان')
                 
-                transformation = self.semantic_system.create_semantic_transformation(source, target)
-                
-                if 'error' in transformation:
-                    return self.create_response(False, error=transformation['error'])
-                
-                data = {
-                    'source': source,
-                    'target': target,
-                    'transformation_score': transformation['transformation_score'],
-                    'mathematical_steps': len(transformation['mathematical_steps']),
-                    'semantic_changes': len(transformation['semantic_changes']),
-                    'transformation_id': transformation['transformation_id']
-                }
+                data, cached = self.semantic_transform_data(source, target)
                 
-                self.log_operation('semantic_transform', {'source': source, 'target': target, 'score': transformation['transformation_score']})
-                return self.create_response(data=data)
+                self.log_operation('semantic_transform', {'source': source, 'target': target, 'score': data['transformation_score'], 'cached': cached})
+                return self.create_response(data={**data, 'cached': cached})
                 
             except Exception as e:
                 return self.create_response(False, error=str(e))
@@ -529,19 +689,10 @@ class BaserahAPIInterface:
                 if not search_term:
                     return self.create_response(False, error='مصطلح البحث فارغ')
 
-                search_result = self.quranic_engine.search_quranic_text(search_term, search_type)
+                data, cached = self.quran_search_data(search_term, search_type)
 
-                data = {
-                    'search_term': search_term,
-                    'search_type': search_type,
-                    'total_matches': search_result['total_matches'],
-                    'surahs_found': len(search_result['surahs_found']),
-                    'matches': search_result['matches'][:20],  # أول 20 نتيجة
-                    'search_statistics': search_result['search_statistics']
-                }
-
-                self.log_operation('quran_search', {'term': search_term, 'matches': search_result['total_matches']})
-                return self.create_response(data=data)
+                self.log_operation('quran_search', {'term': search_term, 'matches': data['total_matches'], 'cached': cached})
+                return self.create_response(data={**data, 'cached': cached})
 
             except Exception as e:
                 return self.create_response(False, error=str(e))
@@ -564,22 +715,10 @@ class BaserahAPIInterface:
                 if not word:
                     return self.create_response(False, error='الكلمة فارغة')
 
-                analysis = self.lexicon_engine.analyze_word_revolutionary(word, deep_analysis=deep_analysis)
+                data, cached = self.lexicon_word_data(word, deep_analysis)
 
-                data = {
-                    'word': analysis.word,
-                    'root': analysis.root,
-                    'meaning': analysis.meaning,
-                    'morphological_weight': analysis.morphological_weight,
-                    'semantic_weight': analysis.semantic_weight,
-                    'revolutionary_insights': analysis.revolutionary_insights,
-                    'morphological_analysis': analysis.morphological_analysis,
-                    'baserah_analysis': analysis.baserah_analysis,
-                    'analysis_id': analysis.analysis_id
-                }
-
-                self.log_operation('lexicon_analyze_word', {'word': word, 'root': analysis.root})
-                return self.create_response(data=data)
+                self.log_operation('lexicon_analyze_word', {'word': word, 'root': data['root'], 'cached': cached})
+                return self.create_response(data={**data, 'cached': cached})
 
             except Exception as e:
                 return self.create_response(False, error=str(e))
@@ -601,22 +740,139 @@ class BaserahAPIInterface:
                 if not root:
                     return self.create_response(False, error='الجذر فارغ')
 
-                search_result = self.lexicon_engine.search_by_root(root)
+                data, cached = self.lexicon_root_data(root)
 
-                data = {
-                    'root': root,
-                    'words_found': len(search_result['words']),
-                    'words': search_result['words'][:30],  # أول 30 كلمة
-                    'root_meaning': search_result.get('root_meaning', ''),
-                    'morphological_patterns': search_result.get('patterns', [])
-                }
+                self.log_operation('lexicon_search_root', {'root': root, 'words_found': data['words_found'], 'cached': cached})
+                return self.create_response(data={**data, 'cached': cached})
+
+            except Exception as e:
+                return self.create_response(False, error=str(e))
+
+        # البحث في القرآن (دفعة)
+        @self.app.route('/api/quran/search_batch', methods=['POST'])
+        def quran_search_batch():
+            """البحث عن عدة مصطلحات في طلب واحد."""
+            if not self.system_ready:
+                return self.create_response(False, error='النظام غير جاهز')
+
+            try:
+                search_terms, error = self.read_batch_items('search_terms')
+                if error:
+                    return self.create_response(False, error=error)
+                search_type = request.get_json().get('search_type', 'word')
+
+                def search_one(search_term):
+                    search_term = str(search_term).strip()
+                    if not search_term:
+                        raise ValueError('مصطلح البحث فارغ')
+                    return self.quran_search_data(search_term, search_type)
+
+                data = self.run_batch(search_terms, search_one)
+                self.log_operation('quran_search_batch', {'terms': data['total'], 'cache_hits': data['cache_hits']})
+                return self.create_response(data=data)
+
+            except Exception as e:
+                return self.create_response(False, error=str(e))
+
+        # تحليل كلمات عربية (دفعة)
+        @self.app.route('/api/lexicon/analyze_word_batch', methods=['POST'])
+        def lexicon_analyze_word_batch():
+            """تحليل عدة كلمات عربية في طلب واحد."""
+            if not self.system_ready:
+                return self.create_response(False, error='النظام غير جاهز')
 
-                self.log_operation('lexicon_search_root', {'root': root, 'words_found': len(search_result['words'])})
+            try:
+                words, error = self.read_batch_items('words')
+                if error:
+                    return self.create_response(False, error=error)
+                deep_analysis = request.get_json().get('deep_analysis', True)
+
+                def analyze_one(word):
+                    word = str(word).strip()
+                    if not word:
+                        raise ValueError('الكلمة فارغة')
+                    return self.lexicon_word_data(word, deep_analysis)
+
+                data = self.run_batch(words, analyze_one)
+                self.log_operation('lexicon_analyze_word_batch', {'words': data['total'], 'cache_hits': data['cache_hits']})
+                return self.create_response(data=data)
+
+            except Exception as e:
+                return self.create_response(False, error=str(e))
+
+        # البحث بالجذور (دفعة)
+        @self.app.route('/api/lexicon/search_root_batch', methods=['POST'])
+        def lexicon_search_root_batch():
+            """البحث عن عدة جذور في طلب واحد."""
+            if not self.system_ready:
+                return self.create_response(False, error='النظام غير جاهز')
+
+            try:
+                roots, error = self.read_batch_items('roots')
+                if error:
+                    return self.create_response(False, error=error)
+
+                def search_one(root):
+                    root = str(root).strip()
+                    if not root:
+                        raise ValueError('الجذر فارغ')
+                    return self.lexicon_root_data(root)
+
+                data = self.run_batch(roots, search_one)
+                self.log_operation('lexicon_search_root_batch', {'roots': data['total'], 'cache_hits': data['cache_hits']})
                 return self.create_response(data=data)
 
             except Exception as e:
                 return self.create_response(False, error=str(e))
 
+        # تفسير دلالي (دفعة)
+        @self.app.route('/api/semantic/interpret_batch', methods=['POST'])
+        def semantic_interpret_batch():
+            """تفسير عدة جمل دلالية في طلب واحد."""
+            if not self.system_ready:
+                return self.create_response(False, error='النظام غير جاهز')
+
+            try:
+                sentences, error = self.read_batch_items('sentences')
+                if error:
+                    return self.create_response(False, error=error)
+
+                def interpret_one(sentence):
+                    sentence = str(sentence).strip()
+                    if not sentence:
+                        raise ValueError('الجملة فارغة')
+                    return self.semantic_interpret_data(sentence)
+
+                data = self.run_batch(sentences, interpret_one)
+                self.log_operation('semantic_interpret_batch', {'sentences': data['total'], 'cache_hits': data['cache_hits']})
+                return self.create_response(data=data)
+
+            except Exception as e:
+                return self.create_response(False, error=str(e))
+
+    def setup_metrics_routes(self):
+        """قياس زمن كل طلب وإتاحة مقاييس المحركات بصيغة Prometheus النصية."""
+
+        @self.app.before_request
+        def start_request_timer():
+            g.request_start = time.perf_counter()
+
+        @self.app.after_request
+        def record_request_metrics(response):
+            start = g.pop('request_start', None)
+            if start is not None:
+                # المسار المطابق (القالب) وليس الرابط الفعلي، لتبقى التسميات محدودة
+                endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+                ENGINE_METRICS.observe('api_request_seconds', time.perf_counter() - start,
+                                       endpoint=endpoint, method=request.method)
+                ENGINE_METRICS.count('api_requests_total', endpoint=endpoint, status=response.status_code)
+            return response
+
+        @self.app.route('/metrics', methods=['GET'])
+        def prometheus_metrics():
+            """مقاييس المحركات بصيغة Prometheus."""
+            return Response(ENGINE_METRICS.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
     def run(self, host='localhost', port=8000, debug=False):
         """تشغيل خادم API."""
         
@@ -625,6 +881,8 @@ class BaserahAPIInterface:
             print("📚 وثائق API متاحة على:")
             print(f"   معلومات API: http://{host}:{port}/api/info")
             print(f"   حالة النظام: http://{host}:{port}/api/system/status")
+            if self.engine_metrics_enabled:
+                print(f"   مقاييس المحركات: http://{host}:{port}/metrics")
             self.app.run(host=host, port=port, debug=debug)
         else:
             print("❌ النظام غير جاهز للتشغيل")
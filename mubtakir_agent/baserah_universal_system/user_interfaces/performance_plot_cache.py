@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# performance_plot_cache.py - ذاكرة رسم أداء النظام (رسم مسبق في الخلفية + ETag)
+
+import base64
+import hashlib
+import io
+import json
+import threading
+import time
+from dataclasses import astuple
+from typing import Dict, List, Any, Optional, Callable, Hashable
+
+from matplotlib.figure import Figure
+
+# الرسوم الأربعة: (الخاصية، العنوان، تسمية المحور، نمط الخط، عرض محور الخطوات)
+PERFORMANCE_PANELS = (
+    ('performance_score', 'نقاط الأداء', 'النقاط', 'b-o', False),
+    ('adaptation_efficiency', 'كفاءة التكيف', 'الكفاءة', 'g-o', False),
+    ('revolutionary_potential', 'الإمكانات الثورية', 'الإمكانات', 'r-o', True),
+    ('system_complexity', 'تعقيد النظام', 'التعقيد', 'm-o', True),
+)
+
+
+def render_performance_png(metrics_history: List[Any], dpi: int = 150) -> bytes:
+    """
+    رسم تاريخ المقاييس إلى صورة PNG
+
+    يستخدم Figure مباشرة دون pyplot (لا حالة عامة، فالرسم آمن في خيط خلفي)
+    """
+    figure = Figure(figsize=(12, 8))
+    figure.suptitle('أداء النظام الثوري Baserah', fontsize=16)
+    axes = figure.subplots(2, 2)
+
+    steps = range(len(metrics_history))
+    for axis, (attribute, title, label, style, show_steps) in zip(axes.flat, PERFORMANCE_PANELS):
+        axis.plot(steps, [getattr(m, attribute) for m in metrics_history], style)
+        axis.set_title(title)
+        axis.set_ylabel(label)
+        if show_steps:
+            axis.set_xlabel('الخطوة')
+        axis.grid(True)
+
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def metrics_signature(self_evolving) -> Hashable:
+    """بصمة المقاييس المرسومة (التاريخ يُضاف إليه فقط، فيكفي عدد الإضافات وآخر عنصر).
+
+    التاريخ محدود السعة فيثبت طوله بعد الامتلاء، لذا يُستخدم عدد الإضافات الكلي إن توفر.
+    """
+    history = self_evolving.metrics_history
+    latest = history[-1] if history else self_evolving.current_metrics
+    return getattr(history, 'total_appended', len(history)), astuple(latest)
+
+
+def plotted_metrics(self_evolving) -> List[Any]:
+    """المقاييس التي تُرسم (المقاييس الحالية إذا لم يكن هناك تاريخ)."""
+    return list(self_evolving.metrics_history) or [self_evolving.current_metrics]
+
+
+class PlotSnapshot:
+    """صورة مرسومة مسبقاً مع استجابة JSON جاهزة ووسم ETag."""
+
+    __slots__ = ('png', 'etag', 'json_body', 'signature', 'rendered_at')
+
+    def __init__(self, png: bytes, signature: Hashable):
+        self.png = png
+        self.etag = hashlib.sha256(png).hexdigest()[:32]
+        self.json_body = json.dumps({
+            'status': 'success',
+            'image': f"data:image/png;base64,{base64.b64encode(png).decode('ascii')}"
+        }).encode('utf-8')
+        self.signature = signature
+        self.rendered_at = time.time()
+
+    def matches_etag(self, if_none_match: Optional[str]) -> bool:
+        """هل يطابق ترويسة If-None-Match (مع دعم * والوسوم الضعيفة W/)؟"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag == '*':
+                return True
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag.strip('"') == self.etag:
+                return True
+        return False
+
+
+class PerformancePlotCache:
+    """
+    ذاكرة رسم الأداء
+
+    - لا يُعاد الرسم إلا عند تغير بصمة المقاييس
+    - مُحدِّث خلفي اختياري يفحص البصمة كل refresh_interval ثانية
+    - بدون المُحدِّث: يُفحص عند الطلب (البصمة رخيصة والرسم عند التغير فقط)
+    """
+
+    def __init__(self, render: Callable[[], bytes], signature: Callable[[], Hashable],
+                 refresh_interval: float = 5.0):
+        self.render = render
+        self.signature = signature
+        self.refresh_interval = refresh_interval
+
+        self._snapshot: Optional[PlotSnapshot] = None
+        self._render_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.cache_stats = {
+            'renders': 0,
+            'unchanged_checks': 0,
+            'render_errors': 0,
+            'last_render_time': 0.0
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self, force: bool = False) -> bool:
+        """إعادة الرسم إن تغيرت المقاييس (True إذا رُسمت صورة جديدة)."""
+        current_signature = self.signature()
+        snapshot = self._snapshot
+        if not force and snapshot is not None and snapshot.signature == current_signature:
+            self.cache_stats['unchanged_checks'] += 1
+            return False
+
+        with self._render_lock:
+            snapshot = self._snapshot
+            if not force and snapshot is not None and snapshot.signature == current_signature:
+                return False
+            start_time = time.perf_counter()
+            png = self.render()
+            self._snapshot = PlotSnapshot(png, current_signature)
+            self.cache_stats['renders'] += 1
+            self.cache_stats['last_render_time'] = time.perf_counter() - start_time
+        return True
+
+    def get(self) -> PlotSnapshot:
+        """الصورة الحالية (من الذاكرة إن كان المُحدِّث يعمل، وإلا بعد فحص البصمة)."""
+        snapshot = self._snapshot
+        if snapshot is None or not self.is_running:
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.cache_stats['render_errors'] += 1
+                print(f"❌ خطأ في تحديث رسم الأداء: {e}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def start(self) -> 'PerformancePlotCache':
+        """تشغيل المُحدِّث الخلفي."""
+        if not self.is_running:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._refresh_loop,
+                                            name="PerformancePlotRefresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """إيقاف المُحدِّث الخلفي."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_cache_status(self) -> Dict[str, Any]:
+        """حالة الذاكرة."""
+        snapshot = self._snapshot
+        return {
+            **self.cache_stats,
+            'background_refresh': self.is_running,
+            'refresh_interval': self.refresh_interval,
+            'etag': snapshot.etag if snapshot else None,
+            'image_bytes': len(snapshot.png) if snapshot else 0,
+            'rendered_at': snapshot.rendered_at if snapshot else None
+        }
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# prefork_server.py - خادم إنتاجي متعدد العمليات (pre-fork) لواجهتي API والويب
+#
+# - العملية الرئيسية تنشئ الواجهة وتحمّل جميع المحركات مرة واحدة، ثم تتفرع منها العمّال
+#   فتُشارك المحركات بين العمّال بنسخ-عند-الكتابة (copy-on-write)
+# - كل عامل يخدم المقبس المشترك بمجمع خيوط محدد العدد (اتصالات دائمة HTTP/1.1)
+# - مهلة الطلب: العامل الذي يتجاوز فيه طلبٌ المهلةَ يُنهى ويُستبدل بعامل جديد
+# - SIGHUP: تدوير رشيق للعمّال (عمّال جدد أولاً ثم إيقاف القدامى بعد إنهاء طلباتهم)؛
+#   العمّال الجدد يتفرعون من صورة العملية الرئيسية المحملة، فلا يُعاد تحميل الكود ولا المحركات.
+#   لنشر تغييرات الكود: SIGTERM للعملية الرئيسية ثم تشغيلها من جديد
+# - الموارد التي لا تُشارك عبر fork (اتصال SQLite لمحرك المعجم) تُعاد تهيئتها في كل عامل
+# - SIGTERM / SIGINT: إيقاف رشيق
+#
+# الاستخدام:
+#     python prefork_server.py --interface api --port 8000 --workers 4 --threads 8 --timeout 30
+#     kill -HUP <pid>   # تدوير العمّال (لا يعيد تحميل الكود)
+#
+# 🌟 النظام: Baserah Universal System
+
+import argparse
+import gc
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+SYSTEM_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERFACES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# الواجهات المتاحة: (الملف، اسم الصنف، المنفذ الافتراضي)
+# تُحمّل بالمسار لأن الحزم user_interfaces/api_interface/ و web_interface/ تحجب الملفات
+INTERFACES = {
+    'api': ('api_interface.py', 'BaserahAPIInterface', 8000),
+    'web': ('web_interface.py', 'BaserahWebInterface', 5000)
+}
+
+# رمز خروج العامل الذي أنهته مهلة الطلب
+WORKER_TIMEOUT_EXIT_CODE = 3
+
+# فترة فحص العمّال ومهلة الطلبات (بالثواني)
+SUPERVISOR_INTERVAL = 0.2
+WATCHDOG_INTERVAL = 0.5
+
+
+def load_interface(interface: str, **interface_kwargs) -> Any:
+    """إنشاء واجهة بالاسم (api / web) مع تحميل جميع محركاتها مسبقاً."""
+
+    file_name, class_name, _ = INTERFACES[interface]
+    if SYSTEM_ROOT not in sys.path:
+        sys.path.insert(0, SYSTEM_ROOT)
+
+    spec = importlib.util.spec_from_file_location(f"{interface}_interface_prefork",
+                                                  os.path.join(INTERFACES_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    instance = getattr(module, class_name)(**interface_kwargs)
+    if not instance.system_ready:
+        raise RuntimeError("النظام غير جاهز للتشغيل")
+
+    # جميع المحركات الكسولة تُنشأ في العملية الرئيسية قبل التفرع
+    instance.component_registry.warm_up()
+    return instance
+
+
+def start_worker_services(instance: Any):
+    """تشغيل الخدمات الخلفية الخاصة بكل عامل (الخيوط لا تنتقل عبر fork)."""
+
+    performance_plot = getattr(instance, 'performance_plot', None)
+    if performance_plot is not None:
+        performance_plot.start()
+
+
+class RequestTimeoutMiddleware:
+    """تغليف WSGI يسجل بداية كل طلب جارٍ (حتى انتهاء إرسال جسم الاستجابة)."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+        self._active: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _begin(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            self._active[self._next_id] = time.monotonic()
+            return self._next_id
+
+    def _finish(self, request_id: int):
+        with self._lock:
+            self._active.pop(request_id, None)
+
+    def oldest_request_age(self) -> float:
+        """عمر أقدم طلب جارٍ بالثواني (0 إذا لم توجد طلبات)."""
+        with self._lock:
+            if not self._active:
+                return 0.0
+            return time.monotonic() - min(self._active.values())
+
+    def active_requests(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def __call__(self, environ, start_response):
+        request_id = self._begin()
+        try:
+            iterable = self.app(environ, start_response)
+        except BaseException:
+            self._finish(request_id)
+            raise
+        return self._iterate(iterable, request_id)
+
+    def _iterate(self, iterable, request_id: int):
+        try:
+            yield from iterable
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+            self._finish(request_id)
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """معالج HTTP/1.1 بمهلة للاتصالات الخاملة ودون سجل لكل طلب."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """خادم WSGI على مقبس موروث يعالج الاتصالات بمجمع خيوط محدد العدد."""
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, listen_socket: socket.socket, app: Callable, threads: int,
+                 keepalive_timeout: float = 2.0, access_log: bool = False):
+        handler = type('PreforkRequestHandler',
+                       (WSGIRequestHandler if access_log else _QuietRequestHandler,),
+                       {'protocol_version': "HTTP/1.1", 'timeout': keepalive_timeout})
+        host, port = listen_socket.getsockname()[:2]
+        super().__init__(host, port, app, handler=handler, fd=listen_socket.fileno())
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="PreforkRequest")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_in_pool, request, client_address)
+
+    def _process_request_in_pool(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def drain(self):
+        """انتظار انتهاء الطلبات الجارية."""
+        self._pool.shutdown(wait=True)
+
+
+def run_worker(listen_socket: socket.socket, wsgi_app: Callable, threads: int,
+               timeout: float, keepalive_timeout: float = 2.0, access_log: bool = False) -> int:
+    """حلقة العامل: خدمة المقبس المشترك حتى SIGTERM أو تجاوز مهلة طلب."""
+
+    # الإشارات تُدار من العملية الرئيسية؛ العامل يستجيب لـ SIGTERM فقط
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    middleware = RequestTimeoutMiddleware(wsgi_app)
+    server = PooledWSGIServer(listen_socket, middleware, threads, keepalive_timeout, access_log)
+
+    def _graceful_stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _graceful_stop)
+
+    def _watchdog():
+        while True:
+            time.sleep(WATCHDOG_INTERVAL)
+            if timeout and middleware.oldest_request_age() > timeout:
+                print(f"❌ العامل {os.getpid()}: تجاوز طلب المهلة ({timeout} ثانية)، إعادة تشغيل العامل",
+                      flush=True)
+                os._exit(WORKER_TIMEOUT_EXIT_CODE)
+
+    threading.Thread(target=_watchdog, name="PreforkWatchdog", daemon=True).start()
+
+    server.serve_forever(poll_interval=SUPERVISOR_INTERVAL)
+    server.drain()
+    return 0
+
+
+class PreforkServer:
+    """
+    🏭 خادم pre-fork
+
+    - تُنشأ الواجهة مرة واحدة في العملية الرئيسية (مع جميع المحركات)
+    - gc.freeze قبل التفرع حتى لا يلمس جامع القمامة صفحات المحركات المشتركة
+    - العامل الذي يتوقف (خطأ أو مهلة) يُستبدل تلقائياً
+    """
+
+    def __init__(self, application_factory: Callable[[], Any], host: str = "127.0.0.1",
+                 port: int = 8000, workers: Optional[int] = None, threads: int = 4,
+                 timeout: float = 30.0, graceful_timeout: float = 30.0,
+                 keepalive_timeout: float = 2.0, backlog: int = 2048, access_log: bool = False):
+        self.application_factory = application_factory
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = max(1, threads)
+        self.timeout = timeout
+        self.graceful_timeout = graceful_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.backlog = backlog
+        self.access_log = access_log
+
+        self.application = None
+        self.listen_socket: Optional[socket.socket] = None
+        self.worker_pids: Dict[int, int] = {}   # pid -> الجيل
+        self.generation = 0
+
+        self._stopping = False
+        self._reload_requested = False
+
+        self.server_stats = {
+            'spawned_workers': 0,
+            'timed_out_workers': 0,
+            'crashed_workers': 0,
+            'reloads': 0
+        }
+
+    @property
+    def wsgi_app(self) -> Callable:
+        """تطبيق WSGI من الواجهة (خاصية app) أو التطبيق نفسه."""
+        return getattr(self.application, 'app', self.application)
+
+    def load(self):
+        """إنشاء التطبيق والمقبس في العملية الرئيسية."""
+        start_time = time.perf_counter()
+        self.application = self.application_factory()
+        print(f"📦 تم تحميل التطبيق في {time.perf_counter() - start_time:.2f} ثانية")
+
+        gc.collect()
+        gc.freeze()
+
+        self.listen_socket = socket.create_server((self.host, self.port), backlog=self.backlog)
+        self.listen_socket.set_inheritable(True)
+        self.port = self.listen_socket.getsockname()[1]
+
+    def spawn_worker(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                start_worker_services(self.application)
+                exit_code = run_worker(self.listen_socket, self.wsgi_app, self.threads,
+                                       self.timeout, self.keepalive_timeout, self.access_log)
+            except BaseException as e:
+                print(f"❌ خطأ في العامل {os.getpid()}: {e}", flush=True)
+            finally:
+                os._exit(exit_code)
+
+        self.worker_pids[pid] = self.generation
+        self.server_stats['spawned_workers'] += 1
+        return pid
+
+    def _current_workers(self) -> List[int]:
+        return [pid for pid, generation in self.worker_pids.items() if generation == self.generation]
+
+    def _reap_workers(self):
+        """جمع العمّال المنتهين وتسجيل سبب الانتهاء."""
+        while self.worker_pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.worker_pids.clear()
+                return
+            if pid == 0:
+                return
+
+            generation = self.worker_pids.pop(pid, None)
+            exit_code = os.waitstatus_to_exitcode(status)
+            if generation != self.generation or self._stopping:
+                continue
+            if exit_code == WORKER_TIMEOUT_EXIT_CODE:
+                self.server_stats['timed_out_workers'] += 1
+            else:
+                self.server_stats['crashed_workers'] += 1
+                print(f"⚠️ توقف العامل {pid} (رمز الخروج {exit_code})، تشغيل بديل", flush=True)
+
+    def _signal_workers(self, pids: List[int], signum: int):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _wait_for_workers(self, pids: List[int], deadline: float):
+        """انتظار انتهاء العمّال حتى الموعد ثم إنهاؤهم قسراً."""
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    finished, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    finished = pid
+                if finished:
+                    remaining.discard(pid)
+                    self.worker_pids.pop(pid, None)
+            time.sleep(0.05)
+
+        self._signal_workers(list(remaining), signal.SIGKILL)
+        for pid in remaining:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self.worker_pids.pop(pid, None)
+
+    def reload(self):
+        """
+        تدوير رشيق: جيل جديد من العمّال ثم إيقاف الجيل القديم.
+
+        الجيل الجديد يتفرع من التطبيق المحمل في العملية الرئيسية، فتغييرات الكود
+        لا تظهر إلا بإعادة تشغيل العملية الرئيسية.
+        """
+        old_workers = self._current_workers()
+        self.generation += 1
+        for _ in range(self.workers):
+            self.spawn_worker()
+
+        self._signal_workers(old_workers, signal.SIGTERM)
+        self._wait_for_workers(old_workers, time.monotonic() + self.graceful_timeout)
+        self.server_stats['reloads'] += 1
+        print(f"🔄 إعادة تحميل رشيقة: الجيل {self.generation} ({self.workers} عامل)", flush=True)
+
+    def stop(self):
+        """إيقاف رشيق لجميع العمّال."""
+        self._stopping = True
+        workers = list(self.worker_pids)
+        self._signal_workers(workers, signal.SIGTERM)
+        self._wait_for_workers(workers, time.monotonic() + self.graceful_timeout)
+        if self.listen_socket is not None:
+            self.listen_socket.close()
+            self.listen_socket = None
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+
+    def _request_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def serve_forever(self):
+        """تشغيل الخادم حتى SIGTERM / SIGINT."""
+        if self.application is None:
+            self.load()
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+
+        print(f"🏭 خادم pre-fork على http://{self.host}:{self.port} "
+              f"({self.workers} عامل × {self.threads} خيط، مهلة {self.timeout} ثانية، pid {os.getpid()})",
+              flush=True)
+
+        try:
+            while not self._stopping:
+                self._reap_workers()
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self.reload()
+                while len(self._current_workers()) < self.workers and not self._stopping:
+                    self.spawn_worker()
+                time.sleep(SUPERVISOR_INTERVAL)
+        finally:
+            self.stop()
+            print("🛑 تم إيقاف خادم pre-fork", flush=True)
+
+    def get_server_status(self) -> Dict[str, Any]:
+        return {
+            **self.server_stats,
+            'pid': os.getpid(),
+            'workers': self.workers,
+            'threads': self.threads,
+            'timeout': self.timeout,
+            'generation': self.generation,
+            'worker_pids': self._current_workers()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="خادم pre-fork إنتاجي لواجهات النظام الثوري")
+    parser.add_argument('--interface', choices=list(INTERFACES), default='api')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, help="المنفذ (الافتراضي: 8000 لـ API و 5000 للويب)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="عدد العمليات")
+    parser.add_argument('--threads', type=int, default=4, help="عدد الخيوط لكل عملية")
+    parser.add_argument('--timeout', type=float, default=30.0, help="مهلة الطلب بالثواني (0 = بلا مهلة)")
+    parser.add_argument('--graceful-timeout', type=float, default=30.0,
+                        help="مهلة إنهاء الطلبات الجارية عند الإيقاف أو إعادة التحميل")
+    parser.add_argument('--keepalive', type=float, default=2.0, help="مهلة الاتصالات الخاملة بالثواني")
+    parser.add_argument('--access-log', action='store_true', help="سجل لكل طلب")
+    parser.add_argument('--metrics', action='store_true',
+                        help="تفعيل مقاييس المحركات ومسار /metrics (واجهة API؛ المقاييس لكل عامل)")
+    args = parser.parse_args()
+    if args.metrics and args.interface != 'api':
+        parser.error("--metrics متاح لواجهة API فقط")
+    interface_kwargs = {'enable_engine_metrics': True} if args.metrics else {}
+
+    port = args.port if args.port is not None else INTERFACES[args.interface][2]
+    server = PreforkServer(lambda: load_interface(args.interface, **interface_kwargs), host=args.host, port=port,
+                           workers=args.workers, threads=args.threads, timeout=args.timeout,
+                           graceful_timeout=args.graceful_timeout, keepalive_timeout=args.keepalive,
+                           access_log=args.access_log)
+    try:
+        server.serve_forever()
+    except Exception as e:
+        print(f"❌ خطأ في تشغيل خادم pre-fork: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,17 @@
 
 import sys
 import os
+import importlib.util
 import time
 import threading
 import requests
 import json
 from datetime import datetime
+from types import SimpleNamespace
 
 # إضافة المسار للاستيراد
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def test_api_interface():
     """اختبار واجهة API."""
@@ -202,6 +205,207 @@ def test_desktop_gui():
     print("   ℹ️ لاختبار كامل، شغل الواجهة يدوياً\n")
     return True
 
+class FakeLexiconEngine:
+    """محرك معجم بديل سريع لاختبار مسارات API (يعد الاستدعاءات ويحاكي كتابات المعجم)."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.write_listeners = []
+    
+    def add_write_listener(self, listener):
+        self.write_listeners.append(listener)
+    
+    def write_entry(self, word, root):
+        for listener in self.write_listeners:
+            listener([word], [root])
+    
+    def analyze_word_revolutionary(self, word, deep_analysis=True):
+        self.calls += 1
+        if word == 'خطأ':
+            raise ValueError('كلمة غير قابلة للتحليل')
+        return SimpleNamespace(
+            word=word, root=word[:3], meaning=f'معنى {word}', morphological_weight='فعل',
+            semantic_weight=0.5, revolutionary_insights=[], morphological_analysis={},
+            baserah_analysis={}, analysis_id=f'analysis_{self.calls}'
+        )
+    
+    def search_by_root(self, root):
+        self.calls += 1
+        return {'words': [root + 'ة'], 'root_meaning': f'معنى {root}', 'patterns': []}
+
+
+_api_module = None
+
+def load_api_module():
+    """تحميل api_interface.py بالمسار (الحزمة user_interfaces/api_interface/ تحجب الملف)."""
+    global _api_module
+    if _api_module is None:
+        spec = importlib.util.spec_from_file_location(
+            "api_interface_routes_test", os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_interface.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            # لا تبقى وحدة نصف مهيأة في الذاكرة: المحاولة التالية تعيد التحميل
+            sys.modules.pop(spec.name, None)
+            raise
+        _api_module = module
+    return _api_module
+
+def api_module_or_skip():
+    """وحدة API، أو None مع رسالة تخطي إذا تعذر استيرادها في هذه البيئة (flask_cors غير مثبتة مثلاً)."""
+    try:
+        return load_api_module()
+    except ImportError as e:
+        print(f"   ⚠️ تعذر تحميل واجهة API ({e}) - تم تخطي الاختبار\n")
+        return None
+
+def build_test_api():
+    """واجهة API بمحرك معجم بديل وذاكرة استجابات حقيقية (دون تهيئة النظام الثوري الكامل)."""
+    from flask import Flask
+    from revolutionary_intelligence.cognitive_result_cache import CognitiveResultCache
+    
+    api_module = load_api_module()
+    api = api_module.BaserahAPIInterface.__new__(api_module.BaserahAPIInterface)
+    api.system_ready = True
+    api.engine_metrics_enabled = False
+    api.operation_log = []
+    api.response_cache = CognitiveResultCache(**api_module.DEFAULT_RESPONSE_CACHE_CONFIG)
+    api.lexicon_engine = api.watch_lexicon_writes(FakeLexiconEngine())
+    api.app = Flask('api_routes_test')
+    api.setup_api_routes()
+    return api, api.app.test_client()
+
+def test_api_response_cache():
+    """ذاكرة الاستجابات: الإصابة تحمل cached، الأخطاء لا تُخزن، وكتابة المعجم تبطل الكلمة وجذرها."""
+    
+    print("🗃️ اختبار ذاكرة استجابات API...")
+    print("-" * 40)
+    
+    if api_module_or_skip() is None:
+        return True
+    
+    try:
+        api, client = build_test_api()
+        engine = api.lexicon_engine
+        
+        first = client.post('/api/lexicon/analyze_word', json={'word': 'كتب'}).get_json()
+        second = client.post('/api/lexicon/analyze_word', json={'word': 'كتب'}).get_json()
+        assert first['success'] and first['data']['cached'] is False
+        assert second['success'] and second['data']['cached'] is True
+        assert second['data']['analysis_id'] == first['data']['analysis_id'] and engine.calls == 1
+        
+        # الأخطاء لا تُخزن: كل طلب يعيد الحساب
+        for expected_calls in (2, 3):
+            failed = client.post('/api/lexicon/analyze_word', json={'word': 'خطأ'}).get_json()
+            assert not failed['success'] and engine.calls == expected_calls
+        
+        # كتابة في المعجم تبطل استجابة الكلمة والجذر
+        root = client.post('/api/lexicon/search_root', json={'root': 'كتب'}).get_json()
+        assert root['data']['cached'] is False
+        engine.write_entry('كتب', 'كتب')
+        assert client.post('/api/lexicon/analyze_word', json={'word': 'كتب'}).get_json()['data']['cached'] is False
+        assert client.post('/api/lexicon/search_root', json={'root': 'كتب'}).get_json()['data']['cached'] is False
+        
+        print("   ✅ ذاكرة الاستجابات تعمل بشكل صحيح\n")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ خطأ في اختبار ذاكرة الاستجابات: {e}\n")
+        return False
+
+def test_api_batch_endpoints():
+    """نقاط الدفعات: نتيجة لكل عنصر بالترتيب مع ملخص، ورفض القوائم الفارغة والكبيرة."""
+    
+    print("📦 اختبار نقاط الدفعات في API...")
+    print("-" * 40)
+    
+    api_module = api_module_or_skip()
+    if api_module is None:
+        return True
+    
+    try:
+        MAX_BATCH_ITEMS = api_module.MAX_BATCH_ITEMS
+        api, client = build_test_api()
+        
+        response = client.post('/api/lexicon/analyze_word_batch',
+                               json={'words': ['كتب', '', 'خطأ', 'درس', 'كتب']}).get_json()
+        assert response['success']
+        data = response['data']
+        results = data['results']
+        assert [result['success'] for result in results] == [True, False, False, True, True]
+        assert [result['data']['word'] for result in results if result['success']] == ['كتب', 'درس', 'كتب']
+        assert results[1]['error'] == 'الكلمة فارغة' and 'error' in results[2]
+        assert [result['cached'] for result in results if result['success']] == [False, False, True]
+        assert (data['total'], data['succeeded'], data['failed'], data['cache_hits']) == (5, 3, 2, 1)
+        
+        for payload in ({'words': []}, {'words': ['كتب'] * (MAX_BATCH_ITEMS + 1)}, {'words': 'كتب'}, {}):
+            rejected = client.post('/api/lexicon/analyze_word_batch', json=payload).get_json()
+            assert not rejected['success'] and rejected['error']
+        assert api.lexicon_engine.calls == 3
+        
+        print("   ✅ نقاط الدفعات تعمل بشكل صحيح\n")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ خطأ في اختبار نقاط الدفعات: {e}\n")
+        return False
+
+def load_thinking_core_module():
+    """تحميل النواة التفكيرية من مجلد core في جذر المستودع."""
+    core_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+                            "core")
+    if core_dir not in sys.path:
+        sys.path.append(core_dir)
+    spec = importlib.util.spec_from_file_location(
+        "thinking_core_metrics_test", os.path.join(core_dir, "complete_multi_layer_thinking_core.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_api_metrics_include_thinking_core():
+    """مؤقتات النواة التفكيرية تظهر في /metrics لواجهة API (سجل مقاييس واحد)."""
+    
+    print("📈 اختبار مقاييس النواة التفكيرية في API...")
+    print("-" * 40)
+    
+    api_module = api_module_or_skip()
+    if api_module is None:
+        return True
+    
+    from revolutionary_intelligence.engine_metrics import ENGINE_METRICS
+    was_enabled = ENGINE_METRICS.enabled
+    try:
+        thinking_core_module = load_thinking_core_module()
+        assert thinking_core_module.ENGINE_METRICS is ENGINE_METRICS
+        assert api_module.ENGINE_METRICS is ENGINE_METRICS
+        
+        api, client = build_test_api()
+        api.engine_metrics_enabled = True
+        api.setup_metrics_routes()
+        ENGINE_METRICS.enable()
+        ENGINE_METRICS.reset()
+        
+        core = thinking_core_module.CompleteMultiLayerThinkingCore("MetricsTestCore", background_learning=False)
+        core.comprehensive_processing("اختبار المقاييس")
+        
+        exposition = client.get('/metrics').get_data(as_text=True)
+        assert 'baserah_thinking_core_processing_seconds_count 1' in exposition.splitlines()
+        assert 'baserah_thinking_core_stage_seconds_count{stage="layers"} 1' in exposition.splitlines()
+        
+        print("   ✅ مؤقتات النواة التفكيرية تظهر في /metrics\n")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ خطأ في اختبار مقاييس النواة التفكيرية: {e}\n")
+        return False
+    finally:
+        ENGINE_METRICS.reset()
+        ENGINE_METRICS.enabled = was_enabled
+
 def start_test_servers():
     """بدء تشغيل الخوادم للاختبار."""
     
@@ -250,6 +454,9 @@ def run_comprehensive_test():
     print("🔧 اختبار الواجهات المحلية...")
     results['cli'] = test_cli_interface()
     results['desktop'] = test_desktop_gui()
+    results['api_cache'] = test_api_response_cache()
+    results['api_batch'] = test_api_batch_endpoints()
+    results['api_metrics'] = test_api_metrics_include_thinking_core()
     
     # بدء تشغيل الخوادم
     print("🌐 بدء تشغيل خوادم الاختبار...")
@@ -282,6 +489,9 @@ def run_comprehensive_test():
         interface_names = {
             'cli': 'واجهة سطر الأوامر',
             'desktop': 'واجهة سطح المكتب',
+            'api_cache': 'ذاكرة استجابات API',
+            'api_batch': 'نقاط الدفعات في API',
+            'api_metrics': 'مقاييس النواة التفكيرية في API',
             'api': 'واجهة API',
             'web': 'واجهة الويب'
         }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# test_performance_plot_cache.py - اختبار ذاكرة رسم أداء النظام
+
+import sys
+import os
+import time
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .performance_plot_cache import PerformancePlotCache, PlotSnapshot, render_performance_png
+
+
+class _MetricsSource:
+    """مصدر مقاييس وهمي يحسب عدد مرات الرسم."""
+
+    def __init__(self):
+        self.version = 0
+        self.renders = 0
+
+    def render(self) -> bytes:
+        self.renders += 1
+        return f"png-{self.version}".encode('utf-8')
+
+    def signature(self):
+        return self.version
+
+
+def test_render_only_on_change():
+    """لا يُعاد الرسم إلا عند تغير بصمة المقاييس."""
+
+    print("🧪 اختبار إعادة الرسم عند التغير فقط")
+    print("=" * 50)
+
+    try:
+        source = _MetricsSource()
+        cache = PerformancePlotCache(source.render, source.signature)
+
+        first = cache.get()
+        assert cache.get() is first and source.renders == 1
+        assert b'"status": "success"' in first.json_body
+
+        source.version += 1
+        second = cache.get()
+        assert source.renders == 2 and second.etag != first.etag
+
+        assert cache.refresh(force=True) and source.renders == 3
+        assert cache.get().etag == second.etag  # المحتوى نفسه -> الوسم نفسه
+
+        print("✅ إعادة الرسم عند التغير فقط تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار إعادة الرسم: {e}")
+        return False
+
+
+def test_etag_matching():
+    """مطابقة ترويسة If-None-Match."""
+
+    print("🧪 اختبار مطابقة ETag")
+    print("=" * 50)
+
+    try:
+        snapshot = PlotSnapshot(b"png", signature=0)
+        assert snapshot.matches_etag(f'"{snapshot.etag}"')
+        assert snapshot.matches_etag(f'"other", W/"{snapshot.etag}"')
+        assert snapshot.matches_etag('*')
+        assert not snapshot.matches_etag('"other"')
+        assert not snapshot.matches_etag(None)
+
+        print("✅ مطابقة ETag تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار ETag: {e}")
+        return False
+
+
+def test_background_refresh():
+    """المُحدِّث الخلفي يلتقط تغير المقاييس والطلبات تُخدم من الذاكرة."""
+
+    print("🧪 اختبار المُحدِّث الخلفي")
+    print("=" * 50)
+
+    try:
+        source = _MetricsSource()
+        cache = PerformancePlotCache(source.render, source.signature, refresh_interval=0.01).start()
+        try:
+            deadline = time.time() + 5
+            while cache.get_cache_status()['renders'] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            first_etag = cache.get().etag
+
+            source.version += 1
+            while cache.get().etag == first_etag and time.time() < deadline:
+                time.sleep(0.01)
+            assert cache.get().etag != first_etag
+            assert source.renders == 2
+        finally:
+            cache.stop(timeout=5)
+        assert not cache.is_running
+
+        print("✅ المُحدِّث الخلفي يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار المُحدِّث الخلفي: {e}")
+        return False
+
+
+def test_png_rendering():
+    """رسم المقاييس إلى PNG دون pyplot."""
+
+    print("🧪 اختبار رسم المقاييس")
+    print("=" * 50)
+
+    try:
+        class _Metrics:
+            performance_score = 0.5
+            adaptation_efficiency = 0.4
+            revolutionary_potential = 0.3
+            system_complexity = 0.2
+
+        png = render_performance_png([_Metrics(), _Metrics()], dpi=30)
+        assert png.startswith(b'\x89PNG')
+
+        print("✅ رسم المقاييس يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار الرسم: {e}")
+        return False
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات ذاكرة رسم الأداء")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("إعادة الرسم عند التغير فقط", test_render_only_on_change()),
+        ("مطابقة ETag", test_etag_matching()),
+        ("المُحدِّث الخلفي", test_background_refresh()),
+        ("رسم المقاييس", test_png_rendering())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# test_prefork_server.py - اختبار خادم pre-fork متعدد العمليات
+
+import sys
+import os
+import json
+import signal
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+# إضافة المسار للوصول للمكتبات
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .prefork_server import RequestTimeoutMiddleware
+
+# خادم صغير في عملية منفصلة: التطبيق يُنشأ مرة واحدة في العملية الرئيسية
+SERVER_TEMPLATE = """
+import os, sys, time
+sys.path.insert(0, {interfaces_dir!r})
+from flask import Flask, jsonify
+from prefork_server import PreforkServer
+
+def factory():
+    print('FACTORY', os.getpid(), flush=True)
+    app = Flask('prefork_test')
+
+    @app.route('/pid')
+    def pid():
+        return jsonify(pid=os.getpid(), master=os.getppid())
+
+    @app.route('/slow')
+    def slow():
+        time.sleep(30)
+        return 'late'
+
+    return app
+
+PreforkServer(factory, port={port}, workers=3, threads=2, timeout=1, graceful_timeout=5).serve_forever()
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _get_json(url: str, timeout: float = 5.0):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def test_request_tracking():
+    """الطلب يُعد جارياً حتى انتهاء إرسال جسم الاستجابة."""
+
+    print("🧪 اختبار تتبع الطلبات الجارية")
+    print("=" * 50)
+
+    try:
+        def app(environ, start_response):
+            start_response('200 OK', [])
+            return [b'a', b'b']
+
+        middleware = RequestTimeoutMiddleware(app)
+        body = middleware({}, lambda status, headers: None)
+        assert middleware.active_requests() == 1
+        time.sleep(0.05)
+        assert middleware.oldest_request_age() >= 0.05
+        assert b''.join(body) == b'ab'
+        assert middleware.active_requests() == 0 and middleware.oldest_request_age() == 0.0
+
+        print("✅ تتبع الطلبات الجارية يعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار تتبع الطلبات: {e}")
+        return False
+
+
+def test_prefork_workers_timeout_and_stop():
+    """عدة عمّال من تحميل واحد، استبدال العامل بعد المهلة، وإيقاف رشيق."""
+
+    print("🧪 اختبار العمّال والمهلة والإيقاف")
+    print("=" * 50)
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    code = SERVER_TEMPLATE.format(interfaces_dir=os.path.dirname(os.path.abspath(__file__)), port=port)
+    process = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True)
+
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                _get_json(f"{base_url}/pid", timeout=1)
+                break
+            except (urllib.error.URLError, OSError):
+                if time.time() > deadline or process.poll() is not None:
+                    raise RuntimeError("لم يبدأ الخادم")
+                time.sleep(0.1)
+
+        worker_pids = {_get_json(f"{base_url}/pid")['pid'] for _ in range(60)}
+        assert len(worker_pids) >= 2, worker_pids
+
+        try:
+            urllib.request.urlopen(f"{base_url}/slow", timeout=10).read()
+            raise AssertionError("الطلب البطيء لم يُقطع")
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        assert _get_json(f"{base_url}/pid")['master'] == process.pid
+
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=15)
+        assert process.returncode == 0
+        assert output.count('FACTORY') == 1
+        assert 'تجاوز طلب المهلة' in output
+
+        print("✅ العمّال والمهلة والإيقاف تعمل بشكل صحيح")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار خادم pre-fork: {e}")
+        return False
+
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def run_all_tests():
+    """تشغيل جميع الاختبارات."""
+
+    print("🚀 بدء اختبارات خادم pre-fork")
+    print(f"📅 وقت البدء: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    results = [
+        ("تتبع الطلبات الجارية", test_request_tracking()),
+        ("العمّال والمهلة والإيقاف", test_prefork_workers_timeout_and_stop())
+    ]
+
+    passed_tests = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ نجح" if result else "❌ فشل"
+        print(f"{status} {test_name}")
+
+    print()
+    print(f"📈 النتيجة الإجمالية: {passed_tests}/{len(results)}")
+    return passed_tests == len(results)
+
+
+if __name__ == "__main__":
+    run_all_tests()
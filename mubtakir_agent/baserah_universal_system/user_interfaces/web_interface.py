@@ -8,15 +8,12 @@
 # 🌐 الواجهة: واجهة ويب شاملة للنظام الثوري المتكامل
 # 🌟 النظام: Baserah Universal System - واجهة موحدة لجميع المحركات الثورية
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response
 import json
 import sys
 import os
 from datetime import datetime
 import numpy as np
-import matplotlib.pyplot as plt
-import io
-import base64
 
 # إضافة المسار للاستيراد
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -29,7 +26,11 @@ from artistic_unit.integrated_system import BaserahIntegratedSystem
 from revolutionary_intelligence.quranic_analysis_engine import QuranicAnalysisEngine
 from revolutionary_intelligence.arabic_lexicon_engine import ArabicLexiconEngine
 from revolutionary_intelligent_agent.intelligent_agent import BaserahIntelligentAgent
+from revolutionary_intelligence.lazy_component_registry import LazyComponentRegistry
 from revolutionary_intelligence.advanced_mathematical_engine import AdvancedMathematicalEngine
+from user_interfaces.performance_plot_cache import (
+    PerformancePlotCache, render_performance_png, metrics_signature, plotted_metrics
+)
 
 class BaserahWebInterface:
     """
@@ -43,8 +44,18 @@ class BaserahWebInterface:
     - الوحدة الفنية
     """
     
-    def __init__(self):
-        """تهيئة واجهة الويب."""
+    def __init__(self, preload_components: list = None, plot_refresh_interval: float = 5.0):
+        """
+        تهيئة واجهة الويب.
+
+        Args:
+            preload_components: محركات تُنشأ مسبقاً بدلاً من الانتظار لأول طلب
+                (مثلاً ['quranic_engine', 'lexicon_engine'])
+            plot_refresh_interval: فترة فحص المقاييس لإعادة رسم الأداء في الخلفية (بالثواني)
+        """
+
+        self.preload_components = preload_components
+        self.plot_refresh_interval = plot_refresh_interval
         
         self.app = Flask(__name__, template_folder='templates', static_folder='static')
         
@@ -75,22 +86,44 @@ class BaserahWebInterface:
             # وراثة الوحدة الفنية من النظام الأم
             self.mother_system.inherit_to_unit(InheritanceType.ARTISTIC_UNIT, self.artistic_unit)
 
+            # المحركات الثقيلة تُنشأ عند أول طلب يحتاجها (سجل المكونات الكسولة)
+            self.component_registry = LazyComponentRegistry("WebComponents")
+
             # محرك التحليل القرآني
-            self.quranic_engine = QuranicAnalysisEngine("WebQuranicEngine")
+            self.quranic_engine = self.component_registry.register(
+                'quranic_engine', lambda: QuranicAnalysisEngine("WebQuranicEngine")
+            )
 
             # محرك المعجم العربي
-            self.lexicon_engine = ArabicLexiconEngine("WebLexiconEngine")
+            self.lexicon_engine = self.component_registry.register(
+                'lexicon_engine', lambda: ArabicLexiconEngine("WebLexiconEngine")
+            )
 
             # الوكيل الذكي الثوري
-            self.intelligent_agent = BaserahIntelligentAgent("WebIntelligentAgent")
+            self.intelligent_agent = self.component_registry.register(
+                'intelligent_agent', lambda: BaserahIntelligentAgent("WebIntelligentAgent")
+            )
 
             # المحرك الرياضي المتقدم
-            self.mathematical_engine = AdvancedMathematicalEngine("WebMathematicalEngine")
+            self.mathematical_engine = self.component_registry.register(
+                'mathematical_engine', lambda: AdvancedMathematicalEngine("WebMathematicalEngine")
+            )
             
             # كائن معرفي متقدم
             self.consciousness = BaserahAdvancedCognitiveObject("الوعي الويب", 
                                                               AdvancedCognitiveType.CONSCIOUSNESS_SIMULATOR)
             
+            # رسم الأداء يُحفظ في الذاكرة ولا يُعاد إلا عند تغير المقاييس
+            self.performance_plot = PerformancePlotCache(
+                lambda: render_performance_png(plotted_metrics(self.self_evolving)),
+                lambda: metrics_signature(self.self_evolving),
+                refresh_interval=self.plot_refresh_interval
+            )
+            
+            # إحماء مسبق اختياري للمحركات المحددة
+            if self.preload_components:
+                self.component_registry.warm_up(self.preload_components)
+            
             self.system_ready = True
             print("✅ تم تهيئة النظام الثوري للويب بنجاح")
             
@@ -132,6 +165,8 @@ class BaserahWebInterface:
                         'adaptation_efficiency': metrics.adaptation_efficiency,
                         'revolutionary_potential': metrics.revolutionary_potential
                     },
+                    'lazy_components': self.component_registry.get_registry_status(),
+                    'performance_plot': self.performance_plot.get_cache_status(),
                     'timestamp': datetime.now().isoformat()
                 })
                 
@@ -417,67 +452,21 @@ class BaserahWebInterface:
         
         @self.app.route('/api/plot/system_performance')
         def plot_system_performance():
-            """رسم أداء النظام."""
+            """رسم أداء النظام (من الذاكرة، مع ETag)."""
             if not self.system_ready:
                 return jsonify({'status': 'error', 'message': 'النظام غير جاهز'})
             
             try:
-                # إنشاء بيانات وهمية للرسم
-                metrics_history = self.self_evolving.metrics_history
-                
-                if not metrics_history:
-                    # بيانات وهمية إذا لم يكن هناك تاريخ
-                    metrics_history = [self.self_evolving.current_metrics]
-                
-                # إنشاء الرسم
-                fig, axes = plt.subplots(2, 2, figsize=(12, 8))
-                fig.suptitle('أداء النظام الثوري Baserah', fontsize=16)
-                
-                steps = range(len(metrics_history))
-                
-                # رسم نقاط الأداء
-                performance_scores = [m.performance_score for m in metrics_history]
-                axes[0, 0].plot(steps, performance_scores, 'b-o')
-                axes[0, 0].set_title('نقاط الأداء')
-                axes[0, 0].set_ylabel('النقاط')
-                axes[0, 0].grid(True)
-                
-                # رسم كفاءة التكيف
-                adaptation_efficiency = [m.adaptation_efficiency for m in metrics_history]
-                axes[0, 1].plot(steps, adaptation_efficiency, 'g-o')
-                axes[0, 1].set_title('كفاءة التكيف')
-                axes[0, 1].set_ylabel('الكفاءة')
-                axes[0, 1].grid(True)
-                
-                # رسم الإمكانات الثورية
-                revolutionary_potential = [m.revolutionary_potential for m in metrics_history]
-                axes[1, 0].plot(steps, revolutionary_potential, 'r-o')
-                axes[1, 0].set_title('الإمكانات الثورية')
-                axes[1, 0].set_ylabel('الإمكانات')
-                axes[1, 0].set_xlabel('الخطوة')
-                axes[1, 0].grid(True)
+                snapshot = self.performance_plot.get()
                 
-                # رسم تعقيد النظام
-                system_complexity = [m.system_complexity for m in metrics_history]
-                axes[1, 1].plot(steps, system_complexity, 'm-o')
-                axes[1, 1].set_title('تعقيد النظام')
-                axes[1, 1].set_ylabel('التعقيد')
-                axes[1, 1].set_xlabel('الخطوة')
-                axes[1, 1].grid(True)
-                
-                plt.tight_layout()
-                
-                # تحويل إلى base64
-                img_buffer = io.BytesIO()
-                plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-                img_buffer.seek(0)
-                img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-                plt.close()
-                
-                return jsonify({
-                    'status': 'success',
-                    'image': f'data:image/png;base64,{img_base64}'
-                })
+                # الصورة لم تتغير منذ آخر طلب: لا جسم للاستجابة
+                if snapshot.matches_etag(request.headers.get('If-None-Match')):
+                    response = Response(status=304)
+                else:
+                    response = Response(snapshot.json_body, mimetype='application/json')
+                response.set_etag(snapshot.etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
                 
             except Exception as e:
                 return jsonify({'status': 'error', 'message': str(e)})
@@ -659,7 +648,11 @@ class BaserahWebInterface:
         
         if self.system_ready:
             print(f"🌐 تشغيل واجهة الويب على http://{host}:{port}")
-            self.app.run(host=host, port=port, debug=debug)
+            self.performance_plot.start()
+            try:
+                self.app.run(host=host, port=port, debug=debug)
+            finally:
+                self.performance_plot.stop()
         else:
             print("❌ النظام غير جاهز للتشغيل")
 
@@ -14,9 +14,229 @@ Built on Basera Revolutionary System - No traditional ML
 import numpy as np
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 import math
+import os
 import random
+import sys
+from operator import itemgetter
+
+# سجل التاريخ المحدود المشترك يعيش في حزمة revolutionary_intelligence
+try:
+    from revolutionary_intelligence.bounded_history import BoundedHistory
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                 'mubtakir_agent', 'baserah_universal_system'))
+    from revolutionary_intelligence.bounded_history import BoundedHistory
+
+# تصنيف أنواع المعاملات (ثنائية الصفر)
+SPENDING_TYPES = frozenset(["purchase", "withdrawal", "payment"])
+SAVING_TYPES = frozenset(["deposit", "transfer_in", "refund"])
+
+# أزواج السلوك المتضاد (الأضداد المتعامدة)
+OPPOSITE_BEHAVIOR_PAIRS = [
+    ("purchase", "refund"),
+    ("withdrawal", "deposit"),
+    ("payment", "transfer_in"),
+    ("spending", "saving")
+]
+
+# أوزان مؤشرات الاحتيال
+FRAUD_INDICATOR_WEIGHTS = {
+    "duality_anomaly": 0.3,
+    "perpendicular_anomaly": 0.25,
+    "filament_anomaly": 0.25,
+    "baseline_deviation": 0.2
+}
+
+# عتبات مستويات المخاطر (من الأعلى للأدنى)
+RISK_LEVELS = [(0.8, "عالي جداً"), (0.6, "عالي"), (0.4, "متوسط"), (0.2, "منخفض")]
+SAFE_RISK_LEVEL = "آمن"
+
+# المعاملتان من النوع نفسه مترابطتان (خيط) إذا كانت نسبة المبلغين أقل من 5
+FILAMENT_AMOUNT_RATIO = 5.0
+# دلاء لوغاريتمية للمبالغ: عدد الدلاء داخل نسبة الترابط (تقريب عد الأزواج في O(1))
+FILAMENT_BUCKETS_PER_RATIO = 4
+# دلاء وقت اليوم (ساعات)
+TIME_OF_DAY_BUCKETS = 24
+
+
+def _transaction_hour(transaction: Dict) -> Optional[int]:
+    """ساعة المعاملة من 'hour' أو من الطابع الزمني (None إذا لم يتضمن وقتاً)"""
+    hour = transaction.get("hour")
+    if hour is not None:
+        return int(hour) % TIME_OF_DAY_BUCKETS
+    timestamp = transaction.get("timestamp")
+    if isinstance(timestamp, datetime):
+        return timestamp.hour
+    if isinstance(timestamp, str) and len(timestamp) >= 13 and timestamp[10] in "T ":
+        try:
+            return int(timestamp[11:13])
+        except ValueError:
+            return None
+    return None
+
+
+def _filament_bucket(amount: float) -> int:
+    """دلو المبلغ على مقياس لوغاريتمي (المبالغ ≤ 1 في الدلو صفر)"""
+    return int(math.floor(math.log(max(amount, 1.0)) / math.log(FILAMENT_AMOUNT_RATIO)
+                          * FILAMENT_BUCKETS_PER_RATIO))
+
+
+def risk_level_for(fraud_probability: float) -> str:
+    """مستوى المخاطر لاحتمالية احتيال"""
+    for threshold, level in RISK_LEVELS:
+        if fraud_probability >= threshold:
+            return level
+    return SAFE_RISK_LEVEL
+
+
+class _RunningStats:
+    """متوسط وتباين وحدود بطريقة Welford (تحديث O(1))"""
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def as_pattern(self) -> Dict:
+        if not self.count:
+            return {"average_amount": 0, "frequency": 0, "variance": 0}
+        return {
+            "average_amount": self.mean,
+            "frequency": self.count,
+            "variance": self.variance,
+            "max_amount": self.maximum,
+            "min_amount": self.minimum
+        }
+
+
+class UserBehaviorState:
+    """
+    📊 خط أساس سلوكي بإحصائيات كافية متراكمة
+    كل معاملة تُضاف في O(1)، والذاكرة محدودة (عدادات ومدرجات فقط، لا قائمة معاملات):
+    - إنفاق/ادخار: عدد، متوسط، تباين، حدود
+    - مدرج أنواع المعاملات
+    - مدرج ساعات اليوم
+    - أزواج المعاملات المترابطة (خيوط) عبر مدرج لوغاريتمي للمبالغ لكل نوع
+    """
+
+    def __init__(self):
+        self.transaction_count = 0
+        self.spending = _RunningStats()
+        self.saving = _RunningStats()
+        self.type_counts: Dict[str, int] = {}
+        self.hour_counts = [0] * TIME_OF_DAY_BUCKETS
+        self.timed_count = 0
+        self.filament_buckets: Dict[str, Dict[int, int]] = {}
+        self.connected_pairs = 0
+        self.updated_at = None
+        self._known_types: Optional[frozenset] = None
+
+    def add(self, transaction: Dict):
+        """تحديث الحالة بمعاملة واحدة"""
+        amount = transaction.get("amount", 0)
+        transaction_type = transaction.get("type", "unknown")
+
+        self.transaction_count += 1
+        if transaction_type in SPENDING_TYPES:
+            self.spending.add(amount)
+        elif transaction_type in SAVING_TYPES:
+            self.saving.add(amount)
+
+        if transaction_type not in self.type_counts:
+            self._known_types = None
+        self.type_counts[transaction_type] = self.type_counts.get(transaction_type, 0) + 1
+
+        hour = _transaction_hour(transaction)
+        if hour is not None:
+            self.hour_counts[hour] += 1
+            self.timed_count += 1
+
+        # المعاملات السابقة من النوع نفسه في الدلاء القريبة (نسبة مبالغ < 5)
+        buckets = self.filament_buckets.setdefault(transaction_type, {})
+        bucket = _filament_bucket(amount)
+        window = FILAMENT_BUCKETS_PER_RATIO - 1
+        self.connected_pairs += sum(buckets.get(b, 0) for b in range(bucket - window, bucket + window + 1))
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+
+        self.updated_at = datetime.now().isoformat()
+
+    # ---------- مشتقات خط الأساس ----------
+
+    @property
+    def opposite_behaviors(self) -> List[Tuple]:
+        types = list(self.type_counts)
+        return [(types[i], types[j])
+                for i in range(len(types)) for j in range(i + 1, len(types))
+                if any(types[i] in pair and types[j] in pair for pair in OPPOSITE_BEHAVIOR_PAIRS)]
+
+    @property
+    def known_types(self) -> frozenset:
+        """الأنواع المشاركة في زوج أضداد (تُحسب عند تغير مجموعة الأنواع فقط)"""
+        if self._known_types is None:
+            self._known_types = frozenset(t for pair in self.opposite_behaviors for t in pair)
+        return self._known_types
+
+    @property
+    def complexity_score(self) -> float:
+        return len(self.opposite_behaviors) * 0.2
+
+    @property
+    def connection_density(self) -> float:
+        return self.connected_pairs / self.transaction_count if self.transaction_count else 0.0
+
+    @property
+    def financial_balance(self) -> float:
+        total_spending = self.spending.mean * self.spending.count
+        total_saving = self.saving.mean * self.saving.count
+        total = total_spending + total_saving
+        return total_saving / total if total > 0 else 0.5
+
+    def time_of_day_anomaly(self, hour: Optional[int], min_samples: int = 10) -> float:
+        """ندرة ساعة المعاملة في سجل المستخدم (0 = معتادة، 1 = لم تُرَ قط)"""
+        if hour is None or self.timed_count < min_samples:
+            return 0.0
+        share = (self.hour_counts[hour] + 1) / (self.timed_count + TIME_OF_DAY_BUCKETS)
+        return max(0.0, 1.0 - share * TIME_OF_DAY_BUCKETS)
+
+    def to_baseline(self) -> Dict:
+        """ملخص بصيغة خط الأساس التقليدي"""
+        return {
+            "zero_duality_baseline": {
+                "spending_pattern": self.spending.as_pattern(),
+                "saving_pattern": self.saving.as_pattern(),
+                "financial_balance": self.financial_balance
+            },
+            "perpendicular_baseline": {
+                "opposite_behaviors": self.opposite_behaviors,
+                "complexity_score": self.complexity_score
+            },
+            "filament_baseline": {
+                "connection_density": self.connection_density
+            },
+            "transaction_count": self.transaction_count,
+            "type_histogram": dict(self.type_counts),
+            "time_of_day_histogram": list(self.hour_counts),
+            "established_at": self.updated_at
+        }
+
 
 class RevolutionaryFraudDetection:
     """
@@ -24,17 +244,35 @@ class RevolutionaryFraudDetection:
     يستخدم النظريات الثلاث الثورية لكشف الأنماط المشبوهة
     """
     
-    def __init__(self, system_name: str = "RevolutionaryFraudDetector"):
-        """تهيئة النظام"""
+    def __init__(self, system_name: str = "RevolutionaryFraudDetector", online: bool = False,
+                 detection_history_capacity: int = 10000, detection_archive_path: Optional[str] = None):
+        """
+        تهيئة النظام
+
+        online=True: خط الأساس إحصائيات متراكمة لكل مستخدم (UserBehaviorState)
+        تُحدَّث في O(1) لكل معاملة، والكشف يقيس الانحراف عنها مباشرة.
+        سجل الكشف محدود بـ detection_history_capacity، والنتائج الأقدم تُفرّغ
+        إلى detection_archive_path (JSONL) إن حُدد.
+        """
         self.system_name = system_name
+        self.online = online
         self.normal_patterns = {}
         self.fraud_indicators = {}
         self.behavioral_baselines = {}
-        self.detection_history = []
+        self.user_states: Dict[str, UserBehaviorState] = {}
+        self.detection_history = BoundedHistory(
+            detection_history_capacity,
+            aggregates={"fraud_probability": itemgetter("fraud_probability")},
+            spill_path=detection_archive_path
+        )
         
         print(f"🛡️ تهيئة {self.system_name}")
         print("🧬 نظام كشف احتيال ثوري بدون تعلم آلة تقليدي")
     
+    def get_detection_statistics(self) -> Dict:
+        """📈 إحصائيات سجل الكشف: متوسط احتمالية الاحتيال المتدحرج وأعلاها وعدد الكشوفات"""
+        return self.detection_history.get_statistics()
+    
     def establish_baseline(self, user_id: str, transactions: List[Dict]):
         """
         📊 إنشاء خط أساس للسلوك الطبيعي
@@ -42,6 +280,14 @@ class RevolutionaryFraudDetection:
         """
         print(f"📊 إنشاء خط أساس للمستخدم: {user_id}")
         
+        if self.online:
+            state = UserBehaviorState()
+            for transaction in transactions:
+                state.add(transaction)
+            self.user_states[user_id] = state
+            print(f"✅ تم إنشاء خط أساس من {len(transactions)} معاملة")
+            return
+        
         # تطبيق النظريات الثلاث على المعاملات
         zero_duality = self.apply_zero_duality_to_transactions(transactions)
         perpendicular = self.apply_perpendicular_opposites_to_transactions(transactions)
@@ -131,11 +377,44 @@ class RevolutionaryFraudDetection:
             "connection_density": self._calculate_behavioral_density(transaction_connections)
         }
     
-    def detect_fraud(self, user_id: str, new_transaction: Dict) -> Dict:
+    def update_baseline(self, user_id: str, transaction: Dict):
+        """تحديث خط الأساس المتراكم بمعاملة واحدة (O(1))"""
+        state = self.user_states.get(user_id)
+        if state is None:
+            state = self.user_states[user_id] = UserBehaviorState()
+        state.add(transaction)
+    
+    def _score_against_state(self, state: UserBehaviorState, transaction: Dict) -> Dict:
+        """مؤشرات الاحتيال لمعاملة مقارنة بالحالة المتراكمة"""
+        amount = transaction.get("amount", 0)
+        baseline_avg = state.spending.mean if state.spending.count else 0
+        
+        if baseline_avg > 0:
+            amount_deviation = abs(amount - baseline_avg) / baseline_avg
+            duality_anomaly = amount_deviation
+        else:
+            amount_deviation = 1.0 if amount > 0 else 0.0
+            duality_anomaly = 1.0 if amount > 100 else 0.0
+        
+        complexity_deviation = abs(0.2 - state.complexity_score)
+        
+        return {
+            "duality_anomaly": min(duality_anomaly, 1.0),
+            "perpendicular_anomaly": 0.1 if transaction.get("type", "unknown") in state.known_types else 0.8,
+            "filament_anomaly": 0.6 if state.connection_density > 0.5 else 0.2,
+            "baseline_deviation": min((amount_deviation + complexity_deviation) / 2, 1.0),
+            "time_of_day_anomaly": state.time_of_day_anomaly(_transaction_hour(transaction))
+        }
+    
+    def detect_fraud(self, user_id: str, new_transaction: Dict, update_baseline: bool = True) -> Dict:
         """
         🚨 كشف الاحتيال في معاملة جديدة
+
+        في الوضع المتدفق تُضاف المعاملة إلى خط الأساس بعد فحصها
+        (ما لم تكن عالية المخاطر) إذا كان update_baseline=True.
         """
-        print(f"\n🚨 فحص معاملة للمستخدم: {user_id}")
+        if self.online:
+            return self._detect_fraud_online(user_id, new_transaction, update_baseline)
         
         if user_id not in self.behavioral_baselines:
             return {
@@ -183,6 +462,138 @@ class RevolutionaryFraudDetection:
         
         return detection_result
     
+    def _detect_fraud_online(self, user_id: str, new_transaction: Dict, update_baseline: bool) -> Dict:
+        """كشف الاحتيال مقابل الحالة المتراكمة للمستخدم"""
+        state = self.user_states.get(user_id)
+        if state is None or state.transaction_count == 0:
+            if update_baseline:
+                self.update_baseline(user_id, new_transaction)
+            return {
+                "fraud_probability": 0.5,
+                "risk_level": "unknown",
+                "reason": "لا يوجد خط أساس للمستخدم"
+            }
+        
+        fraud_indicators = self._score_against_state(state, new_transaction)
+        fraud_probability = self._calculate_fraud_probability(fraud_indicators)
+        
+        detection_result = {
+            "user_id": user_id,
+            "transaction": new_transaction,
+            "fraud_probability": fraud_probability,
+            "risk_level": self._determine_risk_level(fraud_probability),
+            "explanation": self._generate_fraud_explanation(fraud_indicators),
+            "fraud_indicators": fraud_indicators,
+            "detected_at": datetime.now().isoformat()
+        }
+        self.detection_history.append(detection_result)
+        
+        # المعاملات المشبوهة لا تُضم إلى السلوك الطبيعي
+        if update_baseline and fraud_probability < 0.6:
+            state.add(new_transaction)
+        
+        return detection_result
+    
+    def detect_fraud_batch(self, user_ids: Sequence[str],
+                           transactions: Union[List[Dict], Dict[str, Sequence]]) -> Dict[str, np.ndarray]:
+        """
+        🚨 كشف الاحتيال لمصفوفة معاملات في تمريرة متجهية واحدة (الوضع المتدفق)
+
+        transactions: قائمة قواميس، أو أعمدة {'amount': [...], 'type': [...], 'hour'/'timestamp': [...]}
+        النتيجة مصفوفات بطول المعاملات؛ لا يُعدَّل خط الأساس ولا سجل الكشف.
+        """
+        if isinstance(transactions, dict):
+            amounts = np.asarray(transactions.get("amount", []), dtype=float)
+            types = np.asarray(transactions.get("type", ["unknown"] * len(amounts)), dtype=object)
+            if "hour" in transactions:
+                hours_source = [{"hour": h} for h in transactions["hour"]]
+            else:
+                hours_source = [{"timestamp": t} for t in transactions.get("timestamp", [None] * len(amounts))]
+        else:
+            amounts = np.fromiter((t.get("amount", 0) for t in transactions), dtype=float, count=len(transactions))
+            types = np.array([t.get("type", "unknown") for t in transactions], dtype=object)
+            hours_source = transactions
+        hours = np.array([-1 if hour is None else hour for hour in map(_transaction_hour, hours_source)],
+                         dtype=int)
+        
+        n = len(amounts)
+        if len(user_ids) != n:
+            raise ValueError(f"عدد المستخدمين ({len(user_ids)}) لا يطابق عدد المعاملات ({n})")
+        if n == 0:
+            empty = np.zeros(0)
+            return {
+                "fraud_probability": empty,
+                "risk_level": np.zeros(0, dtype=object),
+                "duality_anomaly": empty.copy(),
+                "perpendicular_anomaly": empty.copy(),
+                "filament_anomaly": empty.copy(),
+                "baseline_deviation": empty.copy(),
+                "time_of_day_anomaly": empty.copy(),
+                "has_baseline": np.zeros(0, dtype=bool)
+            }
+        unique_users, user_index = np.unique(np.asarray(user_ids, dtype=object), return_inverse=True)
+        unique_types, type_index = np.unique(types, return_inverse=True)
+        states = [self.user_states.get(user_id) for user_id in unique_users]
+        
+        # خصائص كل مستخدم مرة واحدة
+        has_state = np.array([s is not None and s.transaction_count > 0 for s in states], dtype=bool)
+        spending_mean = np.array([s.spending.mean if s is not None and s.spending.count else 0.0 for s in states],
+                                 dtype=float)
+        complexity = np.array([s.complexity_score if s is not None else 0.0 for s in states], dtype=float)
+        density = np.array([s.connection_density if s is not None else 0.0 for s in states], dtype=float)
+        known = np.array([[s is not None and t in s.known_types for t in unique_types] for s in states],
+                         dtype=bool).reshape(len(states), len(unique_types))
+        hour_share = np.zeros((len(states), TIME_OF_DAY_BUCKETS))
+        enough_time = np.zeros(len(states), dtype=bool)
+        for i, s in enumerate(states):
+            if s is not None and s.timed_count >= 10:
+                enough_time[i] = True
+                hour_share[i] = (np.asarray(s.hour_counts) + 1) / (s.timed_count + TIME_OF_DAY_BUCKETS)
+        
+        # المؤشرات متجهياً
+        baseline_avg = spending_mean[user_index]
+        positive_avg = baseline_avg > 0
+        safe_avg = np.where(positive_avg, baseline_avg, 1.0)
+        relative = np.abs(amounts - baseline_avg) / safe_avg
+        amount_deviation = np.where(positive_avg, relative, (amounts > 0).astype(float))
+        duality = np.minimum(np.where(positive_avg, relative, (amounts > 100).astype(float)), 1.0)
+        perpendicular = np.where(known[user_index, type_index], 0.1, 0.8)
+        filament = np.where(density[user_index] > 0.5, 0.6, 0.2)
+        deviation = np.minimum((amount_deviation + np.abs(0.2 - complexity[user_index])) / 2, 1.0)
+        timed = (hours >= 0) & enough_time[user_index]
+        time_anomaly = np.zeros(n)
+        time_anomaly[timed] = np.maximum(
+            0.0, 1.0 - hour_share[user_index[timed], hours[timed]] * TIME_OF_DAY_BUCKETS
+        )
+        
+        probability = np.minimum(
+            duality * FRAUD_INDICATOR_WEIGHTS["duality_anomaly"]
+            + perpendicular * FRAUD_INDICATOR_WEIGHTS["perpendicular_anomaly"]
+            + filament * FRAUD_INDICATOR_WEIGHTS["filament_anomaly"]
+            + deviation * FRAUD_INDICATOR_WEIGHTS["baseline_deviation"],
+            1.0
+        )
+        
+        known_user = has_state[user_index]
+        probability = np.where(known_user, probability, 0.5)
+        risk_level = np.select(
+            [probability >= threshold for threshold, _ in RISK_LEVELS],
+            [level for _, level in RISK_LEVELS],
+            default=SAFE_RISK_LEVEL
+        ).astype(object)
+        risk_level[~known_user] = "unknown"
+        
+        return {
+            "fraud_probability": probability,
+            "risk_level": risk_level,
+            "duality_anomaly": duality,
+            "perpendicular_anomaly": perpendicular,
+            "filament_anomaly": filament,
+            "baseline_deviation": deviation,
+            "time_of_day_anomaly": time_anomaly,
+            "has_baseline": known_user
+        }
+    
     def _analyze_spending_pattern(self, spending_transactions: List[Dict]) -> Dict:
         """تحليل نمط الإنفاق"""
         if not spending_transactions:
@@ -248,14 +659,7 @@ class RevolutionaryFraudDetection:
     
     def _are_opposite_behaviors(self, behavior1: str, behavior2: str) -> bool:
         """تحديد إذا كان السلوكان متضادين"""
-        opposite_pairs = [
-            ("purchase", "refund"),
-            ("withdrawal", "deposit"),
-            ("payment", "transfer_in"),
-            ("spending", "saving")
-        ]
-        
-        for pair in opposite_pairs:
+        for pair in OPPOSITE_BEHAVIOR_PAIRS:
             if (behavior1 in pair and behavior2 in pair):
                 return True
         
@@ -428,32 +832,16 @@ class RevolutionaryFraudDetection:
     
     def _calculate_fraud_probability(self, indicators: Dict) -> float:
         """حساب احتمالية الاحتيال"""
-        weights = {
-            "duality_anomaly": 0.3,
-            "perpendicular_anomaly": 0.25,
-            "filament_anomaly": 0.25,
-            "baseline_deviation": 0.2
-        }
-        
         fraud_probability = sum(
-            indicators[key] * weights[key] 
-            for key in weights.keys()
+            indicators[key] * weight
+            for key, weight in FRAUD_INDICATOR_WEIGHTS.items()
         )
         
         return min(fraud_probability, 1.0)
     
     def _determine_risk_level(self, fraud_probability: float) -> str:
         """تحديد مستوى المخاطر"""
-        if fraud_probability >= 0.8:
-            return "عالي جداً"
-        elif fraud_probability >= 0.6:
-            return "عالي"
-        elif fraud_probability >= 0.4:
-            return "متوسط"
-        elif fraud_probability >= 0.2:
-            return "منخفض"
-        else:
-            return "آمن"
+        return risk_level_for(fraud_probability)
     
     def _generate_fraud_explanation(self, indicators: Dict) -> str:
         """توليد تفسير للاحتيال"""
@@ -471,6 +859,9 @@ class RevolutionaryFraudDetection:
         if indicators["baseline_deviation"] > 0.5:
             explanations.append("انحراف عن السلوك المعتاد")
         
+        if indicators.get("time_of_day_anomaly", 0.0) > 0.5:
+            explanations.append("وقت غير معتاد")
+        
         if not explanations:
             return "المعاملة تبدو طبيعية"
         
@@ -520,7 +911,87 @@ def main():
         else:
             print("   ✅ معاملة آمنة")
     
+    # الوضع المتدفق: خط أساس متراكم وفحص دفعة كاملة بتمريرة واحدة
+    print("\n⚡ الوضع المتدفق - فحص دفعة:")
+    online_detector = RevolutionaryFraudDetection("StreamingFraudDetector", online=True)
+    online_detector.establish_baseline("user_123", normal_transactions)
+    batch_result = online_detector.detect_fraud_batch(["user_123"] * len(test_transactions), test_transactions)
+    for transaction, probability, risk_level in zip(test_transactions, batch_result["fraud_probability"],
+                                                    batch_result["risk_level"]):
+        print(f"   💰 {transaction['amount']}: {probability:.3f} ({risk_level})")
+    
+    rolling = fraud_detector.get_detection_statistics()["aggregates"]["fraud_probability"]
+    print(f"\n📈 سجل الكشف: {rolling['count']} كشف، متوسط الاحتمالية {rolling['mean']:.3f}، الأعلى {rolling['max']:.3f}")
+    
     print("\n✅ تم إنجاز اختبار كشف الاحتيال بنجاح!")
 
+def test_batch_and_online_match_offline() -> bool:
+    """🧪 الكشف الدفعي والمتدفق يعطيان احتمالات المسار الأصلي (خط الأساس الكامل) ومستويات مخاطره"""
+    print("🧪 اختبار تطابق الكشف الدفعي والمتدفق مع المسار الأصلي")
+    print("=" * 60)
+
+    try:
+        histories = {
+            "user_a": [
+                {"amount": 50, "type": "purchase", "timestamp": "2025-01-01T09:00:00", "merchant": "grocery"},
+                {"amount": 100, "type": "withdrawal", "timestamp": "2025-01-02T10:00:00", "location": "atm_1"},
+                {"amount": 30, "type": "purchase", "timestamp": "2025-01-03T11:00:00", "merchant": "cafe"},
+                {"amount": 200, "type": "deposit", "timestamp": "2025-01-04T12:00:00", "location": "bank"},
+                {"amount": 20, "type": "refund", "timestamp": "2025-01-05T14:00:00", "merchant": "pharmacy"}
+            ],
+            # معاملات متشابهة كثيرة: كثافة ترابط عالية (مؤشر الخيوط 0.6)
+            "user_b": [
+                {"amount": 40 + i, "type": "purchase", "timestamp": f"2025-02-{i + 1:02d}T08:00:00",
+                 "merchant": "cafe"}
+                for i in range(12)
+            ]
+        }
+        new_transactions = [
+            ("user_a", {"amount": 60, "type": "purchase", "timestamp": "2025-01-06T09:00:00"}),
+            ("user_b", {"amount": 45, "type": "purchase", "timestamp": "2025-02-20T08:00:00"}),
+            ("user_a", {"amount": 5000, "type": "withdrawal", "timestamp": "2025-01-07T03:00:00"}),
+            ("user_b", {"amount": 900, "type": "transfer", "timestamp": "2025-02-21T03:00:00"}),
+            ("user_a", {"amount": 0, "type": "deposit"}),
+            ("user_c", {"amount": 10, "type": "purchase"})
+        ]
+
+        offline = RevolutionaryFraudDetection("OfflineTest")
+        online = RevolutionaryFraudDetection("OnlineTest", online=True)
+        for user_id, history in histories.items():
+            offline.establish_baseline(user_id, history)
+            online.establish_baseline(user_id, history)
+
+        batch = online.detect_fraud_batch([user_id for user_id, _ in new_transactions],
+                                          [transaction for _, transaction in new_transactions])
+        for index, (user_id, transaction) in enumerate(new_transactions):
+            expected = offline.detect_fraud(user_id, transaction)
+            streamed = online.detect_fraud(user_id, transaction, update_baseline=False)
+            for result in (streamed, {"fraud_probability": batch["fraud_probability"][index],
+                                      "risk_level": batch["risk_level"][index]}):
+                assert math.isclose(result["fraud_probability"], expected["fraud_probability"], abs_tol=1e-9)
+                assert result["risk_level"] == expected["risk_level"]
+        assert batch["has_baseline"].tolist() == [True] * 5 + [False]
+        assert batch["filament_anomaly"][1] == 0.6 and batch["filament_anomaly"][0] == 0.2
+
+        # التحديث المتدفق يساوي إعادة بناء خط الأساس من التاريخ والمعاملات المقبولة
+        accepted = list(histories["user_a"])
+        for _, transaction in new_transactions[:5:2]:
+            result = online.detect_fraud("user_a", transaction)
+            if result["fraud_probability"] < 0.6:
+                accepted.append(transaction)
+        rebuilt = RevolutionaryFraudDetection("RebuiltTest")
+        rebuilt.establish_baseline("user_a", accepted)
+        probe = {"amount": 80, "type": "payment", "timestamp": "2025-01-10T10:00:00"}
+        assert math.isclose(online.detect_fraud("user_a", probe, update_baseline=False)["fraud_probability"],
+                            rebuilt.detect_fraud("user_a", probe)["fraud_probability"], abs_tol=1e-9)
+
+        print("✅ الكشف الدفعي والمتدفق مطابقان للمسار الأصلي")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار تطابق الكشف: {e}")
+        return False
+
 if __name__ == "__main__":
     main()
+    test_batch_and_online_match_offline()
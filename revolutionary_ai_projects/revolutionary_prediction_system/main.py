@@ -14,10 +14,97 @@ Built on Basera Revolutionary System - No traditional ML
 import numpy as np
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Union, Sequence
 import math
 import random
 
+# اتصال النقطتين = (تشابه القيمة + 1 / (1 + 0.1 × المسافة)) / 2، ويُعتمد فوق العتبة
+CONNECTION_THRESHOLD = 0.7
+CONNECTION_TIME_DECAY = 0.1
+# أقصى مسافة يمكن أن تتجاوز عندها القوة العتبة (تشابه القيمة ≤ 1):
+# 1 / (1 + 0.1 × d) > 2 × 0.7 - 1  ⟸  d < 15
+MAX_CONNECTION_LAG = int(math.ceil((1.0 / (2 * CONNECTION_THRESHOLD - 1) - 1) / CONNECTION_TIME_DECAY)) - 1
+
+# عدد العناصر المحفوظة نصاً في النموذج (الإحصائيات تشمل الكل)
+MAX_LISTED_CYCLES = 100
+MAX_LISTED_CONNECTIONS = 1000
+
+
+def find_extrema(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """القمم والقيعان الصارمة من تغير إشارة الفروق"""
+    if len(data) < 3:
+        empty = np.array([], dtype=int)
+        return empty, empty
+    sign = np.sign(np.diff(data))
+    peaks = np.flatnonzero((sign[:-1] > 0) & (sign[1:] < 0)) + 1
+    valleys = np.flatnonzero((sign[:-1] < 0) & (sign[1:] > 0)) + 1
+    return peaks, valleys
+
+
+def find_cycles(peaks: np.ndarray, valleys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """الدورات الكاملة (قاع ← قمة ← قاع متتالية بين النقاط القصوى): البدايات، القمم، النهايات"""
+    positions = np.concatenate([peaks, valleys])
+    is_valley = np.concatenate([np.zeros(len(peaks), dtype=bool), np.ones(len(valleys), dtype=bool)])
+    order = np.argsort(positions, kind='stable')
+    positions, is_valley = positions[order], is_valley[order]
+
+    count = max(len(positions) - 3, 0)
+    starts = np.flatnonzero(is_valley[:count] & ~is_valley[1:count + 1] & is_valley[2:count + 2])
+    return positions[starts], positions[starts + 1], positions[starts + 2]
+
+
+def dominant_period(data: np.ndarray) -> Tuple[float, float]:
+    """طول الدورة المهيمن بالتقدير الطيفي (بعد إزالة الاتجاه الخطي): (الطول، حصة الطاقة)"""
+    n = len(data)
+    if n < 4:
+        return 0.0, 0.0
+    t = np.arange(n, dtype=float)
+    slope, intercept = np.polyfit(t, data, 1)
+    power = np.abs(np.fft.rfft(data - (slope * t + intercept))) ** 2
+    # الترددات من دورتين في السلسلة فأكثر (ترددات أدنى لا تمثل دورة مكتملة)
+    candidates = power[2:]
+    total = power[1:].sum()
+    if len(candidates) == 0 or total <= 0:
+        return 0.0, 0.0
+    k = int(np.argmax(candidates)) + 2
+    return n / k, float(candidates[k - 2] / total)
+
+
+def find_lagged_connections(data: np.ndarray, max_lag: int = MAX_CONNECTION_LAG,
+                            max_listed: int = MAX_LISTED_CONNECTIONS) -> Dict[str, Any]:
+    """
+    الاتصالات بين النقاط بمسافات محدودة (خطي في طول السلسلة)
+    النتيجة: العدد ومجموع القوى وأول max_listed اتصالاً بترتيب (i, j)
+    """
+    count = 0
+    strength_sum = 0.0
+    listed_i, listed_j, listed_strength = [], [], []
+
+    for lag in range(1, min(max_lag, len(data) - 1) + 1):
+        first, second = data[:-lag], data[lag:]
+        max_value = np.maximum(np.maximum(np.abs(first), np.abs(second)), 1.0)
+        value_similarity = 1.0 - np.abs(first - second) / max_value
+        strength = (value_similarity + 1.0 / (1.0 + lag * CONNECTION_TIME_DECAY)) / 2
+        connected = np.flatnonzero(strength > CONNECTION_THRESHOLD)
+
+        count += len(connected)
+        strength_sum += float(strength[connected].sum())
+        head = connected[:max_listed]
+        listed_i.append(head)
+        listed_j.append(head + lag)
+        listed_strength.append(strength[head])
+
+    if count == 0:
+        return {"count": 0, "strength_sum": 0.0, "listed": []}
+
+    i = np.concatenate(listed_i)
+    j = np.concatenate(listed_j)
+    strengths = np.concatenate(listed_strength)
+    order = np.lexsort((j, i))[:max_listed]
+    listed = [(int(a), int(b), float(c)) for a, b, c in zip(i[order], j[order], strengths[order])]
+    return {"count": count, "strength_sum": strength_sum, "listed": listed}
+
+
 class RevolutionaryPredictionSystem:
     """
     🔮 نظام التنبؤ الثوري
@@ -41,6 +128,9 @@ class RevolutionaryPredictionSystem:
         """
         print(f"📊 تحليل السلسلة: {series_name} بـ {len(data_series)} نقطة")
         
+        # مصفوفة واحدة لجميع التحليلات
+        data_series = np.asarray(data_series, dtype=float)
+        
         # تطبيق النظريات الثلاث على البيانات
         zero_duality = self.apply_zero_duality_to_data(data_series)
         perpendicular = self.apply_perpendicular_opposites_to_data(data_series)
@@ -64,15 +154,16 @@ class RevolutionaryPredictionSystem:
         🔄 تطبيق نظرية ثنائية الصفر على البيانات
         تحليل التوازن بين الارتفاع والانخفاض
         """
+        data = np.asarray(data, dtype=float)
         if len(data) < 2:
             return {"trend_balance": 0.5, "volatility": 0.0}
         
         # حساب التغيرات
-        changes = [data[i] - data[i-1] for i in range(1, len(data))]
+        changes = np.diff(data)
         
         # تصنيف التغيرات
-        positive_changes = [c for c in changes if c > 0]
-        negative_changes = [c for c in changes if c < 0]
+        positive_changes = changes[changes > 0]
+        negative_changes = changes[changes < 0]
         
         # حساب التوازن
         total_changes = len(positive_changes) + len(negative_changes)
@@ -82,13 +173,13 @@ class RevolutionaryPredictionSystem:
             trend_balance = 0.5
         
         # حساب التقلبات
-        volatility = np.std(changes) if changes else 0.0
+        volatility = float(np.std(changes))
         
         return {
             "trend_balance": trend_balance,
             "volatility": volatility,
-            "positive_momentum": np.mean(positive_changes) if positive_changes else 0.0,
-            "negative_momentum": abs(np.mean(negative_changes)) if negative_changes else 0.0,
+            "positive_momentum": float(positive_changes.mean()) if len(positive_changes) else 0.0,
+            "negative_momentum": abs(float(negative_changes.mean())) if len(negative_changes) else 0.0,
             "duality_insight": self._interpret_trend_balance(trend_balance)
         }
     
@@ -97,25 +188,39 @@ class RevolutionaryPredictionSystem:
         ⊥ تطبيق نظرية الأضداد المتعامدة على البيانات
         إنشاء أبعاد جديدة من الأنماط المتضادة
         """
+        data = np.asarray(data, dtype=float)
         if len(data) < 4:
             return {"cycles": [], "amplitude": 0.0}
         
         # البحث عن الدورات والأنماط المتضادة
-        peaks = self._find_peaks(data)
-        valleys = self._find_valleys(data)
+        peaks, valleys = find_extrema(data)
+        
+        # حساب الدورات (كلها لإحصائيات الانتظام، وأولها نصاً في النموذج)
+        starts, cycle_peaks, ends = find_cycles(peaks, valleys)
+        cycle_lengths = ends - starts
+        cycles = [
+            {"start": int(start), "peak": int(peak), "end": int(end), "length": int(end - start)}
+            for start, peak, end in zip(starts[:MAX_LISTED_CYCLES], cycle_peaks[:MAX_LISTED_CYCLES],
+                                        ends[:MAX_LISTED_CYCLES])
+        ]
         
-        # حساب الدورات
-        cycles = self._calculate_cycles(peaks, valleys)
+        # طول الدورة المهيمن بالتقدير الطيفي
+        spectral_period, spectral_power = dominant_period(data)
         
         # حساب السعة
-        amplitude = self._calculate_amplitude(data, peaks, valleys)
+        amplitude = (float(data[peaks].mean() - data[valleys].mean())
+                     if len(peaks) and len(valleys) else 0.0)
         
         return {
-            "peaks": peaks,
-            "valleys": valleys,
+            "peaks": peaks.tolist(),
+            "valleys": valleys.tolist(),
             "cycles": cycles,
+            "cycle_count": len(cycle_lengths),
+            "cycle_length": spectral_period if spectral_period > 0 else (
+                float(cycle_lengths.mean()) if len(cycle_lengths) else 0.0),
+            "spectral_power": spectral_power,
             "amplitude": amplitude,
-            "cycle_regularity": self._assess_cycle_regularity(cycles)
+            "cycle_regularity": 1.0 / (1.0 + float(np.var(cycle_lengths))) if len(cycle_lengths) >= 2 else 0.0
         }
     
     def apply_filament_theory_to_data(self, data: List[float]) -> Dict:
@@ -123,29 +228,36 @@ class RevolutionaryPredictionSystem:
         🧵 تطبيق نظرية الخيوط على البيانات
         ربط نقاط البيانات بخيوط خفية
         """
+        data = np.asarray(data, dtype=float)
         if len(data) < 3:
             return {"connections": [], "patterns": []}
         
-        # البحث عن الاتصالات بين النقاط
-        connections = self._find_data_connections(data)
+        # البحث عن الاتصالات بين النقاط (مسافات محدودة بـ MAX_CONNECTION_LAG)
+        connections = find_lagged_connections(data)
         
         # اكتشاف الأنماط الخفية
-        hidden_patterns = self._discover_hidden_patterns(data, connections)
+        hidden_patterns = self._discover_hidden_patterns(data, connections["count"])
         
         # حساب قوة الاتصال
-        connection_strength = self._calculate_connection_strength(connections)
+        connection_strength = (connections["strength_sum"] / connections["count"]
+                               if connections["count"] else 0.0)
         
         return {
-            "connections": connections,
+            "connections": connections["listed"],
+            "connection_count": connections["count"],
             "hidden_patterns": hidden_patterns,
             "connection_strength": connection_strength,
             "pattern_complexity": len(hidden_patterns) * 0.1
         }
     
-    def predict_next_values(self, series_name: str, steps_ahead: int = 1) -> Dict:
+    def predict_next_values(self, series_name: Union[str, Sequence[str]], steps_ahead: int = 1) -> Dict:
         """
         🔮 التنبؤ بالقيم التالية
+        series_name قد يكون قائمة أسماء: النتيجة حينها قاموس {اسم السلسلة: نتيجة التنبؤ}
         """
+        if not isinstance(series_name, str):
+            return {name: self.predict_next_values(name, steps_ahead) for name in series_name}
+        
         print(f"\n🔮 التنبؤ بـ {steps_ahead} خطوة للسلسلة: {series_name}")
         
         if series_name not in self.prediction_models:
@@ -211,114 +323,12 @@ class RevolutionaryPredictionSystem:
         else:
             return "اتجاه هابط قوي"
     
-    def _find_peaks(self, data: List[float]) -> List[int]:
-        """البحث عن القمم"""
-        peaks = []
-        
-        for i in range(1, len(data) - 1):
-            if data[i] > data[i-1] and data[i] > data[i+1]:
-                peaks.append(i)
-        
-        return peaks
-    
-    def _find_valleys(self, data: List[float]) -> List[int]:
-        """البحث عن القيعان"""
-        valleys = []
-        
-        for i in range(1, len(data) - 1):
-            if data[i] < data[i-1] and data[i] < data[i+1]:
-                valleys.append(i)
-        
-        return valleys
-    
-    def _calculate_cycles(self, peaks: List[int], valleys: List[int]) -> List[Dict]:
-        """حساب الدورات"""
-        cycles = []
-        
-        # دمج القمم والقيعان وترتيبها
-        extremes = [(p, "peak") for p in peaks] + [(v, "valley") for v in valleys]
-        extremes.sort(key=lambda x: x[0])
-        
-        # البحث عن الدورات الكاملة
-        for i in range(len(extremes) - 3):
-            if (extremes[i][1] == "valley" and extremes[i+1][1] == "peak" and 
-                extremes[i+2][1] == "valley"):
-                
-                cycle = {
-                    "start": extremes[i][0],
-                    "peak": extremes[i+1][0],
-                    "end": extremes[i+2][0],
-                    "length": extremes[i+2][0] - extremes[i][0]
-                }
-                cycles.append(cycle)
-        
-        return cycles
-    
-    def _calculate_amplitude(self, data: List[float], peaks: List[int], valleys: List[int]) -> float:
-        """حساب السعة"""
-        if not peaks or not valleys:
-            return 0.0
-        
-        peak_values = [data[p] for p in peaks]
-        valley_values = [data[v] for v in valleys]
-        
-        avg_peak = np.mean(peak_values)
-        avg_valley = np.mean(valley_values)
-        
-        amplitude = avg_peak - avg_valley
-        return amplitude
-    
-    def _assess_cycle_regularity(self, cycles: List[Dict]) -> float:
-        """تقييم انتظام الدورات"""
-        if len(cycles) < 2:
-            return 0.0
-        
-        cycle_lengths = [c["length"] for c in cycles]
-        length_variance = np.var(cycle_lengths)
-        
-        # كلما قل التباين، زاد الانتظام
-        regularity = 1.0 / (1.0 + length_variance)
-        
-        return regularity
-    
-    def _find_data_connections(self, data: List[float]) -> List[Tuple]:
-        """البحث عن اتصالات البيانات"""
-        connections = []
-        
-        for i in range(len(data)):
-            for j in range(i + 1, len(data)):
-                # حساب قوة الاتصال
-                connection_strength = self._calculate_point_connection(
-                    data[i], data[j], i, j
-                )
-                
-                if connection_strength > 0.7:
-                    connections.append((i, j, connection_strength))
-        
-        return connections
-    
-    def _calculate_point_connection(self, value1: float, value2: float, 
-                                   index1: int, index2: int) -> float:
-        """حساب قوة الاتصال بين نقطتين"""
-        # التشابه في القيمة
-        max_val = max(abs(value1), abs(value2), 1.0)
-        value_similarity = 1.0 - abs(value1 - value2) / max_val
-        
-        # المسافة الزمنية
-        time_distance = abs(index2 - index1)
-        time_factor = 1.0 / (1.0 + time_distance * 0.1)
-        
-        # قوة الاتصال الإجمالية
-        connection_strength = (value_similarity + time_factor) / 2
-        
-        return connection_strength
-    
-    def _discover_hidden_patterns(self, data: List[float], connections: List[Tuple]) -> List[str]:
+    def _discover_hidden_patterns(self, data: np.ndarray, connection_count: int) -> List[str]:
         """اكتشاف الأنماط الخفية"""
         patterns = []
         
         # البحث عن أنماط التكرار
-        if len(connections) > 3:
+        if connection_count > 3:
             patterns.append("نمط اتصالات قوية")
         
         # البحث عن أنماط الدورية
@@ -335,14 +345,6 @@ class RevolutionaryPredictionSystem:
         
         return patterns
     
-    def _calculate_connection_strength(self, connections: List[Tuple]) -> float:
-        """حساب قوة الاتصال الإجمالية"""
-        if not connections:
-            return 0.0
-        
-        strengths = [conn[2] for conn in connections]
-        return np.mean(strengths)
-    
     def _predict_using_zero_duality(self, model: Dict, step: int) -> Dict:
         """التنبؤ باستخدام ثنائية الصفر"""
         duality_patterns = model["zero_duality_patterns"]
@@ -379,8 +381,8 @@ class RevolutionaryPredictionSystem:
         amplitude = perpendicular_patterns["amplitude"]
         
         if cycles:
-            # استخدام متوسط طول الدورة للتنبؤ
-            avg_cycle_length = np.mean([c["length"] for c in cycles])
+            # طول الدورة المقدر طيفياً (أو متوسط أطوال الدورات)
+            avg_cycle_length = perpendicular_patterns["cycle_length"]
             
             # تحديد موقع في الدورة
             cycle_position = step % avg_cycle_length
@@ -529,6 +531,19 @@ def main():
         print(f"   اليوم {i}: {temp:.1f}°C")
     print(f"   📊 الثقة: {weather_prediction['confidence']:.3f}")
     
+    # سلسلة طويلة (مليون نقطة) ثم تنبؤ دفعي لعدة سلاسل
+    import time
+    long_series = 100 + 10 * np.sin(np.arange(1_000_000) * 2 * np.pi / 50) + np.random.normal(0, 1, 1_000_000)
+    start = time.perf_counter()
+    predictor.learn_from_data(long_series, "sensor")
+    print(f"   ⏱️ زمن التعلم: {time.perf_counter() - start:.2f} ثانية")
+    print(f"   🔁 طول الدورة الطيفي: {predictor.prediction_models['sensor']['perpendicular_patterns']['cycle_length']:.1f}")
+    
+    batch = predictor.predict_next_values(["AAPL_stock", "temperature", "sensor"], 2)
+    print(f"\n📦 تنبؤ دفعي لـ {len(batch)} سلاسل:")
+    for name, result in batch.items():
+        print(f"   {name}: {', '.join(f'{value:.2f}' for value in result['predictions'])}")
+    
     print("\n✅ تم إنجاز التنبؤ بنجاح!")
 
 if __name__ == "__main__":
@@ -14,9 +14,138 @@ Built on Basera Revolutionary System - No neural networks or traditional ML
 import numpy as np
 import json
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, Sequence
 import math
 
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    print("⚠️ scipy غير متوفر - التوصيات الجماعية بالمصفوفات المتناثرة معطلة")
+
+# عتبات النظريات الثلاث (نفسها في المسار الفردي)
+LIKE_THRESHOLD = 0.5        # ثنائية الصفر: أعلى منها إعجاب
+OPPOSITE_GAP = 0.5          # الأضداد: فرق تقييم أكبر منه
+FILAMENT_STRENGTH = 0.6     # الخيوط: قوة 1 - الفرق أكبر منها
+
+# أوزان النقاط الثورية (الخيوط بين العناصر تحل محل عامل الاستكشاف العشوائي)
+SCORE_WEIGHTS = {"duality": 0.4, "complexity": 0.3, "connection": 0.3, "filament": 0.1}
+
+# عدد الجيران المحفوظين لكل عنصر في مصفوفة اتصالات العناصر
+ITEM_NEIGHBORS = 50
+
+
+def build_rating_matrix(users_preferences: Dict[str, Dict[str, float]],
+                        item_index: Optional[Dict[str, int]] = None) -> Tuple[Any, List[str], Dict[str, int]]:
+    """
+    مصفوفة متناثرة مستخدم×عنصر من قواميس التفضيلات
+    مع item_index ثابت تُهمل العناصر غير المعروفة، وإلا يُبنى الفهرس من البيانات
+    """
+    user_ids = list(users_preferences)
+    growing = item_index is None
+    item_index = {} if growing else item_index
+
+    rows, cols, ratings = [], [], []
+    for row, preferences in enumerate(users_preferences.values()):
+        for item, rating in preferences.items():
+            col = item_index.get(item)
+            if col is None:
+                if not growing:
+                    continue
+                col = item_index[item] = len(item_index)
+            rows.append(row)
+            cols.append(col)
+            ratings.append(rating)
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(ratings, dtype=np.float64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(user_ids), len(item_index))
+    )
+    matrix.sum_duplicates()
+    return matrix, user_ids, item_index
+
+
+def top_k_per_row(matrix, k: int, by_magnitude: bool = False) -> Any:
+    """أعلى k قيمة في كل صف من مصفوفة CSR (القيم غير الموجبة تُهمل ما لم يكن by_magnitude)"""
+    matrix = matrix.tocsr()
+    row_ids = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    data = matrix.data
+    keys = np.abs(data) if by_magnitude else data
+
+    candidates = np.flatnonzero(keys > 0)
+    row_ids, keys = row_ids[candidates], keys[candidates]
+    if len(candidates) == 0:
+        return sparse.csr_matrix(matrix.shape, dtype=data.dtype)
+
+    # ترتيب واحد: الصف تصاعدياً ثم القيمة تنازلياً (القيم مطبّعة إلى (0, 1])
+    order = np.argsort(row_ids * 2.0 - keys / keys.max(), kind='stable')
+    sorted_rows = row_ids[order]
+    row_starts = np.searchsorted(sorted_rows, np.arange(matrix.shape[0]))
+    keep = candidates[order[np.arange(len(order)) - row_starts[sorted_rows] < k]]
+    kept_rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))[keep]
+
+    return sparse.csr_matrix((data[keep], (kept_rows, matrix.indices[keep])), shape=matrix.shape)
+
+
+def _row_pairs(indptr: np.ndarray, first_row: int, last_row: int) -> Tuple[np.ndarray, np.ndarray]:
+    """مواضع أزواج التقييمات (i < j) داخل كل صف من الصفوف [first_row, last_row)"""
+    positions = np.arange(indptr[first_row], indptr[last_row])
+    row_end = np.repeat(indptr[first_row + 1:last_row + 1], np.diff(indptr[first_row:last_row + 1]))
+    partners = row_end - positions - 1
+    left = np.repeat(positions, partners)
+    group_start = np.repeat(np.cumsum(partners) - partners, partners)
+    right = left + 1 + (np.arange(len(left)) - group_start)
+    return left, right
+
+
+def cohort_profiles(ratings, pair_block: int = 1 << 22) -> Dict[str, np.ndarray]:
+    """
+    ثنائية الصفر والأضداد والخيوط لكل مستخدم دفعة واحدة
+    (فروق أزواج التقييمات داخل كل صف بالمقارنات نفسها في المسار الفردي، على دفعات من pair_block زوجاً)
+    """
+    ratings = ratings.tocsr()
+    n_users = ratings.shape[0]
+    counts = np.diff(ratings.indptr)
+    row_ids = np.repeat(np.arange(n_users), counts)
+    values = ratings.data
+
+    # ثنائية الصفر: مجموع الإعجاب مقابل مجموع عدم الإعجاب
+    liked = values > LIKE_THRESHOLD
+    positive = np.bincount(row_ids, weights=np.where(liked, values, 0.0), minlength=n_users)
+    negative = np.bincount(row_ids, weights=np.where(liked, 0.0, 1.0 - values), minlength=n_users)
+    total = positive + negative
+    balance = np.divide(positive, total, out=np.full(n_users, 0.5), where=total > 0)
+
+    # الأضداد: أزواج فرقها أكبر من OPPOSITE_GAP، والخيوط: أزواج قوتها 1 - الفرق أكبر من FILAMENT_STRENGTH
+    opposite_pairs = np.zeros(n_users)
+    connections = np.zeros(len(values))
+    pair_offsets = np.concatenate(([0], np.cumsum(counts * (counts - 1) // 2)))
+    first_row = 0
+    while first_row < n_users:
+        last_row = int(np.searchsorted(pair_offsets, pair_offsets[first_row] + pair_block, 'right')) - 1
+        last_row = min(n_users, max(last_row, first_row + 1))
+        left, right = _row_pairs(ratings.indptr, first_row, last_row)
+        gaps = np.abs(values[left] - values[right])
+
+        opposite_pairs += np.bincount(row_ids[left[gaps > OPPOSITE_GAP]], minlength=n_users)
+        strong = (1.0 - gaps) > FILAMENT_STRENGTH
+        connections += (np.bincount(left[strong], minlength=len(values))
+                        + np.bincount(right[strong], minlength=len(values)))
+        first_row = last_row
+
+    connection_strength = np.divide(np.bincount(row_ids, weights=connections, minlength=n_users), counts,
+                                    out=np.zeros(n_users), where=counts > 0)
+    has_patterns = np.bincount(row_ids, weights=connections >= 2, minlength=n_users) > 0
+
+    return {
+        "balance_score": balance,
+        "complexity_factor": opposite_pairs * 0.1,
+        "connection_strength": connection_strength,
+        "has_patterns": has_patterns
+    }
+
+
 class RevolutionaryRecommendationSystem:
     """
     🎯 نظام التوصيات الثوري
@@ -31,6 +160,12 @@ class RevolutionaryRecommendationSystem:
         self.filament_connections = {}
         self.adaptation_history = []
         
+        # الخيوط بين العناصر (مصفوفة متناثرة عنصر×عنصر مبنية مسبقاً)
+        self.catalog_items: List[str] = []
+        self.item_index: Dict[str, int] = {}
+        self.item_connections = None
+        self.item_popularity: Optional[np.ndarray] = None
+        
         print(f"🎯 تهيئة {self.system_name}")
         print("🧬 مبني على النظريات الثورية الثلاث")
     
@@ -110,6 +245,10 @@ class RevolutionaryRecommendationSystem:
         """
         print(f"\n🎯 توليد توصيات للمستخدم: {user_id}")
         
+        # بعد بناء الخيوط بين العناصر يُستخدم المسار المصفوفي نفسه
+        if self.item_connections is not None:
+            return self.recommend_for_users({user_id: user_preferences}, top_k, available_items)[user_id]
+        
         # تطبيق النظريات الثلاث
         zero_duality = self.apply_zero_duality_theory(user_preferences)
         perpendicular = self.apply_perpendicular_opposites_theory(user_preferences)
@@ -137,6 +276,165 @@ class RevolutionaryRecommendationSystem:
         
         return recommendations[:top_k]
     
+    def fit_item_connections(self, users_preferences: Dict[str, Dict[str, float]],
+                             neighbors: int = ITEM_NEIGHBORS, item_block: int = 1024):
+        """
+        🧵 بناء الخيوط بين العناصر من تفضيلات جميع المستخدمين
+        """
+        if not SCIPY_AVAILABLE:
+            print("❌ بناء الخيوط بين العناصر يتطلب scipy")
+            return
+        ratings, _, item_index = build_rating_matrix(users_preferences)
+        self.fit_item_connections_from_matrix(ratings, sorted(item_index, key=item_index.get),
+                                              neighbors, item_block)
+    
+    def fit_item_connections_from_matrix(self, ratings, item_ids: Sequence[str],
+                                         neighbors: int = ITEM_NEIGHBORS, item_block: int = 1024):
+        """
+        🧵 الخيوط بين العناصر من مصفوفة تقييمات مستخدم×عنصر
+        قوة الخيط = تشابه جيب التمام بين أعمدة التقييمات المتمركزة حول الصفر
+        (موجبة: تفضيل متوافق، سالبة: تفضيل متضاد)، ويُحفظ لكل عنصر أقوى neighbors خيطاً
+        """
+        if not SCIPY_AVAILABLE:
+            print("❌ بناء الخيوط بين العناصر يتطلب scipy")
+            return
+        
+        ratings = sparse.csr_matrix(ratings, dtype=np.float64)
+        centered = ratings.copy()
+        centered.data -= LIKE_THRESHOLD
+        centered_by_item = centered.T.tocsr()
+        
+        norms = np.sqrt(np.asarray(centered.multiply(centered).sum(axis=0)).ravel())
+        inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        
+        n_items = ratings.shape[1]
+        blocks = []
+        for start in range(0, n_items, item_block):
+            stop = min(start + item_block, n_items)
+            block = (centered_by_item[start:stop] @ centered).tocsr()
+            block = sparse.diags(inverse_norms[start:stop]) @ block @ sparse.diags(inverse_norms)
+            block.setdiag(0)
+            blocks.append(top_k_per_row(block, neighbors, by_magnitude=True).astype(np.float32))
+        
+        self.item_connections = sparse.vstack(blocks).tocsr() if blocks else sparse.csr_matrix((0, 0))
+        self.catalog_items = list(item_ids)
+        self.item_index = {item: index for index, item in enumerate(self.catalog_items)}
+        self.item_popularity = np.diff(ratings.tocsc().indptr)
+        
+        print(f"🧵 خيوط العناصر: {n_items} عنصر، {self.item_connections.nnz} اتصال")
+    
+    def recommend_for_users(self, users_preferences: Dict[str, Dict[str, float]], top_k: int = 5,
+                            available_items: Optional[List[str]] = None,
+                            user_block: int = 2048) -> Dict[str, List[Dict]]:
+        """
+        🎯 توصيات لمجموعة مستخدمين دفعة واحدة: {المستخدم: التوصيات}
+        """
+        if self.item_connections is None:
+            print("❌ يجب بناء الخيوط بين العناصر أولاً (fit_item_connections)")
+            return {}
+        ratings, user_ids, _ = build_rating_matrix(users_preferences, self.item_index)
+        return self.recommend_from_matrix(ratings, user_ids, top_k, available_items, user_block)
+    
+    def recommend_from_matrix(self, ratings, user_ids: Sequence[str], top_k: int = 5,
+                              available_items: Optional[List[str]] = None,
+                              user_block: int = 2048) -> Dict[str, List[Dict]]:
+        """
+        🎯 التوصيات بضرب المصفوفات المتناثرة واختيار أعلى k لكل مستخدم
+        ارتباط العنصر = مجموع (التقييم المتمركز × قوة الخيط) ÷ مجموع |التقييمات المتمركزة|
+        """
+        if self.item_connections is None:
+            print("❌ يجب بناء الخيوط بين العناصر أولاً (fit_item_connections)")
+            return {}
+        
+        ratings = sparse.csr_matrix(ratings, dtype=np.float64)
+        profiles = cohort_profiles(ratings)
+        
+        # الثوابت لكل مستخدم من النظريات الثلاث
+        weights = SCORE_WEIGHTS
+        base_scores = (weights["duality"] * profiles["balance_score"]
+                       + weights["complexity"] * profiles["complexity_factor"]
+                       + weights["connection"] * profiles["connection_strength"])
+        reasonings = [
+            f"بناءً على {self._generate_duality_insight(balance)}" + (" ووجود أنماط مترابطة" if patterns else "")
+            for balance, patterns in zip(profiles["balance_score"], profiles["has_patterns"])
+        ]
+        
+        # العناصر المسموح بها (مع العناصر غير الموجودة في الكتالوج بلا خيوط)
+        allowed = None
+        extra_items: List[str] = []
+        if available_items is not None:
+            allowed = np.zeros(len(self.catalog_items), dtype=np.float32)
+            for item in available_items:
+                index = self.item_index.get(item)
+                if index is None:
+                    extra_items.append(item)
+                else:
+                    allowed[index] = 1.0
+        fallback_order = np.argsort(-self.item_popularity, kind='stable')
+        if allowed is not None:
+            fallback_order = fallback_order[allowed[fallback_order] > 0]
+        
+        recommendations: Dict[str, List[Dict]] = {}
+        for start in range(0, ratings.shape[0], user_block):
+            stop = min(start + user_block, ratings.shape[0])
+            block = ratings[start:stop]
+            centered = block.copy()
+            centered.data -= LIKE_THRESHOLD
+            
+            affinity = (centered @ self.item_connections).tocsr()
+            scale = np.asarray(abs(centered).sum(axis=1)).ravel()
+            affinity = sparse.diags(np.divide(1.0, scale, out=np.zeros_like(scale), where=scale > 0)) @ affinity
+            
+            # استبعاد العناصر المقيّمة وغير المسموح بها
+            rated = block.copy()
+            rated.data[:] = 1.0
+            affinity = affinity - affinity.multiply(rated)
+            if allowed is not None:
+                affinity = affinity @ sparse.diags(allowed)
+            top = top_k_per_row(affinity, top_k)
+            
+            for offset in range(stop - start):
+                user_row = start + offset
+                row_slice = slice(top.indptr[offset], top.indptr[offset + 1])
+                order = np.argsort(-top.data[row_slice], kind='stable')
+                items = top.indices[row_slice][order].tolist()
+                affinities = top.data[row_slice][order].tolist()
+                
+                # ملء النقص بالعناصر الأكثر شيوعاً (ارتباط محايد)
+                if len(items) < top_k:
+                    seen = set(items).union(block.indices[block.indptr[offset]:block.indptr[offset + 1]].tolist())
+                    for index in fallback_order:
+                        if len(items) >= top_k:
+                            break
+                        if index not in seen:
+                            items.append(int(index))
+                            affinities.append(0.0)
+                    names = [self.catalog_items[index] for index in items]
+                    names += extra_items[:top_k - len(names)]
+                    affinities += [0.0] * (len(names) - len(affinities))
+                else:
+                    names = [self.catalog_items[index] for index in items]
+                
+                base = base_scores[user_row]
+                recommendations[user_ids[user_row]] = [
+                    {
+                        "item": name,
+                        "score": min(1.0, float(base + weights["filament"] * (1.0 + value) / 2)),
+                        "reasoning": reasonings[user_row]
+                    }
+                    for name, value in zip(names, affinities)
+                ]
+        
+        scores = [rec["score"] for recs in recommendations.values() for rec in recs]
+        self.adaptation_history.append({
+            "timestamp": datetime.now().isoformat(),
+            "user_id": f"cohort:{len(recommendations)}",
+            "recommendations_count": len(scores),
+            "avg_score": float(np.mean(scores)) if scores else 0.0
+        })
+        
+        return recommendations
+    
     def _calculate_preference_balance(self, positive: Dict, negative: Dict) -> float:
         """حساب توازن التفضيلات"""
         pos_sum = sum(positive.values()) if positive else 0
@@ -320,7 +618,88 @@ def main():
         print(f"   💡 السبب: {rec['reasoning']}")
         print()
     
+    # توصيات جماعية: خيوط العناصر من تفضيلات مجموعة مستخدمين ثم ضرب مصفوفات
+    if SCIPY_AVAILABLE:
+        catalog = list(user_preferences) + available_movies
+        rng = np.random.default_rng(7)
+        cohort = {
+            f"user_{index}": {str(item): float(rng.random()) for item in rng.choice(catalog, 5, replace=False)}
+            for index in range(200)
+        }
+        cohort["user_123"] = user_preferences
+        
+        recommender.fit_item_connections(cohort)
+        cohort_recommendations = recommender.recommend_for_users(cohort, top_k=3)
+        
+        print("\n👥 توصيات جماعية (user_123):")
+        for i, rec in enumerate(cohort_recommendations["user_123"], 1):
+            print(f"{i}. {rec['item']} - {rec['score']:.3f}")
+        print()
+    
     print("✅ تم إنجاز التوصيات بنجاح!")
 
+def test_cohort_matches_single_user() -> bool:
+    """🧪 التوصيات الجماعية تطابق المسار الفردي (تقييمات بمنزلة عشرية واحدة تقع فروقها على العتبات تماماً)"""
+    print("🧪 اختبار تطابق التوصيات الجماعية مع المسار الفردي")
+    print("=" * 60)
+
+    if not SCIPY_AVAILABLE:
+        print("⚠️ scipy غير متوفر - تخطي الاختبار")
+        return True
+
+    try:
+        catalog = [f"item_{index}" for index in range(12)]
+        rng = np.random.default_rng(11)
+        cohort = {
+            f"user_{index}": {str(item): float(rng.integers(0, 11)) / 10
+                              for item in rng.choice(catalog, int(rng.integers(1, 9)), replace=False)}
+            for index in range(60)
+        }
+        cohort["edges"] = {"item_0": 0.9, "item_1": 0.5, "item_2": 0.8, "item_3": 0.3, "item_4": 0.1}
+
+        # أجزاء النقاط من النظريات الثلاث: المسار المصفوفي (بدفعات أزواج صغيرة) مقابل المسار الفردي
+        single = RevolutionaryRecommendationSystem("SingleTest")
+        ratings, user_ids, _ = build_rating_matrix(cohort)
+        profiles = cohort_profiles(ratings, pair_block=7)
+        base_scores = {}
+        for row, user_id in enumerate(user_ids):
+            preferences = cohort[user_id]
+            zero_duality = single.apply_zero_duality_theory(preferences)
+            perpendicular = single.apply_perpendicular_opposites_theory(preferences)
+            filaments = single.apply_filament_theory(user_id, preferences)
+            assert math.isclose(profiles["balance_score"][row], zero_duality["balance_score"], abs_tol=1e-12)
+            assert profiles["complexity_factor"][row] == perpendicular["complexity_factor"]
+            assert profiles["connection_strength"][row] == filaments["connection_strength"]
+            assert profiles["has_patterns"][row] == bool(filaments["hidden_patterns"])
+            base_scores[user_id] = (SCORE_WEIGHTS["duality"] * zero_duality["balance_score"]
+                                    + SCORE_WEIGHTS["complexity"] * perpendicular["complexity_factor"]
+                                    + SCORE_WEIGHTS["connection"] * filaments["connection_strength"])
+
+        # التوصيات: الفردي (قبل بناء الخيوط) يضيف 0.1 × عشوائي، والجماعي 0.1 × (1 + الخيط) / 2
+        cohort_recommender = RevolutionaryRecommendationSystem("CohortTest")
+        cohort_recommender.fit_item_connections(cohort)
+        batch = cohort_recommender.recommend_for_users(cohort, top_k=3, available_items=catalog)
+        for user_id, preferences in cohort.items():
+            if base_scores[user_id] >= 0.9:
+                continue
+            recommendations = single.generate_recommendations(user_id, preferences, catalog, top_k=3)
+            assert len(batch[user_id]) == len(recommendations)
+            for cohort_rec, single_rec in zip(batch[user_id], recommendations):
+                assert cohort_rec["reasoning"] == single_rec["reasoning"]
+                assert cohort_rec["item"] not in preferences
+                for rec in (cohort_rec, single_rec):
+                    assert base_scores[user_id] - 1e-9 <= rec["score"] <= base_scores[user_id] + 0.1 + 1e-9
+
+        # بعد بناء الخيوط يمر المسار الفردي بالمسار المصفوفي نفسه
+        assert cohort_recommender.generate_recommendations("edges", cohort["edges"], catalog, top_k=3) == batch["edges"]
+
+        print("✅ التوصيات الجماعية مطابقة للمسار الفردي")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار تطابق التوصيات: {e}")
+        return False
+
 if __name__ == "__main__":
     main()
+    test_cohort_matches_single_user()
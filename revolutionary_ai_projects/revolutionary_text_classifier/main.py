@@ -16,9 +16,44 @@ import json
 import re
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
-from collections import defaultdict
+from collections import defaultdict, Counter
 import math
 
+# قاموس بسيط للأضداد
+OPPOSITE_WORD_PAIRS = [
+    ('جميل', 'قبيح'), ('كبير', 'صغير'), ('سريع', 'بطيء'),
+    ('ساخن', 'بارد'), ('نور', 'ظلام'), ('فرح', 'حزن')
+]
+
+
+def _build_opposite_fragments(pairs: List[Tuple[str, str]],
+                              min_length: int = 3) -> Dict[str, Tuple[frozenset, frozenset]]:
+    """
+    فهرس الأجزاء: كل جزء من كلمات الأضداد (بطول الكلمات المستخرجة على الأقل)
+    ← (أطرافه {(رقم الزوج، الطرف)}، الأطراف المقابلة لها)
+    الكلمة تطابق طرفاً إذا كانت جزءاً منه، فيكفي بحث واحد في الفهرس لكل كلمة
+    """
+    fragments = defaultdict(set)
+    for pair_index, pair in enumerate(pairs):
+        for side, opposite_word in enumerate(pair):
+            for start in range(len(opposite_word)):
+                for end in range(start + min_length, len(opposite_word) + 1):
+                    fragments[opposite_word[start:end]].add((pair_index, side))
+    return {
+        fragment: (frozenset(tags), frozenset((pair_index, 1 - side) for pair_index, side in tags))
+        for fragment, tags in fragments.items()
+    }
+
+
+OPPOSITE_FRAGMENTS = _build_opposite_fragments(OPPOSITE_WORD_PAIRS)
+
+# خصائص المركز العددي لكل فئة (بترتيب الأعمدة في مصفوفة الخصائص)
+CATEGORY_FEATURES = ("formality_ratio", "conceptual_complexity", "coherence_score")
+
+# حد ذاكرة خصائص الكلمات (تُفرغ عند تجاوزه)
+WORD_FEATURE_CACHE_SIZE = 200000
+
+
 class RevolutionaryTextClassifier:
     """
     📝 مصنف النصوص الثوري
@@ -32,6 +67,11 @@ class RevolutionaryTextClassifier:
         self.sentiment_patterns = {}
         self.classification_history = []
         
+        # مراكز الفئات: صف لكل فئة بأعمدة CATEGORY_FEATURES
+        self.category_names: List[str] = []
+        self.centroid_matrix = np.zeros((0, len(CATEGORY_FEATURES)))
+        self._formal_words: Dict[str, bool] = {}
+        
         print(f"📝 تهيئة {self.classifier_name}")
         print("🧬 مصنف نصوص ثوري بدون معالجة لغة تقليدية")
     
@@ -47,9 +87,13 @@ class RevolutionaryTextClassifier:
         # حفظ ملف الفئة
         self.categories[category_name] = {
             "profile": category_profile,
+            "centroid": np.array([category_profile.get("average_formality", 0.5),
+                                  category_profile.get("average_complexity", 0.0),
+                                  category_profile.get("average_coherence", 0.0)]),
             "training_count": len(training_texts),
             "trained_at": datetime.now().isoformat()
         }
+        self._compile_centroids()
         
         print(f"✅ تم تدريب فئة {category_name} بنجاح")
     
@@ -66,24 +110,18 @@ class RevolutionaryTextClassifier:
                 "reason": "لا توجد فئات مدربة"
             }
         
-        # تحليل النص باستخدام النظريات الثلاث
-        text_analysis = self._analyze_text(text)
-        
-        # حساب التطابق مع كل فئة
-        category_scores = {}
-        for category_name, category_data in self.categories.items():
-            score = self._calculate_category_match(
-                text_analysis, category_data["profile"]
-            )
-            category_scores[category_name] = score
+        # خصائص النص ومطابقتها مع جميع المراكز
+        features = np.array(self._text_features(text))
+        scores = self._score_features(features[np.newaxis, :])[0]
+        category_scores = {name: float(score) for name, score in zip(self.category_names, scores)}
         
         # اختيار أفضل فئة
-        best_category = max(category_scores, key=category_scores.get)
+        best_category = self.category_names[int(np.argmax(scores))]
         confidence = category_scores[best_category]
         
         # توليد التفسير
         explanation = self._generate_classification_explanation(
-            text_analysis, best_category, confidence
+            features, best_category, confidence
         )
         
         # حفظ نتيجة التصنيف
@@ -100,6 +138,27 @@ class RevolutionaryTextClassifier:
         
         return classification_result
     
+    def classify_batch(self, texts: List[str]) -> Dict[str, Any]:
+        """
+        📦 تصنيف مجموعة نصوص دفعة واحدة
+        مصفوفة خصائص لجميع النصوص تُطابق مع جميع المراكز بعملية مصفوفية واحدة
+        (لا طباعة لكل نص ولا إضافة إلى سجل التصنيف)
+        """
+        if not self.categories:
+            return {"categories": [], "predicted_categories": ["unknown"] * len(texts),
+                    "confidence": np.zeros(len(texts)), "scores": np.zeros((len(texts), 0))}
+        
+        features = self._feature_matrix(texts)
+        scores = self._score_features(features)
+        best = np.argmax(scores, axis=1)
+        
+        return {
+            "categories": list(self.category_names),
+            "predicted_categories": [self.category_names[index] for index in best],
+            "confidence": scores[np.arange(len(texts)), best],
+            "scores": scores
+        }
+    
     def analyze_sentiment(self, text: str) -> Dict:
         """
         😊 تحليل المشاعر باستخدام ثنائية الصفر
@@ -157,16 +216,72 @@ class RevolutionaryTextClassifier:
     
     def _create_category_profile(self, training_texts: List[str]) -> Dict:
         """إنشاء ملف شخصي للفئة"""
-        all_analyses = []
-        
-        for text in training_texts:
-            analysis = self._analyze_text(text)
-            all_analyses.append(analysis)
+        if not training_texts:
+            return {}
         
-        # دمج التحليلات لإنشاء ملف الفئة
-        category_profile = self._merge_text_analyses(all_analyses)
+        # متوسطات خصائص النصوص التدريبية (نفس دمج التحليلات الكاملة)
+        features = self._feature_matrix(training_texts)
+        word_counts = [len(self._extract_words(text)) for text in training_texts]
         
-        return category_profile
+        return {
+            "average_formality": float(features[:, 0].mean()),
+            "average_complexity": float(features[:, 1].mean()),
+            "average_coherence": float(features[:, 2].mean()),
+            "average_word_count": float(np.mean(word_counts)),
+            "profile_created_at": datetime.now().isoformat()
+        }
+    
+    def _compile_centroids(self):
+        """تجميع مراكز الفئات في مصفوفة واحدة (صف لكل فئة)"""
+        self.category_names = list(self.categories)
+        self.centroid_matrix = (np.vstack([self.categories[name]["centroid"] for name in self.category_names])
+                                if self.category_names else np.zeros((0, len(CATEGORY_FEATURES))))
+    
+    def _score_features(self, features: np.ndarray) -> np.ndarray:
+        """التطابق = 1 - متوسط الفرق المطلق عن كل مركز (نصوص × فئات)"""
+        return 1.0 - np.abs(features[:, np.newaxis, :] - self.centroid_matrix[np.newaxis, :, :]).mean(axis=2)
+    
+    def _feature_matrix(self, texts: List[str]) -> np.ndarray:
+        """مصفوفة خصائص (نصوص × CATEGORY_FEATURES)"""
+        if not texts:
+            return np.zeros((0, len(CATEGORY_FEATURES)))
+        return np.array([self._text_features(text) for text in texts], dtype=float)
+    
+    def _is_formal_word(self, word: str) -> bool:
+        """هل الكلمة رسمية؟ مع ذاكرة للكلمات المتكررة"""
+        cached = self._formal_words.get(word)
+        if cached is None:
+            if len(self._formal_words) >= WORD_FEATURE_CACHE_SIZE:
+                self._formal_words.clear()
+            cached = self._formal_words[word] = self._calculate_formality_score(word) > 0.5
+        return cached
+    
+    def _text_features(self, text: str) -> Tuple[float, float, float]:
+        """
+        خصائص النص الثلاث دون بناء التحليل الكامل:
+        نسبة الرسمية، التعقيد المفاهيمي (0.1 × أزواج الأضداد)، التماسك
+        """
+        words = self._extract_words(text)
+        if not words:
+            return 0.5, 0.0, 0.0
+        
+        formality_ratio = sum(self._is_formal_word(word) for word in words) / len(words)
+        complexity = self._count_word_opposites(words) * 0.1
+        
+        # الخيوط: لا اتصال دون تطابق الحرف الأول، فالمقارنة داخل كل مجموعة حرف فقط
+        counts = Counter(words)
+        groups = defaultdict(list)
+        for word in counts:
+            groups[word[0]].append(word)
+        total_connections = 0
+        for group in groups.values():
+            for word in group:
+                for other_word in group:
+                    if other_word != word and self._calculate_word_connection(word, other_word) > 0.6:
+                        total_connections += counts[other_word]
+        coherence = min(total_connections / len(counts), 1.0)
+        
+        return formality_ratio, complexity, coherence
     
     def _analyze_text(self, text: str) -> Dict:
         """تحليل نص باستخدام النظريات الثلاث"""
@@ -318,25 +433,27 @@ class RevolutionaryTextClassifier:
             return "عامي"
     
     def _find_word_opposites(self, words: List[str]) -> List[Tuple]:
-        """البحث عن الكلمات المتضادة"""
+        """البحث عن الكلمات المتضادة (بحث في فهرس الأجزاء بدلاً من مقارنة كل زوج بكل ضد)"""
         opposites = []
         
-        # قاموس بسيط للأضداد
-        opposite_pairs = [
-            ('جميل', 'قبيح'), ('كبير', 'صغير'), ('سريع', 'بطيء'),
-            ('ساخن', 'بارد'), ('نور', 'ظلام'), ('فرح', 'حزن')
-        ]
+        # الكلمات التي تطابق طرفاً من زوج أضداد فقط
+        tagged = [(word,) + OPPOSITE_FRAGMENTS[word] for word in words if word in OPPOSITE_FRAGMENTS]
         
-        for word1 in words:
-            for word2 in words:
-                if word1 != word2:
-                    for pair in opposite_pairs:
-                        if (word1 in pair[0] and word2 in pair[1]) or \
-                           (word1 in pair[1] and word2 in pair[0]):
-                            opposites.append((word1, word2))
+        for word1, _, counterparts1 in tagged:
+            for word2, tags2, _ in tagged:
+                if word1 != word2 and not counterparts1.isdisjoint(tags2):
+                    # زوج لكل ضد مطابق
+                    matched_pairs = {pair_index for pair_index, _ in counterparts1 & tags2}
+                    opposites.extend([(word1, word2)] * len(matched_pairs))
         
         return opposites
     
+    def _count_word_opposites(self, words: List[str]) -> int:
+        """عدد أزواج الأضداد (كما في _find_word_opposites) دون بناء القائمة"""
+        if not any(word in OPPOSITE_FRAGMENTS for word in words):
+            return 0
+        return len(self._find_word_opposites(words))
+    
     def _create_word_dimension(self, word_pair: Tuple) -> Dict:
         """إنشاء بُعد من زوج كلمات"""
         word1, word2 = word_pair
@@ -414,52 +531,10 @@ class RevolutionaryTextClassifier:
         coherence = total_connections / total_words
         return min(coherence, 1.0)
     
-    def _merge_text_analyses(self, analyses: List[Dict]) -> Dict:
-        """دمج تحليلات النصوص لإنشاء ملف الفئة"""
-        if not analyses:
-            return {}
-        
-        # حساب المتوسطات
-        avg_formality = np.mean([a["zero_duality"]["formality_ratio"] for a in analyses])
-        avg_complexity = np.mean([a["perpendicular_opposites"]["conceptual_complexity"] for a in analyses])
-        avg_coherence = np.mean([a["filament_connections"]["coherence_score"] for a in analyses])
-        avg_word_count = np.mean([a["word_count"] for a in analyses])
-        
-        return {
-            "average_formality": avg_formality,
-            "average_complexity": avg_complexity,
-            "average_coherence": avg_coherence,
-            "average_word_count": avg_word_count,
-            "profile_created_at": datetime.now().isoformat()
-        }
-    
-    def _calculate_category_match(self, text_analysis: Dict, category_profile: Dict) -> float:
-        """حساب التطابق مع فئة"""
-        # مقارنة الخصائص
-        formality_match = 1.0 - abs(
-            text_analysis["zero_duality"]["formality_ratio"] - 
-            category_profile["average_formality"]
-        )
-        
-        complexity_match = 1.0 - abs(
-            text_analysis["perpendicular_opposites"]["conceptual_complexity"] - 
-            category_profile["average_complexity"]
-        )
-        
-        coherence_match = 1.0 - abs(
-            text_analysis["filament_connections"]["coherence_score"] - 
-            category_profile["average_coherence"]
-        )
-        
-        # النتيجة الإجمالية
-        overall_match = (formality_match + complexity_match + coherence_match) / 3
-        
-        return overall_match
-    
-    def _generate_classification_explanation(self, text_analysis: Dict, category: str, confidence: float) -> str:
+    def _generate_classification_explanation(self, features: np.ndarray, category: str, confidence: float) -> str:
         """توليد تفسير للتصنيف"""
-        style = text_analysis["zero_duality"]["style_insight"]
-        complexity = text_analysis["perpendicular_opposites"]["conceptual_complexity"]
+        style = self._interpret_style(features[0])
+        complexity = features[1]
         
         explanation = f"تم تصنيف النص كـ '{category}' بناءً على الأسلوب ({style})"
         
@@ -520,7 +595,59 @@ def main():
         print(f"   😊 المشاعر: {sentiment['overall_sentiment']}")
         print(f"   📈 الإيجابية: {sentiment['sentiment_analysis']['positivity_ratio']:.3f}")
     
+    # تصنيف دفعي لجميع النصوص
+    batch = classifier.classify_batch(test_texts)
+    print("\n📦 التصنيف الدفعي:")
+    for text, category, confidence in zip(test_texts, batch["predicted_categories"], batch["confidence"]):
+        print(f"   {category} ({confidence:.3f}): {text}")
+    
     print("\n✅ تم إنجاز التصنيف وتحليل المشاعر بنجاح!")
 
+def test_classify_batch_matches_single() -> bool:
+    """🧪 التصنيف الدفعي يطابق تصنيف كل نص منفرداً، وخصائصه تطابق التحليل الكامل"""
+    print("🧪 اختبار تطابق التصنيف الدفعي مع التصنيف الفردي")
+    print("=" * 60)
+
+    try:
+        classifier = RevolutionaryTextClassifier("BatchTest")
+        classifier.train_category("رياضة", ["الفريق فاز في المباراة بنتيجة رائعة",
+                                            "اللاعب سجل هدف جميل في الدقيقة الأخيرة"])
+        classifier.train_category("تكنولوجيا", ["الذكاء الاصطناعي يطور تقنيات جديدة",
+                                                "البرمجة تتطور بسرعة كبيرة والبرامج كثيرة"])
+        texts = [
+            "الفريق الجديد يستخدم تقنيات متطورة في التدريب",
+            "الجو جميل اليوم لكن المكان قبيح والطعام بارد وساخن",
+            "المباراة المباراة المباريات كانت مثيرة، والجمهور استمتع!",
+            "",
+            "هذا المنتج سيء جداً ولا أنصح بشرائه"
+        ]
+
+        batch = classifier.classify_batch(texts)
+        assert batch["categories"] == classifier.category_names
+        for index, text in enumerate(texts):
+            single = classifier.classify_text(text)
+            assert batch["predicted_categories"][index] == single["predicted_category"]
+            assert math.isclose(batch["confidence"][index], single["confidence"], abs_tol=1e-12)
+            for column, name in enumerate(batch["categories"]):
+                assert math.isclose(batch["scores"][index, column], single["all_scores"][name], abs_tol=1e-12)
+
+            # الخصائص المختصرة = خصائص التحليل الكامل بالنظريات الثلاث
+            analysis = classifier._analyze_text(text)
+            expected = (analysis["zero_duality"]["formality_ratio"],
+                        analysis["perpendicular_opposites"]["conceptual_complexity"],
+                        analysis["filament_connections"]["coherence_score"])
+            assert np.allclose(classifier._text_features(text), expected, atol=1e-12)
+
+        empty = RevolutionaryTextClassifier("EmptyTest").classify_batch(texts)
+        assert empty["predicted_categories"] == ["unknown"] * len(texts)
+
+        print("✅ التصنيف الدفعي مطابق للتصنيف الفردي")
+        return True
+
+    except Exception as e:
+        print(f"❌ خطأ في اختبار التصنيف الدفعي: {e}")
+        return False
+
 if __name__ == "__main__":
     main()
+    test_classify_batch_matches_single()
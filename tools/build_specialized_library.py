@@ -8,26 +8,165 @@
 باستخدام نظام بصيرة الثوري مع تكامل Ollama.
 
 الاستخدام:
-    python3 build_specialized_library.py
+    python3 build_specialized_library.py [--workers 4] [--rebuild] [--fresh]
+
+- المواضيع تُولَّد بتزامن محدود مع تباطؤ تكيفي عند الفشل (بدل التوقف الثابت)
+- سجل نقاط تفتيش (JSONL) يسمح بالاستئناف بعد الانقطاع من آخر موضوع مكتمل
+- ذاكرة نتائج لكل موضوع تتخطى المواضيع غير المتغيرة عند إعادة البناء
 
 المطور: باسل يحيى عبدالله
 """
 
 from revolutionary_knowledge_system import RevolutionaryKnowledgeSystem
+import argparse
+import hashlib
+import json
+import os
+import threading
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Dict, Any, Optional, Set, Tuple
+
+# يُرفع عند تغيير طريقة توليد المواضيع لإبطال ذاكرة النتائج
+TOPIC_CACHE_VERSION = 1
+
+
+def topic_fingerprint(library_name: str, topic: str, source_type: str = 'ollama') -> str:
+    """بصمة الموضوع (المكتبة + نص الموضوع + المصدر + إصدار الذاكرة)"""
+    key = f"{TOPIC_CACHE_VERSION}|{source_type}|{library_name}|{topic}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class AdaptiveBackoff:
+    """
+    تباطؤ تكيفي مشترك بين العمال
+    الفشل يضاعف التأخير (حتى حد أقصى)، والنجاح ينصفه حتى يعود صفراً
+    """
+
+    def __init__(self, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.current_delay = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            delay = self.current_delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self):
+        with self._lock:
+            self.current_delay = self.current_delay / 2 if self.current_delay > self.base_delay else 0.0
+
+    def record_failure(self):
+        with self._lock:
+            self.current_delay = min(self.max_delay, max(self.base_delay, self.current_delay * 2))
+
+
+class BuildJournal:
+    """سجل نقاط تفتيش: سطر JSON لكل موضوع مكتمل (يُكتب فوراً ليصمد أمام الانقطاع)"""
+
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def completed_topics(self) -> Set[Tuple[str, str]]:
+        """(المكتبة، الموضوع) لكل موضوع نجح في البناء السابق غير المكتمل"""
+        completed = set()
+        if not os.path.exists(self.journal_path):
+            return completed
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # سطر أخير مقطوع بسبب الانقطاع
+                if entry.get('status') == 'success':
+                    completed.add((entry['library'], entry['topic']))
+        return completed
+
+    def record(self, entry: Dict[str, Any]):
+        with self._lock:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+
+class TopicResultCache:
+    """ذاكرة نتائج المواضيع عبر عمليات البناء (بصمة الموضوع -> ملخص المحتوى)"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(fingerprint)
+
+    def put(self, fingerprint: str, entry: Dict[str, Any]):
+        with self._lock:
+            self.entries[fingerprint] = entry
+
+    def save(self):
+        """حفظ ذري للذاكرة"""
+        with self._lock:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.cache_path)
+
 
 class SpecializedLibraryBuilder:
     """بناء مكتبات معرفية متخصصة"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, max_retries: int = 2,
+                 journal_path: str = "databases/library_build_journal.jsonl",
+                 cache_path: str = "databases/library_topic_cache.json",
+                 use_cache: bool = True, resume: bool = True,
+                 min_content_length: int = 50, system=None):
         """تهيئة البناء"""
         print("🧬 تهيئة بناء المكتبة المتخصصة...")
-        self.system = RevolutionaryKnowledgeSystem()
+        self.system = system if system is not None else RevolutionaryKnowledgeSystem()
         self.successful = 0
         self.failed = 0
+        self.skipped = 0
         self.start_time = datetime.now()
+        
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.min_content_length = min_content_length
+        self.use_cache = use_cache
+        self.backoff = AdaptiveBackoff()
+        self.journal = BuildJournal(journal_path)
+        self.topic_cache = TopicResultCache(cache_path)
+        self.resumed_topics = self.journal.completed_topics() if resume else set()
+        if not resume:
+            self.journal.clear()
+        if self.resumed_topics:
+            print(f"🔁 استئناف بناء سابق: {len(self.resumed_topics)} موضوع مكتمل")
+        self._counter_lock = threading.Lock()
     
     def build_ai_library(self):
         """بناء مكتبة متخصصة في الذكاء الاصطناعي"""
@@ -117,6 +256,28 @@ class SpecializedLibraryBuilder:
         
         return self._build_library("اللغة العربية", arabic_topics)
     
+    def _generate_topic(self, library_name: str, topic: str) -> Dict[str, Any]:
+        """توليد موضوع واحد مع إعادة المحاولة والتباطؤ التكيفي"""
+        error = None
+        for attempt in range(self.max_retries + 1):
+            self.backoff.wait()
+            try:
+                result = self.system.extract_from_external_source('ollama', topic)
+                if result and len(result.strip()) > self.min_content_length:  # التأكد من جودة المحتوى
+                    self.backoff.record_success()
+                    return {
+                        'status': 'success',
+                        'length': len(result),
+                        'content_hash': hashlib.sha256(result.encode('utf-8')).hexdigest(),
+                        'attempts': attempt + 1
+                    }
+                error = "فشل أو محتوى ضعيف"
+            except Exception as e:
+                error = str(e)[:50]
+            self.backoff.record_failure()
+        
+        return {'status': 'failed', 'error': error, 'attempts': self.max_retries + 1}
+    
     def _build_library(self, library_name: str, topics: list) -> dict:
         """بناء مكتبة معرفية متخصصة"""
         print(f"\n🎯 بناء مكتبة {library_name}")
@@ -125,42 +286,80 @@ class SpecializedLibraryBuilder:
         
         local_successful = 0
         local_failed = 0
+        local_skipped = 0
+        pending = []
         
-        for i, topic in enumerate(topics, 1):
-            print(f"📖 ({i:2d}/{len(topics)}) {topic}")
-            
-            try:
-                result = self.system.extract_from_external_source('ollama', topic)
-                if result and len(result.strip()) > 50:  # التأكد من جودة المحتوى
+        # تخطي المواضيع المكتملة (استئناف) أو غير المتغيرة (ذاكرة النتائج)
+        for topic in topics:
+            fingerprint = topic_fingerprint(library_name, topic)
+            cached = self.topic_cache.get(fingerprint) if self.use_cache else None
+            if (library_name, topic) in self.resumed_topics or (cached and cached.get('status') == 'success'):
+                local_skipped += 1
+                print(f"⏭️ {topic} (مكتمل سابقاً)")
+            else:
+                pending.append((topic, fingerprint))
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="LibraryBuilder")
+        try:
+            futures = {
+                executor.submit(self._generate_topic, library_name, topic): (topic, fingerprint)
+                for topic, fingerprint in pending
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                topic, fingerprint = futures[future]
+                outcome = future.result()
+                print(f"📖 ({i:2d}/{len(pending)}) {topic}")
+                
+                if outcome['status'] == 'success':
                     local_successful += 1
-                    self.successful += 1
-                    print(f"✅ تم بنجاح ({len(result)} حرف)")
+                    print(f"✅ تم بنجاح ({outcome['length']} حرف)")
+                    self.topic_cache.put(fingerprint, {
+                        **outcome,
+                        'library': library_name,
+                        'topic': topic,
+                        'built_at': datetime.now().isoformat()
+                    })
                 else:
                     local_failed += 1
-                    self.failed += 1
-                    print(f"❌ فشل أو محتوى ضعيف")
-                
-                # توقف قصير لتجنب إرهاق النظام
-                time.sleep(3)
+                    print(f"❌ {outcome['error']}")
                 
-            except Exception as e:
-                local_failed += 1
-                self.failed += 1
-                print(f"❌ خطأ: {str(e)[:50]}...")
-                time.sleep(1)
+                self.journal.record({
+                    'library': library_name,
+                    'topic': topic,
+                    'status': outcome['status'],
+                    'timestamp': datetime.now().isoformat()
+                })
+        except KeyboardInterrupt:
+            # إلغاء المواضيع التي لم تبدأ؛ الجارية فقط تكمل (لا تُسجل فتُعاد عند الاستئناف)
+            executor.shutdown(wait=False, cancel_futures=True)
+            with self._counter_lock:
+                self.successful += local_successful
+                self.failed += local_failed
+                self.skipped += local_skipped
+            raise
+        executor.shutdown()
+        
+        self.topic_cache.save()
+        with self._counter_lock:
+            self.successful += local_successful
+            self.failed += local_failed
+            self.skipped += local_skipped
         
         # إحصائيات المكتبة
-        success_rate = (local_successful / len(topics)) * 100
+        success_rate = ((local_successful + local_skipped) / len(topics)) * 100 if topics else 0.0
         
         print(f"\n📊 نتائج مكتبة {library_name}:")
         print(f"✅ نجح: {local_successful}")
+        print(f"⏭️ متخطى: {local_skipped}")
         print(f"❌ فشل: {local_failed}")
         print(f"📈 معدل النجاح: {success_rate:.1f}%")
         
         return {
             'name': library_name,
             'total': len(topics),
-            'successful': local_successful,
+            'successful': local_successful + local_skipped,
+            'generated': local_successful,
+            'skipped': local_skipped,
             'failed': local_failed,
             'success_rate': success_rate
         }
@@ -173,15 +372,20 @@ class SpecializedLibraryBuilder:
         libraries = []
         
         try:
-            # بناء المكتبات واحدة تلو الأخرى
+            # بناء المكتبات واحدة تلو الأخرى (المواضيع داخل كل مكتبة متزامنة)
             libraries.append(self.build_ai_library())
             libraries.append(self.build_programming_library())
             libraries.append(self.build_science_library())
             libraries.append(self.build_arabic_language_library())
             
+            # اكتمل البناء: السجل لم يعد لازماً (ذاكرة النتائج تبقى لإعادة البناء)
+            self.journal.clear()
+            
         except KeyboardInterrupt:
-            print("\n⚠️ تم إيقاف العملية بواسطة المستخدم")
+            self.topic_cache.save()
+            print("\n⚠️ تم إيقاف العملية بواسطة المستخدم (يمكن الاستئناف لاحقاً)")
         except Exception as e:
+            self.topic_cache.save()
             print(f"\n❌ خطأ عام: {e}")
         
         # التقرير النهائي
@@ -202,10 +406,13 @@ class SpecializedLibraryBuilder:
         
         print(f"\n📈 الإحصائيات الإجمالية:")
         print(f"✅ إجمالي النجاح: {self.successful}")
+        print(f"⏭️ إجمالي المتخطى: {self.skipped}")
         print(f"❌ إجمالي الفشل: {self.failed}")
         
-        if self.successful + self.failed > 0:
-            overall_success = (self.successful / (self.successful + self.failed)) * 100
+        overall_success = 0.0
+        completed = self.successful + self.skipped
+        if completed + self.failed > 0:
+            overall_success = (completed / (completed + self.failed)) * 100
             print(f"📊 معدل النجاح الإجمالي: {overall_success:.1f}%")
         
         print(f"\n📚 تفاصيل المكتبات:")
@@ -229,6 +436,12 @@ class SpecializedLibraryBuilder:
 
 def main():
     """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="بناء المكتبات المعرفية المتخصصة")
+    parser.add_argument('--workers', type=int, default=4, help="عدد المواضيع المولدة بالتزامن")
+    parser.add_argument('--rebuild', action='store_true', help="تجاهل ذاكرة النتائج وإعادة توليد كل المواضيع")
+    parser.add_argument('--fresh', action='store_true', help="تجاهل سجل البناء السابق وعدم الاستئناف")
+    args = parser.parse_args()
+    
     print("🧬 مرحباً بك في بناء المكتبات المتخصصة!")
     print("هذا السكريبت سيبني مكتبات معرفية متخصصة في:")
     print("  1. الذكاء الاصطناعي")
@@ -242,7 +455,9 @@ def main():
         print("تم الإلغاء.")
         return
     
-    builder = SpecializedLibraryBuilder()
+    builder = SpecializedLibraryBuilder(max_workers=args.workers,
+                                        use_cache=not args.rebuild,
+                                        resume=not args.fresh)
     builder.build_all_libraries()
 
 if __name__ == "__main__":